@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmarks de los caminos calientes de Abu.
+
+Cada caso usa fechas, ubicaciones y semillas fijas, de modo que dos corridas
+sobre la misma máquina midan exactamente el mismo trabajo. Los resultados se
+guardan como JSON y pueden compararse contra un baseline commiteado con un
+umbral de regresión.
+
+Uso (desde abu_engine/):
+  python benchmarks/bench_core.py                          # corre todo, imprime JSON
+  python benchmarks/bench_core.py --out bench.json         # guarda resultados
+  python benchmarks/bench_core.py --compare                # compara vs benchmarks/baseline.json
+  python benchmarks/bench_core.py --compare --threshold 0.15 --filter forecast
+  python benchmarks/bench_core.py --save-baseline          # regenera el baseline
+
+El baseline depende del hardware: regenerarlo en la máquina de CI con
+--save-baseline antes de usar --compare como gate. Los casos de BUDGETS_MS
+tienen además un presupuesto absoluto (mediana en ms) que se verifica en
+cada corrida; excederlo también termina con código 1.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+CITIES_PATH = Path(__file__).parent.parent / "data" / "cities.json"
+
+SEED = 1234
+BIRTH = datetime(1990, 7, 5, 12, 0, 0, tzinfo=timezone.utc)
+LAT, LON = -34.6037, -58.3816  # Buenos Aires
+YEAR = 2025
+PLANET_NAMES = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+
+
+def random_planets(rng: random.Random, n: int = 10) -> List[Dict[str, Any]]:
+    """Planetas sintéticos reproducibles: [{name, longitude, speed}]."""
+    return [
+        {"name": PLANET_NAMES[i % len(PLANET_NAMES)], "longitude": rng.uniform(0, 360), "speed": rng.uniform(-0.5, 1.5)}
+        for i in range(n)
+    ]
+
+
+def _bench_chart_json():
+    from core.chart import chart_json
+    return lambda: chart_json(LAT, LON, BIRTH)
+
+
+def _bench_find_solar_return():
+    from core.chart import find_solar_return
+    return lambda: find_solar_return(BIRTH, LAT, LON, YEAR)
+
+
+def _bench_rank_16():
+    from core.solar_return_ranking import rank_solar_return_locations
+    return lambda: rank_solar_return_locations(BIRTH, year=YEAR, top_n=5)
+
+
+def _bench_rank_large():
+    """Ranking sobre las 16 ciudades de relocación + las 58 de cities.json."""
+    from core import solar_return_ranking as srr
+
+    with open(CITIES_PATH, encoding="utf-8") as f:
+        extra = {
+            f"{c['city']}, {c['country']}": {"lat": c["lat"], "lon": c["lon"], "region": c["country"]}
+            for c in json.load(f)
+        }
+
+    def run():
+        original = srr.RELOCATION_CITIES
+        srr.RELOCATION_CITIES = {**original, **extra}
+        try:
+            return srr.rank_solar_return_locations(
+                BIRTH, year=YEAR, city_names=list(srr.RELOCATION_CITIES), top_n=5
+            )
+        finally:
+            srr.RELOCATION_CITIES = original
+    return run
+
+
+def _bench_forecast(years: int, step: str):
+    def setup():
+        from core.forecast import forecast_timeseries
+        start = datetime(YEAR, 1, 1, tzinfo=timezone.utc)
+        end = datetime(YEAR + years, 1, 1, tzinfo=timezone.utc)
+        return lambda: forecast_timeseries(BIRTH, LAT, LON, start, end, step)
+    return setup
+
+
+def _bench_life_cycles():
+    from core.life_cycles import forecast_life_cycles
+    return lambda: forecast_life_cycles(BIRTH.isoformat())
+
+
+def _bench_transits():
+    from core.transits import calculate_transits
+    rng = random.Random(SEED)
+    natal, transit = random_planets(rng), random_planets(rng)
+    return lambda: calculate_transits(natal, transit, include_minor=True)
+
+
+def _bench_houses():
+    from core.houses_swiss import calculate_houses
+    return lambda: calculate_houses(BIRTH, LAT, LON)
+
+
+def _bench_transit_calendar():
+    from core.chart import chart_json
+    from core.transit_calendar import transit_calendar
+    natal = {p.name: p.lon for p in chart_json(LAT, LON, BIRTH).planets}
+    start, end = datetime(YEAR, 1, 1, tzinfo=timezone.utc), datetime(YEAR + 1, 1, 1, tzinfo=timezone.utc)
+    return lambda: transit_calendar(natal, start, end)
+
+
+def _bench_fixed_stars():
+    from core.fixed_stars import get_all_fixed_star_contacts
+    planets = random_planets(random.Random(SEED), n=13)
+    return lambda: get_all_fixed_star_contacts(planets)
+
+
+# name -> (setup que devuelve el callable, repeticiones, llamadas por repetición)
+BENCHMARKS: Dict[str, tuple] = {
+    "chart_json": (_bench_chart_json, 7, 5),
+    "find_solar_return": (_bench_find_solar_return, 7, 3),
+    "rank_solar_return_locations_16": (_bench_rank_16, 3, 1),
+    "rank_solar_return_locations_large": (_bench_rank_large, 3, 1),
+    "forecast_timeseries_1y_1d": (_bench_forecast(1, "1d"), 3, 1),
+    "forecast_timeseries_10y_7d": (_bench_forecast(10, "7d"), 3, 1),
+    "forecast_life_cycles": (_bench_life_cycles, 3, 1),
+    "calculate_transits": (_bench_transits, 7, 200),
+    "calculate_houses": (_bench_houses, 7, 500),
+    "get_all_fixed_star_contacts": (_bench_fixed_stars, 7, 500),
+    "transit_calendar_1y": (_bench_transit_calendar, 5, 1),
+}
+
+# name -> mediana máxima (ms), independiente del baseline
+BUDGETS_MS: Dict[str, float] = {
+    "transit_calendar_1y": 1000.0,  # diez planetas, un año completo
+}
+
+
+def measure(fn: Callable[[], Any], repeat: int, number: int) -> Dict[str, Any]:
+    """Tiempo por llamada (ms) sobre `repeat` rondas de `number` llamadas."""
+    fn()  # warm-up: carga efemérides, caches, imports perezosos
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - t0) * 1000 / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        "repeat": repeat,
+        "number": number,
+        "min_ms": round(min(samples), 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "stdev_ms": round(statistics.stdev(samples), 4) if len(samples) > 1 else 0.0,
+        "max_ms": round(max(samples), 4),
+    }
+
+
+def run_benchmarks(names: Optional[List[str]] = None, quick: bool = False) -> Dict[str, Any]:
+    results = {}
+    for name, (setup, repeat, number) in BENCHMARKS.items():
+        if names is not None and name not in names:
+            continue
+        if quick:
+            repeat, number = min(repeat, 3), max(1, number // 10)
+        print(f"[INFO] {name} ({repeat}x{number})...", file=sys.stderr)
+        results[name] = measure(setup(), repeat, number)
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": SEED,
+            "birth": BIRTH.isoformat(),
+            "location": [LAT, LON],
+            "year": YEAR,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> Dict[str, Any]:
+    """Compara medianas; regresión si current > baseline * (1 + threshold)."""
+    rows, regressions = {}, []
+    for name, res in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            rows[name] = {"status": "new", "median_ms": res["median_ms"]}
+            continue
+        ratio = res["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        status = "regression" if ratio > 1 + threshold else "improvement" if ratio < 1 - threshold else "ok"
+        rows[name] = {
+            "status": status,
+            "baseline_ms": base["median_ms"],
+            "median_ms": res["median_ms"],
+            "ratio": round(ratio, 3),
+        }
+        if status == "regression":
+            regressions.append(name)
+    return {"threshold": threshold, "benchmarks": rows, "regressions": regressions}
+
+
+def over_budget(current: Dict[str, Any]) -> List[str]:
+    """Casos medidos cuya mediana excede su presupuesto en BUDGETS_MS."""
+    return [
+        name for name, res in current["results"].items()
+        if name in BUDGETS_MS and res["median_ms"] > BUDGETS_MS[name]
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Abu core micro-benchmarks")
+    ap.add_argument("--filter", default=None, help="Corre solo benchmarks cuyo nombre contenga este texto")
+    ap.add_argument("--quick", action="store_true", help="Menos repeticiones (smoke test)")
+    ap.add_argument("--out", default=None, help="Archivo JSON de resultados")
+    ap.add_argument("--baseline", default=str(BASELINE_PATH))
+    ap.add_argument("--compare", action="store_true", help="Comparar contra el baseline")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Regresión tolerada (0.25 = +25%%)")
+    ap.add_argument("--save-baseline", action="store_true", help="Escribir los resultados como baseline")
+    args = ap.parse_args(argv)
+
+    names = [n for n in BENCHMARKS if args.filter in n] if args.filter else None
+    report = run_benchmarks(names, quick=args.quick)
+
+    exit_code = 0
+    if args.compare:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f), args.threshold)
+        for name in report["comparison"]["regressions"]:
+            row = report["comparison"]["benchmarks"][name]
+            print(f"[WARN] Regression {name}: {row['baseline_ms']} ms -> {row['median_ms']} ms (x{row['ratio']})", file=sys.stderr)
+        exit_code = 1 if report["comparison"]["regressions"] else 0
+    for name in over_budget(report):
+        print(f"[WARN] Over budget {name}: {report['results'][name]['median_ms']} ms > {BUDGETS_MS[name]} ms", file=sys.stderr)
+        exit_code = 1
+
+    text = json.dumps(report, indent=2)
+    if args.save_baseline:
+        Path(args.baseline).write_text(text + "\n", encoding="utf-8")
+        print(f"[INFO] Baseline saved to {args.baseline}", file=sys.stderr)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    elif not args.save_baseline:
+        print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,19 @@
 ﻿# -*- coding: utf-8 -*-
+"""
+Aspectos entre longitudes eclípticas.
+
+`aspect_matrix` es el kernel común: recibe dos vectores de longitudes y una
+tabla de aspectos/orbes y devuelve en un solo broadcast de NumPy la matriz
+completa (separación, aspecto más cercano dentro de orbe, orbe y si aplica).
+Cartas, tránsitos, retornos solares, forecast y sinastría se construyen sobre
+él; `aspect_between`, `calculate_aspect_type` e `is_applying` son las vistas
+escalares del mismo cálculo.
+"""
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
 ASPECTS = {"conjunction": 0, "sextile": 60, "square": 90, "trine": 120, "opposition": 180}
 
 # Aspectos menores
@@ -9,15 +24,106 @@ MINOR_ASPECTS = {
     "quincunx": 150,
 }
 
+ALL_ASPECTS = {**ASPECTS, **MINOR_ASPECTS}
+
+Orbs = Union[float, Dict[str, float]]
+
+
+def _applying(diff: np.ndarray, separation: np.ndarray, angle: np.ndarray, rate: np.ndarray) -> np.ndarray:
+    """
+    True donde el orbe |separación - ángulo| disminuye.
+
+    diff es la diferencia con signo (b - a) en (-180, 180] y rate la velocidad
+    relativa de b respecto de a (°/día). Sin velocidad se asume aplicativo.
+    """
+    # La separación |diff| crece si b se aleja de a; el orbe disminuye si la
+    # separación va hacia el ángulo del aspecto.
+    separation_rate = np.where(diff >= 0, rate, -rate)
+    towards = np.where(separation >= angle, separation_rate < 0, separation_rate > 0)
+    return np.where(rate == 0, True, towards)
+
+
+def aspect_matrix(
+    lons_a: Sequence[float],
+    lons_b: Sequence[float],
+    aspects: Optional[Dict[str, float]] = None,
+    orbs: Orbs = 6.0,
+    speeds_a: Optional[Sequence[float]] = None,
+    speeds_b: Optional[Sequence[float]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Matriz de aspectos entre todos los pares (a[i], b[j]).
+
+    Args:
+        lons_a, lons_b: Longitudes (n,) y (m,)
+        aspects: {nombre: ángulo} (default: ASPECTS); el orden desempata
+        orbs: Orbe único o {nombre: orbe} (aspectos sin entrada: 3°)
+        speeds_a, speeds_b: Velocidades (°/día) para calcular si aplica;
+            sin ellas `applying` es None
+
+    Returns:
+        dict con arrays (n, m):
+            "separation": distancia angular 0-180
+            "aspect": índice en "names" del aspecto más cercano dentro de su orbe (-1 si ninguno)
+            "orb": |separación - ángulo| (nan si no hay aspecto)
+            "delta": separación - ángulo, con signo (nan si no hay aspecto)
+            "applying": bool o None
+        y "names": lista de nombres de aspecto.
+    """
+    aspects = ASPECTS if aspects is None else aspects
+    names = list(aspects.keys())
+    angles = np.array([aspects[n] for n in names], dtype=float)
+    if isinstance(orbs, dict):
+        orb_limits = np.array([orbs.get(n, 3) for n in names], dtype=float)
+    else:
+        orb_limits = np.full(len(names), float(orbs))
+
+    # Normalizar los vectores (n + m) y no la matriz (n * m): |a - b| ya queda en [0, 360)
+    a = (np.asarray(lons_a, dtype=float) % 360.0)[:, None]
+    b = (np.asarray(lons_b, dtype=float) % 360.0)[None, :]
+    d = np.abs(a - b)
+    separation = np.minimum(d, 360.0 - d)
+
+    # Un pase 2D por aspecto (k es chico) en lugar de un arreglo (n, m, k):
+    # con miles de columnas (ranking de sinastría) evita la memoria intermedia.
+    # La comparación estricta conserva el primer aspecto en caso de empate.
+    best_dev = np.full(separation.shape, np.inf)
+    aspect_idx = np.full(separation.shape, -1, dtype=np.intp)
+    for k, (angle, limit) in enumerate(zip(angles, orb_limits)):
+        deviation = np.abs(separation - angle)
+        better = (deviation <= limit) & (deviation < best_dev)
+        np.copyto(best_dev, deviation, where=better)
+        np.copyto(aspect_idx, k, where=better)
+    found = aspect_idx >= 0
+    best_angle = angles[np.maximum(aspect_idx, 0)]
+    delta = np.where(found, separation - best_angle, np.nan)
+
+    applying = None
+    if speeds_a is not None or speeds_b is not None:
+        sa = np.zeros(a.shape) if speeds_a is None else np.asarray(speeds_a, dtype=float)[:, None]
+        sb = np.zeros(b.shape) if speeds_b is None else np.asarray(speeds_b, dtype=float)[None, :]
+        diff = (b - a + 180.0) % 360.0 - 180.0
+        applying = _applying(diff, separation, best_angle, sb - sa)
+
+    return {
+        "names": names,
+        "separation": separation,
+        "aspect": aspect_idx,
+        "orb": np.abs(delta),
+        "delta": delta,
+        "applying": applying,
+    }
+
+
 def aspect_between(a_lon, b_lon, orb=6):
     """
     Devuelve el tipo de aspecto y la diferencia angular (orb) si existe.
     """
-    diff = abs((a_lon - b_lon + 180) % 360 - 180)
-    for name, angle in ASPECTS.items():
-        if abs(diff - angle) <= orb:
-            return name, round(diff - angle, 2)
-    return None, None
+    m = aspect_matrix([a_lon], [b_lon], ASPECTS, orb)
+    idx = m["aspect"][0, 0]
+    if idx < 0:
+        return None, None
+    return m["names"][idx], round(float(m["delta"][0, 0]), 2)
 
 
 def calculate_aspect_type(lon_a: float, lon_b: float, include_minor: bool = False) -> dict:
@@ -32,35 +138,16 @@ def calculate_aspect_type(lon_a: float, lon_b: float, include_minor: bool = Fals
     Returns:
         dict: {"aspect": str, "orb": float, "angle": float}
     """
-    # Diferencia angular normalizada
-    diff = abs((lon_a - lon_b + 180) % 360 - 180)
-    
-    # Buscar en aspectos mayores
-    aspects_to_check = ASPECTS.copy()
-    if include_minor:
-        aspects_to_check.update(MINOR_ASPECTS)
-    
-    closest_aspect = None
-    closest_orb = 999
-    
-    for aspect_name, aspect_angle in aspects_to_check.items():
-        orb = abs(diff - aspect_angle)
-        if orb < closest_orb:
-            closest_orb = orb
-            closest_aspect = aspect_name
-    
-    # Devolver solo si el orbe es razonable (< 10°)
-    if closest_orb < 10:
-        return {
-            "aspect": closest_aspect,
-            "orb": round(closest_orb, 2),
-            "angle": round(diff, 2)
-        }
-    
-    return {"aspect": None, "orb": None, "angle": round(diff, 2)}
+    # Aspecto más cercano, devuelto sólo si el orbe es razonable (< 10°)
+    m = aspect_matrix([lon_a], [lon_b], ALL_ASPECTS if include_minor else ASPECTS, np.nextafter(10.0, 0.0))
+    idx = m["aspect"][0, 0]
+    angle = round(float(m["separation"][0, 0]), 2)
+    if idx < 0:
+        return {"aspect": None, "orb": None, "angle": angle}
+    return {"aspect": m["names"][idx], "orb": round(float(m["orb"][0, 0]), 2), "angle": angle}
 
 
-def is_applying(lon_natal: float, lon_transit: float, speed_transit: float) -> bool:
+def is_applying(lon_natal: float, lon_transit: float, speed_transit: float, aspect_angle: float = 0) -> bool:
     """
     Determina si un aspecto es aplicativo o separativo.
     
@@ -68,22 +155,13 @@ def is_applying(lon_natal: float, lon_transit: float, speed_transit: float) -> b
         lon_natal: Longitud del planeta natal
         lon_transit: Longitud del planeta en tránsito
         speed_transit: Velocidad del planeta en tránsito (°/día)
+        aspect_angle: Ángulo del aspecto (0 conjunción, 90 cuadratura, ...)
     
     Returns:
-        bool: True si es aplicativo, False si es separativo
+        bool: True si es aplicativo (el orbe disminuye), False si es separativo
     """
     # Si la velocidad es 0 o no disponible, asumir aplicativo
-    if speed_transit == 0:
+    if not speed_transit:
         return True
-    
-    # Calcular diferencia angular
     diff = (lon_transit - lon_natal + 180) % 360 - 180
-    
-    # Si la velocidad es positiva (directo) y diff es negativa, está aplicando
-    # Si la velocidad es negativa (retrógrado) y diff es positiva, está aplicando
-    if speed_transit > 0:
-        return diff < 0
-    else:
-        return diff > 0
-
-
+    return bool(_applying(np.float64(diff), np.float64(abs(diff)), np.float64(aspect_angle), np.float64(speed_transit)))
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Cartas en lote para POST /api/astro/charts:batch.
+
+Todas las fechas válidas del lote se evalúan en una sola pasada de Skyfield
+(chart_json_many: un arreglo de tiempos por cuerpo) y las casas con una
+llamada swisseph por ítem. Los resultados vuelven en el orden de entrada; un
+ítem inválido o que falla deja {"index", "id", "error"} en su posición sin
+abortar el resto del lote.
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from core.chart import chart_json_many, ephemeris_years
+from core.timezones import local_to_utc
+
+BATCH_MAX_ITEMS = int(os.getenv("ABU_BATCH_MAX_ITEMS", "1000"))
+
+
+class BatchChartItem(BaseModel):
+    datetime: str = Field(..., description="Fecha y hora ISO (ej: 1990-07-05T12:00:00Z); sin zona se asume UTC o la hora local de `timezone`")
+    lat: float = Field(..., description="Latitud en grados decimales")
+    lon: float = Field(..., description="Longitud en grados decimales")
+    timezone: Optional[str] = Field(None, description="Zona IANA (ej: America/Argentina/Buenos_Aires) de una hora local sin offset")
+    id: Optional[str] = Field(None, description="Identificador opcional del cliente, se devuelve tal cual")
+
+
+class BatchChartRequest(BaseModel):
+    items: List[BatchChartItem]
+    include_houses: bool = Field(True, description="Calcular casas Placidus y la casa de cada planeta")
+
+
+def parse_item(item: BatchChartItem) -> datetime:
+    """Fecha UTC del ítem; ValueError si la fecha (o su rango), la zona o las coordenadas no son válidas."""
+    try:
+        dt = datetime.fromisoformat(item.datetime.replace("Z", "+00:00"))
+    except Exception:
+        raise ValueError("Invalid date format")
+    if not -90.0 <= item.lat <= 90.0:
+        raise ValueError("lat must be between -90 and 90")
+    if not -180.0 <= item.lon <= 180.0:
+        raise ValueError("lon must be between -180 and 180")
+    if dt.tzinfo is None and item.timezone:
+        dt = local_to_utc(dt, item.timezone)
+    elif dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    else:
+        dt = dt.astimezone(timezone.utc)
+    # Una fecha fuera de la efeméride haría fallar la pasada vectorizada de todo el lote
+    first, last = ephemeris_years()
+    if not first <= dt.year <= last:
+        raise ValueError(f"datetime must be within the ephemeris range {first}-{last}")
+    return dt
+
+
+def with_houses(chart: Dict[str, Any], dt: datetime, lat: float, lon: float) -> Dict[str, Any]:
+    from core.houses_swiss import calculate_houses, house_numbers, HOUSE_SYSTEM_PLACIDUS
+    houses = calculate_houses(dt, lat, lon, HOUSE_SYSTEM_PLACIDUS)
+    cusps = houses["cusps"]
+    for planet, house in zip(chart["planets"], house_numbers([p["lon"] for p in chart["planets"]], cusps)):
+        planet["house"] = int(house)
+    chart["asc"] = houses["asc"]
+    chart["mc"] = houses["mc"]
+    chart["cusps"] = cusps
+    return chart
+
+
+def charts_batch(items: List[BatchChartItem], include_houses: bool = True) -> List[Dict[str, Any]]:
+    """
+    Calcula las cartas del lote.
+
+    Args:
+        items: Ítems (datetime, lat, lon, timezone e id opcionales)
+        include_houses: Agregar asc, mc, cusps y casa por planeta
+
+    Returns:
+        Lista del mismo largo que `items`: cada posición es la carta
+        (formato ChartDTO + index/id) o {"index", "id", "error"}.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    valid: List[int] = []
+    dates: List[datetime] = []
+    for i, item in enumerate(items):
+        try:
+            dates.append(parse_item(item))
+            valid.append(i)
+        except ValueError as e:
+            results[i] = {"index": i, "id": item.id, "error": str(e)}
+
+    charts = chart_json_many(dates, [items[i].lat for i in valid], [items[i].lon for i in valid])
+    for i, dt, chart in zip(valid, dates, charts):
+        item = items[i]
+        try:
+            data = {"index": i, "id": item.id, **chart.dict()}
+            if include_houses:
+                data = with_houses(data, dt, item.lat, item.lon)
+            results[i] = data
+        except Exception as e:
+            results[i] = {"index": i, "id": item.id, "error": str(e)}
+    return results
+
+
+__all__ = ["BATCH_MAX_ITEMS", "BatchChartItem", "BatchChartRequest", "charts_batch", "parse_item", "with_houses"]
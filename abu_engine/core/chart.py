@@ -2,13 +2,19 @@
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from functools import lru_cache
 from pydantic import BaseModel, Field
 from skyfield.api import load, Topos
+from skyfield.framelib import ecliptic_J2000_frame
 from threading import Lock
 from pathlib import Path
 import urllib.request
+import numpy as np
 import logging
-from core.aspects import aspect_between
+import time
+from core.aspects import aspect_matrix
+from core.metrics import CACHE, EPHEMERIS_LOAD
+from core.profiling import span, timed
 
 # Singleton para efemérides
 class EphemerisSingleton:
@@ -26,7 +32,10 @@ class EphemerisSingleton:
         - Print clear messages on download success/failure.
         """
         with cls._lock:
-            if cls._instance is None:
+            if cls._instance is not None:
+                CACHE.hit("ephemeris")
+            else:
+                CACHE.miss("ephemeris")
                 # Resolve data directory next to the package root (…/abu_engine/data)
                 base_dir = Path(__file__).resolve().parent.parent
                 data_dir = base_dir / "data"
@@ -47,7 +56,10 @@ class EphemerisSingleton:
                         raise
 
                 # Load the local BSP file
-                cls._instance = load(bsp_path.as_posix())
+                t0 = time.perf_counter()
+                with span("ephemeris_load"):
+                    cls._instance = load(bsp_path.as_posix())
+                EPHEMERIS_LOAD.set(time.perf_counter() - t0)
             return cls._instance
 
 def normalize_lon(lon: float) -> float:
@@ -63,6 +75,8 @@ class PlanetDTO(BaseModel):
     lon: float
     sign: str
     house: Optional[int] = None
+    speed: Optional[float] = None  # movimiento diario en longitud (°/día)
+    retrograde: Optional[bool] = None
 
 class AspectDTO(BaseModel):
     a: str
@@ -70,6 +84,7 @@ class AspectDTO(BaseModel):
     type: str
     orb: float
     angle: float
+    applying: Optional[bool] = None
 
 class ChartDTO(BaseModel):
     datetime: str
@@ -86,43 +101,69 @@ SUPPORTED_ASPECTS = {
 }
 ASPECT_ORB = 6.0
 
+# Solar returns en serie (find_solar_returns)
+TROPICAL_YEAR_DAYS = 365.24219
+SR_MAX_ITERATIONS = 8
+
+# Nombre del planeta -> clave en el kernel JPL
+BODY_KEYS = {
+    'Sun': 'sun',
+    'Moon': 'moon',
+    'Mercury': 'mercury barycenter',
+    'Venus': 'venus barycenter',
+    'Mars': 'mars barycenter',
+    'Jupiter': 'jupiter barycenter',
+    'Saturn': 'saturn barycenter',
+    'Uranus': 'uranus barycenter',
+    'Neptune': 'neptune barycenter',
+    'Pluto': 'pluto barycenter'
+}
+
+def ecliptic_lon_speed(astrometric):
+    """
+    Longitud eclíptica J2000 (igual que ecliptic_latlon()) y su velocidad en
+    °/día, tomada del vector velocidad de la misma observación (sin
+    evaluaciones extra de la efeméride). Acepta posiciones escalares o
+    vectorizadas.
+    """
+    _, lon_val, _, _, lon_rate, _ = astrometric.frame_latlon_and_rates(ecliptic_J2000_frame)
+    return lon_val.degrees, lon_rate.degrees.per_day
+
+def chart_aspects(planet_positions: Dict[str, float], speeds: Optional[Dict[str, float]] = None) -> List[AspectDTO]:
+    """Aspectos mayores (SUPPORTED_ASPECTS, orbe ASPECT_ORB) entre todas las parejas."""
+    names = list(planet_positions.keys())
+    lons = [planet_positions[n] for n in names]
+    speed_list = [speeds.get(n, 0.0) for n in names] if speeds else None
+    m = aspect_matrix(lons, lons, SUPPORTED_ASPECTS, ASPECT_ORB, speed_list, speed_list)
+    aspects = []
+    for i, j in zip(*np.nonzero(np.triu(m["aspect"] >= 0, k=1))):
+        aspects.append(AspectDTO(
+            a=names[i], b=names[j], type=m["names"][m["aspect"][i, j]],
+            orb=round(float(m["orb"][i, j]), 2), angle=round(float(m["separation"][i, j]), 2),
+            applying=bool(m["applying"][i, j]) if speed_list else None
+        ))
+    return aspects
+
 def chart_json(lat: float, lon: float, date: datetime) -> ChartDTO:
     planets = EphemerisSingleton()
     ts = load.timescale()
     t = ts.from_datetime(date)
     location = Topos(latitude_degrees=lat, longitude_degrees=lon)
     earth = planets['earth']
-    bodies = {
-        'Sun': planets['sun'],
-        'Moon': planets['moon'],
-        'Mercury': planets['mercury barycenter'],
-        'Venus': planets['venus barycenter'],
-        'Mars': planets['mars barycenter'],
-        'Jupiter': planets['jupiter barycenter'],
-        'Saturn': planets['saturn barycenter'],
-        'Uranus': planets['uranus barycenter'],
-        'Neptune': planets['neptune barycenter'],
-        'Pluto': planets['pluto barycenter']
-    }
+    bodies = {name: planets[key] for name, key in BODY_KEYS.items()}
     planet_positions = {}
     planet_dtos = []
-    for name, body in bodies.items():
-        pos = earth.at(t).observe(body)
-        _, lon_val, _ = pos.ecliptic_latlon()
-        lon_norm = normalize_lon(lon_val.degrees)
-        planet_positions[name] = lon_norm
-        planet_dtos.append(PlanetDTO(name=name, lon=lon_norm, sign=get_sign(lon_norm), house=None))
-    aspects = []
-    names = list(planet_positions.keys())
-    for i in range(len(names)):
-        for j in range(i+1, len(names)):
-            a_name, b_name = names[i], names[j]
-            angle = abs(planet_positions[a_name] - planet_positions[b_name])
-            angle = min(angle, 360 - angle)
-            for asp_type, asp_angle in SUPPORTED_ASPECTS.items():
-                orb = abs(angle - asp_angle)
-                if orb <= ASPECT_ORB:
-                    aspects.append(AspectDTO(a=a_name, b=b_name, type=asp_type, orb=round(orb,2), angle=round(angle,2)))
+    with span("skyfield"):
+        for name, body in bodies.items():
+            pos = earth.at(t).observe(body)
+            lon_deg, speed = ecliptic_lon_speed(pos)
+            lon_norm = normalize_lon(lon_deg)
+            planet_positions[name] = lon_norm
+            planet_dtos.append(PlanetDTO(
+                name=name, lon=lon_norm, sign=get_sign(lon_norm), house=None,
+                speed=float(speed), retrograde=bool(speed < 0)
+            ))
+    aspects = chart_aspects(planet_positions, {p.name: p.speed for p in planet_dtos})
     return ChartDTO(
         datetime=date.isoformat(),
         location={"lat": lat, "lon": lon},
@@ -131,6 +172,62 @@ def chart_json(lat: float, lon: float, date: datetime) -> ChartDTO:
     )
 
 
+def planet_longitudes_many(dates: List[datetime]):
+    """
+    Longitudes y velocidades geocéntricas de BODY_KEYS para varias fechas.
+
+    Las posiciones son geocéntricas (como en chart_json), así que se observa
+    cada cuerpo una vez sobre un arreglo de tiempos en lugar de una vez por
+    fecha.
+
+    Returns:
+        (nombres, longitudes (n, 10) en [0, 360), velocidades (n, 10) en °/día)
+    """
+    names = list(BODY_KEYS.keys())
+    if not dates:
+        return names, np.zeros((0, len(names))), np.zeros((0, len(names)))
+    planets = EphemerisSingleton()
+    ts = load.timescale()
+    t = ts.from_datetimes(list(dates))
+    with span("skyfield"):
+        earth_at = planets['earth'].at(t)
+        lons, speeds = [], []
+        for key in BODY_KEYS.values():
+            lon_deg, speed = ecliptic_lon_speed(earth_at.observe(planets[key]))
+            lons.append(np.atleast_1d(lon_deg) % 360.0)
+            speeds.append(np.atleast_1d(speed))
+    return names, np.stack(lons, axis=1), np.stack(speeds, axis=1)
+
+
+def chart_json_many(dates: List[datetime], lats: List[float], lons: List[float]) -> List[ChartDTO]:
+    """
+    Varias cartas en una sola pasada de Skyfield (planet_longitudes_many).
+
+    Devuelve un ChartDTO por fecha, en el mismo orden.
+    """
+    if not dates:
+        return []
+    names, longitudes, speeds = planet_longitudes_many(dates)
+    charts = []
+    for i, date in enumerate(dates):
+        planet_positions = {name: float(longitudes[i, k]) for k, name in enumerate(names)}
+        planet_speeds = {name: float(speeds[i, k]) for k, name in enumerate(names)}
+        charts.append(ChartDTO(
+            datetime=date.isoformat(),
+            location={"lat": lats[i], "lon": lons[i]},
+            planets=[
+                PlanetDTO(
+                    name=name, lon=lon_val, sign=get_sign(lon_val), house=None,
+                    speed=planet_speeds[name], retrograde=planet_speeds[name] < 0
+                )
+                for name, lon_val in planet_positions.items()
+            ],
+            aspects=chart_aspects(planet_positions, planet_speeds)
+        ))
+    return charts
+
+
+@timed("skyfield")
 def find_solar_return(birth_date: datetime, lat: float, lon: float, year: Optional[int] = None) -> datetime:
     """
     Finds the exact datetime when the Sun returns to its natal longitude.
@@ -210,14 +307,26 @@ def solar_return_chart(birth_date: datetime, lat: float, lon: float, year: Optio
     Returns:
         Dictionary with solar return datetime, planets, aspects, and score summary
     """
-    from core.scoring import compute_score
-    
     # Find exact solar return time
     sr_datetime = find_solar_return(birth_date, lat, lon, year)
     
     # Calculate chart for that moment
     chart = chart_json(lat, lon, sr_datetime)
     
+    return {
+        "solar_return_datetime": sr_datetime.isoformat(),
+        "birth_date": birth_date.isoformat(),
+        "location": {"lat": lat, "lon": lon},
+        "year": year or sr_datetime.year,
+        "planets": [p.dict() for p in chart.planets],
+        "aspects": [a.dict() for a in chart.aspects],
+        "score_summary": _score_summary(chart)
+    }
+
+
+def _score_summary(chart: ChartDTO) -> Dict[str, Any]:
+    from core.scoring import compute_score
+
     # Compute score summary (reuse scoring logic)
     aspects_for_score = [
         {
@@ -229,17 +338,103 @@ def solar_return_chart(birth_date: datetime, lat: float, lon: float, year: Optio
     ]
     
     score = compute_score(aspects_for_score) if aspects_for_score else 0.0
-    
     return {
-        "solar_return_datetime": sr_datetime.isoformat(),
-        "birth_date": birth_date.isoformat(),
-        "location": {"lat": lat, "lon": lon},
-        "year": year or sr_datetime.year,
-        "planets": [p.dict() for p in chart.planets],
-        "aspects": [a.dict() for a in chart.aspects],
-        "score_summary": {
-            "total_score": score,
-            "num_aspects": len(chart.aspects),
-            "interpretation": "favorable" if score > 0 else "challenging" if score < 0 else "neutral"
+        "total_score": score,
+        "num_aspects": len(chart.aspects),
+        "interpretation": "favorable" if score > 0 else "challenging" if score < 0 else "neutral"
+    }
+
+
+@lru_cache(maxsize=1)
+def ephemeris_years() -> tuple:
+    """(primer, último) año completo cubierto por todos los segmentos del kernel cargado."""
+    ts = load.timescale()
+    ranges = [seg.time_range(ts) for seg in EphemerisSingleton().segments]
+    first = max(start.utc_datetime() for start, _ in ranges)
+    last = min(end.utc_datetime() for _, end in ranges)
+    return first.year + 1, last.year - 1
+
+
+@timed("skyfield")
+def find_solar_returns(birth_date: datetime, years: List[int]) -> List[datetime]:
+    """
+    Solar return instants for several years at once.
+
+    Each year is seeded with the birth instant plus whole tropical years (the
+    previous return plus one tropical year, unrolled) and refined with Newton
+    steps on the Sun's longitude and daily motion. Every iteration evaluates
+    all years in a single vectorized Skyfield call; 3-4 iterations reach
+    sub-second precision.
+
+    Returns:
+        UTC datetimes in the same order as `years`
+    """
+    if not years:
+        return []
+    planets = EphemerisSingleton()
+    ts = load.timescale()
+    earth = planets['earth']
+    sun = planets['sun']
+
+    t_birth = ts.from_datetime(birth_date)
+    natal_lon, _ = ecliptic_lon_speed(earth.at(t_birth).observe(sun))
+    natal_lon = normalize_lon(float(natal_lon))
+
+    jd = t_birth.tt + (np.asarray(years, dtype=float) - birth_date.year) * TROPICAL_YEAR_DAYS
+    for _ in range(SR_MAX_ITERATIONS):
+        lon_deg, speed = ecliptic_lon_speed(earth.at(ts.tt_jd(jd)).observe(sun))
+        diff = (np.atleast_1d(lon_deg) - natal_lon + 180.0) % 360.0 - 180.0
+        jd = jd - diff / np.atleast_1d(speed)
+        if np.max(np.abs(diff)) < 1e-6:  # ~0.004"; el Sol recorre 1" en ~24 s
+            break
+    return list(ts.tt_jd(jd).utc_datetime())
+
+
+def solar_return_series(
+    birth_date: datetime,
+    lat: float,
+    lon: float,
+    start_year: int,
+    end_year: int,
+    include_houses: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Solar Return charts for every year in [start_year, end_year].
+
+    Return instants come from find_solar_returns and all positions from one
+    chart_json_many batch; houses (optional) are one swisseph call per year.
+
+    Returns:
+        List of {"year", "solar_return_datetime", "planets", "aspects",
+        "score_summary"} (plus "asc", "mc", "cusps" and planet houses when
+        include_houses), one per year. Years where houses are undefined
+        (polar latitudes) get asc/mc/cusps None and a "note".
+
+    Raises:
+        ValueError: if the birth or a year is outside the ephemeris range
+    """
+    first, last = ephemeris_years()
+    if not first <= birth_date.year <= last or start_year < first or end_year > last:
+        raise ValueError(f"Years must be within the ephemeris range {first}-{last}")
+    years = list(range(start_year, end_year + 1))
+    dates = find_solar_returns(birth_date, years)
+    charts = chart_json_many(dates, [lat] * len(dates), [lon] * len(dates))
+    results = []
+    for year, sr_datetime, chart in zip(years, dates, charts):
+        item = {
+            "year": year,
+            "solar_return_datetime": sr_datetime.isoformat(),
+            "planets": [p.dict() for p in chart.planets],
+            "aspects": [a.dict() for a in chart.aspects],
+            "score_summary": _score_summary(chart)
         }
-    }
\ No newline at end of file
+        if include_houses:
+            from core.batch import with_houses
+            try:
+                item = with_houses(item, sr_datetime, lat, lon)
+            except Exception as e:
+                for planet in item["planets"]:
+                    planet["house"] = None
+                item.update(asc=None, mc=None, cusps=None, note=f"Houses not available: {str(e)}")
+        results.append(item)
+    return results
\ No newline at end of file
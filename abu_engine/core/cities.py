@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de ciudades en memoria (data/cities.json).
+
+Se carga una vez y se vuelve a construir sólo si cambia el mtime del
+archivo. Los nombres se normalizan (minúsculas, sin acentos ni signos:
+"Córdoba" -> "cordoba") y se indexan de tres formas:
+
+- Prefijos: lista ordenada de claves (nombre completo, cada palabra del
+  nombre y país) recorrida con bisect, O(log n + resultados).
+- Subcadenas: nombres y países normalizados concatenados en un solo texto,
+  recorrido con re.finditer cuando los prefijos no alcanzan ("adal" ->
+  Guadalajara, como la búsqueda lineal original).
+- Trigramas: listas de ciudades por trigrama del nombre para la búsqueda
+  aproximada (errores de tipeo), puntuada con Dice.
+- k-d tree sobre vectores unitarios 3D para las ciudades más cercanas a
+  unas coordenadas (sin problemas en el antimeridiano ni en los polos).
+
+Los resultados conservan los registros originales ({city, country, lat,
+lon, ...}) y se ordenan por tipo de coincidencia, población (si el registro
+la trae) y orden del archivo.
+"""
+
+import bisect
+import json
+import logging
+import os
+import re
+import unicodedata
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.metrics import CACHE
+
+CITIES_PATH = Path(__file__).resolve().parent.parent / "data" / "cities.json"
+EARTH_RADIUS_KM = 6371.0
+MIN_QUERY_LENGTH = 2
+DEFAULT_LIMIT = 20
+FUZZY_MIN_SIMILARITY = 0.3
+PREFIX_OVERSAMPLE = 4
+KDTREE_LEAF_SIZE = 32
+
+# Tipos de coincidencia, de mejor a peor
+MATCH_EXACT, MATCH_NAME_PREFIX, MATCH_WORD_PREFIX, MATCH_COUNTRY_PREFIX, MATCH_SUBSTRING, MATCH_FUZZY = range(6)
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def fold(text: str) -> str:
+    """Normaliza para buscar: sin acentos, minúsculas, separadores a un espacio."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    plain = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+    return _NON_ALNUM.sub(" ", plain).strip()
+
+
+def trigrams(folded: str) -> set:
+    """Trigramas de un texto normalizado, con relleno al inicio y final de palabra."""
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _unit_vectors(lat, lon) -> np.ndarray:
+    lat, lon = np.radians(np.asarray(lat, dtype=float)), np.radians(np.asarray(lon, dtype=float))
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def _chord_to_km(chord):
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2.0, 0.0, 1.0))
+
+
+class CityIndex:
+    """Índices de prefijos, subcadenas, trigramas y grilla espacial sobre una lista de ciudades."""
+
+    def __init__(self, cities: List[Dict]):
+        self.cities = cities
+        n = len(cities)
+        names = [fold(c.get("city", "")) for c in cities]
+        countries = [fold(c.get("country", "")) for c in cities]
+        population = np.array([float(c.get("population") or 0) for c in cities], dtype=float)
+        # Orden de desempate: más población primero, luego orden del archivo
+        self._tiebreak = np.empty(n, dtype=np.intp)
+        self._tiebreak[np.lexsort((np.arange(n), -population))] = np.arange(n)
+
+        entries = []
+        for i, (name, country) in enumerate(zip(names, countries)):
+            entries.append((name, MATCH_NAME_PREFIX, i))
+            for word in name.split()[1:]:
+                entries.append((word, MATCH_WORD_PREFIX, i))
+            if country:
+                entries.append((country, MATCH_COUNTRY_PREFIX, i))
+        entries.sort()
+        self._prefix_keys = [e[0] for e in entries]
+        self._prefix_kind = np.array([e[1] for e in entries], dtype=np.intp)
+        self._prefix_ids = np.array([e[2] for e in entries], dtype=np.intp)
+
+        # "nombre\tpaís\n" por ciudad; los separadores impiden coincidencias entre registros
+        lines = [f"{name}\t{country}\n" for name, country in zip(names, countries)]
+        self._text = "".join(lines)
+        self._line_starts = np.cumsum([0] + [len(line) for line in lines[:-1]]).astype(np.intp)
+
+        postings: Dict[str, List[int]] = {}
+        self._trigram_count = np.zeros(n, dtype=float)
+        for i, name in enumerate(names):
+            grams = trigrams(name)
+            self._trigram_count[i] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self._postings = {g: np.array(ids, dtype=np.intp) for g, ids in postings.items()}
+
+        self._vectors = _unit_vectors(
+            [c.get("lat", 0.0) for c in cities], [c.get("lon", 0.0) for c in cities]
+        ).reshape(n, 3)
+        self._build_kdtree()
+
+    def _build_kdtree(self) -> None:
+        """
+        k-d tree sobre los vectores unitarios (la distancia de cuerda ordena
+        igual que la de círculo máximo). Nodos internos en self._nodes como
+        (eje, corte, hijo izquierdo, hijo derecho); las hojas se codifican
+        como ~i, con su rango [start, end) de self._order en self._leaves.
+        """
+        self._order = np.arange(len(self.cities))
+        self._nodes: List[Tuple[int, float, int, int]] = []
+        self._leaves: List[Tuple[int, int]] = []
+
+        def build(start: int, end: int) -> int:
+            if end - start <= KDTREE_LEAF_SIZE:
+                self._leaves.append((start, end))
+                return ~(len(self._leaves) - 1)
+            ids = self._order[start:end]
+            points = self._vectors[ids]
+            dim = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+            mid = (end - start) // 2
+            part = np.argpartition(points[:, dim], mid)
+            self._order[start:end] = ids[part]
+            split = float(points[part[mid], dim])
+            node = len(self._nodes)
+            self._nodes.append(None)
+            left = build(start, start + mid)
+            right = build(start + mid, end)
+            self._nodes[node] = (dim, split, left, right)
+            return node
+
+        self._root = build(0, len(self.cities))
+
+    def __len__(self) -> int:
+        return len(self.cities)
+
+    def _prefix_matches(self, q: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, tipo de coincidencia) de las claves que empiezan con q."""
+        lo = bisect.bisect_left(self._prefix_keys, q)
+        equal = bisect.bisect_right(self._prefix_keys, q, lo)
+        hi = bisect.bisect_left(self._prefix_keys, q + "\uffff", equal)
+        ids, kind = self._prefix_ids[lo:hi], self._prefix_kind[lo:hi].copy()
+        exact = kind[:equal - lo]
+        exact[exact == MATCH_NAME_PREFIX] = MATCH_EXACT
+        return ids, kind
+
+    def _substring_matches(self, q: str) -> np.ndarray:
+        """ids (únicos) cuyo nombre o país contiene q."""
+        offsets = [m.start() for m in re.finditer(re.escape(q), self._text)]
+        if not offsets:
+            return np.zeros(0, dtype=np.intp)
+        return np.unique(np.searchsorted(self._line_starts, offsets, side="right") - 1)
+
+    def _fuzzy_matches(self, q: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, similitud de Dice) por trigramas compartidos con el nombre."""
+        query_grams = trigrams(q)
+        grams = [g for g in query_grams if g in self._postings]
+        if not grams:
+            return np.zeros(0, dtype=np.intp), np.zeros(0)
+        counts = np.bincount(np.concatenate([self._postings[g] for g in grams]), minlength=len(self.cities))
+        # Dice >= t exige compartir al menos t * Q / (2 - t) trigramas (el nombre tiene >= los compartidos)
+        min_shared = max(1, int(np.ceil(FUZZY_MIN_SIMILARITY * len(query_grams) / (2 - FUZZY_MIN_SIMILARITY) - 1e-9)))
+        ids = np.flatnonzero(counts >= min_shared)
+        similarity = 2.0 * counts[ids] / (len(query_grams) + self._trigram_count[ids])
+        keep = similarity >= FUZZY_MIN_SIMILARITY
+        return ids[keep], similarity[keep]
+
+    def search(self, q: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+        """
+        Ciudades que coinciden con `q` (nombre o país), mejor coincidencia primero.
+
+        Orden: nombre exacto, prefijo del nombre, prefijo de una palabra del
+        nombre, prefijo del país y, si faltan resultados, subcadenas del
+        nombre o del país y coincidencias aproximadas por trigramas (de mayor
+        a menor similitud).
+        """
+        q = fold(q)
+        if len(q) < MIN_QUERY_LENGTH:
+            return self.cities[:limit]
+
+        ids, kind = self._prefix_matches(q)
+        # Una ciudad aparece como mucho una vez por clave (nombre, palabras, país): basta
+        # con deduplicar las mejores PREFIX_OVERSAMPLE * limit entradas
+        rank = kind * len(self.cities) + self._tiebreak[ids]
+        if ids.size > PREFIX_OVERSAMPLE * limit:
+            top = np.argpartition(rank, PREFIX_OVERSAMPLE * limit)[:PREFIX_OVERSAMPLE * limit]
+            if np.unique(ids[top]).size >= limit:
+                ids, kind, rank = ids[top], kind[top], rank[top]
+        order = np.argsort(rank, kind="stable")
+        ids, kind = ids[order], kind[order]
+        _, first = np.unique(ids, return_index=True)
+        ids, rank = ids[first], kind[first].astype(float)
+
+        if ids.size < limit:
+            substring_ids = self._substring_matches(q)
+            new = ~np.isin(substring_ids, ids)
+            ids = np.concatenate([ids, substring_ids[new]])
+            rank = np.concatenate([rank, np.full(int(new.sum()), float(MATCH_SUBSTRING))])
+
+        if ids.size < limit:
+            fuzzy_ids, similarity = self._fuzzy_matches(q)
+            new = ~np.isin(fuzzy_ids, ids)
+            ids = np.concatenate([ids, fuzzy_ids[new]])
+            rank = np.concatenate([rank, MATCH_FUZZY + 1.0 - similarity[new]])
+
+        best = np.lexsort((self._tiebreak[ids], rank))[:limit]
+        return [self.cities[i] for i in ids[best].tolist()]
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Dict]:
+        """
+        Las k ciudades más cercanas (distancia de círculo máximo), con
+        "distance_km" agregado a una copia de cada registro.
+        """
+        n = len(self.cities)
+        k = min(k, n)
+        if k <= 0:
+            return []
+        q = _unit_vectors(lat, lon)
+        best_chord, best_ids = np.full(k, np.inf), np.full(k, -1, dtype=np.intp)
+        # (nodo, distancia mínima posible a su región)
+        stack = [(self._root, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound > best_chord[-1]:
+                continue
+            if node < 0:
+                # Hoja: índices de self._order en [start, end)
+                start, end = self._leaves[~node]
+                ids = self._order[start:end]
+                chord = np.sqrt(((self._vectors[ids] - q) ** 2).sum(axis=1))
+                best_chord = np.concatenate([best_chord, chord])
+                best_ids = np.concatenate([best_ids, ids])
+                keep = np.lexsort((best_ids, best_chord))[:k]
+                best_chord, best_ids = best_chord[keep], best_ids[keep]
+                continue
+            dim, split, left, right = self._nodes[node]
+            diff = q[dim] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            # La rama lejana está al menos a |diff| (distancia al plano de corte)
+            stack.append((far, max(bound, abs(diff))))
+            stack.append((near, bound))
+        found = best_ids >= 0
+        return [
+            {**self.cities[i], "distance_km": round(float(d), 1)}
+            for i, d in zip(best_ids[found].tolist(), _chord_to_km(best_chord[found]).tolist())
+        ]
+
+
+_index: Optional[CityIndex] = None
+_index_key: Optional[Tuple[str, int]] = None
+_lock = Lock()
+
+
+def get_city_index(path: Path = CITIES_PATH) -> CityIndex:
+    """Índice de `path`; se reconstruye sólo si cambió el archivo (ruta o mtime)."""
+    global _index, _index_key
+    try:
+        key = (str(path), os.stat(path).st_mtime_ns)
+    except OSError as e:
+        logging.error(f"[Abu] Error loading cities.json: {e}")
+        return _index if _index is not None and _index_key[0] == str(path) else CityIndex([])
+    if _index is not None and _index_key == key:
+        CACHE.hit("city_index")
+        return _index
+    with _lock:
+        if _index is None or _index_key != key:
+            CACHE.miss("city_index")
+            try:
+                with open(path, "r", encoding="utf-8-sig") as f:
+                    cities = json.load(f)
+            except Exception as e:
+                logging.error(f"[Abu] Error loading cities.json: {e}")
+                return _index if _index is not None and _index_key[0] == str(path) else CityIndex([])
+            _index, _index_key = CityIndex(cities), key
+        return _index
+
+
+def search_cities(q: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+    """Búsqueda sobre el índice de data/cities.json (ver CityIndex.search)."""
+    return get_city_index().search(q, limit)
+
+
+def nearest_cities(lat: float, lon: float, k: int = 1) -> List[Dict]:
+    """Ciudades de data/cities.json más cercanas a (lat, lon)."""
+    return get_city_index().nearest(lat, lon, k)
+
+
+__all__ = ["CityIndex", "fold", "get_city_index", "nearest_cities", "search_cities"]
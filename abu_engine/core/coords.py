@@ -1,6 +1,7 @@
 ﻿# -*- coding: utf-8 -*-
 from skyfield.api import load, Topos
 from pathlib import Path
+from core.profiling import timed
 
 ts = load.timescale()
 
@@ -8,6 +9,7 @@ ts = load.timescale()
 path = Path(__file__).parent.parent / "data" / "de440s.bsp"
 planets = load(path.as_posix())
 
+@timed("skyfield")
 def get_planet_positions(date_utc, lat, lon, elev=0):
     earth = planets["earth"]
     observer = earth + Topos(latitude_degrees=lat, longitude_degrees=lon, elevation_m=elev)
@@ -70,21 +70,8 @@ DIGNITY_SCORES = {
 }
 
 
-def get_planet_dignity(planet_name: str, sign: str, degree: float) -> dict:
-    """
-    Calcula la dignidad esencial de un planeta.
-    
-    Args:
-        planet_name: Nombre del planeta (Sun, Moon, Mercury, etc.)
-        sign: Signo zodiacal (Aries, Taurus, etc.)
-        degree: Grado dentro del signo (0-30)
-    
-    Returns:
-        dict: {
-            "kind": str (domicile, exaltation, detriment, fall, peregrine),
-            "score": int
-        }
-    """
+def _dignity_rule(planet_name: str, sign: str, degree: float) -> dict:
+    """Regla de dignidad por ramas; se evalúa una vez por grado al construir DIGNITY_TABLE."""
     # Domicilio
     if RULERSHIPS.get(sign) == planet_name:
         return {"kind": "domicile", "score": DIGNITY_SCORES["domicile"]}
@@ -113,6 +100,52 @@ def get_planet_dignity(planet_name: str, sign: str, degree: float) -> dict:
     return {"kind": "peregrine", "score": DIGNITY_SCORES["peregrine"]}
 
 
+# Planetas tabulados (los de la carta); otros nombres usan la regla directamente
+DIGNITY_TABLE_PLANETS = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+
+
+def _build_dignity_table() -> dict:
+    """
+    {planeta: {signo: [(en el grado exacto, en el intervalo abierto siguiente)] * 30}}.
+
+    Todas las fronteras de la regla son grados enteros, así que es constante
+    dentro de cada intervalo (d, d+1): dos evaluaciones por grado la
+    reproducen exactamente, incluidos los orbes cerrados de ±5°.
+    """
+    return {
+        planet: {
+            sign: [(_dignity_rule(planet, sign, d), _dignity_rule(planet, sign, d + 0.5)) for d in range(30)]
+            for sign in RULERSHIPS
+        }
+        for planet in DIGNITY_TABLE_PLANETS
+    }
+
+
+DIGNITY_TABLE = _build_dignity_table()
+
+
+def get_planet_dignity(planet_name: str, sign: str, degree: float) -> dict:
+    """
+    Calcula la dignidad esencial de un planeta.
+    
+    Args:
+        planet_name: Nombre del planeta (Sun, Moon, Mercury, etc.)
+        sign: Signo zodiacal (Aries, Taurus, etc.)
+        degree: Grado dentro del signo (0-30)
+    
+    Returns:
+        dict: {
+            "kind": str (domicile, exaltation, detriment, fall, peregrine),
+            "score": int
+        }
+    """
+    row = DIGNITY_TABLE.get(planet_name, {}).get(sign)
+    if row is None or not 0 <= degree < 30:
+        return _dignity_rule(planet_name, sign, degree)
+    d = int(degree)
+    return dict(row[d][0 if degree == d else 1])
+
+
 def get_ruler(sign: str) -> str:
     """
     Obtiene el regente (ruler) de un signo zodiacal.
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Búsqueda electiva de ventanas de tiempo.
+
+Responde preguntas del tipo "¿cuándo, en los próximos 90 días, está la
+Luna en una mansión afortunada, libre de los rayos del Sol y sin aspecto a
+un maléfico?".
+
+- Efeméride: los siete planetas tradicionales se evalúan una vez por hora
+  (una llamada vectorizada de Skyfield por cuerpo) y se interpolan a la
+  grilla pedida (minutos u horas); la Luna avanza ~0.5°/h, el error de la
+  interpolación lineal es de segundos de arco.
+- Reglas (ElectionalRules) sobre toda la grilla con NumPy: naturaleza de la
+  mansión (LUNAR_MANSIONS), distancia al Sol (umbrales de
+  core.solar_conditions), fase, debilidad esencial de la Luna
+  (tablas de core.lookup) y aspectos a maléficos (aspect_matrix).
+- Las muestras que cumplen todas las reglas se agrupan en ventanas
+  contiguas, puntuadas con la media del puntaje por muestra: mansión +
+  dignidad de la Luna + aspectos de la Luna con los pesos de weights.json.
+- El Ascendente del pico usa casas swisseph; en latitudes polares queda en
+  None y el resultado lleva "note": "Houses not available: ...".
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+from skyfield.api import load
+
+from core.aspects import ASPECTS, aspect_matrix
+from core.chart import BODY_KEYS, EphemerisSingleton, ecliptic_lon_speed
+from core.lookup import classical_dignity_many
+from core.lunar_mansions import LUNAR_MANSIONS, MANSION_SIZE, get_lunar_mansion
+from core.profiling import span
+from core.scoring import planet_weight, weights
+from core.solar_conditions import UNDER_BEAMS_ORB
+
+TRADITIONAL_PLANETS = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn"]
+EPHEMERIS_STEP_MINUTES = 60
+MAX_RANGE_DAYS = 366
+MANSION_SCORES = {"fortunate": 2.0, "mixed": 0.5, "neutral": 0.0, "unfortunate": -2.0}
+DIGNITY_SCORE_SCALE = 0.2  # domicilio (5) -> +1, caída (-4) -> -0.8
+
+
+class ElectionalRules(BaseModel):
+    mansion_natures: List[str] = Field(["fortunate"], description="Naturalezas de mansión admitidas para la Luna")
+    moon_free_of_beams: bool = Field(True, description="Luna a 17° o más del Sol")
+    moon_waxing: Optional[bool] = Field(None, description="True: creciente, False: menguante, None: cualquiera")
+    avoid_moon_debility: bool = Field(True, description="Excluir Luna en detrimento o caída")
+    avoid_aspects_to: List[str] = Field(["Mars", "Saturn"], description="Sin aspecto mayor de la Luna a estos planetas")
+    aspect_orb: float = Field(6.0, description="Orbe para los aspectos de la Luna")
+
+
+class ElectionalRequest(BaseModel):
+    start: str = Field(..., description="Inicio ISO (sin zona se asume UTC)")
+    end: str = Field(..., description="Fin ISO (máximo 366 días)")
+    lat: float = Field(..., description="Latitud del lugar (Ascendente de cada ventana)")
+    lon: float = Field(..., description="Longitud del lugar")
+    step_minutes: int = Field(60, description="Resolución de la grilla en minutos (1-60)")
+    min_duration_minutes: int = Field(0, description="Descartar ventanas más cortas")
+    top: Optional[int] = Field(None, description="Devolver sólo las N mejores ventanas")
+    rules: ElectionalRules = Field(default_factory=ElectionalRules)
+
+
+def _longitudes(bodies: List[str], start: datetime, minutes: np.ndarray) -> Dict[str, np.ndarray]:
+    """Longitudes de `bodies` en start + minutes, interpoladas desde una grilla horaria."""
+    nodes = np.arange(0, minutes[-1] + EPHEMERIS_STEP_MINUTES, EPHEMERIS_STEP_MINUTES, dtype=float)
+    ts = load.timescale()
+    t = ts.tt_jd(ts.from_datetime(start).tt + nodes / 1440.0)
+    eph = EphemerisSingleton()
+    earth_at = eph['earth'].at(t)
+    result = {}
+    with span("skyfield"):
+        for name in bodies:
+            lon_deg, _ = ecliptic_lon_speed(earth_at.observe(eph[BODY_KEYS[name]]))
+            unwrapped = np.degrees(np.unwrap(np.radians(np.atleast_1d(lon_deg))))
+            result[name] = np.interp(minutes, nodes, unwrapped) % 360.0
+    return result
+
+
+def _moon_aspects(moon: np.ndarray, other: np.ndarray, orb: float) -> Dict[str, np.ndarray]:
+    """
+    Aspecto de la Luna con otro cuerpo muestra a muestra.
+
+    aspect_matrix compara todos contra todos; la diferencia (Luna - otro)
+    contra 0° da la misma separación para cada instante en una matriz (T, 1).
+    """
+    m = aspect_matrix(moon - other, [0.0], ASPECTS, orb)
+    return {"names": m["names"], "aspect": m["aspect"][:, 0], "orb": m["orb"][:, 0]}
+
+
+def _windows(mask: np.ndarray) -> List[tuple]:
+    """Corridas [i, j] de True en mask (índices inclusivos)."""
+    padded = np.concatenate([[False], mask, [False]]).astype(np.int8)
+    edges = np.diff(padded)
+    return list(zip(np.nonzero(edges == 1)[0], np.nonzero(edges == -1)[0] - 1))
+
+
+def electional_search(
+    start: datetime,
+    end: datetime,
+    lat: float,
+    lon: float,
+    rules: Optional[ElectionalRules] = None,
+    step_minutes: int = 60,
+    min_duration_minutes: int = 0,
+    top: Optional[int] = None
+) -> Dict:
+    """
+    Ventanas que cumplen `rules` en [start, end], ordenadas por puntaje.
+
+    Returns:
+        dict: {
+            "start", "end", "step_minutes", "samples", "qualifying_samples",
+            "windows": [
+                {
+                    "start", "end", "duration_minutes", "score",
+                    "peak": {"time", "score", "moon_longitude", "mansion",
+                             "moon_sun_elongation", "asc"}
+                }
+            ]
+        }
+    """
+    rules = rules or ElectionalRules()
+    start = start.replace(tzinfo=timezone.utc) if start.tzinfo is None else start.astimezone(timezone.utc)
+    end = end.replace(tzinfo=timezone.utc) if end.tzinfo is None else end.astimezone(timezone.utc)
+    if end <= start:
+        raise ValueError("end must be after start")
+    if (end - start).days > MAX_RANGE_DAYS:
+        raise ValueError(f"Range too long (max {MAX_RANGE_DAYS} days)")
+    if not 1 <= step_minutes <= EPHEMERIS_STEP_MINUTES:
+        raise ValueError(f"step_minutes must be between 1 and {EPHEMERIS_STEP_MINUTES}")
+    unknown = [n for n in rules.mansion_natures if n not in MANSION_SCORES]
+    unknown += [p for p in rules.avoid_aspects_to if p not in TRADITIONAL_PLANETS or p == "Moon"]
+    if unknown:
+        raise ValueError(f"Unknown rule value(s): {', '.join(unknown)}")
+
+    total = (end - start).total_seconds() / 60.0
+    minutes = np.arange(0, total + 1e-9, step_minutes, dtype=float)
+    lons = _longitudes(TRADITIONAL_PLANETS, start, minutes)
+    moon, sun = lons["Moon"], lons["Sun"]
+
+    with span("scoring"):
+        mansion_idx = np.minimum((moon // MANSION_SIZE).astype(int), 27)
+        nature = np.array([m["nature"] for m in LUNAR_MANSIONS])[mansion_idx]
+        phase = (moon - sun) % 360.0  # 0-180 creciente
+        elongation = np.minimum(phase, 360.0 - phase)
+        _, dignity = classical_dignity_many("Moon", moon)
+
+        mask = np.isin(nature, rules.mansion_natures)
+        if rules.moon_free_of_beams:
+            mask &= elongation >= UNDER_BEAMS_ORB
+        if rules.moon_waxing is not None:
+            mask &= (phase < 180.0) == rules.moon_waxing
+        if rules.avoid_moon_debility:
+            mask &= dignity >= 0
+
+        mansion_score = np.array([MANSION_SCORES[m["nature"]] for m in LUNAR_MANSIONS])[mansion_idx]
+        score = mansion_score + DIGNITY_SCORE_SCALE * dignity
+        for name in TRADITIONAL_PLANETS:
+            if name == "Moon":
+                continue
+            asp = _moon_aspects(moon, lons[name], rules.aspect_orb)
+            found = asp["aspect"] >= 0
+            if name in rules.avoid_aspects_to:
+                mask &= ~found
+            w_asp = np.array([weights["aspects"].get(n, 0) for n in asp["names"]])
+            score += np.where(
+                found, w_asp[np.maximum(asp["aspect"], 0)] * planet_weight(name) * np.exp(-np.nan_to_num(asp["orb"]) / 3), 0.0
+            )
+
+    windows = []
+    for i, j in _windows(mask):
+        w_start = start + timedelta(minutes=float(minutes[i]))
+        w_end = min(end, start + timedelta(minutes=float(minutes[j] + step_minutes)))
+        duration = (w_end - w_start).total_seconds() / 60.0
+        if duration < min_duration_minutes:
+            continue
+        peak = i + int(np.argmax(score[i:j + 1]))
+        windows.append({
+            "start": w_start.isoformat(),
+            "end": w_end.isoformat(),
+            "duration_minutes": round(duration, 1),
+            "score": round(float(score[i:j + 1].mean()), 3),
+            "peak": {
+                "time": (start + timedelta(minutes=float(minutes[peak]))).isoformat(),
+                "score": round(float(score[peak]), 3),
+                "moon_longitude": round(float(moon[peak]), 4),
+                "mansion": get_lunar_mansion(float(moon[peak]))["name"],
+                "moon_sun_elongation": round(float(elongation[peak]), 2),
+            },
+        })
+    windows.sort(key=lambda w: (-w["score"], -w["duration_minutes"]))
+    if top is not None:
+        windows = windows[:max(0, top)]
+
+    note = None
+    if windows:
+        from core.houses_swiss import calculate_houses
+        for w in windows:
+            try:
+                houses = calculate_houses(datetime.fromisoformat(w["peak"]["time"]), lat, lon)
+                w["peak"]["asc"] = round(float(houses["asc"]), 2)
+            except Exception as e:
+                # Latitudes polares: Placidus no está definido, las ventanas valen igual
+                w["peak"]["asc"] = None
+                note = f"Houses not available: {str(e)}"
+
+    result = {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "step_minutes": step_minutes,
+        "samples": int(minutes.size),
+        "qualifying_samples": int(mask.sum()),
+        "windows": windows,
+    }
+    if note:
+        result["note"] = note
+    return result
+
+
+__all__ = ["ElectionalRequest", "ElectionalRules", "electional_search"]
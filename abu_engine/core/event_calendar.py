@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+Calendario precalculado de eventos globales: lunaciones (luna nueva y
+llena), eclipses, ingresos de planetas en signos y estaciones.
+
+Los eventos no dependen de la carta natal, así que se calculan una vez para
+un rango de años (scripts/build_event_calendar.py, al construir la imagen
+Docker) y se guardan en data/event_calendar.sqlite, con un índice B-tree
+sobre el instante UTC: una consulta por rango es O(log n + eventos) y ningún
+request los calcula. El archivo depende de la efeméride cargada, por eso no
+se versiona.
+
+Cálculo (grilla diaria vectorizada de Skyfield + bisección, como
+core.transit_calendar, precisión < 1 minuto):
+
+- Lunaciones: cruces de la elongación aparente Luna - Sol (eclíptica de la
+  fecha) por 0° y 180°.
+- Eclipses: en cada lunación, separación en latitud de la Luna respecto del
+  Sol (solar) o del centro de la sombra (lunar) comparada con paralajes y
+  semidiámetros: total / anular / parcial (solar) y total / parcial /
+  penumbral (lunar). Es la clasificación geocéntrica en la sicigia, no el
+  mínimo exacto: los eclipses rasantes pueden quedar en el límite.
+- Ingresos y estaciones: longitud y velocidad en el marco de core.chart
+  (eclíptica J2000), para que el signo coincida con el de las cartas. Las
+  estaciones se insertan en la grilla antes de buscar ingresos, así el
+  movimiento entre nodos es monótono y los re-ingresos por retrogradación
+  no se pierden. La Luna no tiene ingresos en el calendario.
+
+Las longitudes y signos guardados son siempre los del marco de core.chart.
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from core.chart import BODY_KEYS, EphemerisSingleton, ephemeris_years, get_sign
+from core.profiling import span
+from core.transit_calendar import _bisect, _positions, _timescale, _wrap180
+
+EVENT_CALENDAR_PATH = Path(__file__).resolve().parent.parent / "data" / "event_calendar.sqlite"
+DEFAULT_START_YEAR = 1900
+DEFAULT_END_YEAR = 2100
+GRID_STEP_DAYS = 1.0
+MAX_EVENTS = 5000
+
+EVENT_KINDS = ["new_moon", "full_moon", "solar_eclipse", "lunar_eclipse", "ingress", "station"]
+INGRESS_BODIES = ["Sun", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+STATION_BODIES = INGRESS_BODIES[1:]
+
+EARTH_RADIUS_KM = 6378.137
+MOON_RADIUS_KM = 1737.4
+SUN_RADIUS_KM = 696000.0
+SHADOW_ENLARGEMENT = 1.02  # la atmósfera agranda la sombra de la Tierra (regla de Danjon)
+
+
+def _apparent(body: str, jd_tt: np.ndarray):
+    """(longitud, latitud, distancia km) aparentes geocéntricas, eclíptica verdadera de la fecha."""
+    from skyfield.framelib import ecliptic_frame
+
+    eph = EphemerisSingleton()
+    t = _timescale().tt_jd(jd_tt)
+    lat, lon, distance = eph["earth"].at(t).observe(eph[BODY_KEYS[body]]).apparent().frame_latlon(ecliptic_frame)
+    return np.atleast_1d(lon.degrees), np.atleast_1d(lat.degrees), np.atleast_1d(distance.km)
+
+
+def _elongation(jd_tt: np.ndarray) -> np.ndarray:
+    moon, _, _ = _apparent("Moon", jd_tt)
+    sun, _, _ = _apparent("Sun", jd_tt)
+    return _wrap180(moon - sun)
+
+
+def _upward_zeros(fn, grid: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Raíces donde `values` (ángulo envuelto en ±180) pasa de negativo a positivo."""
+    idx = np.nonzero((values[:-1] < 0) & (values[1:] >= 0) & (values[1:] - values[:-1] < 90.0))[0]
+    if not idx.size:
+        return idx.astype(float)
+    return _bisect(fn, grid[idx], grid[idx + 1], values[idx])
+
+
+def _event(jd_tt: float, kind: str, body: str, longitude: float, detail: Optional[str] = None, sign: Optional[str] = None) -> Dict:
+    longitude = float(longitude) % 360.0
+    return {
+        "jd_tt": float(jd_tt), "kind": kind, "body": body, "longitude": longitude,
+        "sign": sign or get_sign(longitude), "detail": detail,
+    }
+
+
+def _eclipse(kind: str, jd_tt: np.ndarray) -> List[Optional[str]]:
+    """Tipo de eclipse (o None) en cada luna nueva ('solar') o llena ('lunar')."""
+    _, moon_lat, moon_km = _apparent("Moon", jd_tt)
+    _, sun_lat, sun_km = _apparent("Sun", jd_tt)
+    moon_par, sun_par = np.degrees(np.arcsin(EARTH_RADIUS_KM / moon_km)), np.degrees(np.arcsin(EARTH_RADIUS_KM / sun_km))
+    moon_sd, sun_sd = np.degrees(np.arcsin(MOON_RADIUS_KM / moon_km)), np.degrees(np.arcsin(SUN_RADIUS_KM / sun_km))
+    if kind == "solar":
+        separation = np.abs(moon_lat - sun_lat)
+        central = separation < moon_par - sun_par
+        visible = separation < moon_par - sun_par + moon_sd + sun_sd
+        kinds = np.where(central, np.where(moon_sd >= sun_sd, "total", "annular"), "partial")
+    else:
+        separation = np.abs(moon_lat + sun_lat)  # centro de la sombra: punto antisolar
+        umbra = SHADOW_ENLARGEMENT * (moon_par + sun_par - sun_sd)
+        penumbra = SHADOW_ENLARGEMENT * (moon_par + sun_par + sun_sd)
+        visible = separation < penumbra + moon_sd
+        kinds = np.select(
+            [separation <= umbra - moon_sd, separation < umbra + moon_sd], ["total", "partial"], "penumbral"
+        )
+    return [str(k) if v else None for k, v in zip(kinds, visible)]
+
+
+def lunations_and_eclipses(start_tt: float, end_tt: float) -> List[Dict]:
+    """Lunas nuevas y llenas en [start_tt, end_tt] y los eclipses que caen en ellas."""
+    grid = np.arange(start_tt, end_tt + GRID_STEP_DAYS, GRID_STEP_DAYS)
+    elongation = _elongation(grid)
+    events: List[Dict] = []
+    for kind, eclipse, offset in (("new_moon", "solar", 0.0), ("full_moon", "lunar", 180.0)):
+        roots = _upward_zeros(lambda t: _wrap180(_elongation(t) - offset), grid, _wrap180(elongation - offset))
+        roots = roots[(roots >= start_tt) & (roots < end_tt)]
+        if not roots.size:
+            continue
+        moon_lon, _ = _positions("Moon", roots)
+        sun_lon, _ = _positions("Sun", roots)
+        for jd, lon, eclipse_kind, sun in zip(roots, moon_lon, _eclipse(eclipse, roots), sun_lon):
+            events.append(_event(jd, kind, "Moon", lon))
+            if eclipse_kind:
+                body, eclipse_lon = ("Sun", sun) if eclipse == "solar" else ("Moon", lon)
+                events.append(_event(jd, f"{eclipse}_eclipse", body, eclipse_lon, eclipse_kind))
+    return events
+
+
+def ingresses_and_stations(planet: str, start_tt: float, end_tt: float) -> List[Dict]:
+    """Estaciones (retrógrada / directa) e ingresos en signos de `planet` en [start_tt, end_tt]."""
+    grid = np.arange(start_tt, end_tt + GRID_STEP_DAYS, GRID_STEP_DAYS)
+    lon, speed = _positions(planet, grid)
+    events: List[Dict] = []
+
+    idx = np.nonzero(np.sign(speed[:-1]) * np.sign(speed[1:]) < 0)[0]
+    if idx.size and planet in STATION_BODIES:
+        stations = _bisect(lambda t: _positions(planet, t)[1], grid[idx], grid[idx + 1], speed[idx])
+        s_lon, s_speed = _positions(planet, stations)
+        for jd, station_lon, before in zip(stations, s_lon, speed[idx]):
+            if start_tt <= jd < end_tt:
+                events.append(_event(jd, "station", planet, station_lon, "retrograde" if before > 0 else "direct"))
+        order = np.argsort(np.concatenate([grid, stations]), kind="stable")
+        grid = np.concatenate([grid, stations])[order]
+        lon = np.concatenate([lon, s_lon])[order]
+        speed = np.concatenate([speed, s_speed])[order]
+
+    sign = np.floor(lon / 30.0).astype(int) % 12
+    idx = np.nonzero(sign[:-1] != sign[1:])[0]
+    if idx.size:
+        forward = _wrap180(lon[idx + 1] - lon[idx]) > 0
+        # Directo cruza el comienzo del signo nuevo; retrógrado, el comienzo del signo que deja
+        boundary = np.where(forward, sign[idx + 1], sign[idx]) * 30.0
+        roots = _bisect(
+            lambda t: _wrap180(_positions(planet, t)[0] - boundary),
+            grid[idx], grid[idx + 1], _wrap180(lon[idx] - boundary)
+        )
+        # El signo en el que entra es siempre el del nodo siguiente (en la frontera la longitud es ambigua)
+        entered = sign[idx + 1]
+        for jd, b, fwd, new_sign in zip(roots, boundary, forward, entered):
+            if start_tt <= jd < end_tt:
+                events.append(_event(
+                    jd, "ingress", planet, b, "direct" if fwd else "retrograde", get_sign(new_sign * 30.0 + 15.0)
+                ))
+    return events
+
+
+def compute_events(start: datetime, end: datetime) -> List[Dict]:
+    """
+    Todos los eventos de EVENT_KINDS en [start, end), ordenados por tiempo.
+
+    Returns:
+        [{"time" (ISO UTC al minuto), "timestamp" (segundos UNIX),
+          "kind", "body", "longitude", "sign", "detail"}]
+    """
+    ts = _timescale()
+    start_tt = ts.from_datetime(start if start.tzinfo else start.replace(tzinfo=timezone.utc)).tt
+    end_tt = ts.from_datetime(end if end.tzinfo else end.replace(tzinfo=timezone.utc)).tt
+    if end_tt <= start_tt:
+        raise ValueError("end must be after start")
+
+    with span("skyfield"):
+        events = lunations_and_eclipses(start_tt, end_tt)
+        for planet in INGRESS_BODIES:
+            events.extend(ingresses_and_stations(planet, start_tt, end_tt))
+    if not events:
+        return []
+
+    utc = ts.tt_jd(np.array([e["jd_tt"] for e in events])).utc_datetime()
+    rows = []
+    for event, dt in zip(events, utc):
+        # Redondeo al minuto, como core.transit_calendar
+        stamp = int(round(dt.timestamp() / 60.0)) * 60
+        rows.append({
+            "time": datetime.fromtimestamp(stamp, timezone.utc).isoformat(),
+            "timestamp": stamp,
+            "kind": event["kind"],
+            "body": event["body"],
+            "longitude": round(event["longitude"], 4),
+            "sign": event["sign"],
+            "detail": event["detail"],
+        })
+    rows.sort(key=lambda r: (r["timestamp"], EVENT_KINDS.index(r["kind"]), r["body"]))
+    return rows
+
+
+def build_event_calendar(
+    start_year: int = DEFAULT_START_YEAR,
+    end_year: int = DEFAULT_END_YEAR,
+    path: Optional[Path] = None
+) -> Dict:
+    """
+    Calcula los eventos de [start_year, end_year] y reescribe el SQLite en `path`
+    (por defecto EVENT_CALENDAR_PATH).
+
+    Returns:
+        dict con start, end y la cantidad de eventos por tipo
+
+    Raises:
+        ValueError: si el rango está vacío o excede la efeméride cargada
+    """
+    first, last = ephemeris_years()
+    if end_year < start_year:
+        raise ValueError("end_year must be >= start_year")
+    if start_year < first or end_year > last:
+        raise ValueError(f"years must be within the ephemeris range {first}-{last}")
+    start = datetime(start_year, 1, 1, tzinfo=timezone.utc)
+    end = datetime(end_year + 1, 1, 1, tzinfo=timezone.utc)
+    rows = compute_events(start, end)
+
+    path = Path(path or EVENT_CALENDAR_PATH)
+    tmp = path.with_suffix(".tmp")
+    tmp.unlink(missing_ok=True)
+    con = sqlite3.connect(tmp)
+    try:
+        con.executescript("""
+            CREATE TABLE events (
+                ts INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                body TEXT NOT NULL,
+                longitude REAL NOT NULL,
+                sign TEXT NOT NULL,
+                detail TEXT
+            );
+            CREATE INDEX events_ts ON events (ts);
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        """)
+        con.executemany(
+            "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)",
+            [(r["timestamp"], r["kind"], r["body"], r["longitude"], r["sign"], r["detail"]) for r in rows]
+        )
+        counts = {kind: sum(r["kind"] == kind for r in rows) for kind in EVENT_KINDS}
+        meta = {"start": start.isoformat(), "end": end.isoformat(), "counts": json.dumps(counts)}
+        con.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+        con.commit()
+        con.execute("VACUUM")
+    finally:
+        con.close()
+    tmp.replace(path)
+    return {"start": meta["start"], "end": meta["end"], "counts": counts}
+
+
+def _connect(path: Optional[Path]) -> sqlite3.Connection:
+    # Se resuelve en cada llamada (no como default) para poder reapuntar EVENT_CALENDAR_PATH
+    path = path or EVENT_CALENDAR_PATH
+    if not Path(path).exists():
+        raise FileNotFoundError(f"Event calendar not built: run scripts/build_event_calendar.py ({path})")
+    return sqlite3.connect(f"file:{Path(path).as_posix()}?mode=ro", uri=True)
+
+
+def calendar_coverage(path: Optional[Path] = None) -> Dict[str, str]:
+    """Rango [start, end) guardado en el calendario."""
+    con = _connect(path)
+    try:
+        meta = dict(con.execute("SELECT key, value FROM meta WHERE key IN ('start', 'end')"))
+    finally:
+        con.close()
+    return {"start": meta["start"], "end": meta["end"]}
+
+
+def query_events(
+    start: datetime,
+    end: datetime,
+    kinds: Optional[Sequence[str]] = None,
+    bodies: Optional[Sequence[str]] = None,
+    limit: int = MAX_EVENTS,
+    path: Optional[Path] = None
+) -> Dict:
+    """
+    Eventos precalculados en [start, end) (búsqueda por rango sobre el índice de ts).
+
+    Args:
+        start, end: Rango (UTC; sin zona se asume UTC)
+        kinds: Subconjunto de EVENT_KINDS (por defecto todos)
+        bodies: Filtrar por cuerpo (ej: ["Mercury"])
+        limit: Máximo de eventos devueltos
+        path: SQLite a consultar (por defecto EVENT_CALENDAR_PATH)
+
+    Returns:
+        dict: {"start", "end", "coverage": {start, end}, "truncated", "events": [
+            {time, kind, body, longitude, sign, detail}, ...]}
+    """
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    if end <= start:
+        raise ValueError("end must be after start")
+    unknown = [k for k in kinds or [] if k not in EVENT_KINDS]
+    if unknown:
+        raise ValueError(f"Unknown event kind(s): {', '.join(unknown)}")
+
+    sql = "SELECT ts, kind, body, longitude, sign, detail FROM events WHERE ts >= ? AND ts < ?"
+    params: List = [int(start.timestamp()), int(np.ceil(end.timestamp()))]
+    for column, values in (("kind", kinds), ("body", bodies)):
+        if values:
+            sql += f" AND {column} IN ({', '.join('?' * len(values))})"
+            params.extend(values)
+    sql += " ORDER BY ts, rowid LIMIT ?"
+    params.append(limit + 1)
+
+    con = _connect(path)
+    try:
+        rows = con.execute(sql, params).fetchall()
+        meta = dict(con.execute("SELECT key, value FROM meta WHERE key IN ('start', 'end')"))
+    finally:
+        con.close()
+    events = [
+        {
+            "time": datetime.fromtimestamp(stamp, timezone.utc).isoformat(),
+            "kind": kind,
+            "body": body,
+            "longitude": longitude,
+            "sign": sign,
+            "detail": detail,
+        }
+        for stamp, kind, body, longitude, sign, detail in rows[:limit]
+    ]
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "coverage": {"start": meta["start"], "end": meta["end"]},
+        "truncated": len(rows) > limit,
+        "events": events,
+    }
+
+
+__all__ = [
+    "EVENT_KINDS",
+    "build_event_calendar",
+    "calendar_coverage",
+    "compute_events",
+    "query_events",
+]
@@ -104,13 +104,8 @@ def format_position(lon: float) -> str:
     return f"{degrees}°{minutes:02d}' {sign}"
 
 
-def calculate_dignity(planet_name: str, lon: float) -> Dict[str, any]:
-    """
-    Calculate essential dignity for a planet.
-    
-    Returns:
-        Dict with dignity status: domicile, exaltation, detriment, fall, peregrine
-    """
+def _dignity_rule(planet_name: str, lon: float) -> Dict[str, any]:
+    """Branching dignity rule; evaluated once per degree to build DIGNITY_TABLE."""
     sign = get_sign_name(lon)
     deg_in_sign = get_degree_in_sign(lon)
     
@@ -157,6 +152,42 @@ def calculate_dignity(planet_name: str, lon: float) -> Dict[str, any]:
     return dignity
 
 
+# Bodies with a precomputed table; any other name falls back to the rule
+DIGNITY_TABLE_PLANETS = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+
+
+def _build_dignity_table() -> Dict[str, list]:
+    """
+    {planet: [(at whole degree, on the open interval after it)] * 360}.
+
+    Every boundary of the rule is a whole degree, so the rule is constant
+    on each open interval (d, d+1) and two samples per degree reproduce it
+    exactly, closed 5° orbs included.
+    """
+    return {
+        planet: [(_dignity_rule(planet, d), _dignity_rule(planet, d + 0.5)) for d in range(360)]
+        for planet in DIGNITY_TABLE_PLANETS
+    }
+
+
+DIGNITY_TABLE = _build_dignity_table()
+
+
+def calculate_dignity(planet_name: str, lon: float) -> Dict[str, any]:
+    """
+    Calculate essential dignity for a planet.
+    
+    Returns:
+        Dict with dignity status: domicile, exaltation, detriment, fall, peregrine
+    """
+    row = DIGNITY_TABLE.get(planet_name)
+    if row is None:
+        return _dignity_rule(planet_name, lon)
+    lon = normalize_lon(lon)
+    d = int(lon)
+    return dict(row[d % 360][0 if lon == d else 1])
+
+
 def calculate_part_of_fortune(sun_lon: float, moon_lon: float, asc_lon: float, is_day_chart: bool = True) -> float:
     """
     Calculate Part of Fortune (Pars Fortunae).
@@ -216,20 +247,27 @@ def get_lunar_nodes(date: datetime) -> Tuple[float, float]:
     return north_node, south_node
 
 
-def calculate_detailed_positions(planets: Dict[str, float], houses: Optional[List[float]] = None) -> List[Dict]:
+def calculate_detailed_positions(
+    planets: Dict[str, float],
+    houses: Optional[List[float]] = None,
+    speeds: Optional[Dict[str, float]] = None
+) -> List[Dict]:
     """
     Generate detailed position table with degrees, minutes, sign, house, dignity.
     
     Args:
         planets: Dict of planet_name -> ecliptic_longitude
         houses: Optional list of house cusp longitudes (12 cusps)
+        speeds: Optional dict of planet_name -> daily motion (deg/day); adds
+            "speed" and "retrograde" for the planets present in it
     
     Returns:
         List of dicts with detailed planet info
     """
     detailed = []
+    house_nums = find_houses(list(planets.values()), houses) if houses else None
     
-    for name, lon in planets.items():
+    for i, (name, lon) in enumerate(planets.items()):
         pos_info = {
             "name": name,
             "longitude": round(lon, 4),
@@ -239,16 +277,32 @@ def calculate_detailed_positions(planets: Dict[str, float], houses: Optional[Lis
             "dignity": calculate_dignity(name, lon)
         }
         
+        if speeds and name in speeds:
+            pos_info["speed"] = round(speeds[name], 4)
+            pos_info["retrograde"] = speeds[name] < 0
+        
         # Assign house if cusps provided
-        if houses:
-            house_num = find_house(lon, houses)
-            pos_info["house"] = house_num
+        if house_nums is not None:
+            pos_info["house"] = house_nums[i]
         
         detailed.append(pos_info)
     
     return detailed
 
 
+def find_houses(lons: List[float], cusps: List[float]) -> List[int]:
+    """
+    Houses of several longitudes at once (core.houses_swiss.house_numbers).
+
+    Returns:
+        House numbers 1-12, or 0 for every longitude if cusps is not 12 long
+    """
+    if len(cusps) != 12:
+        return [0] * len(lons)  # Unable to determine
+    from core.houses_swiss import house_numbers
+    return [int(h) for h in house_numbers(lons, cusps)]
+
+
 def find_house(lon: float, cusps: List[float]) -> int:
     """
     Find which house a planet is in based on cusp longitudes.
@@ -260,21 +314,4 @@ def find_house(lon: float, cusps: List[float]) -> int:
     Returns:
         House number (1-12)
     """
-    if len(cusps) != 12:
-        return 0  # Unable to determine
-    
-    lon_norm = normalize_lon(lon)
-    
-    for i in range(12):
-        cusp_start = normalize_lon(cusps[i])
-        cusp_end = normalize_lon(cusps[(i + 1) % 12])
-        
-        # Handle wrap-around at 0°
-        if cusp_start < cusp_end:
-            if cusp_start <= lon_norm < cusp_end:
-                return i + 1
-        else:  # Wraps around 360°/0°
-            if lon_norm >= cusp_start or lon_norm < cusp_end:
-                return i + 1
-    
-    return 1  # Default to 1st house if calculation fails
+    return find_houses([lon], cusps)[0]
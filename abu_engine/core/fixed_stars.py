@@ -1,78 +1,191 @@
 """
 Estrellas Fijas (Fixed Stars)
-Catálogo de estrellas fijas principales con naturaleza y magnitud.
-Incluye cálculo de conjunciones y parans básicos.
+Catálogo de estrellas fijas (data/fixed_stars.csv, ~500 estrellas hasta
+magnitud 4) con naturaleza y magnitud.
+Incluye cálculo de conjunciones; los parans están en core.parans.
+
+El catálogo se carga una vez en arreglos ordenados por longitud eclíptica
+J2000. Para una fecha, el movimiento propio y la precesión en longitud se
+aplican en un solo paso vectorizado, y las conjunciones de todos los
+puntos salen de ventanas con searchsorted (± el mayor orbe) filtradas por el
+orbe de la magnitud de cada estrella.
+
+Marco: sin `epoch` las estrellas quedan en la eclíptica J2000, el mismo marco
+de las longitudes de core.chart (Skyfield, ecliptic_J2000_frame); con
+`epoch` quedan en el equinoccio de esa fecha (zodiaco tropical de la fecha,
+como las casas de swisseph).
 """
 
-from typing import Dict, List, Optional
-
-
-# Catálogo de estrellas fijas principales (longitud para época ~2000)
-# Formato: {nombre: {longitude, magnitude, nature, notes}}
-FIXED_STARS = {
-    "Regulus": {
-        "longitude": 149.76,  # ~29° Leo
-        "magnitude": 1.4,
-        "nature": "Mars-Jupiter",
-        "notes": "Corazón del León, realeza, honor, éxito"
-    },
-    "Aldebaran": {
-        "longitude": 69.88,  # ~9° Gemini
-        "magnitude": 0.9,
-        "nature": "Mars",
-        "notes": "Ojo del Toro, honor militar, impulsividad"
-    },
-    "Antares": {
-        "longitude": 249.76,  # ~9° Sagittarius
-        "magnitude": 1.0,
-        "nature": "Mars-Jupiter",
-        "notes": "Corazón del Escorpión, obstinación, violencia"
-    },
-    "Fomalhaut": {
-        "longitude": 333.76,  # ~3° Pisces
-        "magnitude": 1.2,
-        "nature": "Venus-Mercury",
-        "notes": "Boca del Pez, idealismo, arte, magia"
-    },
-    "Spica": {
-        "longitude": 203.76,  # ~23° Libra
-        "magnitude": 1.0,
-        "nature": "Venus-Mars",
-        "notes": "Espiga de trigo, protección, éxito, talento"
-    },
-    "Algol": {
-        "longitude": 56.0,  # ~26° Taurus
-        "magnitude": 2.1,
-        "nature": "Saturn-Jupiter",
-        "notes": "Cabeza de Medusa, peligro, violencia, decapitación"
-    },
-    "Sirius": {
-        "longitude": 104.0,  # ~14° Cancer
-        "magnitude": -1.5,
-        "nature": "Jupiter-Mars",
-        "notes": "Estrella del Perro, honor, riqueza, fidelidad"
-    },
-    "Vega": {
-        "longitude": 285.0,  # ~15° Capricorn
-        "magnitude": 0.0,
-        "nature": "Venus-Mercury",
-        "notes": "Crítica, idealismo, refinamiento"
-    },
-    "Arcturus": {
-        "longitude": 204.0,  # ~24° Libra
-        "magnitude": -0.04,
-        "nature": "Mars-Jupiter",
-        "notes": "Protección, riqueza, honor"
-    },
-    "Betelgeuse": {
-        "longitude": 88.76,  # ~28° Gemini
-        "magnitude": 0.5,
-        "nature": "Mars-Mercury",
-        "notes": "Aventura, éxito rápido, fortuna cambiante"
-    },
+import csv
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+STAR_CATALOG_PATH = Path(__file__).resolve().parent.parent / "data" / "fixed_stars.csv"
+J2000_JD = 2451545.0
+J2000 = datetime(2000, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+OBLIQUITY_J2000 = 23.4392911  # oblicuidad media J2000 (grados)
+MAX_STAR_ORB = 2.0  # mayor orbe de get_orb_for_magnitude
+
+# Naturaleza e interpretación de las estrellas principales
+# Formato: {nombre: {nature, notes}}
+STAR_TRAITS = {
+    "Regulus": {"nature": "Mars-Jupiter", "notes": "Corazón del León, realeza, honor, éxito"},
+    "Aldebaran": {"nature": "Mars", "notes": "Ojo del Toro, honor militar, impulsividad"},
+    "Antares": {"nature": "Mars-Jupiter", "notes": "Corazón del Escorpión, obstinación, violencia"},
+    "Fomalhaut": {"nature": "Venus-Mercury", "notes": "Boca del Pez, idealismo, arte, magia"},
+    "Spica": {"nature": "Venus-Mars", "notes": "Espiga de trigo, protección, éxito, talento"},
+    "Algol": {"nature": "Saturn-Jupiter", "notes": "Cabeza de Medusa, peligro, violencia, decapitación"},
+    "Sirius": {"nature": "Jupiter-Mars", "notes": "Estrella del Perro, honor, riqueza, fidelidad"},
+    "Vega": {"nature": "Venus-Mercury", "notes": "Crítica, idealismo, refinamiento"},
+    "Arcturus": {"nature": "Mars-Jupiter", "notes": "Protección, riqueza, honor"},
+    "Betelgeuse": {"nature": "Mars-Mercury", "notes": "Aventura, éxito rápido, fortuna cambiante"},
 }
 
 
+def _equatorial_to_ecliptic(ra: np.ndarray, dec: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(ascensión recta, declinación) J2000 -> (longitud, latitud) eclípticas J2000, en grados."""
+    ra, dec, eps = np.radians(ra), np.radians(dec), np.radians(OBLIQUITY_J2000)
+    lon = np.arctan2(np.sin(ra) * np.cos(eps) + np.tan(dec) * np.sin(eps), np.cos(ra))
+    lat = np.arcsin(np.sin(dec) * np.cos(eps) - np.cos(dec) * np.sin(eps) * np.sin(ra))
+    return np.degrees(lon) % 360.0, np.degrees(lat)
+
+
+@lru_cache(maxsize=4)
+def load_star_catalog(path: str = str(STAR_CATALOG_PATH)) -> Dict[str, np.ndarray]:
+    """
+    Catálogo en arreglos ordenados por longitud J2000.
+
+    Returns:
+        dict: {
+            "name", "designation", "nature", "notes": arreglos de str,
+            "lon", "lat": posición eclíptica J2000 (grados),
+            "lon_rate": movimiento propio en longitud (°/año),
+            "ra", "dec", "pm_ra", "pm_dec": posición ICRS J2000 (grados) y
+                movimiento propio (mas/año, RA multiplicado por cos δ),
+            "magnitude", "orb": magnitud V y orbe de conjunción
+        }
+    """
+    with open(path, encoding="utf-8") as f:
+        rows = list(csv.DictReader(line for line in f if not line.startswith("#")))
+    ra = np.array([float(r["ra_deg"]) for r in rows])
+    dec = np.array([float(r["dec_deg"]) for r in rows])
+    # Movimiento propio en mas/año (RA ya multiplicado por cos δ): posición a 100 años
+    pm_ra = np.array([float(r["pm_ra_mas"]) for r in rows])
+    pm_dec = np.array([float(r["pm_dec_mas"]) for r in rows])
+    lon, lat = _equatorial_to_ecliptic(ra, dec)
+    lon_100, _ = _equatorial_to_ecliptic(
+        ra + 100 * pm_ra / 3.6e6 / np.cos(np.radians(dec)), dec + 100 * pm_dec / 3.6e6
+    )
+    lon_rate = ((lon_100 - lon + 180.0) % 360.0 - 180.0) / 100.0
+
+    magnitude = np.array([float(r["magnitude"]) for r in rows])
+    order = np.argsort(lon, kind="stable")
+    names = [r["name"] for r in rows]
+    return {
+        "name": np.array(names)[order],
+        "designation": np.array([r["designation"] for r in rows])[order],
+        "nature": np.array([STAR_TRAITS.get(n, {}).get("nature", "") for n in names])[order],
+        "notes": np.array([STAR_TRAITS.get(n, {}).get("notes", "") for n in names])[order],
+        "lon": lon[order],
+        "lat": lat[order],
+        "lon_rate": lon_rate[order],
+        "ra": ra[order],
+        "dec": dec[order],
+        "pm_ra": pm_ra[order],
+        "pm_dec": pm_dec[order],
+        "magnitude": magnitude[order],
+        "orb": np.select([magnitude < 1, magnitude < 2, magnitude < 3], [2.0, 1.5, 1.0], 0.5)[order],
+    }
+
+
+def precession_in_longitude(jd: float) -> float:
+    """Precesión general en longitud desde J2000 (IAU 2006), en grados."""
+    t = (jd - J2000_JD) / 36525.0
+    return (5028.796195 * t + 1.1054348 * t * t) / 3600.0
+
+
+def star_longitudes(epoch: Optional[datetime] = None) -> np.ndarray:
+    """
+    Longitudes del catálogo (orden de load_star_catalog) en `epoch`.
+
+    Sin epoch: posiciones J2000 sin cambios. Con epoch: movimiento propio y
+    precesión hasta el equinoccio de esa fecha.
+    """
+    catalog = load_star_catalog()
+    if epoch is None:
+        return catalog["lon"]
+    if epoch.tzinfo is None:
+        epoch = epoch.replace(tzinfo=timezone.utc)
+    jd = J2000_JD + (epoch - J2000).total_seconds() / 86400.0
+    years = (jd - J2000_JD) / 365.25
+    return (catalog["lon"] + catalog["lon_rate"] * years + precession_in_longitude(jd)) % 360.0
+
+
+def star_conjunctions(
+    longitudes,
+    epoch: Optional[datetime] = None,
+    max_magnitude: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Conjunciones de todos los puntos con todo el catálogo.
+
+    Las estrellas se ordenan por longitud (con copias ±360° cerca de 0°
+    Aries) y cada punto sólo compara las que caen en su ventana
+    [lon - MAX_STAR_ORB, lon + MAX_STAR_ORB] (dos searchsorted); luego se
+    filtra con el orbe de cada estrella.
+
+    Returns:
+        (índice del punto, índice de la estrella en load_star_catalog, orbe,
+        longitudes de las estrellas en epoch); pares ordenados por punto y
+        longitud de la estrella
+    """
+    catalog = load_star_catalog()
+    star_lon = star_longitudes(epoch)
+    lons = np.atleast_1d(np.asarray(longitudes, dtype=float)) % 360.0
+
+    candidates = np.arange(star_lon.size)
+    if max_magnitude is not None:
+        candidates = candidates[catalog["magnitude"] <= max_magnitude]
+    candidates = candidates[np.argsort(star_lon[candidates], kind="stable")]
+    sorted_lon = star_lon[candidates]
+    low, high = sorted_lon > 360.0 - MAX_STAR_ORB, sorted_lon < MAX_STAR_ORB
+    window_lon = np.concatenate([sorted_lon[low] - 360.0, sorted_lon, sorted_lon[high] + 360.0])
+    window_idx = np.concatenate([candidates[low], candidates, candidates[high]])
+
+    start = np.searchsorted(window_lon, lons - MAX_STAR_ORB, side="left")
+    counts = np.searchsorted(window_lon, lons + MAX_STAR_ORB, side="right") - start
+    point = np.repeat(np.arange(lons.size), counts)
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    star = window_idx[np.repeat(start, counts) + offset]
+
+    diff = np.abs((lons[point] - star_lon[star] + 180.0) % 360.0 - 180.0)
+    keep = diff <= catalog["orb"][star]
+    return point[keep], star[keep], diff[keep], star_lon
+
+
+def _catalog_dict() -> Dict[str, Dict]:
+    catalog = load_star_catalog()
+    return {
+        str(name): {
+            "longitude": round(float(lon), 4),
+            "magnitude": float(mag),
+            "nature": str(nature),
+            "notes": str(notes),
+        }
+        for name, lon, mag, nature, notes in zip(
+            catalog["name"], catalog["lon"], catalog["magnitude"], catalog["nature"], catalog["notes"]
+        )
+    }
+
+
+# Catálogo completo por nombre (longitud J2000), en orden de longitud
+FIXED_STARS = _catalog_dict()
+
+
 def get_orb_for_magnitude(magnitude: float) -> float:
     """
     Calcula el orbe permitido según la magnitud de la estrella.
@@ -96,9 +209,34 @@ def get_orb_for_magnitude(magnitude: float) -> float:
         return 0.5
 
 
+@lru_cache(maxsize=1)
+def _catalog_columns() -> Dict[str, list]:
+    """Columnas del catálogo como listas de Python (armar los dicts de salida sin escalares NumPy)."""
+    catalog = load_star_catalog()
+    return {key: catalog[key].tolist() for key in ("name", "magnitude", "nature", "notes")}
+
+
+def _contacts(stars: np.ndarray, orbs: np.ndarray, star_lon: np.ndarray) -> List[Dict]:
+    columns = _catalog_columns()
+    return [
+        {
+            "star": columns["name"][star],
+            "magnitude": columns["magnitude"][star],
+            "nature": columns["nature"][star],
+            "orb": round(orb, 2),
+            "notes": columns["notes"][star],
+            "match": True,
+            "longitude": round(lon, 4)
+        }
+        for star, orb, lon in zip(stars.tolist(), orbs.tolist(), star_lon[stars].tolist())
+    ]
+
+
 def find_fixed_star_conjunctions(
     planet_longitude: float,
-    planet_name: str = None
+    planet_name: str = None,
+    epoch: Optional[datetime] = None,
+    max_magnitude: Optional[float] = None
 ) -> List[Dict]:
     """
     Encuentra estrellas fijas en conjunción con un planeta o punto.
@@ -106,6 +244,9 @@ def find_fixed_star_conjunctions(
     Args:
         planet_longitude: Longitud del planeta (0-360)
         planet_name: Nombre del planeta (opcional, para contexto)
+        epoch: Fecha de la carta si las longitudes son del equinoccio de la
+            fecha (None: eclíptica J2000, como core.chart)
+        max_magnitude: Limitar el catálogo a estrellas más brillantes
     
     Returns:
         List[Dict]: [
@@ -115,61 +256,41 @@ def find_fixed_star_conjunctions(
                 "nature": str,
                 "orb": float,
                 "notes": str,
-                "match": bool
+                "match": bool,
+                "longitude": float
             },
             ...
         ]
     """
-    conjunctions = []
-    
-    for star_name, star_data in FIXED_STARS.items():
-        star_long = star_data["longitude"]
-        magnitude = star_data["magnitude"]
-        
-        # Calcular diferencia angular
-        diff = abs((planet_longitude - star_long + 180) % 360 - 180)
-        
-        # Obtener orbe permitido
-        max_orb = get_orb_for_magnitude(magnitude)
-        
-        # Si está dentro del orbe, es una conjunción
-        if diff <= max_orb:
-            conjunctions.append({
-                "star": star_name,
-                "magnitude": magnitude,
-                "nature": star_data["nature"],
-                "orb": round(diff, 2),
-                "notes": star_data["notes"],
-                "match": True,
-                "longitude": star_long
-            })
-    
-    return conjunctions
+    _, stars, orbs, star_lon = star_conjunctions([planet_longitude], epoch, max_magnitude)
+    return _contacts(stars, orbs, star_lon)
 
 
-def get_all_fixed_star_contacts(planets: List[Dict]) -> List[Dict]:
+def get_all_fixed_star_contacts(
+    planets: List[Dict],
+    epoch: Optional[datetime] = None,
+    max_magnitude: Optional[float] = None
+) -> List[Dict]:
     """
     Encuentra todas las conjunciones de estrellas fijas con planetas de la carta.
     
     Args:
         planets: Lista de planetas [{name, longitude}]
+        epoch: Ver find_fixed_star_conjunctions
+        max_magnitude: Ver find_fixed_star_conjunctions
     
     Returns:
         List[Dict]: Lista de contactos estrella-planeta
     """
-    all_contacts = []
-    
-    for planet in planets:
-        planet_name = planet.get("name")
-        planet_long = planet.get("longitude", 0)
-        
-        conjunctions = find_fixed_star_conjunctions(planet_long, planet_name)
-        
-        for conj in conjunctions:
-            conj["planet"] = planet_name
-            all_contacts.append(conj)
-    
-    return all_contacts
+    if not planets:
+        return []
+    points, stars, orbs, star_lon = star_conjunctions(
+        [planet.get("longitude", 0) for planet in planets], epoch, max_magnitude
+    )
+    contacts = _contacts(stars, orbs, star_lon)
+    for contact, point in zip(contacts, points.tolist()):
+        contact["planet"] = planets[point].get("name")
+    return contacts
 
 
 def format_fixed_stars_output(contacts: List[Dict]) -> List[Dict]:
@@ -1,27 +1,44 @@
 ﻿# -*- coding: utf-8 -*-
 
 from core.coords import get_planet_positions
-from core.aspects import aspect_between
+from core.aspects import ASPECTS, aspect_matrix
 from core.scoring import compute_score
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
+import numpy as np
 from core.chart import EphemerisSingleton
+from core.profiling import timed
+
+def natal_aspects(natal_positions: Dict[str, float], current_positions: Dict[str, float], orb: float = 6) -> List[Dict[str, Any]]:
+    """Aspectos planeta actual -> punto natal (matriz natal x actual en un paso)."""
+    natal_names, planet_names = list(natal_positions), list(current_positions)
+    m = aspect_matrix(
+        [natal_positions[n] for n in natal_names],
+        [current_positions[p] for p in planet_names],
+        ASPECTS, orb
+    )
+    aspects = []
+    for i, j in zip(*np.nonzero(m["aspect"] >= 0)):
+        aspects.append({
+            "planet": planet_names[j],
+            "type": m["names"][m["aspect"][i, j]],
+            "to": natal_names[i],
+            "orb_deg": round(float(m["delta"][i, j]), 2)
+        })
+    return aspects
+
 
 def forecast_for_locations(date_utc, lat, lon):
     # ...existing code...
     natal_positions = {"sun": 103.2, "moon": 45.8}
     current_positions = get_planet_positions(date_utc, lat, lon)
-    aspects = []
-    for natal_name, natal_lon in natal_positions.items():
-        for planet, lon_val in current_positions.items():
-            asp, diff = aspect_between(lon_val, natal_lon, orb=6)
-            if asp:
-                aspects.append({"planet": planet, "type": asp, "to": natal_name, "orb_deg": diff})
+    aspects = natal_aspects(natal_positions, current_positions)
     score = compute_score(aspects)
     return {"score": score, "aspects": aspects}
 
 
 # ...existing code...
+@timed("skyfield")
 def get_planet_positions(date_utc, lat, lon):
     """
     Devuelve las posiciones eclípticas de los planetas para una fecha y ubicación.
@@ -60,12 +77,7 @@ def forecast_timeseries(birth_dt, lat, lon, start_dt, end_dt, step='1d', horizon
     series = []
     for t in times:
         current_positions = get_planet_positions(t, lat, lon)
-        aspects = []
-        for natal_name, natal_lon in natal_positions.items():
-            for planet, lon_val in current_positions.items():
-                asp, diff = aspect_between(lon_val, natal_lon, orb=6)
-                if asp:
-                    aspects.append({"planet": planet, "type": asp, "to": natal_name, "orb_deg": diff})
+        aspects = natal_aspects(natal_positions, current_positions)
         score = compute_score(aspects)
         series.append({"t": t.strftime("%Y-%m-%d"), "F": round(score, 4)})
     peaks = detect_peaks(series)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Casas vectorizadas con NumPy.
+
+Mismo resultado que core.houses_swiss.calculate_houses (swe.houses) pero
+para arreglos completos: muchas ubicaciones en un instante (ranking de
+relocación, mapas) o muchos instantes en una ubicación. swisseph sólo se
+usa para el tiempo sidéreo aparente y la oblicuidad verdadera, una vez por
+instante distinto; ARMC, ASC, MC y cúspides salen de trigonometría esférica
+sobre los arreglos.
+
+Sistemas: Placidus (iteración de la altura del polo, como swisseph), Koch,
+Equal (desde el ASC) y Whole Sign. Placidus y Koch no están definidos dentro
+de los círculos polares (|lat| >= 90° - ε): swe.houses falla ahí y estas
+funciones devuelven NaN en esas filas.
+"""
+
+try:
+    import swisseph as swe
+    SWE_AVAILABLE = True
+except ImportError:
+    SWE_AVAILABLE = False
+
+from datetime import datetime
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+from core.houses_swiss import (
+    HOUSE_SYSTEM_EQUAL,
+    HOUSE_SYSTEM_KOCH,
+    HOUSE_SYSTEM_PLACIDUS,
+    HOUSE_SYSTEM_WHOLE_SIGN,
+)
+from core.profiling import timed
+
+PLACIDUS_MAX_ITERATIONS = 100
+PLACIDUS_TOLERANCE = 1e-10  # radianes (~2e-5")
+
+
+def julian_days(dts: Union[datetime, Iterable[datetime]]) -> np.ndarray:
+    """Día juliano UT de cada datetime (UTC), igual que calculate_houses."""
+    if isinstance(dts, datetime):
+        dts = [dts]
+    return np.array([
+        swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute / 60.0 + dt.second / 3600.0)
+        for dt in dts
+    ], dtype=float)
+
+
+def _sidereal_frame(jd: np.ndarray):
+    """(tiempo sidéreo aparente de Greenwich en grados, oblicuidad verdadera en grados) por instante."""
+    unique, inverse = np.unique(jd, return_inverse=True)
+    gast = np.array([swe.sidtime(j) * 15.0 for j in unique])
+    eps = np.array([swe.calc_ut(j, swe.ECL_NUT)[0][0] for j in unique])
+    return gast[inverse].reshape(jd.shape), eps[inverse].reshape(jd.shape)
+
+
+def _asc1(x, pole, eps):
+    """Longitud del punto de la eclíptica que sale con ascensión oblicua x bajo altura de polo `pole` (radianes)."""
+    return np.arctan2(np.sin(x), np.cos(x) * np.cos(eps) - np.tan(pole) * np.sin(eps)) % (2 * np.pi)
+
+
+def _placidus_cusp(x, fraction, lat, eps):
+    """Cúspide Placidus con ascensión oblicua x (ARMC + 30/60/120/150°) y fracción 1/3 o 2/3 del semiarco."""
+    tan_lat = np.tan(lat)
+
+    def pole_for(tan_decl):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pole = np.arctan(np.sin(np.arcsin(np.clip(tan_lat * tan_decl, -1, 1)) * fraction) / tan_decl)
+        return np.where(np.abs(tan_decl) < 1e-12, np.arctan(fraction * tan_lat), pole)
+
+    cusp = _asc1(x, pole_for(np.full(np.shape(x), np.tan(eps))), eps)
+    for _ in range(PLACIDUS_MAX_ITERATIONS):
+        tan_decl = np.tan(np.arcsin(np.sin(eps) * np.sin(cusp)))
+        new = _asc1(x, pole_for(tan_decl), eps)
+        delta = np.abs((new - cusp + np.pi) % (2 * np.pi) - np.pi)
+        cusp = new
+        if not np.any(delta > PLACIDUS_TOLERANCE):
+            break
+    return cusp
+
+
+@timed("houses_vectorized")
+def houses_many(
+    jd: Union[float, np.ndarray],
+    lat: Union[float, np.ndarray],
+    lon: Union[float, np.ndarray],
+    house_system: bytes = HOUSE_SYSTEM_PLACIDUS
+) -> Dict[str, np.ndarray]:
+    """
+    Casas para arreglos de instantes y ubicaciones (se combinan con broadcasting).
+
+    Args:
+        jd: Días julianos UT (ver julian_days)
+        lat: Latitudes en grados decimales
+        lon: Longitudes en grados decimales (Este positivo)
+        house_system: HOUSE_SYSTEM_PLACIDUS, _KOCH, _EQUAL o _WHOLE_SIGN
+
+    Returns:
+        dict: {
+            "asc", "mc", "armc": arreglos con la forma del broadcast,
+            "cusps": misma forma + (12,) (cúspides casas 1-12),
+            "valid": False donde el sistema no está definido (cúspides NaN)
+        }
+    """
+    if not SWE_AVAILABLE:
+        raise ImportError("pyswisseph no está instalado")
+    if house_system not in (HOUSE_SYSTEM_PLACIDUS, HOUSE_SYSTEM_KOCH, HOUSE_SYSTEM_EQUAL, HOUSE_SYSTEM_WHOLE_SIGN):
+        raise ValueError(f"Unsupported house system: {house_system!r}")
+
+    jd, lat_deg, lon_deg = np.broadcast_arrays(
+        np.asarray(jd, dtype=float), np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+    )
+    gast, eps_deg = _sidereal_frame(jd)
+    armc_deg = (gast + lon_deg) % 360.0
+    armc, eps, lat = np.radians(armc_deg), np.radians(eps_deg), np.radians(lat_deg)
+
+    mc = _asc1(armc, 0.0, eps)
+    asc = _asc1(armc + np.pi / 2, lat, eps)
+    # Dentro del círculo polar swisseph toma el ASC en la mitad oriental (a menos de 180° después del MC)
+    polar = np.abs(lat_deg) >= 90.0 - eps_deg
+    asc = np.where(polar & ((asc - mc) % (2 * np.pi) > np.pi), (asc + np.pi) % (2 * np.pi), asc)
+    third = np.pi / 6
+
+    valid = np.ones(jd.shape, dtype=bool)
+    if house_system == HOUSE_SYSTEM_EQUAL:
+        cusps = asc[..., None] + np.arange(12) * third
+    elif house_system == HOUSE_SYSTEM_WHOLE_SIGN:
+        cusps = np.floor(asc / third)[..., None] * third + np.arange(12) * third
+    else:
+        valid = ~polar
+        lat = np.where(valid, lat, 0.0)
+        if house_system == HOUSE_SYSTEM_PLACIDUS:
+            c11 = _placidus_cusp(armc + third, 1 / 3, lat, eps)
+            c12 = _placidus_cusp(armc + 2 * third, 2 / 3, lat, eps)
+            c2 = _placidus_cusp(armc + 4 * third, 2 / 3, lat, eps)
+            c3 = _placidus_cusp(armc + 5 * third, 1 / 3, lat, eps)
+        else:
+            # Koch: división trisecada del semiarco del MC
+            sina = np.clip(np.sin(mc) * np.sin(eps) / np.cos(lat), -1, 1)
+            c = np.arctan(np.tan(lat) / np.sqrt(1 - sina ** 2))
+            ad3 = np.arcsin(np.sin(c) * sina) / 3
+            c11 = _asc1(armc + third - 2 * ad3, lat, eps)
+            c12 = _asc1(armc + 2 * third - ad3, lat, eps)
+            c2 = _asc1(armc + 4 * third + ad3, lat, eps)
+            c3 = _asc1(armc + 5 * third + 2 * ad3, lat, eps)
+        asc_v = np.where(valid, asc, np.nan)
+        mc_v = np.where(valid, mc, np.nan)
+        first = [asc_v, c2, c3, mc_v + np.pi, c11 + np.pi, c12 + np.pi]
+        cusps = np.stack(first + [c + np.pi for c in first[:3]] + [mc_v, c11, c12], axis=-1)
+        cusps = np.where(valid[..., None], cusps, np.nan)
+
+    return {
+        "asc": np.degrees(asc) % 360.0,
+        "mc": np.degrees(mc) % 360.0,
+        "armc": armc_deg,
+        "cusps": np.degrees(cusps) % 360.0,
+        "valid": valid,
+    }
+
+
+__all__ = ["houses_many", "julian_days"]
@@ -12,6 +12,10 @@ except ImportError:
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 
+import numpy as np
+
+from core.profiling import timed
+
 
 # Constantes de pyswisseph para sistemas de casas
 HOUSE_SYSTEM_PLACIDUS = b'P'
@@ -29,6 +33,7 @@ def init_swisseph(ephemeris_path: str = None):
         swe.set_ephe_path(ephemeris_path)
 
 
+@timed("swisseph_houses")
 def calculate_houses(
     dt: datetime,
     lat: float,
@@ -106,6 +111,33 @@ def longitude_to_sign_degree(longitude: float) -> Tuple[str, float]:
     return signs[sign_index], degree
 
 
+def house_numbers(longitudes, cusps) -> np.ndarray:
+    """
+    Casa (1-12) de cada longitud, para una carta o muchas.
+
+    Las cúspides se rotan para que la casa 1 empiece en 0°: los desplazamientos
+    (cúspide - ASC) % 360 quedan ordenados y la casa es la cantidad de
+    cúspides <= (longitud - ASC) % 360 (un searchsorted por la derecha). Una
+    casa de ancho cero nunca se asigna; las que cruzan 0° Aries no necesitan
+    un caso aparte.
+
+    Args:
+        longitudes: Longitudes, forma (..., P) o escalar
+        cusps: Cúspides, forma (12,) o (..., 12) (una fila por carta)
+
+    Returns:
+        np.ndarray de enteros con la forma del broadcast de longitudes y cartas
+    """
+    cusps = np.asarray(cusps, dtype=float) % 360.0
+    offsets = (cusps - cusps[..., :1]) % 360.0
+    lons = np.asarray(longitudes, dtype=float)
+    if cusps.ndim == 1:
+        return np.searchsorted(offsets, (lons - cusps[0]) % 360.0, side="right")
+    # Muchas cartas: searchsorted fila por fila como conteo (12 comparaciones)
+    x = (lons - cusps[..., :1]) % 360.0
+    return (offsets[..., None, :] <= x[..., None]).sum(axis=-1)
+
+
 def get_planet_house(planet_longitude: float, cusps: List[float]) -> int:
     """
     Determina en qué casa está un planeta según su longitud y las cúspides.
@@ -117,28 +149,9 @@ def get_planet_house(planet_longitude: float, cusps: List[float]) -> int:
     Returns:
         int: Número de casa (1-12)
     """
-    if not cusps:
-        return 1
-    n = len(cusps)
-    if n == 1:
+    if not cusps or len(cusps) == 1:
         return 1
-    
-    planet_longitude = float(planet_longitude) % 360.0
-    
-    for i in range(n):
-        cusp_current = float(cusps[i]) % 360.0
-        cusp_next = float(cusps[(i + 1) % n]) % 360.0
-        
-        # Manejar el caso donde la casa cruza 0° Aries
-        if cusp_current > cusp_next:
-            if planet_longitude >= cusp_current or planet_longitude < cusp_next:
-                return i + 1
-        else:
-            if cusp_current <= planet_longitude < cusp_next:
-                return i + 1
-    
-    # Fallback (no debería llegar aquí)
-    return 1
+    return int(house_numbers(planet_longitude, cusps))
 
 
 def format_houses_output(houses_data: Dict) -> Dict:
@@ -187,11 +200,7 @@ def assign_planets_to_houses(planets: List[Dict], cusps: List[float]) -> List[Di
     Returns:
         Lista de planetas con campo "house" añadido
     """
-    result = []
-    for planet in planets:
-        planet_copy = planet.copy()
-        longitude = planet.get("longitude", 0)
-        planet_copy["house"] = get_planet_house(longitude, cusps)
-        result.append(planet_copy)
-    
-    return result
+    if not cusps or len(cusps) == 1:
+        return [{**planet, "house": 1} for planet in planets]
+    houses = house_numbers([planet.get("longitude", 0) for planet in planets], cusps)
+    return [{**planet, "house": int(house)} for planet, house in zip(planets, houses)]
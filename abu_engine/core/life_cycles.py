@@ -3,7 +3,9 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from skyfield.api import load
 from core.chart import EphemerisSingleton
+from core.profiling import timed
 
+@timed("skyfield")
 def get_slow_planet_position(planets, date: datetime) -> Dict[str, float]:
     """
     Obtiene las posiciones de los planetas lentos para una fecha dada.
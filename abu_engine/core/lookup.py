@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Tablas precalculadas por grado de longitud eclíptica.
+
+Todas las fronteras de signos, dignidades, términos y faces caen en grados
+enteros, así que cada tabla guarda dos valores por grado: el del grado
+exacto (`[..., d, 0]`) y el del intervalo abierto (d, d+1) (`[..., d, 1]`).
+Con eso la búsqueda es exacta (incluidos los orbes cerrados de
+exaltación/caída) y cuesta un índice de NumPy.
+
+- Dignidad clásica (core.dignities): tipo y puntaje por (planeta, grado).
+- Dignidad extendida (core.extended_calc, regentes modernos): banderas y
+  puntaje por (planeta, grado).
+- Regente del término (términos egipcios) y de la faz (decanatos caldeos).
+- Signo y mansión lunar por longitud (particiones uniformes: aritmética).
+
+Las dignidades se arman desde DIGNITY_TABLE de core.dignities y
+core.extended_calc (las mismas tablas que usan sus funciones escalares), así
+que no hay una segunda copia de las reglas; las versiones vectorizadas
+(`*_many`) reciben arreglos de longitudes para el scoring por lotes.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from core import dignities as classical
+from core import extended_calc as extended
+from core.lunar_mansions import MANSION_SIZE
+
+SIGNS = [
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+]
+SIGN_INDEX = {name: i for i, name in enumerate(SIGNS)}
+
+PLANETS = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+PLANET_INDEX = {name: i for i, name in enumerate(PLANETS)}
+
+DIGNITY_KINDS = ["peregrine", "domicile", "exaltation", "detriment", "fall"]
+DIGNITY_KIND_INDEX = {kind: i for i, kind in enumerate(DIGNITY_KINDS)}
+
+# Banderas de la dignidad extendida
+FLAG_DOMICILE, FLAG_EXALTATION, FLAG_DETRIMENT, FLAG_FALL = 1, 2, 4, 8
+
+# Términos egipcios: (regente, grado final) por signo
+EGYPTIAN_TERMS = {
+    "Aries": [("Jupiter", 6), ("Venus", 12), ("Mercury", 20), ("Mars", 25), ("Saturn", 30)],
+    "Taurus": [("Venus", 8), ("Mercury", 14), ("Jupiter", 22), ("Saturn", 27), ("Mars", 30)],
+    "Gemini": [("Mercury", 6), ("Jupiter", 12), ("Venus", 17), ("Mars", 24), ("Saturn", 30)],
+    "Cancer": [("Mars", 7), ("Venus", 13), ("Mercury", 19), ("Jupiter", 26), ("Saturn", 30)],
+    "Leo": [("Jupiter", 6), ("Venus", 11), ("Saturn", 18), ("Mercury", 24), ("Mars", 30)],
+    "Virgo": [("Mercury", 7), ("Venus", 17), ("Jupiter", 21), ("Mars", 28), ("Saturn", 30)],
+    "Libra": [("Saturn", 6), ("Mercury", 14), ("Jupiter", 21), ("Venus", 28), ("Mars", 30)],
+    "Scorpio": [("Mars", 7), ("Venus", 11), ("Mercury", 19), ("Jupiter", 24), ("Saturn", 30)],
+    "Sagittarius": [("Jupiter", 12), ("Venus", 17), ("Mercury", 21), ("Saturn", 26), ("Mars", 30)],
+    "Capricorn": [("Mercury", 7), ("Jupiter", 14), ("Venus", 22), ("Saturn", 26), ("Mars", 30)],
+    "Aquarius": [("Mercury", 7), ("Venus", 13), ("Jupiter", 20), ("Mars", 25), ("Saturn", 30)],
+    "Pisces": [("Venus", 12), ("Jupiter", 16), ("Mercury", 19), ("Mars", 28), ("Saturn", 30)],
+}
+
+# Faces (decanatos): orden caldeo empezando por Marte en 0° Aries
+CHALDEAN_ORDER = ["Saturn", "Jupiter", "Mars", "Sun", "Venus", "Mercury", "Moon"]
+FACE_RULERS = [CHALDEAN_ORDER[(2 + i) % 7] for i in range(36)]
+
+
+def _build_classical() -> Tuple[np.ndarray, np.ndarray]:
+    """Tipo y puntaje (planeta, grado, exacto|intervalo) desde core.dignities.DIGNITY_TABLE."""
+    kind = np.zeros((len(PLANETS), 360, 2), dtype=np.int8)
+    score = np.zeros((len(PLANETS), 360, 2), dtype=np.int8)
+    for p, planet in enumerate(PLANETS):
+        for lon in range(360):
+            for cell, info in enumerate(classical.DIGNITY_TABLE[planet][SIGNS[lon // 30]][lon % 30]):
+                kind[p, lon, cell] = DIGNITY_KIND_INDEX[info["kind"]]
+                score[p, lon, cell] = info["score"]
+    return kind, score
+
+
+def _build_extended() -> Tuple[np.ndarray, np.ndarray]:
+    """Banderas y puntaje desde core.extended_calc.DIGNITY_TABLE."""
+    flags = np.zeros((len(PLANETS), 360, 2), dtype=np.uint8)
+    score = np.zeros((len(PLANETS), 360, 2), dtype=np.int8)
+    bits = (("domicile", FLAG_DOMICILE), ("exaltation", FLAG_EXALTATION), ("detriment", FLAG_DETRIMENT), ("fall", FLAG_FALL))
+    for p, planet in enumerate(PLANETS):
+        for lon, cells in enumerate(extended.DIGNITY_TABLE[planet]):
+            for cell, info in enumerate(cells):
+                flags[p, lon, cell] = sum(bit for name, bit in bits if info[name])
+                score[p, lon, cell] = info["score"]
+    return flags, score
+
+
+def _build_terms() -> np.ndarray:
+    """Regente del término por grado; las fronteras son grados enteros (el intervalo sigue al grado)."""
+    table = np.zeros((360, 2), dtype=np.int8)
+    for s, name in enumerate(SIGNS):
+        start = 0
+        for ruler, end in EGYPTIAN_TERMS[name]:
+            table[s * 30 + start:s * 30 + end] = PLANET_INDEX[ruler]
+            start = end
+    return table
+
+
+CLASSICAL_KIND, CLASSICAL_SCORE = _build_classical()
+EXTENDED_FLAGS, EXTENDED_SCORE = _build_extended()
+TERM_RULER = _build_terms()
+FACE_RULER = np.array([PLANET_INDEX[FACE_RULERS[lon // 10]] for lon in range(360)], dtype=np.int8)[:, None].repeat(2, axis=1)
+
+
+def _cells(lons) -> Tuple[np.ndarray, np.ndarray]:
+    """(grado entero, 0 si la longitud es un grado exacto / 1 si no) para indexar las tablas."""
+    lon = np.asarray(lons, dtype=float) % 360.0
+    degree = np.floor(lon)
+    return degree.astype(np.intp) % 360, (lon != degree).astype(np.intp)
+
+
+def _planet_indices(planets) -> np.ndarray:
+    """Nombres -> índices en PLANETS (-1 si no está); acepta índices enteros tal cual."""
+    p = np.asarray(planets)
+    if np.issubdtype(p.dtype, np.integer):
+        return p
+    return np.array([PLANET_INDEX.get(name, -1) for name in p.ravel()], dtype=np.intp).reshape(p.shape)
+
+
+def sign_indices(lons) -> np.ndarray:
+    """Índice de signo 0-11 por longitud."""
+    return (np.asarray(lons, dtype=float) % 360.0 // 30).astype(np.intp)
+
+
+def mansion_indices(lons) -> np.ndarray:
+    """Índice de mansión lunar 0-27 por longitud (como get_lunar_mansion)."""
+    return np.minimum((np.asarray(lons, dtype=float) % 360.0 / MANSION_SIZE).astype(np.intp), 27)
+
+
+def classical_dignity_many(planets, lons) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dignidad clásica (core.dignities) para arreglos de planetas y longitudes.
+
+    Args:
+        planets: Nombres (broadcast contra lons) o índices de PLANETS
+        lons: Longitudes eclípticas
+
+    Returns:
+        (índices en DIGNITY_KINDS, puntajes); planetas desconocidos -> peregrino
+    """
+    p = _planet_indices(planets)
+    degree, cell = _cells(lons)
+    p, degree, cell = np.broadcast_arrays(p, degree, cell)
+    known = p >= 0
+    kind = np.where(known, CLASSICAL_KIND[np.maximum(p, 0), degree, cell], DIGNITY_KIND_INDEX["peregrine"])
+    return kind, np.where(known, CLASSICAL_SCORE[np.maximum(p, 0), degree, cell], 0)
+
+
+def extended_dignity_many(planets, lons) -> Tuple[np.ndarray, np.ndarray]:
+    """Banderas (FLAG_*) y puntaje de la dignidad extendida, vectorizado."""
+    p = _planet_indices(planets)
+    degree, cell = _cells(lons)
+    p, degree, cell = np.broadcast_arrays(p, degree, cell)
+    known = p >= 0
+    return (
+        np.where(known, EXTENDED_FLAGS[np.maximum(p, 0), degree, cell], 0),
+        np.where(known, EXTENDED_SCORE[np.maximum(p, 0), degree, cell], 0),
+    )
+
+
+def term_rulers_many(lons) -> np.ndarray:
+    """Índice en PLANETS del regente del término egipcio."""
+    degree, cell = _cells(lons)
+    return TERM_RULER[degree, cell]
+
+
+def face_rulers_many(lons) -> np.ndarray:
+    """Índice en PLANETS del regente de la faz (decanato caldeo)."""
+    degree, cell = _cells(lons)
+    return FACE_RULER[degree, cell]
+
+
+def term_ruler(lon: float) -> str:
+    """Regente del término egipcio en `lon`."""
+    return PLANETS[int(TERM_RULER[int(float(lon) % 360.0) % 360, 0])]
+
+
+def face_ruler(lon: float) -> str:
+    """Regente de la faz (decanato caldeo) en `lon`."""
+    return FACE_RULERS[int(float(lon) % 360.0 // 10) % 36]
+
+
+__all__ = [
+    "DIGNITY_KINDS",
+    "EGYPTIAN_TERMS",
+    "FACE_RULERS",
+    "PLANETS",
+    "SIGNS",
+    "classical_dignity_many",
+    "extended_dignity_many",
+    "face_ruler",
+    "face_rulers_many",
+    "mansion_indices",
+    "sign_indices",
+    "term_ruler",
+    "term_rulers_many",
+]
@@ -177,10 +177,11 @@ def calculate_all_lots(
     ]
     
     # Agregar signo, grado y casa
-    from .houses_swiss import get_planet_house
+    from .houses_swiss import house_numbers
     
+    houses = house_numbers([lot["longitude"] for lot in lots], cusps) if cusps else []
     result = []
-    for lot in lots:
+    for i, lot in enumerate(lots):
         sign, degree = longitude_to_sign_degree(lot["longitude"])
         lot_data = {
             "name": lot["name"],
@@ -190,7 +191,7 @@ def calculate_all_lots(
         }
         
         if cusps:
-            lot_data["house"] = get_planet_house(lot["longitude"], cusps)
+            lot_data["house"] = int(houses[i])
         
         result.append(lot_data)
     
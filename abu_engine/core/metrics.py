@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Métricas operativas de Abu en formato Prometheus.
+
+Registro local (prometheus_client.CollectorRegistry) expuesto como texto en
+/metrics; no requiere Pushgateway ni ningún servicio externo.
+
+Exporta:
+- abu_http_requests_total{method,route,status}
+- abu_http_request_duration_seconds{method,route} (histograma)
+- abu_http_requests_in_flight
+- abu_stage_duration_seconds{route,stage} (spans de core/profiling.py)
+- abu_cache_requests_total{cache,result} y abu_cache_hit_ratio{cache}
+- abu_ephemeris_load_seconds
+- process_resident_memory_bytes, process_cpu_seconds_total, ... (ProcessCollector)
+"""
+
+import time
+from threading import Lock
+from typing import Dict, List, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    ProcessCollector,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+STAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+UNMATCHED_ROUTE = "unmatched"
+
+REGISTRY = CollectorRegistry()
+ProcessCollector(registry=REGISTRY)
+
+HTTP_REQUESTS = Counter(
+    "abu_http_requests_total", "HTTP requests handled",
+    ["method", "route", "status"], registry=REGISTRY
+)
+HTTP_LATENCY = Histogram(
+    "abu_http_request_duration_seconds", "HTTP request latency",
+    ["method", "route"], buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+HTTP_IN_FLIGHT = Gauge(
+    "abu_http_requests_in_flight", "HTTP requests currently being handled",
+    registry=REGISTRY
+)
+STAGE_LATENCY = Histogram(
+    "abu_stage_duration_seconds", "Time spent per request stage (summed within a request)",
+    ["route", "stage"], buckets=STAGE_BUCKETS, registry=REGISTRY
+)
+EPHEMERIS_LOAD = Gauge(
+    "abu_ephemeris_load_seconds", "Time taken to load the JPL ephemeris kernel",
+    registry=REGISTRY
+)
+
+
+class CacheStats:
+    """Contadores hit/miss por cache, exportados junto con su hit ratio."""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._counts: Dict[str, List[int]] = {}
+        self._lock = Lock()
+
+    def record(self, cache: str, hit: bool) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(cache, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def hit(self, cache: str) -> None:
+        self.record(cache, True)
+
+    def miss(self, cache: str) -> None:
+        self.record(cache, False)
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        with self._lock:
+            return {name: (c[0], c[1]) for name, c in self._counts.items()}
+
+    def collect(self):
+        requests = CounterMetricFamily(
+            f"{self.prefix}_cache_requests", "Cache lookups by result", labels=["cache", "result"]
+        )
+        ratio = GaugeMetricFamily(
+            f"{self.prefix}_cache_hit_ratio", "Cache hits / lookups since start", labels=["cache"]
+        )
+        for name, (hits, misses) in sorted(self.snapshot().items()):
+            requests.add_metric([name, "hit"], hits)
+            requests.add_metric([name, "miss"], misses)
+            ratio.add_metric([name], hits / (hits + misses) if hits + misses else 0.0)
+        yield requests
+        yield ratio
+
+
+CACHE = CacheStats("abu")
+REGISTRY.register(CACHE)
+
+
+def route_label(request) -> str:
+    """Plantilla de la ruta (p. ej. /api/astro/chart) para acotar la cardinalidad."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+async def metrics_middleware(request, call_next):
+    """Middleware HTTP: cuenta requests, mide latencia y requests en curso."""
+    HTTP_IN_FLIGHT.inc()
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - t0
+        HTTP_IN_FLIGHT.dec()
+        route = route_label(request)
+        HTTP_REQUESTS.labels(request.method, route, str(status)).inc()
+        HTTP_LATENCY.labels(request.method, route).observe(elapsed)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """(cuerpo, content-type) del registro en formato de texto Prometheus."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+__all__ = [
+    "REGISTRY",
+    "CACHE",
+    "EPHEMERIS_LOAD",
+    "STAGE_LATENCY",
+    "metrics_middleware",
+    "render_metrics",
+]
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+Reporte natal compuesto.
+
+Calcula posiciones y casas una sola vez y las pasa por un pipeline ordenado
+por dependencias (dignidades, lotes, profecciones, fardars, mansión lunar,
+estrellas fijas y tránsitos), de modo que un cliente obtiene en un request lo
+que antes requería /chart-detailed + /profections + /fardars + /lots +
+/lunar-mansions + /fixed-stars + /transits, sin reenviar sunLon/ascLon/moonLon.
+
+Cada etapa declara las etapas de las que depende; al pedir un subconjunto de
+secciones sólo se ejecutan esas y sus dependencias.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.chart import chart_json
+from core.dignities import get_planet_dignity
+from core.extended_calc import (
+    calculate_detailed_positions,
+    calculate_part_of_fortune,
+    format_position,
+    get_degree_in_sign,
+    get_lunar_nodes,
+    get_sign_name,
+)
+from core.profiling import span
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    """profections/fardars comparan contra datetime.utcnow() (naive)."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _stage_chart(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """Posiciones Skyfield, nodos y casas Placidus (mismo formato que /chart-detailed)."""
+    birth_dt, lat, lon = ctx["birth_dt"], ctx["lat"], ctx["lon"]
+    base_chart = chart_json(lat, lon, birth_dt)
+    ctx["base_chart"] = base_chart
+
+    planets_dict = {p.name: p.lon for p in base_chart.planets}
+    ctx["planet_longitudes"] = dict(planets_dict)
+    north_node_lon, south_node_lon = get_lunar_nodes(birth_dt)
+    planets_dict["North Node"] = north_node_lon
+    planets_dict["South Node"] = south_node_lon
+
+    houses_block = None
+    houses_data = None
+    try:
+        from core.houses_swiss import calculate_houses, format_houses_output, HOUSE_SYSTEM_PLACIDUS
+        houses_data = calculate_houses(birth_dt, lat, lon, HOUSE_SYSTEM_PLACIDUS)
+        houses_block = format_houses_output(houses_data)
+    except Exception as e:
+        houses_block = {"note": f"Houses not available: {str(e)}"}
+
+    has_houses = houses_data is not None and "houses" in houses_block
+    cusps = houses_data.get("cusps") if has_houses else None
+    asc_lon = houses_data["asc"] if has_houses else None
+    mc_lon = houses_data["mc"] if has_houses else None
+    ctx.update(cusps=cusps, asc_lon=asc_lon, mc_lon=mc_lon)
+
+    speeds = {p.name: p.speed for p in base_chart.planets if p.speed is not None}
+    detailed_planets = calculate_detailed_positions(planets_dict, houses=cusps, speeds=speeds)
+    ctx["detailed_planets"] = detailed_planets
+
+    sun_lon = planets_dict.get("Sun", 0)
+    moon_lon = planets_dict.get("Moon", 0)
+    try:
+        from core.lots import is_diurnal
+        is_day = is_diurnal(sun_lon, asc_lon if asc_lon is not None else 0.0)
+    except Exception:
+        is_day = True
+    ctx["is_diurnal"] = is_day
+    pof_lon = calculate_part_of_fortune(sun_lon, moon_lon, asc_lon if asc_lon is not None else 0.0, is_day_chart=is_day)
+
+    result = {
+        "datetime": base_chart.datetime,
+        "location": base_chart.location,
+        "planets": detailed_planets,
+        "aspects": [a.dict() for a in base_chart.aspects],
+        "arabic_parts": {
+            "part_of_fortune": {
+                "longitude": round(pof_lon, 4),
+                "sign": get_sign_name(pof_lon),
+                "formatted": format_position(pof_lon)
+            }
+        },
+        "lunar_nodes": {
+            "north_node": {
+                "longitude": round(north_node_lon, 4),
+                "sign": get_sign_name(north_node_lon),
+                "formatted": format_position(north_node_lon)
+            },
+            "south_node": {
+                "longitude": round(south_node_lon, 4),
+                "sign": get_sign_name(south_node_lon),
+                "formatted": format_position(south_node_lon)
+            }
+        }
+    }
+    if has_houses:
+        result["houses"] = houses_block["houses"]
+        result["asc"] = houses_block["asc"]
+        result["mc"] = houses_block["mc"]
+        result["asc_longitude"] = asc_lon
+        result["mc_longitude"] = mc_lon
+    else:
+        result["houses"] = houses_block
+    return result
+
+
+def detailed_chart(date_utc: datetime, lat: float, lon: float) -> Dict[str, Any]:
+    """Respuesta de /api/astro/chart-detailed (sección "chart" del reporte)."""
+    return _stage_chart({"birth_dt": date_utc, "lat": lat, "lon": lon})
+
+
+def _require_asc(ctx: Dict[str, Any]) -> float:
+    if ctx.get("asc_lon") is None:
+        raise ValueError("Ascendant not available (houses could not be calculated)")
+    return ctx["asc_lon"]
+
+
+def _stage_dignities(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """Dignidad esencial tradicional (core.dignities) de cada planeta de la carta."""
+    return {
+        name: get_planet_dignity(name, get_sign_name(lon), get_degree_in_sign(lon))
+        for name, lon in ctx["planet_longitudes"].items()
+    }
+
+
+def _stage_sect(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    _require_asc(ctx)
+    return {"is_diurnal": ctx["is_diurnal"]}
+
+
+def _stage_lots(ctx: Dict[str, Any]) -> List[Dict]:
+    from core.lots import calculate_all_lots
+    return calculate_all_lots(ctx["planet_longitudes"], _require_asc(ctx), ctx["cusps"])
+
+
+def _stage_profections(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from core.profections import calculate_annual_profection, calculate_monthly_profection
+    asc_sign = get_sign_name(_require_asc(ctx))
+    birth, current = _naive_utc(ctx["birth_dt"]), _naive_utc(ctx["current_dt"])
+    annual = calculate_annual_profection(birth, asc_sign, current)
+    monthly = calculate_monthly_profection(birth, asc_sign, current)
+    return {**annual, "monthly": monthly}
+
+
+def _stage_fardars(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from core.fardars import calculate_fardars, get_current_fardar
+    _require_asc(ctx)
+    is_diurnal = ctx["is_diurnal"]
+    birth, current = _naive_utc(ctx["birth_dt"]), _naive_utc(ctx["current_dt"])
+    return {
+        "fardars": calculate_fardars(birth, is_diurnal),
+        "current": get_current_fardar(birth, is_diurnal, current),
+        "is_diurnal": is_diurnal
+    }
+
+
+def _stage_lunar_mansion(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from core.lunar_mansions import get_lunar_mansion, get_mansion_interpretation
+    mansion = get_lunar_mansion(ctx["planet_longitudes"]["Moon"])
+    return {**mansion, "interpretation": get_mansion_interpretation(mansion)}
+
+
+def _natal_points(ctx: Dict[str, Any]) -> List[Dict[str, Any]]:
+    points = [{"name": n, "longitude": lon} for n, lon in ctx["planet_longitudes"].items()]
+    if ctx.get("asc_lon") is not None:
+        points.append({"name": "Ascendant", "longitude": ctx["asc_lon"]})
+        points.append({"name": "Midheaven", "longitude": ctx["mc_lon"]})
+    return points
+
+
+def _stage_fixed_stars(ctx: Dict[str, Any]) -> List[Dict]:
+    from core.fixed_stars import get_all_fixed_star_contacts, format_fixed_stars_output
+    return format_fixed_stars_output(get_all_fixed_star_contacts(_natal_points(ctx)))
+
+
+def _stage_transits(ctx: Dict[str, Any]) -> List[Dict]:
+    from core.transits import calculate_transits, filter_major_transits
+    transit_chart = chart_json(ctx["lat"], ctx["lon"], ctx["current_dt"])
+    transit_planets = [
+        {"name": p.name, "longitude": p.lon, "speed": p.speed, "retrograde": p.retrograde}
+        for p in transit_chart.planets
+    ]
+    natal_planets = [{"name": n, "longitude": lon} for n, lon in ctx["planet_longitudes"].items()]
+    transits = calculate_transits(natal_planets, transit_planets)
+    if ctx["major_transits_only"]:
+        transits = filter_major_transits(transits, major_planets_only=True, max_orb=3.0)
+    return transits
+
+
+# (sección, función, dependencias) en orden topológico
+PIPELINE: List[Tuple[str, Callable[[Dict[str, Any]], Any], Tuple[str, ...]]] = [
+    ("chart", _stage_chart, ()),
+    ("dignities", _stage_dignities, ("chart",)),
+    ("sect", _stage_sect, ("chart",)),
+    ("lots", _stage_lots, ("chart",)),
+    ("profections", _stage_profections, ("chart",)),
+    ("fardars", _stage_fardars, ("chart", "sect")),
+    ("lunar_mansion", _stage_lunar_mansion, ("chart",)),
+    ("fixed_stars", _stage_fixed_stars, ("chart",)),
+    ("transits", _stage_transits, ("chart",)),
+]
+SECTIONS = [name for name, _, _ in PIPELINE]
+_DEPENDENCIES = {name: deps for name, _, deps in PIPELINE}
+
+
+def resolve_sections(requested: Optional[Iterable[str]]) -> List[str]:
+    """Secciones a ejecutar (pedidas + dependencias) en orden del pipeline."""
+    if not requested:
+        return list(SECTIONS)
+    wanted = set()
+    stack = list(requested)
+    while stack:
+        name = stack.pop()
+        if name not in _DEPENDENCIES:
+            raise ValueError(f"Unknown section '{name}'. Available: {', '.join(SECTIONS)}")
+        if name not in wanted:
+            wanted.add(name)
+            stack.extend(_DEPENDENCIES[name])
+    return [name for name in SECTIONS if name in wanted]
+
+
+def build_natal_report(
+    birth_dt: datetime,
+    lat: float,
+    lon: float,
+    current_dt: Optional[datetime] = None,
+    sections: Optional[Iterable[str]] = None,
+    major_transits_only: bool = True
+) -> Dict[str, Any]:
+    """
+    Ejecuta el pipeline natal completo (o las secciones pedidas).
+
+    Args:
+        birth_dt: Fecha/hora de nacimiento (UTC)
+        lat, lon: Lugar de nacimiento
+        current_dt: Fecha de referencia para profecciones, fardars y tránsitos
+            (default: ahora, UTC)
+        sections: Subconjunto de SECTIONS (default: todas)
+        major_transits_only: Igual que includeMajorOnly en /transits
+
+    Returns:
+        dict con datetime, location, reference_date, sections y una clave
+        por sección. Una etapa que falla deja {"error": ...} en su sección
+        (y en las que dependen de ella) sin abortar el reporte.
+    """
+    if current_dt is None:
+        current_dt = datetime.now(timezone.utc)
+    elif current_dt.tzinfo is None:
+        current_dt = current_dt.replace(tzinfo=timezone.utc)
+
+    ctx: Dict[str, Any] = {
+        "birth_dt": birth_dt,
+        "lat": lat,
+        "lon": lon,
+        "current_dt": current_dt,
+        "major_transits_only": major_transits_only,
+    }
+    run = resolve_sections(sections)
+    stages = {name: (fn, deps) for name, fn, deps in PIPELINE}
+    report: Dict[str, Any] = {
+        "datetime": birth_dt.isoformat(),
+        "location": {"lat": lat, "lon": lon},
+        "reference_date": current_dt.isoformat(),
+        "sections": run,
+    }
+    failed = set()
+    for name in run:
+        fn, deps = stages[name]
+        broken = [d for d in deps if d in failed]
+        if broken:
+            failed.add(name)
+            report[name] = {"error": f"Depends on failed section(s): {', '.join(broken)}"}
+            continue
+        try:
+            with span(f"natal_{name}"):
+                report[name] = fn(ctx)
+        except Exception as e:
+            if name == "chart":
+                raise
+            failed.add(name)
+            report[name] = {"error": str(e)}
+    return report
+
+
+__all__ = ["SECTIONS", "PIPELINE", "build_natal_report", "detailed_chart", "resolve_sections"]
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Parans: estrellas fijas y planetas que están a la vez en un ángulo
+(saliendo, culminando, poniéndose o en el anticulmen).
+
+Para una latitud φ y un cuerpo con ascensión recta α y declinación δ (de la
+fecha), los cuatro eventos ocurren a tiempo sidéreo local fijo:
+
+    culmina:       TSL = α
+    anticulmen:    TSL = α + 180°
+    sale / se pone: TSL = α ∓ H0,  cos H0 = (sin h0 - sin φ sin δ) / (cos φ cos δ)
+
+Como el TSL no depende de la longitud geográfica, un paran vale para toda
+la banda de latitud. Todo se calcula con broadcasting sobre (latitudes,
+cuerpos, eventos) y los pares estrella-planeta salen de una matriz de
+diferencias por bloques de latitudes, sin bucles por ciudad.
+
+Las posiciones (aparentes, equinoccio de la fecha) se toman en un solo
+instante con Skyfield: la Luna se mueve ~0.5° por hora, así que su
+tolerancia efectiva es más amplia que la de los demás cuerpos. Los cuerpos
+circumpolares o que no salen en una latitud sólo tienen culmen y
+anticulmen. Sin paralaje ni refracción: horizonte geométrico (h0 = 0) salvo
+que se indique otro.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from core.fixed_stars import load_star_catalog
+from core.profiling import span, timed
+
+EVENTS = ["rising", "culminating", "setting", "anti-culminating"]
+PARAN_TOLERANCE_MINUTES = 4.0  # minutos de tiempo sidéreo (1°)
+PARAN_MAX_MAGNITUDE = 2.0
+SIDEREAL_MINUTES_PER_DEGREE = 4.0
+MAX_LATITUDE = 89.999
+PAIR_BLOCK = 2_000_000  # elementos de la matriz de diferencias por bloque
+
+
+def event_lst(ra, dec, latitudes, horizon: float = 0.0) -> np.ndarray:
+    """
+    Tiempo sidéreo local (grados, [0, 360)) de los cuatro eventos de EVENTS.
+
+    Args:
+        ra, dec: Ascensión recta y declinación de cada cuerpo (grados), forma (B,)
+        latitudes: Latitudes (grados), forma (L,)
+        horizon: Altura del horizonte h0 (grados)
+
+    Returns:
+        Arreglo (L, B, 4); salida y puesta son NaN si el cuerpo no cruza el
+        horizonte en esa latitud
+    """
+    ra = np.atleast_1d(np.asarray(ra, dtype=float))
+    dec = np.radians(np.atleast_1d(np.asarray(dec, dtype=float)))
+    lat = np.radians(np.clip(np.atleast_1d(np.asarray(latitudes, dtype=float)), -MAX_LATITUDE, MAX_LATITUDE))[:, None]
+    cos_h0 = (np.sin(np.radians(horizon)) - np.sin(lat) * np.sin(dec)) / (np.cos(lat) * np.cos(dec))
+    with np.errstate(invalid="ignore"):
+        h0 = np.where(np.abs(cos_h0) <= 1.0, np.degrees(np.arccos(cos_h0)), np.nan)
+    culminating = np.broadcast_to(ra, h0.shape)
+    return np.stack([culminating - h0, culminating, culminating + h0, culminating + 180.0], axis=-1) % 360.0
+
+
+def paran_pairs(
+    star_ra, star_dec, planet_ra, planet_dec, latitudes,
+    tolerance_minutes: float = PARAN_TOLERANCE_MINUTES,
+    horizon: float = 0.0
+) -> Dict[str, np.ndarray]:
+    """
+    Pares estrella-planeta cuyos eventos coinciden dentro de la tolerancia.
+
+    Returns:
+        dict de arreglos paralelos (un elemento por paran): "latitude",
+        "star", "star_event", "planet", "planet_event" (índices en las
+        latitudes, cuerpos y EVENTS), "lst" (TSL del evento de la estrella,
+        grados) y "orb_minutes" (minutos de tiempo sidéreo)
+    """
+    stars = event_lst(star_ra, star_dec, latitudes, horizon)
+    planets = event_lst(planet_ra, planet_dec, latitudes, horizon)
+    n_lat, n_star, n_planet = stars.shape[0], stars.shape[1], planets.shape[1]
+    tolerance = tolerance_minutes / SIDEREAL_MINUTES_PER_DEGREE
+    per_latitude = max(1, n_star * n_planet * len(EVENTS) ** 2)
+    block = max(1, PAIR_BLOCK // per_latitude)
+
+    found = []
+    for start in range(0, n_lat, block):
+        s, p = stars[start:start + block], planets[start:start + block]
+        diff = np.abs((s[:, :, :, None, None] - p[:, None, None, :, :] + 180.0) % 360.0 - 180.0)
+        with np.errstate(invalid="ignore"):
+            lat_i, star_i, star_e, planet_i, planet_e = np.nonzero(diff <= tolerance)
+        found.append((
+            lat_i + start, star_i, star_e, planet_i, planet_e,
+            diff[lat_i, star_i, star_e, planet_i, planet_e], s[lat_i, star_i, star_e],
+        ))
+    if not found:
+        found = [tuple(np.zeros(0, dtype=np.intp) for _ in range(5)) + (np.zeros(0), np.zeros(0))]
+    columns = [np.concatenate(c) for c in zip(*found)]
+    keys = ["latitude", "star", "star_event", "planet", "planet_event"]
+    result = dict(zip(keys, columns[:5]))
+    result["orb_minutes"] = columns[5] * SIDEREAL_MINUTES_PER_DEGREE
+    result["lst"] = columns[6]
+    return result
+
+
+@timed("skyfield")
+def equatorial_positions(date: datetime, max_magnitude: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """
+    Ascensión recta y declinación aparentes (equinoccio de la fecha) de las
+    estrellas del catálogo y de los planetas de BODY_KEYS en `date`.
+
+    Returns:
+        dict: {"star_index" (índices en load_star_catalog), "star_ra",
+        "star_dec", "planet_names", "planet_ra", "planet_dec"}
+    """
+    from skyfield.api import Star, load
+
+    from core.chart import BODY_KEYS, EphemerisSingleton
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    catalog = load_star_catalog()
+    index = np.arange(catalog["ra"].size)
+    if max_magnitude is not None:
+        index = index[catalog["magnitude"] <= max_magnitude]
+
+    ephemeris = EphemerisSingleton()
+    t = load.timescale().from_datetime(date)
+    earth_at = ephemeris["earth"].at(t)
+    ra, dec = [], []
+    for key in BODY_KEYS.values():
+        p_ra, p_dec, _ = earth_at.observe(ephemeris[key]).apparent().radec(epoch="date")
+        ra.append(p_ra.hours * 15.0)
+        dec.append(p_dec.degrees)
+    if index.size:
+        stars = Star(
+            ra_hours=catalog["ra"][index] / 15.0,
+            dec_degrees=catalog["dec"][index],
+            ra_mas_per_year=catalog["pm_ra"][index],
+            dec_mas_per_year=catalog["pm_dec"][index],
+        )
+        s_ra, s_dec, _ = earth_at.observe(stars).apparent().radec(epoch="date")
+        star_ra, star_dec = np.atleast_1d(s_ra.hours * 15.0), np.atleast_1d(s_dec.degrees)
+    else:
+        star_ra = star_dec = np.zeros(0)
+    return {
+        "star_index": index,
+        "star_ra": star_ra,
+        "star_dec": star_dec,
+        "planet_names": list(BODY_KEYS.keys()),
+        "planet_ra": np.array(ra, dtype=float),
+        "planet_dec": np.array(dec, dtype=float),
+    }
+
+
+def latitude_bands(lat_min: float, lat_max: float, step: float) -> np.ndarray:
+    """Centros de banda desde lat_min hasta lat_max (inclusive) cada `step` grados."""
+    if step <= 0:
+        raise ValueError("Latitude step must be positive")
+    if lat_min > lat_max or lat_min < -90 or lat_max > 90:
+        raise ValueError("Invalid latitude range")
+    return np.round(np.arange(lat_min, lat_max + step / 2, step), 6)
+
+
+def find_parans(
+    date: datetime,
+    latitudes: Sequence[float],
+    tolerance_minutes: float = PARAN_TOLERANCE_MINUTES,
+    max_magnitude: Optional[float] = PARAN_MAX_MAGNITUDE,
+    planets: Optional[List[str]] = None,
+    horizon: float = 0.0
+) -> Dict:
+    """
+    Parans estrella-planeta de `date` agrupados por latitud.
+
+    Args:
+        date: Instante de las posiciones (UTC si no tiene zona)
+        latitudes: Centros de las bandas de latitud (ver latitude_bands)
+        tolerance_minutes: Diferencia máxima entre eventos (minutos sidéreos)
+        max_magnitude: Sólo estrellas de magnitud <= max_magnitude (None: todo el catálogo)
+        planets: Subconjunto de planetas (por defecto los diez de core.chart)
+        horizon: Altura del horizonte (grados)
+
+    Returns:
+        dict: {date, tolerance_minutes, bands: [{latitude, parans: [...]}]},
+        cada paran con star, magnitude, star_event, planet, planet_event,
+        lst (horas) y orb_minutes, ordenados por orbe
+    """
+    if tolerance_minutes <= 0:
+        raise ValueError("Tolerance must be positive")
+    latitudes = np.atleast_1d(np.asarray(latitudes, dtype=float))
+    if latitudes.size and np.any(np.abs(latitudes) > 90):
+        raise ValueError("Latitudes must be within [-90, 90]")
+
+    positions = equatorial_positions(date, max_magnitude)
+    names = positions["planet_names"]
+    selected = np.arange(len(names))
+    if planets is not None:
+        unknown = [p for p in planets if p not in names]
+        if unknown:
+            raise ValueError(f"Unknown planets: {', '.join(unknown)}")
+        selected = np.array([names.index(p) for p in planets], dtype=np.intp)
+
+    with span("parans"):
+        pairs = paran_pairs(
+            positions["star_ra"], positions["star_dec"],
+            positions["planet_ra"][selected], positions["planet_dec"][selected],
+            latitudes, tolerance_minutes, horizon
+        )
+        order = np.lexsort((pairs["orb_minutes"], pairs["latitude"]))
+
+    catalog = load_star_catalog()
+    star_names = catalog["name"][positions["star_index"]].tolist()
+    magnitudes = catalog["magnitude"][positions["star_index"]].tolist()
+    bands: List[Dict] = [{"latitude": float(lat), "parans": []} for lat in latitudes]
+    for i in order.tolist():
+        star = int(pairs["star"][i])
+        bands[int(pairs["latitude"][i])]["parans"].append({
+            "star": star_names[star],
+            "magnitude": magnitudes[star],
+            "star_event": EVENTS[int(pairs["star_event"][i])],
+            "planet": names[int(selected[pairs["planet"][i]])],
+            "planet_event": EVENTS[int(pairs["planet_event"][i])],
+            "lst": round(float(pairs["lst"][i]) / 15.0, 4),
+            "orb_minutes": round(float(pairs["orb_minutes"][i]), 2),
+        })
+    return {
+        "date": date.isoformat(),
+        "tolerance_minutes": tolerance_minutes,
+        "bands": bands,
+    }
+
+
+__all__ = [
+    "EVENTS",
+    "equatorial_positions",
+    "event_lst",
+    "find_parans",
+    "latitude_bands",
+    "paran_pairs",
+]
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentación por request para Abu.
+
+Spans livianos con nombre alrededor de las etapas costosas (carga de
+efemérides, observación Skyfield, casas swisseph, scoring, validación y
+serialización, llamada a Lilly). Los spans de un request se acumulan en un
+RequestProfile ligado a un ContextVar: fuera de un request, `span()` no mide
+nada y su costo es despreciable.
+
+Por request:
+- Header `Server-Timing` con la suma y cantidad de cada etapa.
+- Histograma abu_stage_duration_seconds{route,stage} en /metrics (core/metrics.py).
+- `?profile=1` devuelve el volcado de cProfile del handler en lugar de la
+  respuesta. Es opt-in: solo con ABU_PROFILE_ENABLED=true (docker-compose de
+  desarrollo); en producción el parámetro se ignora.
+
+Las etapas internas (skyfield, swisseph_houses, scoring, ...) están anidadas
+dentro de `handler`; `validate_serialize` es el tiempo de FastAPI fuera del
+handler (validación de parámetros + serialización Pydantic de la respuesta).
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+
+from core.metrics import STAGE_LATENCY
+
+PROFILE_TOP_N = 60
+
+
+class RequestProfile:
+    """Spans acumulados de un request: stage -> [total_ms, count]."""
+
+    __slots__ = ("endpoint", "spans", "profile_requested", "profiler")
+
+    def __init__(self, profile_requested: bool = False):
+        self.endpoint: Optional[str] = None
+        self.spans: Dict[str, List[float]] = {}
+        self.profile_requested = profile_requested
+        self.profiler: Optional[cProfile.Profile] = None
+
+    def add(self, stage: str, ms: float) -> None:
+        entry = self.spans.get(stage)
+        if entry is None:
+            self.spans[stage] = [ms, 1]
+        else:
+            entry[0] += ms
+            entry[1] += 1
+
+    def server_timing(self) -> str:
+        """Valor del header Server-Timing (https://www.w3.org/TR/server-timing/)."""
+        parts = []
+        for stage, (ms, count) in self.spans.items():
+            part = f"{stage};dur={ms:.3f}"
+            if count > 1:
+                part += f';desc="x{count}"'
+            parts.append(part)
+        return ", ".join(parts)
+
+    def profile_dump(self) -> str:
+        out = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+        return out.getvalue()
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("abu_request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+@contextmanager
+def span(stage: str):
+    """Mide el bloque y lo suma a la etapa `stage` del request en curso."""
+    prof = _current.get()
+    if prof is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        prof.add(stage, (time.perf_counter() - t0) * 1000)
+
+
+def timed(stage: str) -> Callable:
+    """Decorador equivalente a envolver la función en `span(stage)`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def profiling_allowed() -> bool:
+    """Si `?profile=1` está habilitado (env `ABU_PROFILE_ENABLED`, default false)."""
+    return os.getenv("ABU_PROFILE_ENABLED", "false").lower() == "true"
+
+
+@contextmanager
+def _handler_span():
+    prof = _current.get()
+    if prof is None or not prof.profile_requested:
+        with span("handler"):
+            yield
+        return
+    prof.profiler = cProfile.Profile()
+    with span("handler"):
+        prof.profiler.enable()
+        try:
+            yield
+        finally:
+            prof.profiler.disable()
+
+
+def _instrument_endpoint(endpoint: Callable) -> Callable:
+    """Envuelve el endpoint conservando firma y sync/async (FastAPI inspecciona ambas)."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            with _handler_span():
+                return await endpoint(*args, **kwargs)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            with _handler_span():
+                return endpoint(*args, **kwargs)
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute que mide el handler y la validación/serialización de FastAPI."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _instrument_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route_path = self.path
+
+        async def profiled_handler(request):
+            prof = _current.get()
+            if prof is None:
+                return await handler(request)
+            prof.endpoint = route_path
+            t0 = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                elapsed = (time.perf_counter() - t0) * 1000
+                inner = prof.spans.get("handler", (0.0, 0))[0]
+                prof.add("validate_serialize", max(0.0, elapsed - inner))
+
+        return profiled_handler
+
+
+async def profiling_middleware(request, call_next):
+    """Middleware HTTP: crea el RequestProfile, agrega Server-Timing y observa las etapas."""
+    wants_profile = request.query_params.get("profile") in ("1", "true") and profiling_allowed()
+    prof = RequestProfile(profile_requested=wants_profile)
+    token = _current.set(prof)
+    t0 = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+    prof.add("total", (time.perf_counter() - t0) * 1000)
+
+    if prof.endpoint is not None:
+        for stage, (ms, _) in prof.spans.items():
+            STAGE_LATENCY.labels(prof.endpoint, stage).observe(ms / 1000)
+    if prof.profiler is not None:
+        response = PlainTextResponse(prof.profile_dump())
+    response.headers["Server-Timing"] = prof.server_timing()
+    return response
+
+
+__all__ = [
+    "RequestProfile",
+    "ProfiledRoute",
+    "current_profile",
+    "profiling_middleware",
+    "span",
+    "timed",
+]
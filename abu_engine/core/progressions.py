@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+"""
+Progresiones secundarias y direcciones por arco solar.
+
+- Progresión secundaria: un día de efeméride después del nacimiento
+  equivale a un año de vida (año trópico). La carta progresada para una
+  fecha es la carta geocéntrica del instante natal + edad (en días).
+- Arco solar: todos los puntos natales avanzan lo mismo que el Sol
+  progresado (arco = Sol progresado - Sol natal).
+- Ángulos progresados: MC natal + arco solar (arco solar en longitud);
+  Ascendente y cúspides con swe.houses_armc sobre el ARMC de ese MC.
+
+Para la serie de toda una vida se evalúa la efeméride una sola vez sobre
+la grilla de edades (90 años -> ~90 días de efeméride, un paso por mes de
+vida) con planet_longitudes_many, se cachea por nacimiento, y los aspectos
+exactos a la carta natal se buscan como cruces por cero vectorizados.
+"""
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from core.aspects import ASPECTS, aspect_matrix
+from core.chart import BODY_KEYS, get_sign, planet_longitudes_many
+from core.profiling import span
+
+YEAR_DAYS = 365.24219  # año trópico: 1 día progresado = 1 año de vida
+PROGRESSION_ORB = 1.0
+SERIES_STEPS_PER_YEAR = 12
+MAX_SERIES_YEARS = 120
+PLANET_NAMES = list(BODY_KEYS.keys())
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def age_in_years(birth: datetime, target: datetime) -> float:
+    """Edad en años trópicos (negativa si target es anterior al nacimiento)."""
+    return (_utc(target) - _utc(birth)).total_seconds() / 86400.0 / YEAR_DAYS
+
+
+def _check_target(birth: datetime, target: datetime) -> None:
+    if target < birth:
+        raise ValueError("targetDate must not be before birthDate")
+
+
+def progressed_datetime(birth: datetime, target: datetime) -> datetime:
+    """Instante de efeméride de la progresión secundaria para `target`."""
+    return _utc(birth) + timedelta(days=age_in_years(birth, target))
+
+
+@lru_cache(maxsize=128)
+def _natal_positions(birth: datetime) -> Dict[str, float]:
+    _, lons, _ = planet_longitudes_many([birth])
+    return {n: float(lons[0, k]) for k, n in enumerate(PLANET_NAMES)}
+
+
+def natal_points(birth: datetime, lat: float, lon: float, include_angles: bool = True) -> Dict[str, float]:
+    """
+    Planetas natales y, si se pide, Ascendente y Medio Cielo.
+
+    Raises:
+        swisseph.Error: si se piden ángulos donde las casas no están definidas
+        (latitudes polares); ver natal_points_or_note
+    """
+    birth = _utc(birth)
+    points = dict(_natal_positions(birth))
+    if include_angles:
+        from core.houses_swiss import calculate_houses
+        houses = calculate_houses(birth, lat, lon)
+        points["Ascendant"] = float(houses["asc"])
+        points["Midheaven"] = float(houses["mc"])
+    return points
+
+
+def natal_points_or_note(birth: datetime, lat: float, lon: float, include_angles: bool = True) -> Tuple[Dict[str, float], Optional[str]]:
+    """natal_points sin ángulos (y con una nota) si las casas no se pueden calcular."""
+    try:
+        return natal_points(birth, lat, lon, include_angles), None
+    except Exception as e:
+        if not include_angles:
+            raise
+        return natal_points(birth, lat, lon, False), f"Houses not available: {str(e)}"
+
+
+def progressed_angles(birth: datetime, lat: float, lon: float, arc: float) -> Dict:
+    """
+    Ángulos y cúspides Placidus con el MC natal avanzado por el arco solar.
+
+    Returns:
+        dict: {"asc", "mc", "armc", "cusps"}
+    """
+    import swisseph as swe
+    from core.houses_swiss import calculate_houses, HOUSE_SYSTEM_PLACIDUS
+
+    birth = _utc(birth)
+    natal = calculate_houses(birth, lat, lon, HOUSE_SYSTEM_PLACIDUS)
+    jd = swe.julday(birth.year, birth.month, birth.day,
+                    birth.hour + birth.minute / 60.0 + birth.second / 3600.0)
+    eps = swe.calc_ut(jd, swe.ECL_NUT)[0][0]
+    # MC dirigido en longitud -> su ascensión recta es el ARMC progresado
+    mc = np.radians((natal["mc"] + arc) % 360.0)
+    armc = float(np.degrees(np.arctan2(np.sin(mc) * np.cos(np.radians(eps)), np.cos(mc)))) % 360.0
+    cusps, ascmc = swe.houses_armc(armc, lat, eps, HOUSE_SYSTEM_PLACIDUS)
+    return {
+        "asc": float(ascmc[0]) % 360.0,
+        "mc": float(ascmc[1]) % 360.0,
+        "armc": armc,
+        "cusps": [float(c) % 360.0 for c in cusps[:12]],
+    }
+
+
+def _left_orb(birth: datetime, prog_dt: datetime, orb: float) -> Set[str]:
+    """
+    Planetas progresados que se alejaron más de `orb` de su posición natal
+    entre el nacimiento y prog_dt (grilla de un día de efeméride = un año).
+    """
+    days = (prog_dt - birth).total_seconds() / 86400.0
+    if days <= 0:
+        return set()
+    steps = np.append(np.arange(0.0, days, 1.0), days)
+    with span("skyfield"):
+        _, lons, _ = planet_longitudes_many([birth + timedelta(days=float(d)) for d in steps])
+    drift = np.abs((lons - lons[0] + 180.0) % 360.0 - 180.0)
+    return {n for k, n in enumerate(PLANET_NAMES) if drift[:, k].max() > orb}
+
+
+def _aspects_to_natal(moving: Dict[str, float], natal: Dict[str, float], orb: float,
+                      speeds: Optional[Dict[str, float]] = None,
+                      self_pairs: Optional[Set[str]] = None) -> List[Dict]:
+    """
+    Aspectos (ASPECTS, orbe único) entre puntos progresados/dirigidos y natales.
+
+    Un punto con su propia posición natal sólo se informa si está en
+    `self_pairs`: en la progresión secundaria, los puntos que ya salieron
+    del orbe natal (la Luna progresada en cuadratura o retorno a su lugar
+    natal); los planetas lentos que nunca se alejaron quedarían en
+    conjunción toda la vida. En arco solar todos los puntos avanzan juntos
+    y el aspecto de un punto consigo mismo es sólo el arco: no se informa.
+    """
+    m_names, n_names = list(moving), list(natal)
+    m = aspect_matrix(
+        [moving[n] for n in m_names], [natal[n] for n in n_names], ASPECTS, orb,
+        speeds_a=[speeds.get(n, 0.0) for n in m_names] if speeds else None,
+        speeds_b=[0.0] * len(n_names) if speeds else None
+    )
+    aspects = []
+    for i, j in zip(*np.nonzero(m["aspect"] >= 0)):
+        if m_names[i] == n_names[j] and m_names[i] not in (self_pairs or ()):
+            continue
+        aspects.append({
+            "progressed": m_names[i],
+            "natal": n_names[j],
+            "aspect": m["names"][m["aspect"][i, j]],
+            "orb": round(float(m["orb"][i, j]), 2),
+            "applying": None if m["applying"] is None else bool(m["applying"][i, j]),
+        })
+    aspects.sort(key=lambda a: a["orb"])
+    return aspects
+
+
+def progressed_chart(
+    birth: datetime,
+    target: datetime,
+    lat: float,
+    lon: float,
+    include_angles: bool = True,
+    orb: float = PROGRESSION_ORB
+) -> Dict:
+    """
+    Carta progresada (secundaria) para `target`.
+
+    Returns:
+        dict: {
+            "birth", "target", "age", "progressed_datetime", "solar_arc",
+            "planets": [{name, lon, sign, speed, retrograde, natal_lon}],
+            "angles": {asc, mc, armc, cusps} | None,
+            "aspects_to_natal": [{progressed, natal, aspect, orb, applying}],
+            "note"   # sólo si las casas no están disponibles (sin ángulos)
+        }
+
+    Raises:
+        ValueError: si `target` es anterior al nacimiento
+    """
+    birth, target = _utc(birth), _utc(target)
+    _check_target(birth, target)
+    prog_dt = progressed_datetime(birth, target)
+    with span("skyfield"):
+        _, lons, speeds = planet_longitudes_many([prog_dt])
+    natal, note = natal_points_or_note(birth, lat, lon, include_angles)
+    prog = {n: float(lons[0, k]) for k, n in enumerate(PLANET_NAMES)}
+    prog_speeds = {n: float(speeds[0, k]) for k, n in enumerate(PLANET_NAMES)}
+    arc = (prog["Sun"] - natal["Sun"]) % 360.0
+
+    angles = progressed_angles(birth, lat, lon, arc) if "Ascendant" in natal else None
+    moving = dict(prog)
+    self_pairs = _left_orb(birth, prog_dt, orb)
+    if angles:
+        moving["Ascendant"] = angles["asc"]
+        moving["Midheaven"] = angles["mc"]
+        # Los ángulos avanzan con el arco solar (siempre creciente)
+        if arc > orb:
+            self_pairs |= {"Ascendant", "Midheaven"}
+
+    result = {
+        "birth": birth.isoformat(),
+        "target": target.isoformat(),
+        "age": round(age_in_years(birth, target), 4),
+        "progressed_datetime": prog_dt.isoformat(),
+        "solar_arc": round(arc, 4),
+        "planets": [
+            {
+                "name": n,
+                "lon": prog[n],
+                "sign": get_sign(prog[n]),
+                "speed": prog_speeds[n],
+                "retrograde": prog_speeds[n] < 0,
+                "natal_lon": natal[n],
+            }
+            for n in PLANET_NAMES
+        ],
+        "angles": angles,
+        "aspects_to_natal": _aspects_to_natal(moving, natal, orb, prog_speeds, self_pairs),
+    }
+    if note:
+        result["note"] = note
+    return result
+
+
+def solar_arc_directions(
+    birth: datetime,
+    target: datetime,
+    lat: float,
+    lon: float,
+    include_angles: bool = True,
+    orb: float = PROGRESSION_ORB
+) -> Dict:
+    """
+    Direcciones por arco solar para `target`.
+
+    Returns:
+        dict: {
+            "birth", "target", "age", "solar_arc",
+            "directed": [{name, lon, sign, natal_lon}],
+            "aspects_to_natal": [...],
+            "note"   # sólo si las casas no están disponibles (sin ángulos)
+        }
+
+    Raises:
+        ValueError: si `target` es anterior al nacimiento
+    """
+    birth, target = _utc(birth), _utc(target)
+    _check_target(birth, target)
+    with span("skyfield"):
+        _, lons, _ = planet_longitudes_many([progressed_datetime(birth, target)])
+    natal, note = natal_points_or_note(birth, lat, lon, include_angles)
+    arc = (float(lons[0, PLANET_NAMES.index("Sun")]) - natal["Sun"]) % 360.0
+    directed = {n: (v + arc) % 360.0 for n, v in natal.items()}
+    result = {
+        "birth": birth.isoformat(),
+        "target": target.isoformat(),
+        "age": round(age_in_years(birth, target), 4),
+        "solar_arc": round(arc, 4),
+        "directed": [
+            {"name": n, "lon": v, "sign": get_sign(v), "natal_lon": natal[n]}
+            for n, v in directed.items()
+        ],
+        "aspects_to_natal": _aspects_to_natal(directed, natal, orb),
+    }
+    if note:
+        result["note"] = note
+    return result
+
+
+@lru_cache(maxsize=64)
+def _lifetime_table(birth: datetime, years: int, steps_per_year: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Edades (T,) y longitudes progresadas (T, 10) para toda la vida.
+
+    Un solo lote de Skyfield: `years` días de efeméride muestreados cada
+    1/steps_per_year de día (un mes de vida por defecto).
+    """
+    ages = np.arange(years * steps_per_year + 1) / steps_per_year
+    dates = [birth + timedelta(days=float(a)) for a in ages]
+    with span("skyfield"):
+        _, lons, _ = planet_longitudes_many(dates)
+    return ages, lons
+
+
+def _exact_hits(ages: np.ndarray, moving: np.ndarray, moving_names: List[str],
+                natal: Dict[str, float], left: Optional[np.ndarray] = None) -> List[Tuple[float, str, str, str]]:
+    """
+    Cruces por cero de (punto en movimiento - natal ± ángulo) -> (edad, móvil, natal, aspecto).
+
+    Un punto con su propia posición natal sólo cuenta si `left` (T, P) dice
+    que ya había salido del orbe en ese paso (None: nunca, como en arco solar).
+    """
+    targets = []
+    for natal_name, natal_lon in natal.items():
+        for aspect, angle in ASPECTS.items():
+            for side in sorted({(natal_lon + angle) % 360.0, (natal_lon - angle) % 360.0}):
+                targets.append((natal_name, aspect, side))
+    target_lon = np.array([t[2] for t in targets])
+
+    d = (moving[:, :, None] - target_lon[None, None, :] + 180.0) % 360.0 - 180.0  # (T, P, K)
+    f0, f1 = d[:-1], d[1:]
+    near = (np.abs(f0) < 90.0) & (np.abs(f1) < 90.0)  # descarta el salto de ±180
+    crosses = ((f0 * f1 < 0) | (f1 == 0)) & near
+    ti, pi, ki = np.nonzero(crosses)
+    # Interpolación lineal dentro del paso (la Luna progresada avanza ~1° por mes)
+    frac = f0[ti, pi, ki] / (f0[ti, pi, ki] - f1[ti, pi, ki])
+    hit_ages = ages[ti] + frac * (ages[ti + 1] - ages[ti])
+
+    hits = []
+    for age, step, p, k in zip(hit_ages, ti, pi, ki):
+        natal_name, aspect, _ = targets[k]
+        if moving_names[p] == natal_name and (left is None or not left[step, p]):
+            continue
+        hits.append((float(age), moving_names[p], natal_name, aspect))
+    return hits
+
+
+def progression_series(
+    birth: datetime,
+    lat: float,
+    lon: float,
+    years: int = 90,
+    method: str = "secondary",
+    include_angles: bool = True,
+    steps_per_year: int = SERIES_STEPS_PER_YEAR
+) -> Dict:
+    """
+    Aspectos exactos a la carta natal a lo largo de la vida.
+
+    Args:
+        birth: Nacimiento (UTC; sin zona se asume UTC)
+        years: Años de vida a cubrir (máximo MAX_SERIES_YEARS)
+        method: "secondary" (planetas progresados) o "solar_arc" (puntos natales + arco)
+        include_angles: Incluir Ascendente y Medio Cielo natales (y dirigidos en arco solar)
+        steps_per_year: Resolución de la grilla de edades
+
+    Returns:
+        dict: {
+            "birth", "method", "years",
+            "events": [{"age", "date", "progressed", "natal", "aspect"}],   # ordenados por edad
+            "note"   # sólo si las casas no están disponibles (sin ángulos)
+        }
+
+    Raises:
+        ValueError: si `target` es anterior al nacimiento
+    """
+    if method not in ("secondary", "solar_arc"):
+        raise ValueError("method must be 'secondary' or 'solar_arc'")
+    if not 1 <= years <= MAX_SERIES_YEARS:
+        raise ValueError(f"years must be between 1 and {MAX_SERIES_YEARS}")
+    birth = _utc(birth)
+    ages, lons = _lifetime_table(birth, int(years), int(steps_per_year))
+    natal, note = natal_points_or_note(birth, lat, lon, include_angles)
+
+    left = None
+    if method == "secondary":
+        moving, names = lons, list(PLANET_NAMES)
+        # Salió alguna vez del orbe natal (hasta cada paso): la conjunción siguiente es un retorno
+        drift = np.abs((lons - lons[0] + 180.0) % 360.0 - 180.0)
+        left = np.maximum.accumulate(drift > PROGRESSION_ORB, axis=0)
+    else:
+        arc = (lons[:, PLANET_NAMES.index("Sun")] - natal["Sun"]) % 360.0
+        names = list(natal)
+        moving = (np.array([natal[n] for n in names])[None, :] + arc[:, None]) % 360.0
+
+    with span("scoring"):
+        hits = _exact_hits(ages, moving, names, natal, left)
+    hits.sort()
+    result = {
+        "birth": birth.isoformat(),
+        "method": method,
+        "years": years,
+        "events": [
+            {
+                "age": round(age, 3),
+                "date": (birth + timedelta(days=age * YEAR_DAYS)).date().isoformat(),
+                "progressed": moving_name,
+                "natal": natal_name,
+                "aspect": aspect,
+            }
+            for age, moving_name, natal_name, aspect in hits
+        ],
+    }
+    if note:
+        result["note"] = note
+    return result
+
+
+__all__ = [
+    "YEAR_DAYS",
+    "age_in_years",
+    "natal_points_or_note",
+    "progressed_angles",
+    "progressed_chart",
+    "progressed_datetime",
+    "progression_series",
+    "solar_arc_directions",
+]
@@ -1,6 +1,7 @@
 ﻿# -*- coding: utf-8 -*-
 import json, math
 from pathlib import Path
+from core.profiling import timed
 
 # Cargar pesos desde ruta absoluta
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -9,6 +10,15 @@ WEIGHTS_PATH = BASE_DIR / "data" / "weights.json"
 with open(WEIGHTS_PATH, "r", encoding="utf-8") as f:
     weights = json.load(f)
 
+
+def planet_weight(name: str) -> float:
+    """Peso del planeta en weights.json ("Jupiter" -> "jupiter barycenter"; default 1)."""
+    key = name.lower()
+    planets = weights["planets"]
+    return planets.get(key, planets.get(f"{key} barycenter", 1))
+
+
+@timed("scoring")
 def compute_score(aspects):
     """
     Calcula el puntaje total de favorabilidad según pesos configurados.
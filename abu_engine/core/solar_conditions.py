@@ -3,6 +3,10 @@ Condiciones Solares (Óptica)
 Combustión, Bajo Rayos, Cazimi
 """
 
+CAZIMI_ORB = 0.28  # ~17 minutos de arco
+COMBUST_ORB = 8
+UNDER_BEAMS_ORB = 17
+
 def get_solar_condition(planet_longitude: float, sun_longitude: float, planet_name: str) -> dict:
     """
     Determina la condición solar de un planeta.
@@ -31,15 +35,15 @@ def get_solar_condition(planet_longitude: float, sun_longitude: float, planet_na
     diff = abs((planet_longitude - sun_longitude + 180) % 360 - 180)
     
     # Cazimi (corazón del Sol)
-    if diff < 0.28:  # ~17 minutos de arco
+    if diff < CAZIMI_ORB:
         return {"state": "cazimi", "distance_deg": round(diff, 2)}
     
     # Combustión
-    if diff < 8:
+    if diff < COMBUST_ORB:
         return {"state": "combust", "distance_deg": round(diff, 2)}
     
     # Bajo rayos
-    if diff < 17:
+    if diff < UNDER_BEAMS_ORB:
         return {"state": "under_beams", "distance_deg": round(diff, 2)}
     
     # Libre del Sol
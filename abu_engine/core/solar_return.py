@@ -148,19 +148,21 @@ def calculate_solar_return(
             "degree": round(degree, 2)
         })
     
-    # Calcular aspectos básicos
-    from .aspects import aspect_between
+    # Calcular aspectos básicos (matriz planeta x planeta, orbe 6°)
+    from .aspects import ASPECTS, aspect_matrix
     
+    lons = [p["longitude"] for p in planets]
+    m = aspect_matrix(lons, lons, ASPECTS, 6)
     aspects = []
-    for i, p1 in enumerate(planets):
-        for p2 in planets[i + 1:]:
-            aspect_type, orb = aspect_between(p1["longitude"], p2["longitude"])
-            if aspect_type:
+    for i in range(len(planets)):
+        for j in range(i + 1, len(planets)):
+            idx = m["aspect"][i, j]
+            if idx >= 0:
                 aspects.append({
-                    "planet1": p1["name"],
-                    "planet2": p2["name"],
-                    "aspect": aspect_type,
-                    "orb": orb
+                    "planet1": planets[i]["name"],
+                    "planet2": planets[j]["name"],
+                    "aspect": m["names"][idx],
+                    "orb": round(float(m["delta"][i, j]), 2)
                 })
     
     return {
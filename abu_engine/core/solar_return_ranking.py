@@ -15,9 +15,13 @@ Version: 1.0.0
 
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+import numpy as np
 from core.chart import solar_return_chart
 from core.dignities import get_planet_dignity, get_ruler
-from core.houses_swiss import calculate_houses, longitude_to_sign_degree, get_planet_house, HOUSE_SYSTEM_PLACIDUS
+from core.lookup import DIGNITY_KINDS, SIGNS, classical_dignity_many, sign_indices
+from core.houses import houses_many, julian_days
+from core.houses_swiss import calculate_houses, longitude_to_sign_degree, house_numbers, HOUSE_SYSTEM_PLACIDUS
+from core.profiling import span
 
 
 # Persian/Hellenistic scoring tables
@@ -37,6 +41,11 @@ BENEFICS = ['Jupiter', 'Venus']
 MALEFICS = ['Saturn', 'Mars']
 NEUTRALS = ['Sun', 'Moon', 'Mercury']
 
+# Angularity points for planets in houses 1/4/7/10 (malefics depend on dignity)
+ANGULAR_SCORES = {'Jupiter': 8, 'Venus': 8, 'Sun': 6, 'Moon': 5, 'Mercury': 5}
+ANGULAR_HOUSES = [1, 4, 7, 10]
+SUCCEDENT_HOUSES = [2, 5, 8, 11]
+
 # City database for SR relocation (16 cities across elements/regions)
 RELOCATION_CITIES = {
     # Fire cities (energetic, entrepreneurial)
@@ -420,64 +429,181 @@ def score_sect(chart: Dict) -> Tuple[float, Dict]:
     return final_score, details
 
 
-def score_solar_return_location(
-    birth_date: datetime,
-    city_name: str,
-    city_lat: float,
-    city_lon: float,
-    year: Optional[int] = None
-) -> Dict[str, Any]:
+def encode_chart(chart: Dict) -> Dict[str, Any]:
     """
-    Calculate and score a Solar Return chart for a specific location.
-    
+    Encode the location-independent part of an SR chart as fixed-shape arrays.
+
+    The SR moment and planetary longitudes do not depend on the relocation
+    city (positions are geocentric), so dignities, solar conditions and
+    aspects/reception are evaluated once here; only houses and angles vary
+    per city (see score_locations).
+
+    Returns:
+        dict with "names", "lon", "dignity" (score), "dignified" (domicile or
+        exaltation), "ruler_index" (chart index of each sign's ruler, -1 if
+        absent), "angular_weight" and the per-chart scalars "solar",
+        "reception" and the no-house fallbacks.
+    """
+    planets = chart.get('planets', [])
+    names = [p['name'] for p in planets]
+    index = {name: i for i, name in enumerate(names)}
+    lon = np.array([p['lon'] for p in planets], dtype=float)
+    kind, dignity = classical_dignity_many(np.array(names, dtype=object), lon)
+    dignified = np.isin(kind, [DIGNITY_KINDS.index('domicile'), DIGNITY_KINDS.index('exaltation')])
+    is_benefic = np.isin(names, BENEFICS)
+    is_malefic = np.isin(names, MALEFICS)
+
+    angular_weight = np.array([ANGULAR_SCORES.get(n, 0) for n in names], dtype=float)
+    angular_weight = np.where(is_malefic, np.where(dignified, 3.0, -2.0), angular_weight)
+
+    # Solar conditions (thresholds as in check_cazimi / check_combust / check_under_beams)
+    solar = 0.0
+    if 'Sun' in index:
+        distance = np.abs(lon - lon[index['Sun']])
+        distance = np.where(distance > 180, 360 - distance, distance)
+        condition = np.select(
+            [distance < 0.283, (distance > 0.283) & (distance < 8), distance < 17], [10.0, -10.0, -5.0], 0.0
+        )
+        solar = float(max(min(condition[np.array(names) != 'Sun'].sum(), 15), -10))
+
+    # No-house fallbacks of score_angularity / score_sect
+    fallback_angular = float(min(3 * is_benefic.sum() + (is_malefic & dignified).sum(), 25))
+    diurnal = lon[index['Sun']] % 360 < 180 if 'Sun' in index else True
+    sect_planet = 'Jupiter' if diurnal else 'Venus'
+    fallback_sect = 5.0 if sect_planet in index and dignified[index[sect_planet]] else 0.0
+
+    return {
+        'names': names,
+        'index': index,
+        'lon': lon,
+        'dignity': dignity.astype(float),
+        'dignified': dignified,
+        'ruler_index': np.array([index.get(get_ruler(sign), -1) for sign in SIGNS]),
+        'angular_weight': angular_weight,
+        'solar': solar,
+        'reception': float(score_aspects_reception(chart)[0]),
+        'fallback_angularity': fallback_angular,
+        'fallback_sect': fallback_sect,
+    }
+
+
+def score_locations(
+    encoded: Dict[str, Any],
+    cusps: np.ndarray,
+    asc: np.ndarray,
+    mc: np.ndarray,
+    has_houses: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Score one encoded SR chart at C locations at once.
+
+    Equivalent to running score_dignities, score_angularity,
+    score_solar_conditions, score_aspects_reception and score_sect on each
+    relocated chart, but on (city × planet) arrays and without building the
+    detail dicts.
+
     Args:
-        birth_date: Natal birth datetime (UTC)
-        city_name: Name of the relocation city
-        city_lat: Latitude of the city
-        city_lon: Longitude of the city
-        year: Year for SR (default: current year)
-    
+        encoded: Output of encode_chart
+        cusps: (C, 12) Placidus cusps per location
+        asc: (C,) Ascendant longitudes
+        mc: (C,) MC longitudes
+        has_houses: (C,) False where houses could not be computed (those
+            rows use Aries/Capricorn angles and the no-house fallbacks)
+
     Returns:
-        Dictionary with total score, breakdown, and chart data
+        dict of (C,) arrays: "dignities", "angularity", "solar_conditions",
+        "aspects_reception", "sect", "total", plus "houses" (C, P)
     """
-    # Calculate SR chart for this location
-    sr_result = solar_return_chart(birth_date, city_lat, city_lon, year)
-    # Parse datetime and compute houses (Placidus)
-    sr_dt = datetime.fromisoformat(sr_result['solar_return_datetime'].replace('Z', '+00:00'))
-    # Try to compute houses; if fails, continue without houses
-    enriched_planets = []
+    cusps = np.asarray(cusps, dtype=float).reshape(-1, 12)
+    n = cusps.shape[0]
+    has_houses = np.ones(n, dtype=bool) if has_houses is None else np.asarray(has_houses, dtype=bool)
+    houses = house_numbers(encoded['lon'], np.where(has_houses[:, None], cusps, 0.0))
+    index = encoded['index']
+    dignity = encoded['dignity']
+
+    # 1. Dignities: ASC ruler x2, MC ruler x1.5, every planet x0.5
+    asc_sign = np.where(has_houses, sign_indices(np.where(has_houses, asc, 0.0)), SIGNS.index('Aries'))
+    mc_sign = np.where(has_houses, sign_indices(np.where(has_houses, mc, 0.0)), SIGNS.index('Capricorn'))
+    padded = np.append(dignity, 0.0)  # ruler_index -1 -> 0 points
+    dignities = np.minimum(
+        2 * padded[encoded['ruler_index'][asc_sign]] + 1.5 * padded[encoded['ruler_index'][mc_sign]]
+        + 0.5 * dignity.sum(), 35
+    )
+
+    # 2. Angularity
+    angular = np.isin(houses, ANGULAR_HOUSES)
+    angularity = np.where(
+        has_houses, np.minimum(angular @ encoded['angular_weight'], 25), encoded['fallback_angularity']
+    )
+
+    # 5. Sect: diurnal if the Sun is above the horizon (houses 7-12)
+    def in_houses(name: str, allowed: List[int], default: bool) -> np.ndarray:
+        if name not in index:
+            return np.full(n, default)
+        return np.isin(houses[:, index[name]], allowed)
+
+    strong = ANGULAR_HOUSES + SUCCEDENT_HOUSES
+    diurnal = in_houses('Sun', [7, 8, 9, 10, 11, 12], True)
+    sect = np.where(
+        diurnal,
+        5 * in_houses('Jupiter', strong, False) + 3 * ~in_houses('Saturn', ANGULAR_HOUSES, True),
+        5 * in_houses('Venus', strong, False) + 3 * ~in_houses('Mars', ANGULAR_HOUSES, True),
+    )
+    sect = np.where(has_houses, np.minimum(sect, 10), encoded['fallback_sect']).astype(float)
+
+    solar = np.full(n, encoded['solar'])
+    reception = np.full(n, encoded['reception'])
+    return {
+        'dignities': dignities,
+        'angularity': angularity,
+        'solar_conditions': solar,
+        'aspects_reception': reception,
+        'sect': sect,
+        'total': dignities + angularity + solar + reception + sect,
+        'houses': houses,
+    }
+
+
+def _relocated_chart(sr_result: Dict, houses: Optional[Dict]) -> Dict:
+    """SR chart dict for the score_* functions, with houses when available."""
     asc_sign = 'Aries'
     mc_sign = 'Capricorn'
-    try:
-        houses_raw = calculate_houses(sr_dt, city_lat, city_lon, HOUSE_SYSTEM_PLACIDUS)
-        cusps = houses_raw.get('cusps', [])
-        if len(cusps) == 12:
-            asc_sign, _ = longitude_to_sign_degree(houses_raw['asc'])
-            mc_sign, _ = longitude_to_sign_degree(houses_raw['mc'])
-            for p in sr_result['planets']:
-                lon = p.get('lon')
-                house_num = get_planet_house(lon, cusps) if lon is not None else None
-                p2 = dict(p)
-                p2['house'] = house_num
-                enriched_planets.append(p2)
-        else:
-            enriched_planets = list(sr_result['planets'])
-    except Exception:
-        enriched_planets = list(sr_result['planets'])
-    chart = {
-        'planets': enriched_planets,
+    planets = list(sr_result['planets'])
+    cusps = houses.get('cusps', []) if houses else []
+    if len(cusps) == 12:
+        asc_sign, _ = longitude_to_sign_degree(houses['asc'])
+        mc_sign, _ = longitude_to_sign_degree(houses['mc'])
+        lons = [p.get('lon') for p in sr_result['planets']]
+        houses = house_numbers([0.0 if lon is None else lon for lon in lons], cusps)
+        planets = [
+            {**p, 'house': int(house) if lon is not None else None}
+            for p, lon, house in zip(sr_result['planets'], lons, houses)
+        ]
+    return {
+        'planets': planets,
         'aspects': sr_result['aspects'],
         'asc_sign': asc_sign,
         'mc_sign': mc_sign,
         'solar_return_datetime': sr_result['solar_return_datetime']
     }
-    
-    # Score using Persian criteria (simplified for MVP)
-    dig_score, dig_details = score_dignities(chart)
-    ang_score, ang_details = score_angularity(chart)
-    sol_score, sol_details = score_solar_conditions(chart)
-    rec_score, rec_details = score_aspects_reception(chart)
-    sec_score, sec_details = score_sect(chart)
+
+
+def _try_houses(sr_dt: datetime, lat: float, lon: float) -> Optional[Dict]:
+    """Placidus houses, or None if they cannot be computed (e.g. polar latitudes)."""
+    try:
+        return calculate_houses(sr_dt, lat, lon, HOUSE_SYSTEM_PLACIDUS)
+    except Exception:
+        return None
+
+
+def _location_result(city_name: str, city_lat: float, city_lon: float, chart: Dict) -> Dict[str, Any]:
+    """Score a relocated chart with the detailed score_* functions."""
+    with span("scoring"):
+        dig_score, dig_details = score_dignities(chart)
+        ang_score, ang_details = score_angularity(chart)
+        sol_score, sol_details = score_solar_conditions(chart)
+        rec_score, rec_details = score_aspects_reception(chart)
+        sec_score, sec_details = score_sect(chart)
     
     total_score = dig_score + ang_score + sol_score + rec_score + sec_score
     
@@ -495,16 +621,114 @@ def score_solar_return_location(
         'chart_summary': {
             'asc_sign': chart.get('asc_sign'),
             'mc_sign': chart.get('mc_sign'),
-            'solar_return_datetime': sr_result['solar_return_datetime']
+            'solar_return_datetime': chart['solar_return_datetime']
         }
     }
 
 
+def score_solar_return_location(
+    birth_date: datetime,
+    city_name: str,
+    city_lat: float,
+    city_lon: float,
+    year: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Calculate and score a Solar Return chart for a specific location.
+    
+    Args:
+        birth_date: Natal birth datetime (UTC)
+        city_name: Name of the relocation city
+        city_lat: Latitude of the city
+        city_lon: Longitude of the city
+        year: Year for SR (default: current year)
+    
+    Returns:
+        Dictionary with total score, breakdown, and chart data
+    """
+    # Calculate SR chart for this location
+    sr_result = solar_return_chart(birth_date, city_lat, city_lon, year)
+    sr_dt = datetime.fromisoformat(sr_result['solar_return_datetime'].replace('Z', '+00:00'))
+    # Try to compute houses (Placidus); if it fails, continue without houses
+    chart = _relocated_chart(sr_result, _try_houses(sr_dt, city_lat, city_lon))
+    return _location_result(city_name, city_lat, city_lon, chart)
+
+
+def rank_locations(
+    birth_date: datetime,
+    locations: List[Dict[str, Any]],
+    year: Optional[int] = None,
+    breakdown_top: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Score the Solar Return at many locations, best first.
+
+    The SR chart is computed once (it does not depend on the location) and
+    encoded with encode_chart; each location then only needs its houses (one
+    houses_many call for all of them), and all five criteria are scored
+    together with score_locations. Detailed breakdowns (the score_* dicts)
+    are built only for the first `breakdown_top` results; the rest carry
+    per-criterion totals.
+
+    Args:
+        birth_date: Natal birth datetime (UTC)
+        locations: [{"name", "lat", "lon", ...extra keys copied through}]
+        year: Year for SR (default: current year)
+        breakdown_top: Number of results with full breakdowns (None: all)
+
+    Returns:
+        Ranking entries in score_solar_return_location format, sorted by
+        total_score (descending, ties keep input order)
+    """
+    if not locations:
+        return []
+    sr_result = solar_return_chart(birth_date, locations[0]['lat'], locations[0]['lon'], year)
+    sr_dt = datetime.fromisoformat(sr_result['solar_return_datetime'].replace('Z', '+00:00'))
+
+    # Placidus for every location in one vectorized call (invalid inside the polar circles)
+    houses = houses_many(
+        julian_days(sr_dt), [loc['lat'] for loc in locations], [loc['lon'] for loc in locations], HOUSE_SYSTEM_PLACIDUS
+    )
+    has_houses = houses['valid']
+    cusps = np.where(has_houses[:, None], houses['cusps'], 0.0)
+    asc, mc = houses['asc'], houses['mc']
+
+    with span("scoring"):
+        scores = score_locations(encode_chart({'planets': sr_result['planets'], 'aspects': sr_result['aspects']}),
+                                 cusps, asc, mc, has_houses)
+    order = np.argsort(-np.round(scores['total'], 2), kind='stable')
+    criteria = ['dignities', 'angularity', 'solar_conditions', 'aspects_reception', 'sect']
+
+    rankings = []
+    for rank, i in enumerate(order):
+        loc = locations[i]
+        extra = {k: v for k, v in loc.items() if k not in ('name', 'lat', 'lon')}
+        if breakdown_top is None or rank < breakdown_top:
+            city_houses = {'asc': asc[i], 'mc': mc[i], 'cusps': list(cusps[i])} if has_houses[i] else None
+            entry = _location_result(loc['name'], loc['lat'], loc['lon'], _relocated_chart(sr_result, city_houses))
+        else:
+            entry = {
+                'city': loc['name'],
+                'coordinates': {'lat': loc['lat'], 'lon': loc['lon']},
+                'total_score': round(float(scores['total'][i]), 2),
+                'breakdown': {c: {'total': float(scores[c][i])} for c in criteria},
+                'chart_summary': {
+                    'asc_sign': SIGNS[int(sign_indices(asc[i]))] if has_houses[i] else 'Aries',
+                    'mc_sign': SIGNS[int(sign_indices(mc[i]))] if has_houses[i] else 'Capricorn',
+                    'solar_return_datetime': sr_result['solar_return_datetime']
+                }
+            }
+        entry.update(extra)
+        rankings.append(entry)
+    return rankings
+
+
 def rank_solar_return_locations(
     birth_date: datetime,
     year: Optional[int] = None,
     city_names: Optional[List[str]] = None,
-    top_n: int = 3
+    top_n: int = 3,
+    breakdown_top: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Rank multiple cities for Solar Return relocation.
@@ -514,6 +738,8 @@ def rank_solar_return_locations(
         year: Year for SR (default: current year)
         city_names: List of city names to evaluate (default: all 16)
         top_n: Number of top recommendations to return
+        breakdown_top: Only the first N rankings get detailed breakdowns
+            (default: all)
     
     Returns:
         Dictionary with rankings, top recommendations, and metadata
@@ -522,25 +748,12 @@ def rank_solar_return_locations(
     if not city_names:
         city_names = list(RELOCATION_CITIES.keys())
     
-    # Score each city
-    rankings = []
-    for city_name in city_names:
-        city_data = RELOCATION_CITIES.get(city_name)
-        if not city_data:
-            continue
-        
-        result = score_solar_return_location(
-            birth_date,
-            city_name,
-            city_data['lat'],
-            city_data['lon'],
-            year
-        )
-        result['region'] = city_data['region']
-        rankings.append(result)
-    
-    # Sort by total_score (descending)
-    rankings.sort(key=lambda x: x['total_score'], reverse=True)
+    # Unknown cities are skipped
+    locations = [
+        {'name': name, **RELOCATION_CITIES[name]}
+        for name in city_names if name in RELOCATION_CITIES
+    ]
+    rankings = rank_locations(birth_date, locations, year, breakdown_top)
     
     # Get top N
     top_cities = rankings[:top_n]
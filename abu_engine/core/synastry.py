@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+Sinastría y carta compuesta.
+
+- Sinastría: grilla de aspectos entre dos cartas (aspect_matrix sobre los
+  puntos de ambas), superposición de casas (planetas de una carta en las
+  casas de la otra, house_numbers) y puntaje con los pesos de
+  data/weights.json (fórmula de compute_score con el peso medio de los dos
+  planetas, así el puntaje no depende del orden de las cartas).
+- Compuesta: punto medio (media circular) de cada planeta, Ascendente, MC y
+  cúspides de dos o más cartas.
+- Ranking muchos-a-uno: una carta contra N perfiles en un solo broadcast
+  (10 x N*10) del kernel de aspectos; los perfiles pueden traer sus
+  longitudes ya calculadas (p. ej. del Parquet de scripts/bulk_charts.py)
+  para no volver a evaluar la efeméride.
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from core.aspects import ASPECTS, aspect_matrix
+from core.batch import BatchChartItem, parse_item
+from core.chart import BODY_KEYS, chart_aspects, get_sign, planet_longitudes_many
+from core.profiling import span
+from core.scoring import planet_weight, weights
+
+SYNASTRY_ORB = 6.0
+MAX_SYNASTRY_CHARTS = 10
+MAX_RANK_CANDIDATES = int(os.getenv("ABU_SYNASTRY_MAX_CANDIDATES", "10000"))
+PLANET_NAMES = list(BODY_KEYS.keys())
+
+
+class SynastryRequest(BaseModel):
+    charts: List[BatchChartItem] = Field(..., description="Dos o más nacimientos (datetime, lat, lon, id)")
+    include_houses: bool = Field(True, description="Casas Placidus: superposiciones, Ascendente y MC")
+    orb: float = Field(SYNASTRY_ORB, description="Orbe para los aspectos entre cartas")
+
+
+class RankCandidate(BaseModel):
+    id: Optional[str] = None
+    datetime: Optional[str] = Field(None, description="Nacimiento ISO (si no se envían planets)")
+    lat: float = 0.0
+    lon: float = 0.0
+    planets: Optional[Dict[str, float]] = Field(None, description="Longitudes ya calculadas {Sun: 103.1, ...}")
+
+
+class SynastryRankRequest(BaseModel):
+    chart: BatchChartItem
+    candidates: List[RankCandidate]
+    orb: float = Field(SYNASTRY_ORB, description="Orbe para los aspectos entre cartas")
+    top: Optional[int] = Field(None, description="Devolver sólo los N mejores")
+
+
+def _aspect_weights(names: List[str]) -> np.ndarray:
+    return np.array([weights["aspects"].get(n, 0) for n in names], dtype=float)
+
+
+PLANET_WEIGHTS = np.array([planet_weight(n) for n in PLANET_NAMES], dtype=float)
+# Peso de cada celda a x b: media de los dos planetas (simétrica)
+PAIR_WEIGHTS = (PLANET_WEIGHTS[:, None] + PLANET_WEIGHTS[None, :]) / 2
+
+
+def natal_charts(records: List[BatchChartItem], include_houses: bool = True) -> List[Dict[str, Any]]:
+    """
+    Posiciones (una pasada vectorizada de Skyfield) y casas de cada nacimiento.
+
+    Donde las casas no están definidas (latitudes polares) asc, mc y cusps
+    quedan en None y la carta lleva "note": "Houses not available: ...".
+
+    Raises:
+        ValueError: "charts[i]: ..." si un registro no es válido
+    """
+    dates: List[datetime] = []
+    for i, record in enumerate(records):
+        try:
+            dates.append(parse_item(record))
+        except ValueError as e:
+            raise ValueError(f"charts[{i}]: {e}")
+    names, lons, speeds = planet_longitudes_many(dates)
+
+    charts = []
+    for i, (record, dt) in enumerate(zip(records, dates)):
+        chart: Dict[str, Any] = {
+            "id": record.id if record.id is not None else str(i),
+            "datetime": dt.isoformat(),
+            "location": {"lat": record.lat, "lon": record.lon},
+            "planets": {n: float(lons[i, k]) for k, n in enumerate(names)},
+            "speeds": {n: float(speeds[i, k]) for k, n in enumerate(names)},
+            "asc": None,
+            "mc": None,
+            "cusps": None,
+        }
+        if include_houses:
+            from core.houses_swiss import calculate_houses, HOUSE_SYSTEM_PLACIDUS
+            try:
+                houses = calculate_houses(dt, record.lat, record.lon, HOUSE_SYSTEM_PLACIDUS)
+                chart.update(asc=houses["asc"], mc=houses["mc"], cusps=houses["cusps"])
+            except Exception as e:
+                chart["note"] = f"Houses not available: {str(e)}"
+        charts.append(chart)
+    return charts
+
+
+def _points(chart: Dict[str, Any]) -> Dict[str, float]:
+    points = dict(chart["planets"])
+    if chart.get("asc") is not None:
+        points["Ascendant"] = chart["asc"]
+        points["Midheaven"] = chart["mc"]
+    return points
+
+
+def _house_overlay(planets: Dict[str, float], cusps: Optional[List[float]]) -> Optional[Dict[str, int]]:
+    if not cusps:
+        return None
+    from core.houses_swiss import house_numbers
+    return dict(zip(planets, (int(h) for h in house_numbers(list(planets.values()), cusps))))
+
+
+def _score_grid(aspect_idx: np.ndarray, orb: np.ndarray, names: List[str], pair_weights: np.ndarray) -> np.ndarray:
+    """compute_score vectorizado: peso del aspecto x peso del par de planetas x exp(-orbe/3)."""
+    w_asp = np.where(aspect_idx >= 0, _aspect_weights(names)[aspect_idx], 0.0)
+    return w_asp * pair_weights * np.exp(-np.nan_to_num(orb) / 3)
+
+
+def synastry_pair(a: Dict[str, Any], b: Dict[str, Any], orb: float = SYNASTRY_ORB) -> Dict[str, Any]:
+    """Grilla de aspectos a x b, superposición de casas y puntaje."""
+    points_a, points_b = _points(a), _points(b)
+    names_a, names_b = list(points_a), list(points_b)
+    m = aspect_matrix(
+        [points_a[n] for n in names_a], [points_b[n] for n in names_b], ASPECTS, orb,
+        [a["speeds"].get(n, 0.0) for n in names_a], [b["speeds"].get(n, 0.0) for n in names_b]
+    )
+    aspects = []
+    for i, j in zip(*np.nonzero(m["aspect"] >= 0)):
+        aspects.append({
+            "a": names_a[i],
+            "b": names_b[j],
+            "type": m["names"][m["aspect"][i, j]],
+            "orb": round(float(m["orb"][i, j]), 2),
+            "angle": round(float(m["separation"][i, j]), 2),
+            "applying": bool(m["applying"][i, j]),
+        })
+
+    # Puntaje sólo planeta x planeta (los ángulos no tienen peso en weights.json)
+    n_planets = len(PLANET_NAMES)
+    grid = _score_grid(m["aspect"][:n_planets, :n_planets], m["orb"][:n_planets, :n_planets], m["names"], PAIR_WEIGHTS)
+    return {
+        "a": a["id"],
+        "b": b["id"],
+        "aspects": aspects,
+        "overlays": {
+            "a_in_b": _house_overlay(a["planets"], b["cusps"]),
+            "b_in_a": _house_overlay(b["planets"], a["cusps"]),
+        },
+        "score": round(float(grid.sum()), 3),
+    }
+
+
+def synastry(records: List[BatchChartItem], include_houses: bool = True, orb: float = SYNASTRY_ORB) -> Dict[str, Any]:
+    """
+    Sinastría entre todos los pares de cartas (i < j).
+
+    Returns:
+        dict: {"charts": [{id, datetime, location, planets, asc, mc, [note]}], "pairs": [...]}
+    """
+    if len(records) < 2:
+        raise ValueError("At least two charts are required")
+    if len(records) > MAX_SYNASTRY_CHARTS:
+        raise ValueError(f"Too many charts ({len(records)} > {MAX_SYNASTRY_CHARTS})")
+    charts = natal_charts(records, include_houses)
+    with span("scoring"):
+        pairs = [
+            synastry_pair(charts[i], charts[j], orb)
+            for i in range(len(charts)) for j in range(i + 1, len(charts))
+        ]
+    summary = [
+        {k: c[k] for k in ("id", "datetime", "location", "planets", "asc", "mc", "note") if k in c}
+        for c in charts
+    ]
+    return {"charts": summary, "pairs": pairs}
+
+
+def circular_midpoint(lons: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Media circular (para dos longitudes: el punto medio del arco más corto)."""
+    rad = np.radians(lons)
+    x, y = np.cos(rad).sum(axis=axis), np.sin(rad).sum(axis=axis)
+    mean = np.degrees(np.arctan2(y, x)) % 360.0
+    # Longitudes exactamente opuestas: cualquier punto medio es válido, se toma el de la primera + 90°
+    first = np.take(np.asarray(lons, dtype=float), 0, axis=axis)
+    return np.where(np.hypot(x, y) < 1e-9, (first + 90.0) % 360.0, mean)
+
+
+def composite_chart(records: List[BatchChartItem], include_houses: bool = True) -> Dict[str, Any]:
+    """
+    Carta compuesta por puntos medios.
+
+    Returns:
+        dict: {"charts": [ids], "planets": [{name, lon, sign, house}],
+               "aspects": [...], "asc", "mc", "cusps"}
+    """
+    if len(records) < 2:
+        raise ValueError("At least two charts are required")
+    if len(records) > MAX_SYNASTRY_CHARTS:
+        raise ValueError(f"Too many charts ({len(records)} > {MAX_SYNASTRY_CHARTS})")
+    charts = natal_charts(records, include_houses)
+    lons = np.array([[c["planets"][n] for n in PLANET_NAMES] for c in charts])
+    mid = circular_midpoint(lons, axis=0)
+    positions = {n: float(mid[k]) for k, n in enumerate(PLANET_NAMES)}
+
+    result: Dict[str, Any] = {"charts": [c["id"] for c in charts], "asc": None, "mc": None, "cusps": None}
+    cusps = None
+    if include_houses and any(c["cusps"] is None for c in charts):
+        result["note"] = next(c["note"] for c in charts if c["cusps"] is None)
+    elif include_houses:
+        cusps = [float(c) for c in circular_midpoint(np.array([c["cusps"] for c in charts]), axis=0)]
+        result["asc"] = float(circular_midpoint(np.array([c["asc"] for c in charts])))
+        result["mc"] = float(circular_midpoint(np.array([c["mc"] for c in charts])))
+        result["cusps"] = cusps
+    houses = _house_overlay(positions, cusps) or {}
+    result["planets"] = [
+        {"name": n, "lon": lon, "sign": get_sign(lon), "house": houses.get(n)}
+        for n, lon in positions.items()
+    ]
+    result["aspects"] = [a.dict() for a in chart_aspects(positions)]
+    return result
+
+
+def _candidate_longitudes(candidates: List[RankCandidate]) -> np.ndarray:
+    """Matriz (N, 10): usa planets si vienen, si no calcula las fechas en una pasada."""
+    lons = np.empty((len(candidates), len(PLANET_NAMES)))
+    to_compute: List[int] = []
+    dates: List[datetime] = []
+    for i, cand in enumerate(candidates):
+        if cand.planets is not None:
+            missing = [n for n in PLANET_NAMES if n not in cand.planets]
+            if missing:
+                raise ValueError(f"candidates[{i}]: missing planets {', '.join(missing)}")
+            lons[i] = [cand.planets[n] for n in PLANET_NAMES]
+        elif cand.datetime is not None:
+            try:
+                dates.append(parse_item(BatchChartItem(datetime=cand.datetime, lat=cand.lat, lon=cand.lon)))
+            except ValueError as e:
+                raise ValueError(f"candidates[{i}]: {e}")
+            to_compute.append(i)
+        else:
+            raise ValueError(f"candidates[{i}]: datetime or planets is required")
+    if to_compute:
+        _, computed, _ = planet_longitudes_many(dates)
+        lons[to_compute] = computed
+    return lons
+
+
+def score_candidates(base: np.ndarray, candidates: np.ndarray, orb: float = SYNASTRY_ORB) -> np.ndarray:
+    """
+    Puntaje de sinastría de una carta contra N cartas en un solo broadcast.
+
+    Args:
+        base: Longitudes (10,) en el orden de BODY_KEYS
+        candidates: Longitudes (N, 10)
+
+    Returns:
+        Puntajes (N,), iguales al "score" de synastry_pair para cada par.
+    """
+    n, p = candidates.shape
+    m = aspect_matrix(base, candidates.ravel(), ASPECTS, orb)
+    idx = m["aspect"].reshape(len(base), n, p)
+    orbs = m["orb"].reshape(len(base), n, p)
+    return _score_grid(idx, orbs, m["names"], PAIR_WEIGHTS[:, None, :]).sum(axis=(0, 2))
+
+
+def rank_synastry(
+    chart: BatchChartItem,
+    candidates: List[RankCandidate],
+    orb: float = SYNASTRY_ORB,
+    top: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Ordena candidatos por puntaje de sinastría con `chart` (mayor primero).
+
+    Returns:
+        dict: {"chart": id, "count": N, "results": [{"rank", "index", "id", "score"}]}
+    """
+    if not candidates:
+        raise ValueError("candidates must not be empty")
+    if len(candidates) > MAX_RANK_CANDIDATES:
+        raise ValueError(f"Too many candidates ({len(candidates)} > {MAX_RANK_CANDIDATES})")
+    base = natal_charts([chart], include_houses=False)[0]
+    cand_lons = _candidate_longitudes(candidates)
+    with span("scoring"):
+        scores = score_candidates(np.array([base["planets"][n] for n in PLANET_NAMES]), cand_lons, orb)
+        order = np.argsort(-scores, kind="stable")
+        if top is not None:
+            order = order[:max(0, top)]
+    return {
+        "chart": base["id"],
+        "count": len(candidates),
+        "results": [
+            {
+                "rank": r + 1,
+                "index": int(i),
+                "id": candidates[i].id if candidates[i].id is not None else str(int(i)),
+                "score": round(float(scores[i]), 3),
+            }
+            for r, i in enumerate(order)
+        ],
+    }
+
+
+__all__ = [
+    "RankCandidate",
+    "SynastryRankRequest",
+    "SynastryRequest",
+    "circular_midpoint",
+    "composite_chart",
+    "rank_synastry",
+    "score_candidates",
+    "synastry",
+    "synastry_pair",
+]
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Hora local de nacimiento -> UTC con zonas IANA (zoneinfo, con el historial
+de horarios de verano de la base tz).
+
+La API trabaja en UTC; estas funciones convierten una hora local sin zona
+usando la zona IANA indicada o la de una ciudad de data/cities.json (campo
+"timezone"). El desfase de cada (zona, día local) se resuelve una vez y se
+guarda en caché: en los días sin cambio de hora todas las horas del día
+comparten el mismo desfase y la conversión es una resta, sin volver a
+consultar la base tz. Sólo los días con transición usan zoneinfo por hora.
+
+Horas ambiguas (se repiten al atrasar el reloj) y horas inexistentes (se
+saltean al adelantarlo) siguen la regla de PEP 495: fold=0 toma el desfase
+anterior a la transición y fold=1 el posterior.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+ZONE_CACHE_SIZE = 1024
+OFFSET_CACHE_SIZE = 65536
+_DAY_END = time(23, 59, 59, 999999)
+
+
+@lru_cache(maxsize=ZONE_CACHE_SIZE)
+def get_zone(name: str) -> ZoneInfo:
+    """ZoneInfo de una zona IANA; ValueError si no existe."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        raise ValueError(f"Unknown timezone: {name}")
+
+
+@lru_cache(maxsize=OFFSET_CACHE_SIZE)
+def day_offset(zone: str, day: date) -> Optional[timedelta]:
+    """
+    Desfase UTC de `zone` válido para todas las horas locales de `day`, o
+    None si ese día hay un cambio de hora (hay que resolver hora por hora).
+    """
+    tz = get_zone(zone)
+    start, end = datetime.combine(day, time(0), tz), datetime.combine(day, _DAY_END, tz)
+    offsets = {
+        start.utcoffset(), start.replace(fold=1).utcoffset(),
+        end.utcoffset(), end.replace(fold=1).utcoffset(),
+    }
+    return offsets.pop() if len(offsets) == 1 else None
+
+
+def local_to_utc(local: datetime, zone: str, fold: int = 0) -> datetime:
+    """
+    Hora local en `zone` -> datetime UTC (con tzinfo).
+
+    Si `local` ya trae zona u offset, se respeta y sólo se convierte a UTC.
+    """
+    if local.tzinfo is not None:
+        return local.astimezone(timezone.utc)
+    offset = day_offset(zone, local.date())
+    if offset is not None:
+        return (local - offset).replace(tzinfo=timezone.utc)
+    return local.replace(tzinfo=get_zone(zone), fold=fold).astimezone(timezone.utc)
+
+
+def local_to_utc_many(locals_: Iterable[datetime], zones: Iterable[str], fold: int = 0) -> List[datetime]:
+    """local_to_utc para pares (hora local, zona); reutiliza la caché por (zona, día)."""
+    return [local_to_utc(local, zone, fold) for local, zone in zip(locals_, zones)]
+
+
+def resolve_local_time(local: datetime, zone: str, fold: int = 0) -> Dict:
+    """
+    Conversión detallada de una hora local sin zona.
+
+    Returns:
+        dict: {local, timezone, utc, offset_hours, dst, abbreviation,
+        ambiguous, nonexistent}
+    """
+    tz = get_zone(zone)
+    local = local.replace(tzinfo=None)
+    aware = local.replace(tzinfo=tz, fold=fold)
+    other = aware.replace(fold=1 - fold)
+    utc = aware.astimezone(timezone.utc)
+    # Inexistente: la hora no sobrevive la ida y vuelta por UTC (cae en el salto del reloj)
+    nonexistent = utc.astimezone(tz).replace(tzinfo=None) != local
+    ambiguous = not nonexistent and aware.utcoffset() != other.utcoffset()
+    shown = utc.astimezone(tz) if nonexistent else aware
+    return {
+        "local": local.isoformat(),
+        "timezone": zone,
+        "utc": utc.isoformat(),
+        "offset_hours": aware.utcoffset().total_seconds() / 3600.0,
+        "dst": bool(shown.dst()),
+        "abbreviation": shown.tzname(),
+        "ambiguous": ambiguous,
+        "nonexistent": nonexistent,
+    }
+
+
+def city_timezone(city: str, country: Optional[str] = None) -> Optional[str]:
+    """Zona IANA de una ciudad de data/cities.json (nombre sin acentos ni mayúsculas)."""
+    from core.cities import fold, get_city_index
+
+    name, country_name = fold(city), fold(country) if country else None
+    for record in get_city_index().search(city, limit=10):
+        if fold(record.get("city", "")) == name and (country_name is None or fold(record.get("country", "")) == country_name):
+            return record.get("timezone")
+    return None
+
+
+__all__ = [
+    "city_timezone",
+    "day_offset",
+    "get_zone",
+    "local_to_utc",
+    "local_to_utc_many",
+    "resolve_local_time",
+]
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Calendario de tránsitos con horas exactas.
+
+En lugar de muestrear fechas sueltas (get_transit_timeline), para cada
+planeta en tránsito se evalúa una grilla diaria vectorizada de Skyfield y se
+buscan los cruces de la distancia al punto de aspecto (natal ± ángulo):
+
+- 0        -> aspecto exacto
+- ±orbe    -> entrada / salida del orbe
+
+Las estaciones (velocidad = 0) se refinan primero y se insertan en la grilla,
+de modo que entre dos nodos consecutivos el movimiento es monótono y cada
+cruce queda encerrado en un solo intervalo. Así se detectan también los
+re-toques por retrogradación. Cada cruce se refina por bisección vectorizada
+(todos los cruces de un planeta en el mismo arreglo de tiempos) hasta menos
+de un minuto.
+"""
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from skyfield.api import load
+
+from core.aspects import ALL_ASPECTS, ASPECTS
+from core.chart import BODY_KEYS, EphemerisSingleton, ecliptic_lon_speed
+from core.profiling import span
+from core.transits import DEFAULT_ORBS
+
+GRID_STEP_DAYS = 1.0
+PRECISION_DAYS = 1.0 / 1440 / 4  # 15 s: el punto medio redondeado cae en el minuto correcto
+OUTER_PLANETS = ["Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+
+
+@lru_cache(maxsize=1)
+def _timescale():
+    """load.timescale() reconstruye las tablas de delta T en cada llamada."""
+    return load.timescale()
+
+
+def _wrap180(x: np.ndarray) -> np.ndarray:
+    return (x + 180.0) % 360.0 - 180.0
+
+
+def _positions(planet: str, jd_tt: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(longitud, velocidad °/día) geocéntricas de `planet` en los tiempos TT dados."""
+    eph = EphemerisSingleton()
+    t = _timescale().tt_jd(jd_tt)
+    lon, speed = ecliptic_lon_speed(eph['earth'].at(t).observe(eph[BODY_KEYS[planet]]))
+    return np.atleast_1d(lon % 360.0), np.atleast_1d(speed)
+
+
+def _bisect(fn, lo: np.ndarray, hi: np.ndarray, f_lo: np.ndarray) -> np.ndarray:
+    """Bisección vectorizada: raíz de fn en cada [lo, hi] (fn(lo) tiene signo f_lo)."""
+    lo, hi = lo.copy(), hi.copy()
+    sign_lo = np.sign(f_lo)
+    while lo.size and np.max(hi - lo) > PRECISION_DAYS:
+        mid = (lo + hi) / 2
+        same = np.sign(fn(mid)) == sign_lo
+        lo = np.where(same, mid, lo)
+        hi = np.where(same, hi, mid)
+    return (lo + hi) / 2
+
+
+def _aspect_targets(
+    natal_points: Dict[str, float],
+    aspects: Dict[str, float],
+    orbs: Dict[str, float]
+) -> List[Tuple[str, str, float, float]]:
+    """[(punto natal, aspecto, longitud objetivo, orbe)], un objetivo por lado del aspecto."""
+    targets = []
+    for natal_name, natal_lon in natal_points.items():
+        for aspect, angle in aspects.items():
+            sides = {(natal_lon + angle) % 360.0, (natal_lon - angle) % 360.0}
+            for target in sorted(sides):
+                targets.append((natal_name, aspect, target, orbs.get(aspect, 3)))
+    return targets
+
+
+def _to_iso(jd_tt: np.ndarray) -> List[str]:
+    """Fechas UTC ISO redondeadas al minuto."""
+    if not jd_tt.size:
+        return []
+    dts = _timescale().tt_jd(jd_tt).utc_datetime()
+    return [(dt + timedelta(seconds=30)).replace(second=0, microsecond=0).isoformat() for dt in dts]
+
+
+def _planet_calendar(
+    planet: str,
+    start_tt: float,
+    end_tt: float,
+    targets: List[Tuple[str, str, float, float]],
+    natal_points: Dict[str, float]
+) -> List[Dict]:
+    n_steps = max(1, int(np.ceil((end_tt - start_tt) / GRID_STEP_DAYS)))
+    grid = np.linspace(start_tt, end_tt, n_steps + 1)
+    lon, speed = _positions(planet, grid)
+
+    # Estaciones: cambio de signo de la velocidad entre nodos de la grilla
+    idx = np.nonzero(np.sign(speed[:-1]) * np.sign(speed[1:]) < 0)[0]
+    stations = _bisect(lambda t: _positions(planet, t)[1], grid[idx], grid[idx + 1], speed[idx])
+    if stations.size:
+        s_lon, s_speed = _positions(planet, stations)
+        order = np.argsort(np.concatenate([grid, stations]), kind="stable")
+        grid = np.concatenate([grid, stations])[order]
+        lon = np.concatenate([lon, s_lon])[order]
+        speed = np.concatenate([speed, s_speed])[order]
+
+    target_lon = np.array([t[2] for t in targets])
+    orb = np.array([t[3] for t in targets])
+    d = _wrap180(lon[None, :] - target_lon[:, None])  # (objetivos, nodos)
+
+    # Cruces de los niveles 0, +orbe y -orbe entre nodos consecutivos
+    levels = np.stack([np.zeros_like(orb), orb, -orb], axis=1)  # (objetivos, 3)
+    diff = d[:, None, :] - levels[:, :, None]  # (objetivos, 3, nodos)
+    near = np.abs(diff) < 90.0  # descarta el salto de ±180
+    crosses = (np.sign(diff[..., :-1]) * np.sign(diff[..., 1:]) <= 0) & near[..., :-1] & near[..., 1:]
+    crosses &= diff[..., 1:] != 0  # un cero exacto en un nodo se cuenta una vez
+    ti, li, ni = np.nonzero(crosses)
+
+    target_of, level_of = target_lon[ti], levels[ti, li]
+    root = _bisect(
+        lambda t: _wrap180(_positions(planet, t)[0] - target_of) - level_of,
+        grid[ni], grid[ni + 1], diff[ti, li, ni]
+    )
+    root_speed = _positions(planet, root)[1] if root.size else root
+    root_iso = _to_iso(root)
+
+    passes: List[Dict] = []
+    for k in range(len(targets)):
+        natal_name, aspect, target, max_orb = targets[k]
+        sel = np.nonzero(ti == k)[0]
+        in_orb = abs(d[k, 0]) <= max_orb
+        if not sel.size and not in_orb:
+            continue
+        current: Optional[Dict] = None
+        node_start = 0
+
+        def _open(enter: Optional[str]) -> Dict:
+            return {
+                "transit_planet": planet,
+                "natal_planet": natal_name,
+                "aspect": aspect,
+                "natal_longitude": round(natal_points[natal_name], 4),
+                "target_longitude": round(target, 4),
+                "enter": enter,
+                "exact": [],
+                "leave": None,
+            }
+
+        def _close(pass_: Dict, end_node: int) -> None:
+            if pass_["exact"]:
+                pass_["min_orb"] = 0.0
+            else:
+                pass_["min_orb"] = round(float(np.min(np.abs(d[k, node_start:end_node + 1]))), 2)
+            passes.append(pass_)
+
+        if in_orb:
+            current = _open(None)
+        for j in sel[np.argsort(root[sel], kind="stable")]:
+            if li[j] == 0:
+                if current is None:  # toque exacto sin cruzar el orbe (no debería ocurrir)
+                    current = _open(root_iso[j])
+                current["exact"].append({"time": root_iso[j], "retrograde": bool(root_speed[j] < 0)})
+            elif current is None:
+                current = _open(root_iso[j])
+                node_start = int(ni[j])
+            else:
+                current["leave"] = root_iso[j]
+                _close(current, int(ni[j]) + 1)
+                current = None
+        if current is not None:
+            _close(current, len(grid) - 1)
+    return passes
+
+
+def transit_calendar(
+    natal_points: Dict[str, float],
+    start: datetime,
+    end: datetime,
+    transit_planets: Optional[List[str]] = None,
+    include_minor: bool = False,
+    orbs: Optional[Dict[str, float]] = None
+) -> Dict:
+    """
+    Calendario de tránsitos sobre puntos natales en [start, end].
+
+    Args:
+        natal_points: {nombre: longitud} de la carta natal
+        start, end: Rango (UTC; sin zona se asume UTC)
+        transit_planets: Planetas en tránsito (default: los 10 de BODY_KEYS)
+        include_minor: Incluir aspectos menores (30, 45, 135, 150)
+        orbs: Orbes por aspecto (default: DEFAULT_ORBS de core.transits)
+
+    Returns:
+        dict: {
+            "start", "end",
+            "events": [
+                {
+                    "transit_planet", "natal_planet", "aspect",
+                    "natal_longitude", "target_longitude",
+                    "enter": iso | None (ya en orbe al inicio),
+                    "exact": [{"time": iso, "retrograde": bool}, ...],
+                    "leave": iso | None (sigue en orbe al final),
+                    "min_orb": float
+                },
+                ...
+            ]   # ordenados por entrada
+        }
+    """
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    if end <= start:
+        raise ValueError("end must be after start")
+
+    planets = transit_planets or list(BODY_KEYS.keys())
+    unknown = [p for p in planets if p not in BODY_KEYS]
+    if unknown:
+        raise ValueError(f"Unknown transit planet(s): {', '.join(unknown)}")
+    aspects = ALL_ASPECTS if include_minor else ASPECTS
+    targets = _aspect_targets(natal_points, aspects, orbs or DEFAULT_ORBS)
+
+    ts = _timescale()
+    start_tt, end_tt = ts.from_datetime(start).tt, ts.from_datetime(end).tt
+    events: List[Dict] = []
+    with span("skyfield"):
+        for planet in planets:
+            events.extend(_planet_calendar(planet, start_tt, end_tt, targets, natal_points))
+
+    events.sort(key=lambda e: (e["enter"] or "", e["exact"][0]["time"] if e["exact"] else "", e["transit_planet"]))
+    return {"start": start.isoformat(), "end": end.isoformat(), "events": events}
+
+
+__all__ = ["OUTER_PLANETS", "transit_calendar"]
@@ -5,7 +5,10 @@ Compara posiciones actuales/futuras con la carta natal para detectar aspectos.
 
 from datetime import datetime
 from typing import List, Dict, Optional
-from .aspects import calculate_aspect_type, is_applying
+
+import numpy as np
+
+from .aspects import ALL_ASPECTS, ASPECTS, aspect_matrix
 
 
 # Orbes por tipo de aspecto (configurables)
@@ -47,61 +50,52 @@ def calculate_transits(
                 "applying": bool,
                 "exactness": str ("approaching", "exact", "separating"),
                 "natal_longitude": float,
-                "transit_longitude": float
+                "transit_longitude": float,
+                "transit_speed": float (°/día, 0 si no se conoce),
+                "transit_retrograde": bool
             },
             ...
         ]
     """
     if orbs is None:
         orbs = DEFAULT_ORBS
+    if not natal_planets or not transit_planets:
+        return []
     
-    transits = []
+    # Matriz natal x tránsito en un solo paso (aspecto más cercano dentro de su orbe)
+    natal_longs = [natal.get("longitude", 0) for natal in natal_planets]
+    transit_longs = [transit.get("longitude", 0) for transit in transit_planets]
+    transit_speeds = [transit.get("speed") or 0 for transit in transit_planets]
+    aspects = ALL_ASPECTS if include_minor else ASPECTS
+    m = aspect_matrix(natal_longs, transit_longs, aspects, orbs, speeds_b=transit_speeds)
     
-    for natal in natal_planets:
-        natal_name = natal.get("name")
-        natal_long = natal.get("longitude", 0)
+    transits = []
+    for i, j in zip(*np.nonzero(m["aspect"] >= 0)):
+        natal, transit = natal_planets[i], transit_planets[j]
+        orb = round(float(m["orb"][i, j]), 2)
+        applying = bool(m["applying"][i, j])
+        transit_speed = transit.get("speed", 0)
         
-        for transit in transit_planets:
-            transit_name = transit.get("name")
-            transit_long = transit.get("longitude", 0)
-            transit_speed = transit.get("speed", 0)
-            
-            # Calcular aspecto
-            aspect_info = calculate_aspect_type(
-                natal_long, 
-                transit_long,
-                include_minor=include_minor
-            )
-            
-            if aspect_info["aspect"]:
-                aspect_type = aspect_info["aspect"]
-                orb = aspect_info["orb"]
-                
-                # Verificar si está dentro del orbe permitido
-                max_orb = orbs.get(aspect_type, 3)
-                
-                if orb <= max_orb:
-                    # Determinar si es aplicativo o separativo
-                    applying = is_applying(natal_long, transit_long, transit_speed)
-                    
-                    # Determinar exactitud
-                    if orb < 1:
-                        exactness = "exact"
-                    elif applying:
-                        exactness = "approaching"
-                    else:
-                        exactness = "separating"
-                    
-                    transits.append({
-                        "natal_planet": natal_name,
-                        "transit_planet": transit_name,
-                        "aspect": aspect_type,
-                        "orb": round(orb, 2),
-                        "applying": applying,
-                        "exactness": exactness,
-                        "natal_longitude": natal_long,
-                        "transit_longitude": transit_long
-                    })
+        # Determinar exactitud
+        if orb < 1:
+            exactness = "exact"
+        elif applying:
+            exactness = "approaching"
+        else:
+            exactness = "separating"
+        
+        transits.append({
+            "natal_planet": natal.get("name"),
+            "transit_planet": transit.get("name"),
+            "aspect": m["names"][m["aspect"][i, j]],
+            "orb": orb,
+            "applying": applying,
+            "exactness": exactness,
+            "natal_longitude": natal_longs[i],
+            "transit_longitude": transit_longs[j],
+            "transit_speed": transit_speed,
+            "transit_retrograde": transit.get("retrograde", bool(transit_speed and transit_speed < 0))
+        })
     
     return transits
 
@@ -165,6 +159,9 @@ def get_transit_timeline(
     """
     Calcula tránsitos para múltiples fechas y genera una línea de tiempo.
     
+    Sólo produce fotos en las fechas dadas; para horas de entrada, exactitud y
+    salida de orbe usar core.transit_calendar.transit_calendar.
+    
     Args:
         natal_planets: Planetas natales
         transit_dates: Lista de fechas a calcular
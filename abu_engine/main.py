@@ -1,39 +1,39 @@
 ﻿# -*- coding: utf-8 -*-
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 import requests
-import json
-from pathlib import Path
 from core.forecast import forecast_for_locations, forecast_timeseries, detect_peaks
 from core.life_cycles import forecast_life_cycles
 from core.chart import chart_json, ChartDTO, solar_return_chart, EphemerisSingleton
-from core.extended_calc import (
-    calculate_detailed_positions, 
-    calculate_part_of_fortune,
-    get_lunar_nodes,
-    format_position,
-    get_sign_name,
-    normalize_lon
-)
+from core.batch import BatchChartRequest
+from core.synastry import SynastryRankRequest, SynastryRequest
+from core.electional import ElectionalRequest
 from core.solar_return_ranking import rank_solar_return_locations, RELOCATION_CITIES
+from core.profiling import ProfiledRoute, profiling_middleware, span
+from core.metrics import metrics_middleware, render_metrics
 import logging
 
 
 def send_to_lilly(data: dict) -> dict:
     """Envía datos a Lilly Engine para interpretación."""
     try:
-        response = requests.post(
-            "http://lilly_engine:8001/api/ai/interpret",
-            json=data,
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        )
-        return response.json()
+        with span("lilly_call"):
+            response = requests.post(
+                "http://lilly_engine:8001/api/ai/interpret",
+                json=data,
+                headers={"Content-Type": "application/json"},
+                timeout=10
+            )
+            return response.json()
     except (requests.RequestException, ValueError):
         return {"error": "Lilly not available"}
 
 app = FastAPI(title="Abu Engine")
+# Spans por etapa (Server-Timing, ?profile=1) y métricas Prometheus en /metrics
+app.router.route_class = ProfiledRoute
+app.middleware("http")(profiling_middleware)
+app.middleware("http")(metrics_middleware)
 
 # Configurar CORS
 app.add_middleware(
@@ -57,6 +57,9 @@ async def warm_up():
         logging.info("[Abu] Warm-up starting…")
         # Ensure SPICE kernel (de440s.bsp) is loaded
         EphemerisSingleton()
+        # Índice de ciudades (se reconstruye sólo si cambia cities.json)
+        from core.cities import get_city_index
+        get_city_index()
 
         # Run a tiny chart calculation to prime Skyfield internals
         from datetime import timezone
@@ -92,33 +95,103 @@ async def warm_up():
         }
     }
 )
-def search_cities(q: str = Query("", description="Búsqueda de ciudad o país")):
+def search_cities(
+    q: str = Query("", description="Búsqueda de ciudad o país"),
+    limit: int = Query(20, ge=1, le=100, description="Máximo de resultados")
+):
     """
     Busca ciudades por nombre o país.
-    Retorna hasta 20 resultados que coincidan con la query.
+    Sin acentos ni mayúsculas ("cordoba" encuentra Córdoba), por prefijo y,
+    si faltan resultados, aproximada ("barcelna" encuentra Barcelona).
+    Retorna hasta `limit` resultados, mejor coincidencia primero.
+    """
+    from core.cities import get_city_index
+
+    return get_city_index().search(q, limit)
+
+
+@app.get(
+    "/api/cities/nearest",
+    response_model=None,
+    responses={
+        200: {
+            "description": "Ciudades más cercanas a las coordenadas",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {"city": "Madrid", "country": "España", "lat": 40.4168, "lon": -3.7038, "distance_km": 1.9}
+                    ]
+                }
+            }
+        }
+    }
+)
+def nearest_cities(
+    lat: float = Query(..., ge=-90, le=90, description="Latitud"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitud"),
+    limit: int = Query(1, ge=1, le=100, description="Cantidad de ciudades")
+):
+    """Ciudades de data/cities.json más cercanas a (lat, lon), con distancia en km."""
+    from core.cities import get_city_index
+
+    return get_city_index().nearest(lat, lon, limit)
+
+
+@app.get(
+    "/api/time/to-utc",
+    response_model=None,
+    responses={
+        400: {"description": "Missing timezone/city, unknown timezone or city without timezone"},
+        422: {"description": "Invalid date format"},
+        200: {
+            "description": "Hora local convertida a UTC",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "local": "1990-07-05T09:00:00",
+                        "timezone": "America/Argentina/Buenos_Aires",
+                        "utc": "1990-07-05T12:00:00+00:00",
+                        "offset_hours": -3.0,
+                        "dst": False,
+                        "abbreviation": "-03",
+                        "ambiguous": False,
+                        "nonexistent": False
+                    }
+                }
+            }
+        }
+    }
+)
+def local_time_to_utc(
+    datetime_: str = Query(..., alias="datetime", description="Hora local ISO sin offset (ej: 1990-07-05T09:00:00)"),
+    timezone: str = Query(None, description="Zona IANA (ej: America/Argentina/Buenos_Aires)"),
+    city: str = Query(None, description="Ciudad de /api/cities/search (alternativa a timezone)"),
+    country: str = Query(None, description="País de la ciudad (opcional, para desambiguar)"),
+    fold: int = Query(0, ge=0, le=1, description="Hora repetida al atrasar el reloj: 0 = primera, 1 = segunda")
+):
+    """
+    Convierte la hora local de nacimiento a UTC con el historial de horario de
+    verano de la base tz (zoneinfo). Indica si la hora es ambigua o
+    inexistente por un cambio de hora.
     """
-    base_dir = Path(__file__).resolve().parent
-    cities_file = base_dir / "data" / "cities.json"
-    
     try:
-        with open(cities_file, 'r', encoding='utf-8') as f:
-            cities = json.load(f)
-    except Exception as e:
-        logging.error(f"[Abu] Error loading cities.json: {e}")
-        return []
-    
-    if not q or len(q) < 2:
-        # Return first 20 cities if no query
-        return cities[:20]
-    
-    # Case-insensitive search in city or country name
-    q_lower = q.lower()
-    matches = [
-        c for c in cities 
-        if q_lower in c["city"].lower() or q_lower in c["country"].lower()
-    ]
-    
-    return matches[:20]
+        local = datetime.fromisoformat(datetime_)
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid date format")
+
+    from core.timezones import city_timezone, resolve_local_time
+
+    zone = timezone
+    if not zone and city:
+        zone = city_timezone(city, country)
+        if not zone:
+            raise HTTPException(status_code=400, detail=f"No timezone found for city: {city}")
+    if not zone:
+        raise HTTPException(status_code=400, detail="Missing timezone or city")
+    try:
+        return resolve_local_time(local, zone, fold)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get(
@@ -235,8 +308,8 @@ def life_cycles(
                         "datetime": "2026-07-05T12:00:00+00:00",
                         "location": {"lat": -34.6, "lon": -58.4},
                         "planets": [
-                            {"name": "Sun", "lon": 103.12, "sign": "Cancer", "house": None},
-                            {"name": "Mars", "lon": 92.0, "sign": "Cancer", "house": None}
+                            {"name": "Sun", "lon": 103.12, "sign": "Cancer", "house": None, "speed": 0.9533, "retrograde": False},
+                            {"name": "Mars", "lon": 92.0, "sign": "Cancer", "house": None, "speed": -0.1021, "retrograde": True}
                         ],
                         "aspects": [
                             {"a": "Sun", "b": "Mars", "type": "square", "orb": 1.2, "angle": 90}
@@ -265,6 +338,186 @@ def get_chart(
     return result
 
 
+@app.post(
+    "/api/astro/charts:batch",
+    response_model=None,
+    responses={
+        400: {"description": "Empty batch or more than ABU_BATCH_MAX_ITEMS items"},
+        500: {"description": "Batch calculation error"},
+        200: {
+            "description": "Cartas del lote en el orden de entrada; los ítems inválidos llevan 'error'",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "count": 2,
+                        "errors": 1,
+                        "results": [
+                            {
+                                "index": 0,
+                                "id": "ana",
+                                "datetime": "1990-07-05T12:00:00+00:00",
+                                "location": {"lat": -34.6, "lon": -58.4},
+                                "planets": [{"name": "Sun", "lon": 103.12, "sign": "Cancer", "house": 10}],
+                                "aspects": [{"a": "Sun", "b": "Mars", "type": "square", "orb": 1.2, "angle": 90}],
+                                "asc": 182.3,
+                                "mc": 94.1,
+                                "cusps": [182.3, 210.5, 241.0, 274.1, 305.8, 334.6, 2.3, 30.5, 61.0, 94.1, 125.8, 154.6]
+                            },
+                            {"index": 1, "id": "bad", "error": "Invalid date format"}
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def post_charts_batch(body: BatchChartRequest):
+    """
+    Calcula varias cartas en un solo request.
+
+    Las posiciones de todo el lote se evalúan con arreglos de tiempo de
+    Skyfield (una observación por cuerpo) y las casas con una llamada
+    swisseph por ítem. Un ítem inválido no hace fallar el lote.
+    """
+    from core.batch import BATCH_MAX_ITEMS, charts_batch
+
+    if not body.items:
+        raise HTTPException(status_code=400, detail="Empty batch")
+    if len(body.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items ({len(body.items)} > {BATCH_MAX_ITEMS})")
+    try:
+        results = charts_batch(body.items, body.include_houses)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch error: {str(e)}")
+    return {
+        "count": len(results),
+        "errors": sum(1 for r in results if "error" in r),
+        "results": results
+    }
+
+
+@app.post(
+    "/api/astro/synastry",
+    response_model=None,
+    responses={
+        400: {"description": "Fewer than two charts, too many charts or an invalid record"},
+        500: {"description": "Synastry calculation error"},
+        200: {
+            "description": "Aspectos entre cartas, superposición de casas y puntaje por par",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "charts": [
+                            {"id": "ana", "datetime": "1990-07-05T12:00:00+00:00", "location": {"lat": -34.6, "lon": -58.4},
+                             "planets": {"Sun": 103.12}, "asc": 182.3, "mc": 94.1}
+                        ],
+                        "pairs": [
+                            {
+                                "a": "ana",
+                                "b": "luis",
+                                "aspects": [{"a": "Sun", "b": "Moon", "type": "trine", "orb": 1.4, "angle": 118.6, "applying": True}],
+                                "overlays": {"a_in_b": {"Sun": 7}, "b_in_a": {"Moon": 3}},
+                                "score": 12.84
+                            }
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def post_synastry(body: SynastryRequest):
+    """
+    Sinastría entre dos o más nacimientos.
+
+    Para cada par (i < j): grilla de aspectos (kernel aspect_matrix), planetas
+    de cada carta en las casas de la otra y puntaje con data/weights.json.
+    """
+    from core.synastry import synastry
+
+    try:
+        return synastry(body.charts, body.include_houses, body.orb)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Synastry error: {str(e)}")
+
+
+@app.post(
+    "/api/astro/synastry:rank",
+    response_model=None,
+    responses={
+        400: {"description": "Empty candidate list, too many candidates or an invalid record"},
+        500: {"description": "Ranking error"},
+        200: {
+            "description": "Candidatos ordenados por puntaje de sinastría con la carta base",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "chart": "ana",
+                        "count": 3,
+                        "results": [
+                            {"rank": 1, "index": 2, "id": "luis", "score": 18.2},
+                            {"rank": 2, "index": 0, "id": "eva", "score": 11.7}
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def post_synastry_rank(body: SynastryRankRequest):
+    """
+    Puntaje de una carta contra muchas (muchos-a-uno).
+
+    Los candidatos pueden enviar sus longitudes ya calculadas en `planets`;
+    el puntaje de todos se obtiene en un solo broadcast del kernel de aspectos.
+    """
+    from core.synastry import rank_synastry
+
+    try:
+        return rank_synastry(body.chart, body.candidates, body.orb, body.top)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ranking error: {str(e)}")
+
+
+@app.post(
+    "/api/astro/composite",
+    response_model=None,
+    responses={
+        400: {"description": "Fewer than two charts, too many charts or an invalid record"},
+        500: {"description": "Composite calculation error"},
+        200: {
+            "description": "Carta compuesta por puntos medios",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "charts": ["ana", "luis"],
+                        "planets": [{"name": "Sun", "lon": 148.3, "sign": "Leo", "house": 11}],
+                        "aspects": [{"a": "Sun", "b": "Mars", "type": "sextile", "orb": 2.1, "angle": 62.1, "applying": None}],
+                        "asc": 201.4,
+                        "mc": 112.7,
+                        "cusps": [201.4, 229.8, 260.2, 292.7, 324.1, 353.0, 21.4, 49.8, 80.2, 112.7, 144.1, 173.0]
+                    }
+                }
+            }
+        }
+    }
+)
+def post_composite(body: SynastryRequest):
+    """Carta compuesta: media circular de planetas, Ascendente, MC y cúspides."""
+    from core.synastry import composite_chart
+
+    try:
+        return composite_chart(body.charts, body.include_houses)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Composite error: {str(e)}")
+
+
 @app.get(
     "/api/astro/chart-detailed",
     response_model=None,
@@ -285,6 +538,8 @@ def get_chart(
                                 "sign": "Cancer",
                                 "degree_in_sign": 13.12,
                                 "formatted": "13°07' Cancer",
+                                "speed": 0.9533,
+                                "retrograde": False,
                                 "house": 10,
                                 "dignity": {
                                     "domicile": False,
@@ -342,85 +597,77 @@ def get_chart_detailed(
     except Exception:
         raise HTTPException(status_code=422, detail="Invalid date format")
     
-    # Get base chart (Skyfield positions and aspects)
-    base_chart = chart_json(lat, lon, date_utc)
-
-    # Build planets dict for extended calculations
-    planets_dict = {p.name: p.lon for p in base_chart.planets}
-
-    # Calculate lunar nodes (approximation in extended_calc)
-    north_node_lon, south_node_lon = get_lunar_nodes(date_utc)
-    planets_dict["North Node"] = north_node_lon
-    planets_dict["South Node"] = south_node_lon
-
-    # Calculate houses with pyswisseph (if available)
-    houses_block = None
-    asc_lon = None
-    mc_lon = None
-    try:
-        from core.houses_swiss import calculate_houses, format_houses_output, HOUSE_SYSTEM_PLACIDUS
-        houses_data = calculate_houses(date_utc, lat, lon, HOUSE_SYSTEM_PLACIDUS)
-        houses_formatted = format_houses_output(houses_data)
-        houses_block = houses_formatted
-        asc_lon = houses_data["asc"]
-        mc_lon = houses_data["mc"]
-    except Exception as e:
-        houses_block = {"note": f"Houses not available: {str(e)}"}
-
-    # Get detailed positions (with dignities) and assign houses if available
-    cusps = None
-    if isinstance(houses_block, dict) and "houses" in houses_block:
-        # houses_data["cusps"] is already a list of floats, not dicts
-        cusps = houses_data.get("cusps")
-    detailed_planets = calculate_detailed_positions(planets_dict, houses=cusps)
-
-    # Calculate Part of Fortune with real Ascendant
-    sun_lon = planets_dict.get("Sun", 0)
-    moon_lon = planets_dict.get("Moon", 0)
-    if asc_lon is None:
-        asc_lon = 0.0
-    # Determine sect (diurnal/nocturnal)
-    try:
-        from core.lots import is_diurnal
-        is_day = is_diurnal(sun_lon, asc_lon)
-    except Exception:
-        is_day = True
-    pof_lon = calculate_part_of_fortune(sun_lon, moon_lon, asc_lon, is_day_chart=is_day)
-
-    response = {
-        "datetime": base_chart.datetime,
-        "location": base_chart.location,
-        "planets": detailed_planets,
-        "aspects": [a.dict() for a in base_chart.aspects],
-        "arabic_parts": {
-            "part_of_fortune": {
-                "longitude": round(pof_lon, 4),
-                "sign": get_sign_name(pof_lon),
-                "formatted": format_position(pof_lon)
-            }
-        },
-        "lunar_nodes": {
-            "north_node": {
-                "longitude": round(north_node_lon, 4),
-                "sign": get_sign_name(north_node_lon),
-                "formatted": format_position(north_node_lon)
-            },
-            "south_node": {
-                "longitude": round(south_node_lon, 4),
-                "sign": get_sign_name(south_node_lon),
-                "formatted": format_position(south_node_lon)
+    from core.natal_report import detailed_chart
+    return detailed_chart(date_utc, lat, lon)
+
+
+@app.get(
+    "/api/astro/natal-report",
+    response_model=None,
+    responses={
+        400: {"description": "Missing date/lat/lon or unknown section"},
+        422: {"description": "Invalid date format"},
+        500: {"description": "Natal report calculation error"},
+        200: {
+            "description": "Reporte natal compuesto (carta, dignidades, lotes, técnicas de tiempo, estrellas fijas, tránsitos)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "datetime": "1990-07-05T12:00:00+00:00",
+                        "location": {"lat": -34.6, "lon": -58.4},
+                        "reference_date": "2025-11-03T00:00:00+00:00",
+                        "sections": ["chart", "dignities", "sect", "lots", "profections", "fardars", "lunar_mansion", "fixed_stars", "transits"],
+                        "chart": {"planets": ["..."], "aspects": ["..."], "houses": ["..."], "asc": "Libra 2.3°", "mc": "Cancer 4.1°"},
+                        "dignities": {"Sun": {"kind": "peregrine", "score": 0}},
+                        "sect": {"is_diurnal": True},
+                        "lots": [{"name": "Fortuna", "longitude": 245.67, "sign": "Sagittarius", "degree": 5.7, "house": 3}],
+                        "profections": {"year": 35, "profected_sign": "Aquarius", "time_lord": "Saturn", "sign_offset": 11, "monthly": {"month": 3, "monthly_sign": "Taurus", "monthly_lord": "Venus"}},
+                        "fardars": {"fardars": ["..."], "current": {"major": "Mercury", "sub": "Moon"}, "is_diurnal": True},
+                        "lunar_mansion": {"index": 11, "name": "Al-Zubrah", "interpretation": "..."},
+                        "fixed_stars": [{"star": "Regulus", "planet": "Sun", "orb": 0.8}],
+                        "transits": [{"natal_planet": "Moon", "transit_planet": "Saturn", "aspect": "square", "orb": 2.3}]
+                    }
+                }
             }
         }
     }
-    if isinstance(houses_block, dict) and "houses" in houses_block:
-        response["houses"] = houses_block["houses"]
-        response["asc"] = houses_block["asc"]
-        response["mc"] = houses_block["mc"]
-        response["asc_longitude"] = asc_lon
-        response["mc_longitude"] = mc_lon
-    else:
-        response["houses"] = houses_block
-    return response
+)
+def get_natal_report(
+    date: str = Query(..., description="Fecha y hora de nacimiento en formato ISO (ej: 1990-07-05T12:00:00Z)"),
+    lat: float = Query(..., description="Latitud en grados decimales"),
+    lon: float = Query(..., description="Longitud en grados decimales"),
+    currentDate: str = Query(None, description="Fecha de referencia para profecciones, fardars y tránsitos (opcional, por defecto ahora)"),
+    sections: str = Query(None, description="Secciones separadas por coma (opcional, por defecto todas): chart, dignities, sect, lots, profections, fardars, lunar_mansion, fixed_stars, transits"),
+    includeMajorOnly: bool = Query(True, description="Tránsitos: filtrar solo planetas exteriores")
+):
+    """
+    Reporte natal compuesto en un solo request.
+
+    Calcula posiciones y casas una vez y las reutiliza para dignidades, lotes,
+    profecciones, fardars, mansión lunar, estrellas fijas y tránsitos.
+    Reemplaza las llamadas separadas a /chart-detailed, /profections,
+    /fardars, /lots, /lunar-mansions, /fixed-stars y /transits.
+    """
+    try:
+        birth_dt = datetime.fromisoformat(date.replace("Z", "+00:00"))
+        current_dt = None
+        if currentDate:
+            current_dt = datetime.fromisoformat(currentDate.replace("Z", "+00:00"))
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid date format")
+
+    from core.natal_report import build_natal_report, resolve_sections
+
+    requested = [s.strip() for s in sections.split(",") if s.strip()] if sections else None
+    try:
+        resolve_sections(requested)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        return build_natal_report(birth_dt, lat, lon, current_dt, requested, includeMajorOnly)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Natal report error: {str(e)}")
 
 
 @app.get(
@@ -493,6 +740,87 @@ def get_solar_return(
         raise HTTPException(status_code=500, detail=f"Solar return calculation error: {str(e)}")
 
 
+@app.get(
+    "/api/astro/solar-returns",
+    response_model=None,
+    responses={
+        400: {"description": "Invalid year range (end before start, more than 121 years or outside the ephemeris)"},
+        422: {"description": "Invalid date format"},
+        500: {"description": "Solar return calculation error"},
+        200: {
+            "description": "Solar Returns para un rango de años en un solo request",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "birth_date": "1990-07-05T12:00:00+00:00",
+                        "location": {"lat": 40.7128, "lon": -74.0060},
+                        "start_year": 2024,
+                        "end_year": 2025,
+                        "returns": [
+                            {
+                                "year": 2025,
+                                "solar_return_datetime": "2025-07-05T11:18:54+00:00",
+                                "planets": [{"name": "Sun", "lon": 103.35, "sign": "Cancer", "house": 10}],
+                                "aspects": [{"a": "Sun", "b": "Mars", "type": "trine", "orb": 2.1, "angle": 120}],
+                                "score_summary": {"total_score": 4.5, "num_aspects": 3, "interpretation": "favorable"},
+                                "asc": 182.3,
+                                "mc": 94.1,
+                                "cusps": [182.3, 210.5, 241.0, 274.1, 305.8, 334.6, 2.3, 30.5, 61.0, 94.1, 125.8, 154.6]
+                            }
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def get_solar_returns(
+    birthDate: str = Query(..., description="Fecha de nacimiento en formato ISO (ej: 1990-07-05T12:00:00Z)"),
+    lat: float = Query(..., description="Latitud para los Solar Returns"),
+    lon: float = Query(..., description="Longitud para los Solar Returns"),
+    startYear: int = Query(None, description="Primer año (opcional, por defecto el año de nacimiento)"),
+    endYear: int = Query(None, description="Último año (opcional, por defecto startYear + 90)"),
+    includeHouses: bool = Query(False, description="Calcular casas Placidus para cada año")
+):
+    """
+    Serie de Solar Returns para un rango de años.
+
+    Cada retorno parte del anterior más un año trópico y se refina con pasos
+    de Newton vectorizados; las posiciones de todos los años salen de una sola
+    pasada de Skyfield.
+    """
+    try:
+        birth_dt = datetime.fromisoformat(birthDate.replace("Z", "+00:00"))
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid birthDate format")
+    from datetime import timezone
+    if birth_dt.tzinfo is None:
+        birth_dt = birth_dt.replace(tzinfo=timezone.utc)
+
+    start_year = startYear if startYear is not None else birth_dt.year
+    end_year = endYear if endYear is not None else start_year + 90
+    if end_year < start_year:
+        raise HTTPException(status_code=400, detail="endYear must not be before startYear")
+    if end_year - start_year > 120:
+        raise HTTPException(status_code=400, detail="Range too long (max 121 years)")
+
+    from core.chart import solar_return_series
+
+    try:
+        returns = solar_return_series(birth_dt, lat, lon, start_year, end_year, includeHouses)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Solar return calculation error: {str(e)}")
+    return {
+        "birth_date": birth_dt.isoformat(),
+        "location": {"lat": lat, "lon": lon},
+        "start_year": start_year,
+        "end_year": end_year,
+        "returns": returns
+    }
+
+
 @app.get(
     "/api/astro/solar-return/ranking",
     response_model=None,
@@ -538,7 +866,8 @@ def get_solar_return_ranking(
     birthDate: str = Query(..., description="Fecha de nacimiento en formato ISO (ej: 1990-07-05T12:00:00Z)"),
     year: int = Query(None, description="Año del Solar Return (opcional, por defecto año actual)"),
     cities: str = Query(None, description="Lista de ciudades separadas por comas (opcional, por defecto las 16 predefinidas)"),
-    top_n: int = Query(3, description="Número de mejores recomendaciones a mostrar")
+    top_n: int = Query(3, description="Número de mejores recomendaciones a mostrar"),
+    breakdown_top: int = Query(None, description="Sólo las N primeras ciudades llevan el breakdown detallado (por defecto todas)")
 ):
     """
     Ranking de ciudades para reubicación de Solar Return usando astrología persa.
@@ -550,6 +879,11 @@ def get_solar_return_ranking(
     - **Aspectos con recepción (15%)**: aspectos armónicos/tensos con recepción mutua
     - **Secta (10%)**: planetas sect en casas favorables
     
+    El Solar Return se calcula una sola vez; por ciudad sólo cambian las
+    casas, y los cinco criterios se puntúan en bloque (ciudad × planeta).
+    Con `breakdown_top` las ciudades fuera del top llevan sólo el total de
+    cada criterio.
+    
     Ciudades predefinidas (16 en total):
     - Fire: Dubai, Los Angeles, Barcelona, Sydney
     - Earth: Zurich, Singapore, Toronto, Copenhagen
@@ -589,7 +923,7 @@ def get_solar_return_ranking(
             )
     
     try:
-        result = rank_solar_return_locations(birth_dt, year, city_names, top_n)
+        result = rank_solar_return_locations(birth_dt, year, city_names, top_n, breakdown_top)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Solar return ranking error: {str(e)}")
@@ -608,6 +942,18 @@ def health_check():
     }
 
 
+@app.get("/metrics", response_class=Response)
+def get_metrics():
+    """
+    Métricas en formato de texto Prometheus: requests y latencia por ruta,
+    requests en curso, duración por etapa (skyfield, swisseph_houses,
+    scoring, validate_serialize, ...), hit ratio de caches, tiempo de carga
+    de efemérides y memoria del proceso (RSS).
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get(
     "/api/astro/profections",
     response_model=None,
@@ -857,6 +1203,7 @@ def get_lunar_mansion(
     "/api/astro/fixed-stars",
     response_model=None,
     responses={
+        422: {"description": "Invalid date format"},
         200: {
             "description": "Conjunciones con estrellas fijas",
             "content": {
@@ -879,20 +1226,29 @@ def get_lunar_mansion(
     }
 )
 def get_fixed_stars(
-    planets: str = Query(..., description="JSON array de planetas [{name, longitude}]")
+    planets: str = Query(..., description="JSON array de planetas [{name, longitude}]"),
+    date: str = Query(None, description="Fecha ISO si las longitudes son del equinoccio de la fecha (opcional; por defecto eclíptica J2000, como /api/astro/chart)"),
+    maxMagnitude: float = Query(None, description="Usar sólo estrellas de magnitud <= maxMagnitude (opcional)")
 ):
     """
-    Encuentra conjunciones con estrellas fijas principales.
+    Encuentra conjunciones con estrellas fijas.
     
-    Catálogo incluye: Regulus, Aldebaran, Antares, Fomalhaut, Spica, Algol, Sirius, etc.
-    Los orbes varían según la magnitud de la estrella.
+    Catálogo de ~500 estrellas hasta magnitud 4 (Regulus, Aldebaran, Antares,
+    Fomalhaut, Spica, Algol, Sirius, etc.), con movimiento propio y precesión
+    hasta `date` si se indica. Los orbes varían según la magnitud de la estrella.
     """
+    epoch = None
+    if date:
+        try:
+            epoch = datetime.fromisoformat(date.replace("Z", "+00:00"))
+        except Exception:
+            raise HTTPException(status_code=422, detail="Invalid date format")
     try:
         from core.fixed_stars import get_all_fixed_star_contacts, format_fixed_stars_output
         import json as json_lib
         
         planets_list = json_lib.loads(planets)
-        contacts = get_all_fixed_star_contacts(planets_list)
+        contacts = get_all_fixed_star_contacts(planets_list, epoch, maxMagnitude)
         formatted = format_fixed_stars_output(contacts)
         
         return formatted
@@ -900,6 +1256,73 @@ def get_fixed_stars(
         raise HTTPException(status_code=500, detail=f"Fixed stars calculation error: {str(e)}")
 
 
+@app.get(
+    "/api/astro/parans",
+    response_model=None,
+    responses={
+        400: {"description": "Invalid latitude range, tolerance or planet"},
+        422: {"description": "Invalid date format"},
+        200: {
+            "description": "Parans estrella-planeta por banda de latitud",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "date": "2025-03-20T12:00:00+00:00",
+                        "tolerance_minutes": 4.0,
+                        "bands": [
+                            {
+                                "latitude": 40.0,
+                                "parans": [
+                                    {
+                                        "star": "Betelgeuse",
+                                        "magnitude": 0.42,
+                                        "star_event": "culminating",
+                                        "planet": "Neptune",
+                                        "planet_event": "setting",
+                                        "lst": 5.9423,
+                                        "orb_minutes": 0.31
+                                    }
+                                ]
+                            }
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def get_parans(
+    date: str = Query(..., description="Fecha ISO de las posiciones (ej: 2025-03-20T12:00:00Z)"),
+    latMin: float = Query(-60.0, description="Latitud mínima de las bandas"),
+    latMax: float = Query(60.0, description="Latitud máxima de las bandas"),
+    latStep: float = Query(1.0, description="Ancho de banda en grados"),
+    tolerance: float = Query(4.0, description="Diferencia máxima entre eventos (minutos de tiempo sidéreo)"),
+    maxMagnitude: float = Query(2.0, description="Usar sólo estrellas de magnitud <= maxMagnitude"),
+    planets: str = Query(None, description="Planetas separados por coma (opcional; por defecto los diez)")
+):
+    """
+    Parans: estrellas fijas y planetas que salen, culminan, se ponen o
+    anticulminan a la vez, para cada banda de latitud de latMin a latMax.
+
+    No dependen de la longitud geográfica; cada paran incluye el tiempo
+    sidéreo local (horas) del evento de la estrella.
+    """
+    try:
+        dt = datetime.fromisoformat(date.replace("Z", "+00:00"))
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid date format")
+
+    from core.parans import find_parans, latitude_bands
+
+    planet_list = [p.strip() for p in planets.split(",") if p.strip()] if planets else None
+    try:
+        return find_parans(dt, latitude_bands(latMin, latMax, latStep), tolerance, maxMagnitude, planet_list)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Parans calculation error: {str(e)}")
+
+
 @app.get(
     "/api/astro/transits",
     response_model=None,
@@ -917,7 +1340,9 @@ def get_fixed_stars(
                             "aspect": "square",
                             "orb": 2.3,
                             "applying": True,
-                            "exactness": "approaching"
+                            "exactness": "approaching",
+                            "transit_speed": 0.0412,
+                            "transit_retrograde": False
                         }
                     ]
                 }
@@ -953,7 +1378,8 @@ def get_transits(
             {
                 "name": p.name,
                 "longitude": p.lon,
-                "speed": 0  # TODO: calcular velocidad real
+                "speed": p.speed,
+                "retrograde": p.retrograde
             }
             for p in transit_chart.planets
         ]
@@ -968,3 +1394,418 @@ def get_transits(
         return transits
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Transits calculation error: {str(e)}")
+
+
+@app.get(
+    "/api/astro/transit-calendar",
+    response_model=None,
+    responses={
+        400: {"description": "Invalid range (end before start or longer than 10 years)"},
+        422: {"description": "Invalid date format"},
+        500: {"description": "Transit calendar calculation error"},
+        200: {
+            "description": "Calendario de tránsitos con entrada en orbe, hora exacta y salida",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "start": "2025-01-01T00:00:00+00:00",
+                        "end": "2026-01-01T00:00:00+00:00",
+                        "events": [
+                            {
+                                "transit_planet": "Saturn",
+                                "natal_planet": "Sun",
+                                "aspect": "trine",
+                                "natal_longitude": 103.3469,
+                                "target_longitude": 343.3469,
+                                "enter": "2024-01-25T05:22:00+00:00",
+                                "exact": [
+                                    {"time": "2024-04-01T17:06:00+00:00", "retrograde": False},
+                                    {"time": "2024-10-11T20:51:00+00:00", "retrograde": True},
+                                    {"time": "2024-12-19T13:47:00+00:00", "retrograde": False}
+                                ],
+                                "leave": "2025-03-09T04:07:00+00:00",
+                                "min_orb": 0.0
+                            }
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def get_transit_calendar(
+    birthDate: str = Query(..., description="Fecha de nacimiento en formato ISO (ej: 1990-07-05T12:00:00Z)"),
+    lat: float = Query(..., description="Latitud de nacimiento"),
+    lon: float = Query(..., description="Longitud de nacimiento"),
+    start: str = Query(..., description="Inicio del rango en formato ISO"),
+    end: str = Query(..., description="Fin del rango en formato ISO (máximo 10 años)"),
+    includeMajorOnly: bool = Query(True, description="Solo planetas exteriores en tránsito (Júpiter a Plutón)"),
+    includeMinor: bool = Query(False, description="Incluir aspectos menores"),
+    includeAngles: bool = Query(True, description="Incluir Ascendente y Medio Cielo natales")
+):
+    """
+    Calendario de tránsitos sobre la carta natal.
+
+    Para cada (planeta en tránsito, punto natal, aspecto) devuelve la entrada
+    en orbe, cada paso exacto (al minuto, incluidos los re-toques por
+    retrogradación) y la salida del orbe. Donde las casas no están definidas
+    (latitudes polares) se omiten los ángulos natales y se agrega "note".
+    """
+    try:
+        birth_dt = datetime.fromisoformat(birthDate.replace("Z", "+00:00"))
+        start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
+        end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid date format")
+    from datetime import timezone
+    birth_dt, start_dt, end_dt = (
+        d if d.tzinfo else d.replace(tzinfo=timezone.utc) for d in (birth_dt, start_dt, end_dt)
+    )
+    if end_dt <= start_dt:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if (end_dt - start_dt).days > 3660:
+        raise HTTPException(status_code=400, detail="Range too long (max 10 years)")
+
+    from core.transit_calendar import OUTER_PLANETS, transit_calendar
+
+    try:
+        natal_points = {p.name: p.lon for p in chart_json(lat, lon, birth_dt).planets}
+        note = None
+        if includeAngles:
+            from core.houses_swiss import calculate_houses
+            try:
+                houses = calculate_houses(birth_dt, lat, lon)
+                natal_points["Ascendant"] = houses["asc"]
+                natal_points["Midheaven"] = houses["mc"]
+            except Exception as e:
+                note = f"Houses not available: {str(e)}"
+        result = transit_calendar(
+            natal_points, start_dt, end_dt,
+            transit_planets=OUTER_PLANETS if includeMajorOnly else None,
+            include_minor=includeMinor
+        )
+        if note:
+            result["note"] = note
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Transit calendar error: {str(e)}")
+
+
+@app.get(
+    "/api/astro/events",
+    response_model=None,
+    responses={
+        400: {"description": "Invalid range or event kind"},
+        422: {"description": "Invalid date format"},
+        503: {"description": "Event calendar not built (run scripts/build_event_calendar.py)"},
+        200: {
+            "description": "Eventos globales precalculados: lunaciones, eclipses, ingresos y estaciones",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "start": "2024-04-01T00:00:00+00:00",
+                        "end": "2024-04-10T00:00:00+00:00",
+                        "coverage": {"start": "1900-01-01T00:00:00+00:00", "end": "2101-01-01T00:00:00+00:00"},
+                        "truncated": False,
+                        "events": [
+                            {
+                                "time": "2024-04-01T22:16:00+00:00",
+                                "kind": "station",
+                                "body": "Mercury",
+                                "longitude": 26.8869,
+                                "sign": "Aries",
+                                "detail": "retrograde"
+                            },
+                            {
+                                "time": "2024-04-05T10:27:00+00:00",
+                                "kind": "ingress",
+                                "body": "Venus",
+                                "longitude": 0.0,
+                                "sign": "Aries",
+                                "detail": "direct"
+                            },
+                            {
+                                "time": "2024-04-08T18:21:00+00:00",
+                                "kind": "new_moon",
+                                "body": "Moon",
+                                "longitude": 19.0691,
+                                "sign": "Aries",
+                                "detail": None
+                            },
+                            {
+                                "time": "2024-04-08T18:21:00+00:00",
+                                "kind": "solar_eclipse",
+                                "body": "Sun",
+                                "longitude": 19.0686,
+                                "sign": "Aries",
+                                "detail": "total"
+                            }
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def get_events(
+    start: str = Query(..., description="Inicio del rango en formato ISO"),
+    end: str = Query(..., description="Fin del rango en formato ISO (exclusivo)"),
+    kinds: str = Query(None, description="Tipos separados por coma: new_moon, full_moon, solar_eclipse, lunar_eclipse, ingress, station"),
+    bodies: str = Query(None, description="Cuerpos separados por coma (ej: Mercury,Venus)"),
+    limit: int = Query(1000, ge=1, le=5000, description="Máximo de eventos")
+):
+    """
+    Lunas nuevas y llenas, eclipses, ingresos en signos y estaciones entre
+    start y end, leídos del calendario precalculado (data/event_calendar.sqlite).
+
+    No se calcula nada por request: es una búsqueda por rango sobre el índice
+    de tiempo. "coverage" indica los años guardados en el calendario.
+    """
+    try:
+        start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
+        end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid date format")
+
+    from core.event_calendar import query_events
+
+    kind_list = [k.strip() for k in kinds.split(",") if k.strip()] if kinds else None
+    body_list = [b.strip() for b in bodies.split(",") if b.strip()] if bodies else None
+    try:
+        return query_events(start_dt, end_dt, kind_list, body_list, limit)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Event calendar error: {str(e)}")
+
+
+@app.get(
+    "/api/astro/progressions",
+    response_model=None,
+    responses={
+        400: {"description": "targetDate before birthDate"},
+        422: {"description": "Invalid date format"},
+        500: {"description": "Progression calculation error"},
+        200: {
+            "description": "Carta progresada (secundaria) y aspectos a la carta natal",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "birth": "1990-07-05T12:00:00+00:00",
+                        "target": "2025-01-01T00:00:00+00:00",
+                        "age": 34.4936,
+                        "progressed_datetime": "1990-08-08T23:50:42+00:00",
+                        "solar_arc": 32.9472,
+                        "planets": [
+                            {"name": "Sun", "lon": 136.29, "sign": "Leo", "speed": 0.9553, "retrograde": False, "natal_lon": 103.35}
+                        ],
+                        "angles": {"asc": 226.4, "mc": 136.9, "armc": 139.1, "cusps": [226.4, 256.0, 289.7, 316.9, 342.4, 5.1, 46.4, 76.0, 109.7, 136.9, 162.4, 185.1]},
+                        "aspects_to_natal": [
+                            {"progressed": "Mercury", "natal": "Sun", "aspect": "sextile", "orb": 0.16, "applying": False}
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def get_progressions(
+    birthDate: str = Query(..., description="Fecha de nacimiento en formato ISO (ej: 1990-07-05T12:00:00Z)"),
+    lat: float = Query(..., description="Latitud de nacimiento"),
+    lon: float = Query(..., description="Longitud de nacimiento"),
+    targetDate: str = Query(None, description="Fecha para la progresión (opcional, por defecto hoy)"),
+    orb: float = Query(1.0, description="Orbe para los aspectos a la carta natal"),
+    includeAngles: bool = Query(True, description="Incluir Ascendente y Medio Cielo natales y progresados")
+):
+    """
+    Progresión secundaria: un día de efeméride por año de vida.
+
+    Los ángulos progresan por arco solar en longitud desde el MC natal. Donde
+    las casas no están definidas (latitudes polares) se omiten y se agrega "note".
+    """
+    try:
+        birth_dt = datetime.fromisoformat(birthDate.replace("Z", "+00:00"))
+        target_dt = datetime.fromisoformat(targetDate.replace("Z", "+00:00")) if targetDate else datetime.utcnow()
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid date format")
+    from core.progressions import progressed_chart
+
+    try:
+        return progressed_chart(birth_dt, target_dt, lat, lon, includeAngles, orb)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Progression error: {str(e)}")
+
+
+@app.get(
+    "/api/astro/solar-arc",
+    response_model=None,
+    responses={
+        400: {"description": "targetDate before birthDate"},
+        422: {"description": "Invalid date format"},
+        500: {"description": "Solar arc calculation error"},
+        200: {
+            "description": "Direcciones por arco solar y aspectos a la carta natal",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "birth": "1990-07-05T12:00:00+00:00",
+                        "target": "2025-01-01T00:00:00+00:00",
+                        "age": 34.4936,
+                        "solar_arc": 32.9472,
+                        "directed": [{"name": "Venus", "lon": 95.1, "sign": "Cancer", "natal_lon": 62.15}],
+                        "aspects_to_natal": [
+                            {"progressed": "Venus", "natal": "Pluto", "aspect": "trine", "orb": 0.33, "applying": None}
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def get_solar_arc(
+    birthDate: str = Query(..., description="Fecha de nacimiento en formato ISO (ej: 1990-07-05T12:00:00Z)"),
+    lat: float = Query(..., description="Latitud de nacimiento"),
+    lon: float = Query(..., description="Longitud de nacimiento"),
+    targetDate: str = Query(None, description="Fecha para la dirección (opcional, por defecto hoy)"),
+    orb: float = Query(1.0, description="Orbe para los aspectos a la carta natal"),
+    includeAngles: bool = Query(True, description="Incluir Ascendente y Medio Cielo")
+):
+    """
+    Direcciones por arco solar: todos los puntos natales avanzan el arco del Sol progresado.
+
+    Donde las casas no están definidas (latitudes polares) se omiten los
+    ángulos y se agrega "note".
+    """
+    try:
+        birth_dt = datetime.fromisoformat(birthDate.replace("Z", "+00:00"))
+        target_dt = datetime.fromisoformat(targetDate.replace("Z", "+00:00")) if targetDate else datetime.utcnow()
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid date format")
+    from core.progressions import solar_arc_directions
+
+    try:
+        return solar_arc_directions(birth_dt, target_dt, lat, lon, includeAngles, orb)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Solar arc error: {str(e)}")
+
+
+@app.get(
+    "/api/astro/progressions/timeline",
+    response_model=None,
+    responses={
+        400: {"description": "Invalid method or years out of range"},
+        422: {"description": "Invalid date format"},
+        500: {"description": "Progression timeline error"},
+        200: {
+            "description": "Aspectos exactos progresados (o dirigidos) a la carta natal a lo largo de la vida",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "birth": "1990-07-05T12:00:00+00:00",
+                        "method": "secondary",
+                        "years": 90,
+                        "events": [
+                            {"age": 0.877, "date": "1991-05-21", "progressed": "Moon", "natal": "Mars", "aspect": "trine"}
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def get_progressions_timeline(
+    birthDate: str = Query(..., description="Fecha de nacimiento en formato ISO (ej: 1990-07-05T12:00:00Z)"),
+    lat: float = Query(..., description="Latitud de nacimiento"),
+    lon: float = Query(..., description="Longitud de nacimiento"),
+    years: int = Query(90, description="Años de vida a cubrir (máximo 120)"),
+    method: str = Query("secondary", description="secondary | solar_arc"),
+    includeAngles: bool = Query(True, description="Incluir Ascendente y Medio Cielo natales")
+):
+    """
+    Serie de vida de progresiones: una sola evaluación vectorizada de la
+    efeméride (~90 días) y búsqueda de los aspectos exactos a la carta natal.
+    Donde las casas no están definidas (latitudes polares) se omiten los
+    ángulos y se agrega "note".
+    """
+    try:
+        birth_dt = datetime.fromisoformat(birthDate.replace("Z", "+00:00"))
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid date format")
+    from core.progressions import progression_series
+
+    try:
+        return progression_series(birth_dt, lat, lon, years, method, includeAngles)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Progression timeline error: {str(e)}")
+
+
+@app.post(
+    "/api/astro/electional",
+    response_model=None,
+    responses={
+        400: {"description": "Invalid range, resolution or rule values"},
+        422: {"description": "Invalid date format"},
+        500: {"description": "Electional search error"},
+        200: {
+            "description": "Ventanas que cumplen las reglas electivas, ordenadas por puntaje",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "start": "2025-01-01T00:00:00+00:00",
+                        "end": "2025-04-01T00:00:00+00:00",
+                        "step_minutes": 60,
+                        "samples": 2161,
+                        "qualifying_samples": 459,
+                        "windows": [
+                            {
+                                "start": "2025-01-08T07:00:00+00:00",
+                                "end": "2025-01-08T14:00:00+00:00",
+                                "duration_minutes": 420.0,
+                                "score": 3.04,
+                                "peak": {
+                                    "time": "2025-01-08T07:00:00+00:00",
+                                    "score": 3.41,
+                                    "moon_longitude": 35.02,
+                                    "mansion": "Al-Thurayya",
+                                    "moon_sun_elongation": 107.1,
+                                    "asc": 268.0
+                                }
+                            }
+                        ]
+                    }
+                }
+            }
+        }
+    }
+)
+def post_electional(body: ElectionalRequest):
+    """
+    Búsqueda electiva: ventanas de tiempo en las que la Luna cumple las reglas
+    (mansión, rayos del Sol, fase, dignidad y aspectos a maléficos), evaluadas
+    sobre una grilla de minutos u horas.
+    """
+    try:
+        start_dt = datetime.fromisoformat(body.start.replace("Z", "+00:00"))
+        end_dt = datetime.fromisoformat(body.end.replace("Z", "+00:00"))
+    except Exception:
+        raise HTTPException(status_code=422, detail="Invalid date format")
+
+    from core.electional import electional_search
+
+    try:
+        return electional_search(
+            start_dt, end_dt, body.lat, body.lon, body.rules,
+            body.step_minutes, body.min_duration_minutes, body.top
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Electional search error: {str(e)}")
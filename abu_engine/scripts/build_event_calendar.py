@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Genera data/event_calendar.sqlite (calendario de core.event_calendar):
+lunas nuevas y llenas, eclipses, ingresos en signos y estaciones.
+
+Uso (desde abu_engine/):
+  python scripts/build_event_calendar.py
+  python scripts/build_event_calendar.py --start 1950 --end 2050 --output /tmp/events.sqlite
+
+El Dockerfile lo corre al construir la imagen. Usa la efeméride de
+core.chart (data/de440s.bsp, se descarga de NAIF si falta; DE440s cubre
+1849-2150) y rechaza años fuera del kernel cargado. El rango por defecto,
+1900-2100, tarda unos segundos; el archivo se reemplaza entero.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.event_calendar import (  # noqa: E402
+    DEFAULT_END_YEAR,
+    DEFAULT_START_YEAR,
+    EVENT_CALENDAR_PATH,
+    build_event_calendar,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--start", type=int, default=DEFAULT_START_YEAR, help="Primer año (inclusive)")
+    parser.add_argument("--end", type=int, default=DEFAULT_END_YEAR, help="Último año (inclusive)")
+    parser.add_argument("--output", type=Path, default=EVENT_CALENDAR_PATH)
+    args = parser.parse_args(argv)
+    try:
+        summary = build_event_calendar(args.start, args.end, args.output)
+    except ValueError as e:
+        parser.error(str(e))
+    total = sum(summary["counts"].values())
+    detail = ", ".join(f"{kind}: {n}" for kind, n in summary["counts"].items())
+    print(f"{total} eventos ({detail}) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
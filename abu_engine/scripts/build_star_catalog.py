@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Genera data/fixed_stars.csv (catálogo de core.fixed_stars) desde un
+sefstars.txt de Swiss Ephemeris (datos de S. Moshier / SIMBAD, posiciones
+ICRS J2000 con movimiento propio).
+
+Uso (desde abu_engine/):
+  python scripts/build_star_catalog.py /ruta/a/sefstars.txt
+  python scripts/build_star_catalog.py sefstars.txt --max-magnitude 4.5 --output data/fixed_stars.csv
+
+Cada estrella (nomenclatura de Bayer/Flamsteed) aparece una vez: se usa el
+primer nombre tradicional del archivo, o el de PREFERRED_NAMES si la
+estrella está ahí; las que no tienen nombre usan la nomenclatura con letra
+griega ("θ Ara"), igual que la segunda de dos estrellas con el mismo
+nombre tradicional (π3 y π4 Ori son "Tabit": la segunda queda "π4 Ori"),
+para que el nombre identifique una sola estrella. Se omiten objetos sin magnitud (999.99), los registros
+en equinoccio 1950, los puntos de referencia y objetos no estelares (el
+archivo les pone magnitud 0.0 sin movimiento propio: ZerL2000, polos
+galácticos, "Sun Pole", NGC 4194...) y los registros repetidos con otra
+nomenclatura en la posición de una estrella anterior (AA11_page_B73 es
+α Centauri).
+"""
+
+import argparse
+import csv
+import math
+import re
+from pathlib import Path
+
+STAR_CATALOG_PATH = Path(__file__).resolve().parent.parent / "data" / "fixed_stars.csv"
+# Nombres preferidos cuando el archivo trae varios (claves de core.fixed_stars.STAR_TRAITS;
+# no se importa el módulo porque carga este mismo CSV)
+PREFERRED_NAMES = {
+    "Regulus", "Aldebaran", "Antares", "Fomalhaut", "Spica",
+    "Algol", "Sirius", "Vega", "Arcturus", "Betelgeuse",
+}
+GREEK = {
+    "al": "α", "be": "β", "ga": "γ", "de": "δ", "ep": "ε", "ze": "ζ", "et": "η", "th": "θ",
+    "io": "ι", "ka": "κ", "la": "λ", "mu": "μ", "nu": "ν", "xi": "ξ", "omi": "ο", "pi": "π",
+    "rh": "ρ", "si": "σ", "ta": "τ", "up": "υ", "ph": "φ", "ch": "χ", "ps": "ψ", "om": "ω",
+}
+DESIGNATION = re.compile(r"^(omi|[a-z]{2})(?:-(\d))?([A-Z][a-z]{2})$")
+FLAMSTEED = re.compile(r"^(\d+)([A-Z][a-z]{2})$")
+DUPLICATE_RADIUS_ARCSEC = 30.0
+
+
+def display_designation(code: str) -> str:
+    """'thAra' -> 'θ Ara', 'ta-1Ari' -> 'τ1 Ari', '41Ari' -> '41 Ari'."""
+    m = DESIGNATION.match(code)
+    if m and m.group(1) in GREEK:
+        return f"{GREEK[m.group(1)]}{m.group(2) or ''} {m.group(3)}"
+    m = FLAMSTEED.match(code)
+    if m:
+        return f"{m.group(1)} {m.group(2)}"
+    return code
+
+
+def _duplicate_position(stars, ra: float, dec: float) -> bool:
+    """True si (ra, dec) está a menos de DUPLICATE_RADIUS_ARCSEC de una estrella ya leída."""
+    radius = DUPLICATE_RADIUS_ARCSEC / 3600.0
+    cos_dec = math.cos(math.radians(dec))
+    for _, _, other_ra, other_dec, *_ in stars:
+        d_ra = ((ra - other_ra + 180.0) % 360.0 - 180.0) * cos_dec
+        if abs(dec - other_dec) < radius and math.hypot(d_ra, dec - other_dec) < radius:
+            return True
+    return False
+
+
+def read_sefstars(path: Path, max_magnitude: float):
+    """Registros únicos por nomenclatura: (nombre, nomenclatura, ra, dec, pm_ra, pm_dec, mag)."""
+    stars = {}
+    with open(path, encoding="latin-1") as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            fields = [x.strip() for x in line.split(",")]
+            if len(fields) < 14 or fields[2] not in ("ICRS", "2000"):
+                continue
+            name, code = fields[0], fields[1]
+            try:
+                h, m, s, dd, dm, ds, pm_ra, pm_dec = (float(x) for x in fields[3:11])
+                magnitude = float(fields[13])
+            except ValueError:
+                continue
+            if magnitude > max_magnitude or (h, m, s, dd, dm, ds) == (0, 0, 0, 0, 0, 0):
+                continue  # objetos débiles y puntos de referencia (GCRS00, Zero2000)
+            if magnitude == 0.0 and pm_ra == 0.0 and pm_dec == 0.0:
+                continue  # puntos de referencia y objetos no estelares con magnitud de relleno
+            sign = -1.0 if fields[6].startswith("-") else 1.0
+            ra = 15.0 * (h + m / 60.0 + s / 3600.0)
+            dec = sign * (abs(dd) + dm / 60.0 + ds / 3600.0)
+            known = stars.get(code)
+            if known is None and _duplicate_position(stars.values(), ra, dec):
+                continue
+            if known is None:
+                stars[code] = [name or display_designation(code), code, ra, dec, pm_ra, pm_dec, magnitude]
+            elif name in PREFERRED_NAMES and known[0] not in PREFERRED_NAMES:
+                known[0] = name
+    used = set()
+    for star in stars.values():
+        if star[0] in used:
+            star[0] = display_designation(star[1])
+        used.add(star[0])
+    return list(stars.values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("sefstars", type=Path)
+    parser.add_argument("--output", type=Path, default=STAR_CATALOG_PATH)
+    parser.add_argument("--max-magnitude", type=float, default=4.0)
+    args = parser.parse_args(argv)
+
+    rows = read_sefstars(args.sefstars, args.max_magnitude)
+    rows.sort(key=lambda r: r[2])
+    with open(args.output, "w", encoding="utf-8", newline="") as f:
+        f.write(f"# Generado por scripts/build_star_catalog.py desde {args.sefstars.name} (Swiss Ephemeris), "
+                f"magnitud <= {args.max_magnitude}\n")
+        writer = csv.writer(f)
+        writer.writerow(["name", "designation", "ra_deg", "dec_deg", "pm_ra_mas", "pm_dec_mas", "magnitude"])
+        for name, code, ra, dec, pm_ra, pm_dec, magnitude in rows:
+            writer.writerow([name, code, f"{ra:.6f}", f"{dec:.6f}", pm_ra, pm_dec, magnitude])
+    print(f"{len(rows)} estrellas -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
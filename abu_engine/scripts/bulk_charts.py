@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Cálculo masivo de cartas natales (offline) con salida Parquet.
+
+Lee un CSV o Parquet de nacimientos (columnas id, datetime, lat, lon), lo
+procesa por bloques en un pool de procesos (uno por núcleo por defecto) y
+escribe un Parquet columnar con posiciones, velocidades, signos, casas Placidus,
+dignidades, lotes, secta y aspectos de cada carta.
+
+Uso (desde abu_engine/):
+  python scripts/bulk_charts.py births.csv charts.parquet
+  python scripts/bulk_charts.py births.parquet charts.parquet --workers 8 --chunk-size 20000
+  python scripts/bulk_charts.py births.csv charts.parquet --no-houses
+
+Memoria acotada: el lector entrega bloques de --chunk-size filas, como máximo
+--max-pending bloques están en vuelo en el pool y cada bloque terminado se
+escribe como un row group y se descarta. El archivo de salida conserva el
+orden de entrada.
+
+Las filas inválidas (fecha o fecha fuera de la efeméride, zona o
+coordenadas) o que fallan no abortan la corrida: quedan en la salida con la
+columna `error` y el resto de columnas en null. Las fechas sin zona horaria se asumen UTC, salvo que la fila traiga una
+zona IANA en la columna opcional `timezone`: entonces son hora local de esa
+zona (core.timezones, desfase en caché por zona y día).
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+PLANET_NAMES = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+LOT_NAMES = ["Fortuna", "Spirit", "Eros", "Necessity"]
+INPUT_COLUMNS = ["id", "datetime", "lat", "lon", "timezone"]
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def _build_schema() -> pa.Schema:
+    fields = [
+        pa.field("id", pa.string()),
+        pa.field("datetime", pa.timestamp("us", tz="UTC")),
+        pa.field("lat", pa.float64()),
+        pa.field("lon", pa.float64()),
+        pa.field("error", pa.string()),
+    ]
+    for name in PLANET_NAMES:
+        key = name.lower()
+        fields += [
+            pa.field(f"{key}_lon", pa.float64()),
+            pa.field(f"{key}_speed", pa.float64()),
+            pa.field(f"{key}_retrograde", pa.bool_()),
+            pa.field(f"{key}_sign", pa.dictionary(pa.int8(), pa.string())),
+            pa.field(f"{key}_house", pa.int8()),
+            pa.field(f"{key}_dignity", pa.dictionary(pa.int8(), pa.string())),
+            pa.field(f"{key}_dignity_score", pa.int8()),
+        ]
+    fields += [pa.field("asc", pa.float64()), pa.field("mc", pa.float64())]
+    fields += [pa.field(f"cusp_{i}", pa.float64()) for i in range(1, 13)]
+    fields.append(pa.field("is_diurnal", pa.bool_()))
+    for name in LOT_NAMES:
+        fields += [
+            pa.field(f"lot_{name.lower()}_lon", pa.float64()),
+            pa.field(f"lot_{name.lower()}_house", pa.int8()),
+        ]
+    fields.append(pa.field("aspects", pa.list_(pa.struct([
+        pa.field("a", pa.string()),
+        pa.field("b", pa.string()),
+        pa.field("type", pa.string()),
+        pa.field("orb", pa.float32()),
+        pa.field("angle", pa.float32()),
+        pa.field("applying", pa.bool_()),
+    ]))))
+    return pa.schema(fields)
+
+
+SCHEMA = _build_schema()
+
+
+# ----------------------------- Worker -----------------------------
+
+def _init_worker() -> None:
+    """Carga las efemérides una vez por proceso."""
+    from core.chart import EphemerisSingleton
+    EphemerisSingleton()
+
+
+def _chart_row(chart, dt, lat: float, lon: float, include_houses: bool) -> Dict[str, Any]:
+    from core.dignities import get_planet_dignity
+    from core.extended_calc import get_degree_in_sign
+    from core.houses_swiss import calculate_houses, get_planet_house, HOUSE_SYSTEM_PLACIDUS
+    from core.lots import calculate_all_lots, is_diurnal
+
+    longitudes = {p.name: p.lon for p in chart.planets}
+    row: Dict[str, Any] = {}
+    cusps = None
+    if include_houses:
+        houses = calculate_houses(dt, lat, lon, HOUSE_SYSTEM_PLACIDUS)
+        cusps = houses["cusps"]
+        row["asc"] = houses["asc"]
+        row["mc"] = houses["mc"]
+        for i, cusp in enumerate(cusps, 1):
+            row[f"cusp_{i}"] = cusp
+        row["is_diurnal"] = is_diurnal(longitudes["Sun"], houses["asc"])
+        for lot in calculate_all_lots(longitudes, houses["asc"], cusps):
+            row[f"lot_{lot['name'].lower()}_lon"] = lot["longitude"]
+            row[f"lot_{lot['name'].lower()}_house"] = lot.get("house")
+
+    for planet in chart.planets:
+        key = planet.name.lower()
+        dignity = get_planet_dignity(planet.name, planet.sign, get_degree_in_sign(planet.lon))
+        row[f"{key}_lon"] = planet.lon
+        row[f"{key}_speed"] = planet.speed
+        row[f"{key}_retrograde"] = planet.retrograde
+        row[f"{key}_sign"] = planet.sign
+        row[f"{key}_house"] = get_planet_house(planet.lon, cusps) if cusps else None
+        row[f"{key}_dignity"] = dignity["kind"]
+        row[f"{key}_dignity_score"] = dignity["score"]
+    row["aspects"] = [a.dict() for a in chart.aspects]
+    return row
+
+
+def _local_datetime(value: Any, zone: str, parsed: pd.Timestamp):
+    """(fecha UTC, error) de una fila con zona: sin offset es hora local de `zone`."""
+    from core.timezones import local_to_utc
+
+    try:
+        if isinstance(value, pd.Timestamp):
+            local = value.to_pydatetime()
+        else:
+            local = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        if local.tzinfo is not None:
+            return parsed, None
+        return pd.Timestamp(local_to_utc(local, zone)), None
+    except ValueError as e:
+        return parsed, str(e)
+
+
+def compute_chunk(df: pd.DataFrame, include_houses: bool = True) -> pa.Table:
+    """
+    Calcula las cartas de un bloque de nacimientos.
+
+    Las posiciones de todo el bloque salen de una sola pasada vectorizada de
+    Skyfield (chart_json_many); casas, dignidades y lotes se calculan por fila.
+
+    Returns:
+        pa.Table con SCHEMA y una fila por fila de entrada, en el mismo orden.
+    """
+    from core.chart import chart_json_many, ephemeris_years
+
+    first_year, last_year = ephemeris_years()
+    ids = df["id"].astype(str).tolist() if "id" in df else [str(i) for i in df.index]
+    dts = pd.to_datetime(df["datetime"], errors="coerce", utc=True, format="ISO8601")
+    zones = df["timezone"] if "timezone" in df else pd.Series([None] * len(df), index=df.index)
+    lats = pd.to_numeric(df["lat"], errors="coerce")
+    lons = pd.to_numeric(df["lon"], errors="coerce")
+
+    rows: List[Dict[str, Any]] = []
+    valid: List[int] = []
+    for i in range(len(df)):
+        dt, lat, lon = dts.iat[i], lats.iat[i], lons.iat[i]
+        zone_error = None
+        if not pd.isna(dt) and isinstance(zones.iat[i], str) and zones.iat[i]:
+            dt, zone_error = _local_datetime(df["datetime"].iat[i], zones.iat[i], dt)
+        row = {
+            "id": ids[i],
+            "datetime": None if pd.isna(dt) else dt.to_pydatetime(),
+            "lat": None if pd.isna(lat) else float(lat),
+            "lon": None if pd.isna(lon) else float(lon),
+        }
+        if zone_error:
+            row["error"] = zone_error
+        elif pd.isna(dt):
+            row["error"] = "Invalid date format"
+        elif not first_year <= dt.year <= last_year:
+            # Fuera de la efeméride fallaría la pasada vectorizada de todo el bloque
+            row["error"] = f"datetime must be within the ephemeris range {first_year}-{last_year}"
+        elif pd.isna(lat) or not -90.0 <= lat <= 90.0:
+            row["error"] = "lat must be between -90 and 90"
+        elif pd.isna(lon) or not -180.0 <= lon <= 180.0:
+            row["error"] = "lon must be between -180 and 180"
+        else:
+            valid.append(i)
+        rows.append(row)
+
+    charts = chart_json_many(
+        [rows[i]["datetime"] for i in valid],
+        [rows[i]["lat"] for i in valid],
+        [rows[i]["lon"] for i in valid],
+    )
+    for i, chart in zip(valid, charts):
+        row = rows[i]
+        try:
+            row.update(_chart_row(chart, row["datetime"], row["lat"], row["lon"], include_houses))
+        except Exception as e:
+            row["error"] = str(e)
+    return pa.Table.from_pylist(rows, schema=SCHEMA)
+
+
+# ----------------------------- I/O -----------------------------
+
+def iter_input_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Bloques de nacimientos desde CSV o Parquet sin cargar el archivo completo."""
+    if path.suffix.lower() in (".parquet", ".pq"):
+        pf = pq.ParquetFile(path)
+        columns = [c for c in INPUT_COLUMNS if c in pf.schema_arrow.names]
+        for batch in pf.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        for df in pd.read_csv(path, chunksize=chunk_size, dtype={"id": str, "datetime": str, "timezone": str}):
+            yield df
+
+
+def run(
+    input_path: Path,
+    output_path: Path,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_pending: Optional[int] = None,
+    include_houses: bool = True,
+    compression: str = "zstd",
+    progress: bool = True,
+) -> Dict[str, Any]:
+    """
+    Procesa `input_path` completo y escribe `output_path`.
+
+    Returns:
+        dict con rows, errors, chunks y seconds.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    stats = {"rows": 0, "errors": 0, "chunks": 0}
+    t0 = time.perf_counter()
+
+    def _write(writer: pq.ParquetWriter, table: pa.Table) -> None:
+        writer.write_table(table)
+        stats["rows"] += table.num_rows
+        stats["errors"] += table.num_rows - table.column("error").null_count
+        stats["chunks"] += 1
+        if progress:
+            rate = stats["rows"] / max(time.perf_counter() - t0, 1e-9)
+            print(f"[bulk] {stats['rows']} rows ({stats['errors']} errors) - {rate:.0f} rows/s", file=sys.stderr)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with pq.ParquetWriter(output_path, SCHEMA, compression=compression) as writer:
+        if workers == 1:
+            _init_worker()
+            for df in iter_input_chunks(input_path, chunk_size):
+                _write(writer, compute_chunk(df, include_houses))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                pending: deque = deque()
+                for df in iter_input_chunks(input_path, chunk_size):
+                    if len(pending) >= max_pending:
+                        _write(writer, pending.popleft().result())
+                    pending.append(pool.submit(compute_chunk, df, include_houses))
+                while pending:
+                    _write(writer, pending.popleft().result())
+
+    stats["seconds"] = round(time.perf_counter() - t0, 3)
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cálculo masivo de cartas natales a Parquet")
+    parser.add_argument("input", type=Path, help="CSV o Parquet con columnas id, datetime, lat, lon")
+    parser.add_argument("output", type=Path, help="Archivo Parquet de salida")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (default: núcleos disponibles)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Filas por bloque / row group")
+    parser.add_argument("--max-pending", type=int, default=None, help="Bloques en vuelo (default: 2 x workers)")
+    parser.add_argument("--no-houses", action="store_true", help="Omitir casas, lotes y secta")
+    parser.add_argument("--compression", default="zstd", help="Códec Parquet (zstd, snappy, gzip, none)")
+    parser.add_argument("--quiet", action="store_true", help="Sin progreso en stderr")
+    args = parser.parse_args(argv)
+
+    if not args.input.exists():
+        parser.error(f"input not found: {args.input}")
+    stats = run(
+        args.input,
+        args.output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        max_pending=args.max_pending,
+        include_houses=not args.no_houses,
+        compression=args.compression,
+        progress=not args.quiet,
+    )
+    print(f"[bulk] Done: {stats['rows']} rows, {stats['errors']} errors, {stats['seconds']}s -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
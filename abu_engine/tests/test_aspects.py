@@ -0,0 +1,140 @@
+"""
+Test the shared aspect matrix kernel (core.aspects.aspect_matrix) and the
+scalar helpers and call sites built on it.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.aspects import (
+    ALL_ASPECTS,
+    ASPECTS,
+    aspect_between,
+    aspect_matrix,
+    calculate_aspect_type,
+    is_applying,
+)
+from core.chart import ASPECT_ORB, SUPPORTED_ASPECTS, chart_aspects
+from core.transits import DEFAULT_ORBS, calculate_transits
+
+
+def _brute_force(a_lons, b_lons, aspects, orbs):
+    """Reference: closest aspect within its own orb, per pair."""
+    out = {}
+    for i, a in enumerate(a_lons):
+        for j, b in enumerate(b_lons):
+            d = abs(a - b) % 360
+            sep = min(d, 360 - d)
+            best = None
+            for name, angle in aspects.items():
+                dev = abs(sep - angle)
+                if dev <= orbs.get(name, 3) and (best is None or dev < best[1]):
+                    best = (name, dev)
+            if best:
+                out[(i, j)] = best
+    return out
+
+
+def test_matrix_matches_brute_force():
+    """One broadcast gives the same pairs, types and orbs as nested loops."""
+    print("=== Testing Aspect Matrix ===")
+
+    rng = random.Random(7)
+    a = [rng.uniform(0, 360) for _ in range(12)]
+    b = [rng.uniform(-360, 720) for _ in range(15)]
+    m = aspect_matrix(a, b, ALL_ASPECTS, DEFAULT_ORBS)
+    assert m["aspect"].shape == (12, 15)
+
+    expected = _brute_force(a, b, ALL_ASPECTS, DEFAULT_ORBS)
+    found = {(int(i), int(j)) for i, j in zip(*np.nonzero(m["aspect"] >= 0))}
+    assert found == set(expected)
+    for (i, j), (name, dev) in expected.items():
+        assert m["names"][m["aspect"][i, j]] == name
+        assert abs(m["orb"][i, j] - dev) < 1e-9
+    assert m["applying"] is None
+    print(f"✓ {len(found)} aspects identical\n")
+
+
+def test_scalar_helpers():
+    """aspect_between / calculate_aspect_type / is_applying are views of the kernel."""
+    print("=== Testing Scalar Helpers ===")
+
+    assert aspect_between(10, 100) == ("square", 0.0)
+    assert aspect_between(10, 105) == ("square", 5.0)
+    assert aspect_between(10, 107) == (None, None)
+    # Cruce de 0° Aries: separación 8°
+    assert aspect_between(355, 3) == (None, None)
+    assert aspect_between(355, 3, orb=8) == ("conjunction", 8.0)
+
+    info = calculate_aspect_type(0, 127.5, include_minor=True)
+    assert info == {"aspect": "trine", "orb": 7.5, "angle": 127.5}
+    assert calculate_aspect_type(0, 25)["aspect"] is None
+    assert calculate_aspect_type(0, 25, include_minor=True)["aspect"] == "semisextile"
+
+    # Cuadratura aplicando (separación 88° creciendo) y separando
+    assert is_applying(100, 188, 1.0, 90) is True
+    assert is_applying(100, 192, 1.0, 90) is False
+    print("✓ Scalar helpers consistent\n")
+
+
+def test_applying_matrix():
+    """Relative speed decides applying for every pair in one pass."""
+    print("=== Testing Applying Matrix ===")
+
+    natal = [100.0, 10.0]
+    transit = [188.0, 192.0]
+    m = aspect_matrix(natal, transit, ASPECTS, 8, speeds_b=[1.0, 1.0])
+    assert m["applying"].shape == (2, 2)
+    assert bool(m["applying"][0, 0]) is True   # cuadratura 88° -> 90
+    assert bool(m["applying"][0, 1]) is False  # cuadratura 92° alejándose
+    # Ambos se mueven: velocidad relativa nula -> aplicativo por convención
+    m = aspect_matrix([100.0], [188.0], ASPECTS, 8, speeds_a=[1.0], speeds_b=[1.0])
+    assert bool(m["applying"][0, 0]) is True
+    print("✓ Applying matrix\n")
+
+
+def test_call_sites():
+    """Charts and transits are rebuilt on the kernel."""
+    print("=== Testing Call Sites ===")
+
+    positions = {"Sun": 10.0, "Moon": 100.5, "Mars": 190.0, "Venus": 250.0}
+    aspects = chart_aspects(positions, {"Sun": 1.0, "Moon": 13.0, "Mars": 0.5, "Venus": 1.2})
+    pairs = {(a.a, a.b, a.type) for a in aspects}
+    expected = _brute_force(list(positions.values()), list(positions.values()), SUPPORTED_ASPECTS,
+                            {k: ASPECT_ORB for k in SUPPORTED_ASPECTS})
+    names = list(positions)
+    assert pairs == {(names[i], names[j], t) for (i, j), (t, _) in expected.items() if i < j}
+    assert all(a.applying is not None for a in aspects)
+
+    natal = [{"name": "Sun", "longitude": 100.0}, {"name": "Moon", "longitude": 10.0}]
+    transit = [{"name": "Saturn", "longitude": 188.0, "speed": 0.05},
+               {"name": "Mars", "longitude": 12.0, "speed": -0.3}]
+    result = calculate_transits(natal, transit)
+    by_pair = {(t["natal_planet"], t["transit_planet"]): t for t in result}
+    assert by_pair[("Sun", "Saturn")]["aspect"] == "square" and by_pair[("Sun", "Saturn")]["applying"] is True
+    assert by_pair[("Moon", "Mars")]["aspect"] == "conjunction" and by_pair[("Moon", "Mars")]["applying"] is True
+    assert calculate_transits([], transit) == []
+    print("✓ Call sites use the kernel\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_matrix_matches_brute_force()
+        test_scalar_helpers()
+        test_applying_matrix()
+        test_call_sites()
+
+        print("=" * 60)
+        print("✓ All aspect tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
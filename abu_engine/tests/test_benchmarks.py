@@ -0,0 +1,69 @@
+"""
+Test the Abu micro-benchmark suite (benchmarks/bench_core.py).
+Checks measurement output, baseline comparison and the committed baseline.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from bench_core import BASELINE_PATH, BENCHMARKS, compare, run_benchmarks
+
+
+def test_run_single_benchmark():
+    """A cheap benchmark runs and reports per-call statistics."""
+    print("=== Testing Benchmark Run ===")
+
+    report = run_benchmarks(["get_all_fixed_star_contacts"], quick=True)
+    res = report["results"]["get_all_fixed_star_contacts"]
+    assert set(report["results"]) == {"get_all_fixed_star_contacts"}
+    assert 0 < res["min_ms"] <= res["median_ms"] <= res["max_ms"]
+    assert report["meta"]["seed"] == 1234
+    print(f"✓ Median: {res['median_ms']} ms\n")
+
+
+def test_compare_threshold():
+    """Ratios above 1 + threshold are regressions, below 1 - threshold improvements."""
+    print("=== Testing Baseline Comparison ===")
+
+    baseline = {"results": {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}, "c": {"median_ms": 10.0}}}
+    current = {"results": {
+        "a": {"median_ms": 13.0}, "b": {"median_ms": 7.0}, "c": {"median_ms": 11.0}, "d": {"median_ms": 1.0}
+    }}
+    cmp = compare(current, baseline, threshold=0.25)
+    statuses = {k: v["status"] for k, v in cmp["benchmarks"].items()}
+    assert statuses == {"a": "regression", "b": "improvement", "c": "ok", "d": "new"}
+    assert cmp["regressions"] == ["a"]
+    print("✓ Threshold applied\n")
+
+
+def test_committed_baseline_covers_suite():
+    """The committed baseline has an entry for every benchmark."""
+    print("=== Testing Committed Baseline ===")
+
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        baseline = json.load(f)
+    assert set(BENCHMARKS) <= set(baseline["results"])
+    print(f"✓ {len(baseline['results'])} benchmarks in baseline\n")
+
+
+if __name__ == "__main__":
+    print("Starting benchmark suite tests...\n")
+
+    try:
+        test_run_single_benchmark()
+        test_compare_threshold()
+        test_committed_baseline_covers_suite()
+
+        print("=" * 60)
+        print("✓ All benchmark suite tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,118 @@
+"""
+Test the offline bulk chart CLI (scripts/bulk_charts.py).
+Validates Parquet schema, input ordering, per-row errors and agreement with
+chart_json, for both the in-process and process-pool paths.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import bulk_charts
+from core.chart import chart_json
+
+BIRTHS = pd.DataFrame({
+    "id": ["ba", "mad", "bad-date", "lon", "bad-lat", "tok"],
+    "datetime": [
+        "1990-07-05T12:00:00Z",
+        "1985-03-21T06:30:00+02:00",
+        "yesterday",
+        "2001-11-11T23:59:00",
+        "2000-01-01T00:00:00Z",
+        "1975-09-30T03:15:00Z",
+    ],
+    "lat": [-34.6, 40.4, 0.0, 51.5, 95.0, 35.7],
+    "lon": [-58.4, -3.7, 0.0, -0.1, 0.0, 139.7],
+})
+
+
+def _run(tmp: Path, workers: int, suffix: str = ".csv") -> pd.DataFrame:
+    src = tmp / f"births{suffix}"
+    if suffix == ".csv":
+        BIRTHS.to_csv(src, index=False)
+    else:
+        BIRTHS.to_parquet(src, index=False)
+    out = tmp / f"charts_{workers}{suffix}.parquet"
+    stats = bulk_charts.run(src, out, workers=workers, chunk_size=2, progress=False)
+    assert stats["rows"] == len(BIRTHS) and stats["errors"] == 2 and stats["chunks"] == 3
+    table = pq.read_table(out)
+    assert table.schema.equals(bulk_charts.SCHEMA, check_metadata=False)
+    assert pq.ParquetFile(out).num_row_groups == 3
+    return table.to_pandas()
+
+
+def test_bulk_output():
+    """Rows keep input order; invalid rows carry an error; values match chart_json."""
+    print("=== Testing Bulk Chart Output ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        df = _run(Path(tmp), workers=1)
+
+    assert df["id"].tolist() == BIRTHS["id"].tolist()
+    assert df.loc[2, "error"] == "Invalid date format"
+    assert df.loc[4, "error"].startswith("lat")
+    assert df["error"].isna().sum() == 4
+
+    mad = df.iloc[1]
+    assert str(mad["datetime"]) == "1985-03-21 04:30:00+00:00"
+    chart = chart_json(mad["lat"], mad["lon"], mad["datetime"].to_pydatetime())
+    for planet in chart.planets:
+        assert abs(mad[f"{planet.name.lower()}_lon"] - planet.lon) < 1e-9
+        assert mad[f"{planet.name.lower()}_sign"] == planet.sign
+    assert 1 <= mad["sun_house"] <= 12
+    assert mad["sun_dignity"] in ("domicile", "exaltation", "detriment", "fall", "peregrine")
+    assert len(mad["aspects"]) == len(chart.aspects)
+    assert mad["lot_fortuna_lon"] is not None and mad["cusp_12"] is not None
+    print("✓ Ordered, validated and consistent with chart_json\n")
+
+
+def test_out_of_range_row():
+    """A row outside the ephemeris gets an error; the rest of the chunk is computed."""
+    print("=== Testing Out-of-Range Row ===")
+
+    chunk = pd.DataFrame({
+        "id": ["ok", "future"],
+        "datetime": ["1990-07-05T12:00:00Z", "2200-01-01T00:00:00Z"],
+        "lat": [-34.6, 0.0],
+        "lon": [-58.4, 0.0],
+    })
+    df = bulk_charts.compute_chunk(chunk).to_pandas()
+    assert pd.isna(df.loc[0, "error"]) and df.loc[0, "sun_lon"] is not None
+    assert "ephemeris range" in df.loc[1, "error"] and pd.isna(df.loc[1, "sun_lon"])
+    print("✓ Out-of-range row reported in place\n")
+
+
+def test_bulk_process_pool_matches_serial():
+    """The process pool and Parquet input produce the same table as the serial path."""
+    print("=== Testing Process Pool ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        serial = _run(Path(tmp), workers=1)
+        pooled = _run(Path(tmp), workers=2, suffix=".parquet")
+
+    cols = [c for c in serial.columns if c != "aspects"]
+    pd.testing.assert_frame_equal(serial[cols], pooled[cols])
+    print("✓ Pool output identical\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_bulk_output()
+        test_out_of_range_row()
+        test_bulk_process_pool_matches_serial()
+
+        print("=" * 60)
+        print("✓ All bulk chart tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,131 @@
+"""
+Test batch chart evaluation (core.chart.chart_json_many, core/batch.py,
+POST /api/astro/charts:batch).
+Validates equivalence with chart_json, input ordering and per-item errors.
+"""
+
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+from core.chart import chart_json, chart_json_many
+from core.houses_swiss import calculate_houses, get_planet_house
+from main import app
+
+client = TestClient(app)
+URL = "/api/astro/charts:batch"
+
+
+def test_many_matches_single():
+    """Vectorized evaluation gives the same planets and aspects as chart_json."""
+    print("=== Testing chart_json_many vs chart_json ===")
+
+    dates = [datetime(1950, 1, 1, tzinfo=timezone.utc) + timedelta(days=173.7 * i) for i in range(40)]
+    lats = [-34.6 + i for i in range(40)]
+    lons = [-58.4 + 2 * i for i in range(40)]
+    many = chart_json_many(dates, lats, lons)
+    assert len(many) == len(dates)
+
+    for d, la, lo, batch in zip(dates, lats, lons, many):
+        single = chart_json(la, lo, d)
+        assert batch.datetime == single.datetime
+        assert batch.location == single.location
+        for p, q in zip(batch.planets, single.planets):
+            assert p.name == q.name and p.sign == q.sign
+            assert abs(p.lon - q.lon) < 1e-9, f"{p.name}: {p.lon} vs {q.lon}"
+        assert batch.aspects == single.aspects
+    assert chart_json_many([], [], []) == []
+    print(f"✓ {len(dates)} charts identical\n")
+
+
+def test_endpoint_order_and_houses():
+    """Results come back in input order with swisseph houses per item."""
+    print("=== Testing Batch Endpoint ===")
+
+    items = [
+        {"datetime": "1990-07-05T12:00:00Z", "lat": -34.6, "lon": -58.4, "id": "ba"},
+        {"datetime": "1985-03-21T06:30:00+02:00", "lat": 40.4, "lon": -3.7, "id": "mad"},
+        {"datetime": "2001-11-11T23:59:00", "lat": 51.5, "lon": -0.1, "id": "lon"},
+    ]
+    r = client.post(URL, json={"items": items})
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["count"] == 3 and data["errors"] == 0
+    assert [x["id"] for x in data["results"]] == ["ba", "mad", "lon"]
+    assert [x["index"] for x in data["results"]] == [0, 1, 2]
+
+    mad = data["results"][1]
+    dt = datetime(1985, 3, 21, 4, 30, tzinfo=timezone.utc)
+    assert mad["datetime"] == dt.isoformat()
+    houses = calculate_houses(dt, 40.4, -3.7)
+    assert abs(mad["asc"] - houses["asc"]) < 1e-9
+    for planet in mad["planets"]:
+        assert planet["house"] == get_planet_house(planet["lon"], houses["cusps"])
+    print("✓ Ordered results with houses\n")
+
+
+def test_per_item_errors():
+    """Invalid items report an error in place without failing the batch."""
+    print("=== Testing Per-Item Errors ===")
+
+    items = [
+        {"datetime": "not-a-date", "lat": 0, "lon": 0, "id": "bad-date"},
+        {"datetime": "2000-01-01T00:00:00Z", "lat": 0, "lon": 0},
+        {"datetime": "2000-01-01T00:00:00Z", "lat": 120, "lon": 0, "id": "bad-lat"},
+    ]
+    r = client.post(URL, json={"items": items, "include_houses": False})
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["count"] == 3 and data["errors"] == 2
+    first, ok, bad_lat = data["results"]
+    assert first == {"index": 0, "id": "bad-date", "error": "Invalid date format"}
+    assert "error" in bad_lat and bad_lat["index"] == 2
+    assert "error" not in ok and len(ok["planets"]) == 10
+    assert "asc" not in ok and all(p["house"] is None for p in ok["planets"])
+
+    # Una fecha fuera de la efeméride no tumba el lote
+    items.append({"datetime": "2200-01-01T00:00:00Z", "lat": 0, "lon": 0, "id": "out-of-range"})
+    r = client.post(URL, json={"items": items, "include_houses": True})
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["errors"] == 3 and "ephemeris range" in data["results"][3]["error"]
+    assert "error" not in data["results"][1] and len(data["results"][1]["planets"]) == 10
+    print("✓ Errors reported per item\n")
+
+
+def test_batch_limits():
+    """Empty and oversized batches are rejected with 400."""
+    print("=== Testing Batch Limits ===")
+    import core.batch as batch
+
+    assert client.post(URL, json={"items": []}).status_code == 400
+    original = batch.BATCH_MAX_ITEMS
+    batch.BATCH_MAX_ITEMS = 2
+    try:
+        item = {"datetime": "2000-01-01T00:00:00Z", "lat": 0, "lon": 0}
+        assert client.post(URL, json={"items": [item] * 3}).status_code == 400
+    finally:
+        batch.BATCH_MAX_ITEMS = original
+    print("✓ Limits enforced\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_many_matches_single()
+        test_endpoint_order_and_houses()
+        test_per_item_errors()
+        test_batch_limits()
+
+        print("=" * 60)
+        print("✓ All batch chart tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,144 @@
+"""
+Test the in-memory city index (core/cities.py): accent-folded prefix and
+fuzzy search, k-d tree nearest lookup against a full scan, and mtime reload.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.cities import CityIndex, fold, get_city_index
+
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371.0 * np.arcsin(np.sqrt(a))
+
+
+def test_fold():
+    """Accents, case and punctuation are normalized."""
+    print("=== Testing Normalization ===")
+
+    assert fold("Córdoba") == "cordoba"
+    assert fold("  São Paulo ") == "sao paulo"
+    assert fold("Zürich (Kreis 3)") == "zurich kreis 3"
+    assert fold("St.-Étienne") == "st etienne"
+    print("✓ Folded\n")
+
+
+def test_search_cities_json():
+    """Prefix, accent-insensitive, country and fuzzy matches on data/cities.json."""
+    print("=== Testing Search ===")
+
+    index = get_city_index()
+    assert len(index) > 0
+
+    def names(q):
+        return [c["city"] for c in index.search(q)]
+
+    assert names("cordoba")[0] == "Córdoba"
+    assert names("CÓRD")[0] == "Córdoba"
+    assert names("buenos")[0] == "Buenos Aires"
+    assert names("aires")[0] == "Buenos Aires"  # prefijo de una palabra del nombre
+    assert names("Barcelna")[0] == "Barcelona"  # aproximada
+    assert "La Habana" in names("aba")  # subcadena del nombre, como la búsqueda lineal original
+    assert "Guadalajara" in names("adal")
+    spain = index.search("espana")
+    assert spain and all(c["country"] == "España" for c in spain)
+    assert index.search("m")[:20] == index.cities[:20]  # consulta corta: primeras ciudades
+    assert index.search("xqzw") == []
+    assert len(index.search("a", limit=3)) == 3
+    print("✓ Search ranking\n")
+
+
+def test_ranking_order():
+    """Exact name beats name prefix, which beats word and country prefixes; ties by population."""
+    print("=== Testing Ranking ===")
+
+    index = CityIndex([
+        {"city": "Santa Rosa", "country": "Argentina", "lat": 0, "lon": 0},
+        {"city": "Rosario", "country": "Argentina", "lat": 0, "lon": 0},
+        {"city": "Rosa", "country": "Italia", "lat": 0, "lon": 0},
+        {"city": "Roskilde", "country": "Denmark", "lat": 0, "lon": 0, "population": 50000},
+        {"city": "Lima", "country": "Rossland", "lat": 0, "lon": 0},
+    ])
+    # Después de los prefijos vienen las coincidencias aproximadas
+    assert [c["city"] for c in index.search("rosa")][:3] == ["Rosa", "Rosario", "Santa Rosa"]
+    assert [c["city"] for c in index.search("ros")] == ["Roskilde", "Rosario", "Rosa", "Santa Rosa", "Lima"]
+    # Subcadenas del nombre o del país, antes que las aproximadas; empates por orden del archivo
+    assert [c["city"] for c in index.search("osa")] == ["Santa Rosa", "Rosario", "Rosa"]
+    assert [c["city"] for c in index.search("kild")] == ["Roskilde"]
+    assert [c["city"] for c in index.search("ssla")] == ["Lima"]
+    print("✓ Ranking order\n")
+
+
+def test_nearest_matches_full_scan():
+    """k-d tree nearest cities equal a brute-force haversine scan."""
+    print("=== Testing Nearest ===")
+
+    rng = np.random.default_rng(21)
+    n = 3000
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lons = rng.uniform(-180, 180, n)
+    index = CityIndex([
+        {"city": f"C{i}", "country": "X", "lat": float(a), "lon": float(o)} for i, (a, o) in enumerate(zip(lats, lons))
+    ])
+    queries = [(89.9, 10.0), (-89.9, -170.0), (0.0, 179.99), (0.0, -179.99)]
+    queries += [(float(a), float(o)) for a, o in zip(rng.uniform(-90, 90, 100), rng.uniform(-180, 180, 100))]
+    for lat, lon in queries:
+        for k in (1, 4):
+            result = index.nearest(lat, lon, k)
+            expected = np.sort(_haversine_km(lat, lon, lats, lons))[:k]
+            assert np.allclose([c["distance_km"] for c in result], expected, atol=0.06)
+    madrid = get_city_index().nearest(40.42, -3.70)[0]
+    assert madrid["city"] == "Madrid" and madrid["distance_km"] < 5
+    assert CityIndex([]).nearest(0, 0) == []
+    assert len(CityIndex(index.cities[:2]).nearest(0, 0, 5)) == 2
+    print(f"✓ {len(queries)} queries identical to the full scan\n")
+
+
+def test_mtime_reload():
+    """The index is reused while the file is unchanged and rebuilt when it changes."""
+    print("=== Testing Reload ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cities.json"
+        path.write_text(json.dumps([{"city": "Quito", "country": "Ecuador", "lat": -0.18, "lon": -78.47}]), encoding="utf-8")
+        first = get_city_index(path)
+        assert get_city_index(path) is first
+        path.write_text(json.dumps([
+            {"city": "Quito", "country": "Ecuador", "lat": -0.18, "lon": -78.47},
+            {"city": "Cuenca", "country": "Ecuador", "lat": -2.90, "lon": -79.00},
+        ]), encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = get_city_index(path)
+        assert second is not first and len(second) == 2
+        assert second.search("cuenca")[0]["city"] == "Cuenca"
+    print("✓ Reloaded on mtime change\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_fold()
+        test_search_cities_json()
+        test_ranking_order()
+        test_nearest_matches_full_scan()
+        test_mtime_reload()
+
+        print("=" * 60)
+        print("✓ All city index tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,121 @@
+"""
+Test the electional window search (core/electional.py, /api/astro/electional).
+Every sample inside a returned window must satisfy the rules when checked
+with the scalar primitives.
+"""
+
+import sys
+import time
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+from core.aspects import aspect_between
+from core.chart import chart_json, get_sign
+from core.dignities import get_planet_dignity
+from core.electional import ElectionalRules, electional_search
+from core.lunar_mansions import get_lunar_mansion
+from main import app
+
+client = TestClient(app)
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+LAT, LON = -34.6037, -58.3816
+
+
+def _check(dt: datetime, rules: ElectionalRules) -> None:
+    lons = {p.name: p.lon for p in chart_json(LAT, LON, dt).planets}
+    moon, sun = lons["Moon"], lons["Sun"]
+    assert get_lunar_mansion(moon)["nature"] in rules.mansion_natures
+    assert abs((moon - sun + 180) % 360 - 180) >= 17 - 0.01
+    assert get_planet_dignity("Moon", get_sign(moon), moon % 30)["score"] >= 0
+    for malefic in rules.avoid_aspects_to:
+        name, orb = aspect_between(moon, lons[malefic], orb=rules.aspect_orb)
+        assert name is None or abs(orb) > rules.aspect_orb - 0.01, (dt, malefic, name, orb)
+
+
+def test_windows_satisfy_rules():
+    """Window starts, peaks and ends (minus one step) satisfy every rule."""
+    print("=== Testing Electional Windows ===")
+
+    rules = ElectionalRules()
+    result = electional_search(START, START + timedelta(days=90), LAT, LON, rules, step_minutes=30)
+    windows = result["windows"]
+    assert windows and result["qualifying_samples"] < result["samples"]
+    scores = [w["score"] for w in windows]
+    assert scores == sorted(scores, reverse=True)
+    for w in windows[:10]:
+        _check(datetime.fromisoformat(w["start"]), rules)
+        _check(datetime.fromisoformat(w["peak"]["time"]), rules)
+        _check(datetime.fromisoformat(w["end"]) - timedelta(minutes=30), rules)
+        assert 0 <= w["peak"]["asc"] < 360
+    print(f"✓ {len(windows)} windows, best score {scores[0]}\n")
+
+
+def test_minute_grid_fast():
+    """Ninety days at one-minute resolution in well under a second."""
+    print("=== Testing Minute Grid ===")
+
+    electional_search(START, START + timedelta(days=2), LAT, LON)  # warm-up
+    t0 = time.perf_counter()
+    result = electional_search(START, START + timedelta(days=90), LAT, LON, step_minutes=1,
+                               min_duration_minutes=120, top=5)
+    elapsed = time.perf_counter() - t0
+    assert result["samples"] == 90 * 1440 + 1
+    assert len(result["windows"]) <= 5 and all(w["duration_minutes"] >= 120 for w in result["windows"])
+    assert elapsed < 1.0, f"{elapsed:.2f}s"
+    print(f"✓ {result['samples']} samples in {elapsed:.3f}s\n")
+
+
+def test_endpoint():
+    """The endpoint applies the rule set and validates input."""
+    print("=== Testing Endpoint ===")
+
+    body = {"start": "2025-01-01T00:00:00Z", "end": "2025-02-01T00:00:00Z", "lat": LAT, "lon": LON,
+            "rules": {"mansion_natures": ["fortunate", "mixed"], "moon_waxing": True}}
+    r = client.post("/api/astro/electional", json=body)
+    assert r.status_code == 200, r.text
+    assert r.json()["windows"]
+
+    assert client.post("/api/astro/electional", json={**body, "end": "2024-01-01"}).status_code == 400
+    assert client.post("/api/astro/electional", json={**body, "step_minutes": 0}).status_code == 400
+    bad_rules = {**body, "rules": {"avoid_aspects_to": ["Chiron"]}}
+    assert client.post("/api/astro/electional", json=bad_rules).status_code == 400
+    assert client.post("/api/astro/electional", json={**body, "start": "nope"}).status_code == 422
+    print("✓ Endpoint OK\n")
+
+
+def test_polar_latitude():
+    """At lat 70 the windows are still found; the peak Ascendant is None with a note."""
+    print("=== Testing Polar Latitude ===")
+
+    body = {"start": "2025-01-01T00:00:00Z", "end": "2025-02-01T00:00:00Z", "lat": 70.0, "lon": 25.0,
+            "rules": {"mansion_natures": ["fortunate", "mixed"], "moon_waxing": True}}
+    r = client.post("/api/astro/electional", json=body)
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data["windows"]
+    assert all(w["peak"]["asc"] is None for w in data["windows"])
+    assert data["note"].startswith("Houses not available")
+    assert "note" not in client.post("/api/astro/electional", json={**body, "lat": LAT, "lon": LON}).json()
+    print(f"✓ {len(data['windows'])} windows, {data['note']}\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_windows_satisfy_rules()
+        test_minute_grid_fast()
+        test_endpoint()
+        test_polar_latitude()
+
+        print("=" * 60)
+        print("✓ All electional tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
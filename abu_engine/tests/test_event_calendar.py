@@ -0,0 +1,203 @@
+"""
+Test the precomputed event calendar (core/event_calendar.py): lunations,
+eclipse classification, stations and ingresses against known dates, the
+SQLite range queries and the /api/astro/events endpoint.
+"""
+
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+import core.event_calendar as event_calendar
+from core.chart import ephemeris_years
+from core.event_calendar import build_event_calendar, calendar_coverage, query_events
+from main import app
+
+client = TestClient(app)
+CALENDAR = Path(tempfile.mkdtemp()) / "events.sqlite"
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def _minutes(event, when):
+    return abs((datetime.fromisoformat(event["time"]) - when).total_seconds()) / 60.0
+
+
+def _calendar():
+    if not CALENDAR.exists():
+        build_event_calendar(2023, 2026, CALENDAR)
+    return CALENDAR
+
+
+def test_eclipses():
+    """Eclipse dates and types 2023-2026 (NASA canon)."""
+    print("=== Testing Eclipses ===")
+
+    path = _calendar()
+    expected = {
+        "solar_eclipse": {
+            "2023-04-20": "annular",  # híbrido: central, la Luna apenas menor que el Sol
+            "2023-10-14": "annular", "2024-04-08": "total", "2024-10-02": "annular",
+            "2025-03-29": "partial", "2025-09-21": "partial", "2026-02-17": "annular", "2026-08-12": "total",
+        },
+        "lunar_eclipse": {
+            "2023-05-05": "penumbral", "2023-10-28": "partial", "2024-03-25": "penumbral", "2024-09-18": "partial",
+            "2025-03-14": "total", "2025-09-07": "total", "2026-03-03": "total", "2026-08-28": "partial",
+        },
+    }
+    for kind, dates in expected.items():
+        events = query_events(_utc(2023, 1, 1), _utc(2027, 1, 1), kinds=[kind], path=path)["events"]
+        found = {e["time"][:10]: e["detail"] for e in events}
+        print(f"{kind}: {found}")
+        assert found == dates
+
+    # Máximo del eclipse total de 2024-04-08: 18:17 UTC (la conjunción en longitud, 18:21)
+    eclipse = query_events(_utc(2024, 4, 8), _utc(2024, 4, 9), kinds=["solar_eclipse"], path=path)["events"][0]
+    assert _minutes(eclipse, _utc(2024, 4, 8, 18, 17)) < 10
+    assert eclipse["body"] == "Sun" and eclipse["sign"] == "Aries"
+    print("✓ Eclipse dates and types\n")
+
+
+def test_lunations():
+    """New and full moons alternate and are ~29.53 days apart."""
+    print("=== Testing Lunations ===")
+
+    path = _calendar()
+    events = query_events(_utc(2023, 1, 1), _utc(2027, 1, 1), kinds=["new_moon", "full_moon"], path=path)["events"]
+    assert len(events) == 99
+    assert all(a["kind"] != b["kind"] for a, b in zip(events, events[1:]))
+    new = [datetime.fromisoformat(e["time"]) for e in events if e["kind"] == "new_moon"]
+    gaps = [(b - a).total_seconds() / 86400 for a, b in zip(new, new[1:])]
+    assert 29.2 < min(gaps) and max(gaps) < 29.9
+    # Luna llena 2025-03-14 06:55 UTC (la del eclipse total)
+    full = query_events(_utc(2025, 3, 14), _utc(2025, 3, 15), kinds=["full_moon"], path=path)["events"]
+    assert len(full) == 1 and _minutes(full[0], _utc(2025, 3, 14, 6, 55)) < 3
+    print(f"✓ {len(events)} lunations, synodic month {min(gaps):.2f}-{max(gaps):.2f} days\n")
+
+
+def test_stations_and_ingresses():
+    """Mercury retrograde of August 2024: station, re-ingress into Leo, direct station."""
+    print("=== Testing Stations and Ingresses ===")
+
+    path = _calendar()
+    events = query_events(
+        _utc(2024, 7, 20), _utc(2024, 9, 15), kinds=["station", "ingress"], bodies=["Mercury"], path=path
+    )["events"]
+    summary = [(e["kind"], e["sign"], e["detail"]) for e in events]
+    for e in events:
+        print(f"  {e['time']} {e['kind']} {e['sign']} {e['detail']}")
+    assert summary == [
+        ("ingress", "Virgo", "direct"),
+        ("station", "Virgo", "retrograde"),
+        ("ingress", "Leo", "retrograde"),
+        ("station", "Leo", "direct"),
+        ("ingress", "Virgo", "direct"),
+    ]
+    assert _minutes(events[1], _utc(2024, 8, 5, 4, 56)) < 30
+
+    # El Sol entra en los doce signos cada año, sin estaciones
+    sun = query_events(_utc(2025, 1, 1), _utc(2026, 1, 1), bodies=["Sun"], kinds=["ingress", "station"], path=path)
+    assert [e["detail"] for e in sun["events"]] == ["direct"] * 12
+    assert len({e["sign"] for e in sun["events"]}) == 12
+    print("✓ Stations and ingresses\n")
+
+
+def test_range_queries():
+    """Half-open ranges, filters, limit and coverage."""
+    print("=== Testing Range Queries ===")
+
+    path = _calendar()
+    assert calendar_coverage(path) == {"start": "2023-01-01T00:00:00+00:00", "end": "2027-01-01T00:00:00+00:00"}
+    everything = query_events(_utc(2023, 1, 1), _utc(2027, 1, 1), limit=5000, path=path)["events"]
+    times = [e["time"] for e in everything]
+    assert times == sorted(times)
+
+    # [start, end) sin solapamiento: dos mitades suman el total
+    first = query_events(_utc(2023, 1, 1), _utc(2025, 1, 1), limit=5000, path=path)["events"]
+    second = query_events(_utc(2025, 1, 1), _utc(2027, 1, 1), limit=5000, path=path)["events"]
+    assert first + second == everything
+
+    exact = datetime.fromisoformat(everything[10]["time"])
+    assert query_events(exact, _utc(2027, 1, 1), limit=5000, path=path)["events"][0]["time"] == everything[10]["time"]
+
+    limited = query_events(_utc(2023, 1, 1), _utc(2027, 1, 1), limit=5, path=path)
+    assert limited["truncated"] and limited["events"] == everything[:5]
+    assert not query_events(_utc(2030, 1, 1), _utc(2031, 1, 1), path=path)["events"]
+
+    try:
+        query_events(_utc(2024, 1, 1), _utc(2025, 1, 1), kinds=["eclipse"], path=path)
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+    try:
+        query_events(_utc(2025, 1, 1), _utc(2024, 1, 1), path=path)
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+    # Años fuera del kernel cargado: no se construye nada
+    first, last = ephemeris_years()
+    try:
+        build_event_calendar(first, last + 1, CALENDAR.with_name("outside.sqlite"))
+        raise AssertionError("expected ValueError")
+    except ValueError as e:
+        assert "ephemeris range" in str(e)
+    assert not CALENDAR.with_name("outside.sqlite").exists()
+    print(f"✓ {len(everything)} events, filters and limits\n")
+
+
+def test_events_endpoint():
+    """GET /api/astro/events reads EVENT_CALENDAR_PATH; 503 while it is not built."""
+    print("=== Testing /api/astro/events ===")
+
+    shipped = event_calendar.EVENT_CALENDAR_PATH
+    event_calendar.EVENT_CALENDAR_PATH = _calendar()
+    try:
+        r = client.get("/api/astro/events", params={"start": "2024-04-01T00:00:00Z", "end": "2024-04-10T00:00:00Z"})
+        assert r.status_code == 200, r.text
+        data = r.json()
+        kinds = [e["kind"] for e in data["events"]]
+        assert "solar_eclipse" in kinds and "new_moon" in kinds
+        assert data["coverage"] == {"start": "2023-01-01T00:00:00+00:00", "end": "2027-01-01T00:00:00+00:00"}
+
+        r = client.get("/api/astro/events", params={
+            "start": "2024-01-01", "end": "2025-01-01", "kinds": "station", "bodies": "Mercury"
+        })
+        assert r.status_code == 200
+        assert [e["detail"] for e in r.json()["events"]] == ["direct"] + ["retrograde", "direct"] * 3
+
+        assert client.get("/api/astro/events", params={"start": "2024-01-01", "end": "2025-01-01", "kinds": "eclipse"}).status_code == 400
+        assert client.get("/api/astro/events", params={"start": "2025-01-01", "end": "2024-01-01"}).status_code == 400
+        assert client.get("/api/astro/events", params={"start": "ayer", "end": "2025-01-01"}).status_code == 422
+
+        event_calendar.EVENT_CALENDAR_PATH = CALENDAR.with_name("missing.sqlite")
+        r = client.get("/api/astro/events", params={"start": "2024-01-01", "end": "2025-01-01"})
+        assert r.status_code == 503 and "build_event_calendar" in r.json()["detail"]
+    finally:
+        event_calendar.EVENT_CALENDAR_PATH = shipped
+    print("✓ Endpoint\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_eclipses()
+        test_lunations()
+        test_stations_and_ingresses()
+        test_range_queries()
+        test_events_endpoint()
+
+        print("=" * 60)
+        print("✓ All event calendar tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
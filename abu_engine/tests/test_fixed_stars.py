@@ -0,0 +1,146 @@
+"""
+Test the fixed-star catalogue (core/fixed_stars.py): loading, precession,
+and the searchsorted conjunction windows against a brute-force scan.
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.fixed_stars import (
+    FIXED_STARS,
+    find_fixed_star_conjunctions,
+    format_fixed_stars_output,
+    get_all_fixed_star_contacts,
+    load_star_catalog,
+    star_conjunctions,
+    star_longitudes,
+)
+
+
+def _brute_force(lons, star_lon, orb, magnitude, max_magnitude=None):
+    pairs = set()
+    for p, lon in enumerate(lons):
+        for s in range(star_lon.size):
+            if max_magnitude is not None and magnitude[s] > max_magnitude:
+                continue
+            if abs((lon - star_lon[s] + 180) % 360 - 180) <= orb[s]:
+                pairs.add((p, s))
+    return pairs
+
+
+def test_catalog_loaded_sorted():
+    """Hundreds of stars, sorted by J2000 longitude, with known positions."""
+    print("=== Testing Catalogue ===")
+
+    catalog = load_star_catalog()
+    assert catalog["lon"].size >= 300
+    assert np.all(np.diff(catalog["lon"]) >= 0)
+    names = list(catalog["name"])
+    # Longitudes eclípticas J2000 de referencia
+    for name, expected in [("Regulus", 149.83), ("Aldebaran", 69.79), ("Spica", 203.84), ("Algol", 56.17)]:
+        assert abs(catalog["lon"][names.index(name)] - expected) < 0.01, name
+    assert FIXED_STARS["Regulus"]["nature"] == "Mars-Jupiter"
+    print(f"✓ {catalog['lon'].size} stars\n")
+
+
+def test_catalog_only_stars():
+    """No Swiss Ephemeris reference points, non-stellar objects or repeated stars."""
+    print("=== Testing Catalogue Cleanup ===")
+
+    catalog = load_star_catalog()
+    names = set(catalog["name"])
+    placeholders = {
+        "ZerL2000", "NGC 4194", "Gal.Plane Pole", "Gal.Pole IAU1958", "Gal.Pole",
+        "Infrared Dragon", "Sun Pole", "Test", "AA11_page_B73",
+    }
+    assert not names & placeholders, names & placeholders
+    # Un nombre por estrella: FIXED_STARS (por nombre) no pierde registros (π3/π4 Ori "Tabit")
+    assert len(names) == catalog["name"].size
+    assert len(FIXED_STARS) == catalog["name"].size
+    # Sin dos registros en la misma posición (α Cen sólo una vez)
+    ra, dec = np.radians(catalog["ra"]), np.radians(catalog["dec"])
+    xyz = np.stack([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)], axis=1)
+    separation = np.degrees(np.arccos(np.clip(xyz @ xyz.T, -1, 1))) * 3600
+    np.fill_diagonal(separation, np.inf)
+    assert separation.min() > 30, separation.min()
+
+    # Un Sol en 180° (ZerL2000, polos galácticos) no toca ningún punto de relleno
+    contacts = get_all_fixed_star_contacts([{"name": "Sun", "longitude": 180.0}])
+    assert not {c["star"] for c in contacts} & placeholders
+    print(f"✓ {catalog['name'].size} real stars\n")
+
+
+def test_precession():
+    """About 1.4° per century; Regulus enters Virgo (of date) around 2012."""
+    print("=== Testing Precession ===")
+
+    names = list(load_star_catalog()["name"])
+    regulus = names.index("Regulus")
+    j2000 = star_longitudes()
+    assert np.array_equal(star_longitudes(None), j2000)
+    in_2100 = star_longitudes(datetime(2100, 1, 1, 12, tzinfo=timezone.utc))
+    shift = (in_2100 - j2000 + 180) % 360 - 180
+    assert 1.35 < np.median(shift) < 1.45
+    assert star_longitudes(datetime(2010, 1, 1))[regulus] < 150.0 < star_longitudes(datetime(2013, 1, 1))[regulus]
+    print(f"✓ Median shift per century: {np.median(shift):.4f}°\n")
+
+
+def test_windows_match_brute_force():
+    """searchsorted windows find exactly the pairs of a full scan, including wrap-around."""
+    print("=== Testing Conjunction Windows ===")
+
+    catalog = load_star_catalog()
+    rng = np.random.default_rng(9)
+    lons = np.concatenate([rng.uniform(0, 360, 300), [0.0, 0.3, 359.7, 359.99, 360.0, -1.0]])
+    for epoch, max_magnitude in [(None, None), (datetime(1950, 6, 1), None), (datetime(2030, 1, 1), 2.5)]:
+        points, stars, orbs, star_lon = star_conjunctions(lons, epoch, max_magnitude)
+        found = set(zip(points.tolist(), stars.tolist()))
+        assert len(found) == points.size
+        expected = _brute_force(lons % 360, star_lon, catalog["orb"], catalog["magnitude"], max_magnitude)
+        assert found == expected, (epoch, len(found), len(expected))
+        assert np.all(orbs <= catalog["orb"][stars])
+    print(f"✓ {len(found)} contacts identical to the full scan\n")
+
+
+def test_contacts_format():
+    """Public helpers keep their output format."""
+    print("=== Testing Contacts Format ===")
+
+    regulus = FIXED_STARS["Regulus"]["longitude"]
+    conj = find_fixed_star_conjunctions(regulus + 0.5, "Sun")
+    assert any(c["star"] == "Regulus" and c["orb"] == 0.5 and c["match"] for c in conj)
+
+    contacts = get_all_fixed_star_contacts([
+        {"name": "Sun", "longitude": regulus},
+        {"name": "Moon", "longitude": FIXED_STARS["Algol"]["longitude"]},
+    ])
+    assert {"Sun", "Moon"} <= {c["planet"] for c in contacts}
+    formatted = format_fixed_stars_output(contacts)
+    regulus_row = next(f for f in formatted if f["star"] == "Regulus")
+    assert regulus_row["long"] == "Leo 29°" and regulus_row["planet"] == "Sun"
+    assert get_all_fixed_star_contacts([]) == []
+    print("✓ Output format\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_catalog_loaded_sorted()
+        test_catalog_only_stars()
+        test_precession()
+        test_windows_match_brute_force()
+        test_contacts_format()
+
+        print("=" * 60)
+        print("✓ All fixed star tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
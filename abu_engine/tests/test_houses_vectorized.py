@@ -0,0 +1,150 @@
+"""
+Test the vectorized house engine (core/houses.py) against swisseph.
+Cusps, ASC, MC and ARMC must agree to well under an arc-second for
+Placidus, Koch, Equal and Whole Sign.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import swisseph as swe
+
+from core.houses import houses_many, julian_days
+from core.houses_swiss import (
+    HOUSE_SYSTEM_EQUAL,
+    HOUSE_SYSTEM_KOCH,
+    HOUSE_SYSTEM_PLACIDUS,
+    HOUSE_SYSTEM_WHOLE_SIGN,
+    calculate_houses,
+    get_planet_house,
+    house_numbers,
+)
+from core.extended_calc import find_house
+
+ARCSEC = 1.0 / 3600.0
+SYSTEMS = [HOUSE_SYSTEM_PLACIDUS, HOUSE_SYSTEM_KOCH, HOUSE_SYSTEM_EQUAL, HOUSE_SYSTEM_WHOLE_SIGN]
+
+
+def _diff(a, b):
+    return np.abs((np.asarray(a) - np.asarray(b) + 180.0) % 360.0 - 180.0)
+
+
+def test_locations_match_swisseph():
+    """Random instants and locations, including polar latitudes."""
+    print("=== Testing Locations vs swisseph ===")
+
+    rng = np.random.default_rng(7)
+    n = 400
+    jd = 2451545.0 + rng.uniform(-25000, 15000, n)
+    lat = rng.uniform(-85, 85, n)
+    lon = rng.uniform(-180, 180, n)
+    for system in SYSTEMS:
+        result = houses_many(jd, lat, lon, system)
+        worst = 0.0
+        for i in range(n):
+            try:
+                cusps, ascmc = swe.houses(jd[i], lat[i], lon[i], system)
+            except Exception:
+                # Placidus/Koch no definidos dentro del círculo polar
+                assert not result["valid"][i] and np.isnan(result["cusps"][i]).all()
+                continue
+            assert result["valid"][i]
+            worst = max(worst, _diff(cusps[:12], result["cusps"][i]).max())
+            assert _diff(ascmc[0], result["asc"][i]) < ARCSEC
+            assert _diff(ascmc[1], result["mc"][i]) < ARCSEC
+            assert _diff(ascmc[2], result["armc"][i]) < ARCSEC
+        assert worst < ARCSEC, f"{system}: {worst * 3600:.4f}\""
+        print(f"✓ {system.decode()}: max cusp error {worst * 3600:.5f}\"")
+    print()
+
+
+def test_instants_at_one_location():
+    """Many instants at a fixed place match calculate_houses."""
+    print("=== Testing Instants at One Location ===")
+
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    dates = [start + timedelta(hours=7 * k) for k in range(200)]
+    result = houses_many(julian_days(dates), 40.4168, -3.7038)
+    assert result["cusps"].shape == (200, 12)
+    for k in range(0, 200, 13):
+        ref = calculate_houses(dates[k], 40.4168, -3.7038)
+        assert _diff(ref["cusps"], result["cusps"][k]).max() < ARCSEC
+        assert _diff(ref["asc"], result["asc"][k]) < ARCSEC
+    print("✓ 200 instants consistent\n")
+
+
+def test_grid_broadcast():
+    """A latitude x longitude grid at one instant broadcasts to (lat, lon, 12)."""
+    print("=== Testing Grid Broadcast ===")
+
+    jd = julian_days(datetime(2000, 1, 1, 12, tzinfo=timezone.utc))[0]
+    lats = np.linspace(-60, 60, 25)[:, None]
+    lons = np.linspace(-180, 180, 73)[None, :]
+    result = houses_many(jd, lats, lons, HOUSE_SYSTEM_PLACIDUS)
+    assert result["cusps"].shape == (25, 73, 12)
+    assert result["valid"].all()
+    # La cúspide 10 es el MC y la 1 el ASC
+    assert np.allclose(result["cusps"][..., 9], result["mc"])
+    assert np.allclose(result["cusps"][..., 0], result["asc"])
+    print("✓ Grid shape and angles\n")
+
+
+def _reference_house(lon, cusps):
+    """Original loop of get_planet_house / find_house."""
+    lon = lon % 360.0
+    for i in range(12):
+        start, end = cusps[i] % 360.0, cusps[(i + 1) % 12] % 360.0
+        if start > end:
+            if lon >= start or lon < end:
+                return i + 1
+        elif start <= lon < end:
+            return i + 1
+    return 1
+
+
+def test_house_numbers_match_loop():
+    """Rotated searchsorted placement equals the old per-cusp loop."""
+    print("=== Testing House Placement ===")
+
+    rng = np.random.default_rng(3)
+    jd = 2451545.0 + rng.uniform(-20000, 20000, 60)
+    lat = rng.uniform(-60, 60, 60)
+    lon = rng.uniform(-180, 180, 60)
+    lons = np.concatenate([rng.uniform(0, 360, 200), np.arange(0, 360, 30.0), [359.999999, -10.0, 725.0]])
+    for system in SYSTEMS:
+        cusps = houses_many(jd, lat, lon, system)["cusps"]
+        batch = house_numbers(lons, cusps)
+        assert batch.shape == (60, len(lons))
+        for c in range(0, 60, 7):
+            row = list(cusps[c])
+            # Los puntos exactamente en la cúspide pertenecen a la casa que empieza ahí
+            points = np.concatenate([lons, cusps[c]])
+            expected = [_reference_house(x, row) for x in points]
+            assert list(house_numbers(points, row)) == expected
+            assert list(batch[c]) == expected[:len(lons)]
+            assert get_planet_house(points[5], row) == expected[5]
+            assert find_house(points[-1], row) == expected[-1]
+    assert find_house(10.0, [0.0] * 3) == 0 and get_planet_house(10.0, []) == 1
+    print("✓ Placement identical for all systems\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_locations_match_swisseph()
+        test_instants_at_one_location()
+        test_grid_broadcast()
+        test_house_numbers_match_loop()
+
+        print("=" * 60)
+        print("✓ All vectorized house tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
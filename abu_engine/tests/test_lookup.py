@@ -0,0 +1,158 @@
+"""
+Test the precomputed dignity/term/face/mansion tables (core/lookup.py).
+The scalar wrappers must agree exactly with the original branching
+implementations, including exact-degree orb boundaries.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core import dignities, extended_calc
+from core.dignities import get_planet_dignity
+from core.extended_calc import calculate_dignity
+from core.lookup import (
+    DIGNITY_KINDS,
+    PLANETS,
+    SIGNS,
+    classical_dignity_many,
+    extended_dignity_many,
+    face_ruler,
+    mansion_indices,
+    sign_indices,
+    term_ruler,
+    term_rulers_many,
+)
+from core.lunar_mansions import get_lunar_mansion
+
+
+def _reference_classical(planet_name, sign, degree):
+    """Original core.dignities.get_planet_dignity."""
+    if dignities.RULERSHIPS.get(sign) == planet_name:
+        return {"kind": "domicile", "score": 5}
+    exalt = dignities.EXALTATIONS.get(planet_name)
+    if exalt and exalt["sign"] == sign and abs(degree - exalt["degree"]) <= 5:
+        return {"kind": "exaltation", "score": 4}
+    if dignities.DETRIMENTS.get(sign) == planet_name:
+        return {"kind": "detriment", "score": -5}
+    fall = dignities.FALLS.get(planet_name)
+    if fall and fall["sign"] == sign and abs(degree - fall["degree"]) <= 5:
+        return {"kind": "fall", "score": -4}
+    return {"kind": "peregrine", "score": 0}
+
+
+def _reference_extended(planet_name, lon):
+    """Original core.extended_calc.calculate_dignity."""
+    sign = SIGNS[int(lon % 360 // 30)]
+    deg = lon % 360 % 30
+    d = {"domicile": False, "exaltation": False, "detriment": False, "fall": False, "peregrine": False, "score": 0}
+    if extended_calc.RULERSHIPS.get(sign) == planet_name:
+        d["domicile"] = True
+        d["score"] += 5
+    if planet_name in extended_calc.EXALTATIONS:
+        s, x = extended_calc.EXALTATIONS[planet_name]
+        if sign == s and (abs(deg - x) <= 5 or abs(deg - x) >= 25):
+            d["exaltation"] = True
+            d["score"] += 4
+    if extended_calc.DETRIMENTS.get(sign) == planet_name:
+        d["detriment"] = True
+        d["score"] -= 5
+    if planet_name in extended_calc.FALLS:
+        s, x = extended_calc.FALLS[planet_name]
+        if sign == s and (abs(deg - x) <= 5 or abs(deg - x) >= 25):
+            d["fall"] = True
+            d["score"] -= 4
+    if d["score"] == 0:
+        d["peregrine"] = True
+    return d
+
+
+def _sample_longitudes():
+    rng = random.Random(11)
+    # Grados exactos, medios grados (fronteras de orbe) y aleatorios
+    return [float(d) for d in range(360)] + [d + 0.5 for d in range(360)] + [rng.uniform(0, 360) for _ in range(3000)]
+
+
+def test_scalar_wrappers_match_reference():
+    """get_planet_dignity and calculate_dignity are unchanged."""
+    print("=== Testing Scalar Wrappers ===")
+
+    lons = _sample_longitudes()
+    for planet in PLANETS + ["Chiron"]:
+        for lon in lons:
+            sign, deg = SIGNS[int(lon // 30)], lon % 30
+            assert get_planet_dignity(planet, sign, deg) == _reference_classical(planet, sign, deg), (planet, lon)
+            assert calculate_dignity(planet, lon) == _reference_extended(planet, lon), (planet, lon)
+    assert get_planet_dignity("Sun", "Nowhere", 3) == {"kind": "peregrine", "score": 0}
+    print(f"✓ {len(lons) * (len(PLANETS) + 1)} lookups identical\n")
+
+
+def test_vectorized_tables():
+    """Vectorized lookups agree with the scalar ones for every planet at once."""
+    print("=== Testing Vectorized Tables ===")
+
+    lons = np.array(_sample_longitudes())
+    planets = np.array(PLANETS)[:, None]
+    kind, score = classical_dignity_many(planets, lons[None, :])
+    _, ext_score = extended_dignity_many(planets, lons[None, :])
+    assert kind.shape == (len(PLANETS), len(lons))
+    for p, planet in enumerate(PLANETS):
+        for i in range(0, len(lons), 37):
+            ref = get_planet_dignity(planet, SIGNS[int(lons[i] // 30)], lons[i] % 30)
+            assert DIGNITY_KINDS[kind[p, i]] == ref["kind"] and score[p, i] == ref["score"]
+            assert ext_score[p, i] == calculate_dignity(planet, lons[i])["score"]
+
+    assert list(sign_indices([0, 29.99, 30, 359.9, -0.1])) == [0, 0, 1, 11, 11]
+    for lon in lons[::50]:
+        assert mansion_indices(lon) == get_lunar_mansion(lon)["index"] - 1
+    print("✓ Vectorized tables consistent\n")
+
+
+def test_terms_and_faces():
+    """Egyptian terms and Chaldean faces at known points."""
+    print("=== Testing Terms and Faces ===")
+
+    assert term_ruler(0.0) == "Jupiter" and term_ruler(5.99) == "Jupiter" and term_ruler(6.0) == "Venus"
+    assert term_ruler(30 + 27.5) == "Mars"     # Tauro 27-30
+    assert term_ruler(359.9) == "Saturn"       # Piscis 28-30
+    assert face_ruler(0.0) == "Mars" and face_ruler(10.0) == "Sun" and face_ruler(25.0) == "Venus"
+    assert face_ruler(30.0) == "Mercury" and face_ruler(359.0) == "Mars"
+    assert list(term_rulers_many([0.0, 6.0])) == [PLANETS.index("Jupiter"), PLANETS.index("Venus")]
+    print("✓ Terms and faces\n")
+
+
+def test_batch_speed():
+    """A million (planet, longitude) lookups in a few dozen milliseconds."""
+    print("=== Testing Batch Speed ===")
+
+    rng = np.random.default_rng(5)
+    lons = rng.uniform(0, 360, (100000, len(PLANETS)))
+    idx = np.arange(len(PLANETS))[None, :]
+    t0 = time.perf_counter()
+    classical_dignity_many(idx, lons)
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 0.5, f"{elapsed:.3f}s"
+    print(f"✓ 1M lookups in {elapsed * 1000:.1f} ms\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_scalar_wrappers_match_reference()
+        test_vectorized_tables()
+        test_terms_and_faces()
+        test_batch_speed()
+
+        print("=" * 60)
+        print("✓ All lookup table tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
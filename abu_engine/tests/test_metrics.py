@@ -0,0 +1,100 @@
+"""
+Test the Prometheus /metrics endpoint (core/metrics.py).
+Validates text format, per-route counters, in-flight gauge, cache ratios and RSS.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+from core.metrics import REGISTRY, CacheStats
+from main import app
+
+client = TestClient(app)
+
+
+def test_prometheus_text_format():
+    """/metrics serves Prometheus text with process and HTTP families."""
+    print("=== Testing /metrics Format ===")
+
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    for family in (
+        "# TYPE abu_http_requests_total counter",
+        "# TYPE abu_http_request_duration_seconds histogram",
+        "# TYPE abu_http_requests_in_flight gauge",
+        "# TYPE abu_stage_duration_seconds histogram",
+        "process_resident_memory_bytes",
+    ):
+        assert family in text, f"Missing {family}"
+    print("✓ Prometheus families present\n")
+
+
+def test_route_counters_use_templates():
+    """Requests are labelled by route template; unknown paths collapse to 'unmatched'."""
+    print("=== Testing Route Labels ===")
+
+    def count(route, status):
+        return REGISTRY.get_sample_value(
+            "abu_http_requests_total", {"method": "GET", "route": route, "status": status}
+        ) or 0
+
+    before_health, before_404 = count("/health", "200"), count("unmatched", "404")
+    client.get("/health")
+    client.get("/no/such/path/123")
+    assert count("/health", "200") == before_health + 1
+    assert count("unmatched", "404") == before_404 + 1
+    assert 'route="/no/such/path/123"' not in client.get("/metrics").text
+    print("✓ Route labels bounded\n")
+
+
+def test_cache_stats_ratio():
+    """CacheStats exports hit/miss counters and the hit ratio."""
+    print("=== Testing CacheStats ===")
+
+    stats = CacheStats("unit")
+    stats.hit("cities")
+    stats.hit("cities")
+    stats.miss("cities")
+    samples = {(m.name, s.labels.get("result")): s.value for m in stats.collect() for s in m.samples}
+    assert samples[("unit_cache_requests", "hit")] == 2
+    assert samples[("unit_cache_requests", "miss")] == 1
+    assert abs(samples[("unit_cache_hit_ratio", None)] - 2 / 3) < 1e-9
+    print("✓ Hit ratio 2/3\n")
+
+
+def test_ephemeris_metrics():
+    """Ephemeris lookups are counted and the load time is exported."""
+    print("=== Testing Ephemeris Metrics ===")
+
+    client.get("/api/astro/chart", params={"date": "1990-07-05T12:00:00Z", "lat": 0, "lon": 0})
+    text = client.get("/metrics").text
+    assert 'abu_cache_requests_total{cache="ephemeris"' in text
+    assert "abu_ephemeris_load_seconds" in text
+    print("✓ Ephemeris metrics exported\n")
+
+
+if __name__ == "__main__":
+    print("Starting metrics tests...\n")
+
+    try:
+        test_prometheus_text_format()
+        test_route_counters_use_templates()
+        test_cache_stats_ratio()
+        test_ephemeris_metrics()
+
+        print("=" * 60)
+        print("✓ All metrics tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,111 @@
+"""
+Test the composite natal report (core/natal_report.py, /api/astro/natal-report).
+Validates section pipeline, dependency resolution and consistency with the
+individual endpoints it replaces.
+"""
+
+import sys
+from pathlib import Path
+from datetime import datetime, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+from core.natal_report import SECTIONS, build_natal_report, resolve_sections
+from main import app
+
+client = TestClient(app)
+BIRTH = datetime(1990, 7, 5, 12, 0, 0, tzinfo=timezone.utc)
+CURRENT = datetime(2025, 11, 3, tzinfo=timezone.utc)
+LAT, LON = -34.6037, -58.3816
+
+
+def test_resolve_sections():
+    """Requested sections pull in their dependencies, in pipeline order."""
+    print("=== Testing Section Resolution ===")
+
+    assert resolve_sections(None) == SECTIONS
+    assert resolve_sections(["fardars"]) == ["chart", "sect", "fardars"]
+    assert resolve_sections(["transits", "lots"]) == ["chart", "lots", "transits"]
+    try:
+        resolve_sections(["nope"])
+        assert False, "Unknown section should raise"
+    except ValueError:
+        pass
+    print("✓ Dependencies resolved\n")
+
+
+def test_full_report_structure():
+    """A full report has every section and no stage errors."""
+    print("=== Testing Full Report ===")
+
+    report = build_natal_report(BIRTH, LAT, LON, CURRENT)
+    for section in SECTIONS:
+        assert section in report, f"Missing section {section}"
+        assert not (isinstance(report[section], dict) and "error" in report[section]), report[section]
+    assert len(report["chart"]["houses"]) == 12
+    assert {lot["name"] for lot in report["lots"]} == {"Fortuna", "Spirit", "Eros", "Necessity"}
+    assert report["profections"]["year"] == 35
+    assert report["fardars"]["is_diurnal"] == report["sect"]["is_diurnal"]
+    assert set(report["dignities"]) >= {"Sun", "Moon", "Saturn"}
+    print(f"✓ Sections: {report['sections']}\n")
+
+
+def test_matches_individual_endpoints():
+    """Sections agree with /chart-detailed, /lunar-mansions and /lots for the same chart."""
+    print("=== Testing Consistency With Individual Endpoints ===")
+
+    report = client.get("/api/astro/natal-report", params={
+        "date": "1990-07-05T12:00:00Z", "lat": LAT, "lon": LON, "currentDate": "2025-11-03T00:00:00Z"
+    }).json()
+    detailed = client.get("/api/astro/chart-detailed", params={
+        "date": "1990-07-05T12:00:00Z", "lat": LAT, "lon": LON
+    }).json()
+    assert report["chart"] == detailed
+
+    moon = next(p for p in detailed["planets"] if p["name"] == "Moon")["longitude"]
+    mansion = client.get("/api/astro/lunar-mansions", params={"moonLon": moon}).json()
+    assert report["lunar_mansion"]["index"] == mansion["index"]
+
+    lon_of = {p["name"]: p["longitude"] for p in detailed["planets"]}
+    lots = client.get("/api/astro/lots", params={
+        "sunLon": lon_of["Sun"], "moonLon": lon_of["Moon"], "ascLon": detailed["asc_longitude"],
+        "venusLon": lon_of["Venus"], "mercuryLon": lon_of["Mercury"]
+    }).json()
+    for mine, theirs in zip(report["lots"], lots):
+        assert mine["name"] == theirs["name"]
+        assert abs(mine["longitude"] - theirs["longitude"]) < 1e-3
+    print("✓ Report matches individual endpoints\n")
+
+
+def test_endpoint_errors():
+    """Unknown sections give 400, bad dates 422."""
+    print("=== Testing Endpoint Errors ===")
+
+    params = {"date": "1990-07-05T12:00:00Z", "lat": LAT, "lon": LON}
+    assert client.get("/api/astro/natal-report", params={**params, "sections": "bogus"}).status_code == 400
+    assert client.get("/api/astro/natal-report", params={**params, "date": "not-a-date"}).status_code == 422
+    subset = client.get("/api/astro/natal-report", params={**params, "sections": "lunar_mansion"}).json()
+    assert subset["sections"] == ["chart", "lunar_mansion"] and "transits" not in subset
+    print("✓ Errors and subsets handled\n")
+
+
+if __name__ == "__main__":
+    print("Starting natal report tests...\n")
+
+    try:
+        test_resolve_sections()
+        test_full_report_structure()
+        test_matches_individual_endpoints()
+        test_endpoint_errors()
+
+        print("=" * 60)
+        print("✓ All natal report tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,143 @@
+"""
+Test the parans engine (core/parans.py): event sidereal times checked
+against the altitude formula, and star-planet pairs against a full scan.
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.fixed_stars import load_star_catalog
+from core.parans import EVENTS, event_lst, find_parans, latitude_bands, paran_pairs
+
+
+def _altitude(ra, dec, lat, lst):
+    ha, dec, lat = np.radians(lst - ra), np.radians(dec), np.radians(lat)
+    return np.degrees(np.arcsin(np.sin(lat) * np.sin(dec) + np.cos(lat) * np.cos(dec) * np.cos(ha)))
+
+
+def test_event_times_geometry():
+    """Rising/setting at the horizon (east/west), culmination due south/north."""
+    print("=== Testing Event Geometry ===")
+
+    rng = np.random.default_rng(11)
+    ra, dec = rng.uniform(0, 360, 50), rng.uniform(-80, 80, 50)
+    lats = np.linspace(-70, 70, 29)
+    for horizon in (0.0, -0.5667):
+        events = event_lst(ra, dec, lats, horizon)
+        assert events.shape == (29, 50, 4)
+        lat = lats[:, None]
+        crosses = ~np.isnan(events[..., 0])
+        # Cuerpos que cruzan el horizonte: |δ| < 90° - |φ| (h0 = 0)
+        if horizon == 0.0:
+            assert np.array_equal(crosses, np.abs(dec) < 90 - np.abs(lat))
+        for e in (0, 2):
+            alt = _altitude(ra, dec, lat, events[..., e])
+            assert np.allclose(alt[crosses], horizon, atol=1e-9)
+        # Sale al este (ángulo horario negativo), se pone al oeste
+        ha_rise = (events[..., 0] - ra + 180) % 360 - 180
+        assert np.all(ha_rise[crosses] < 0)
+        alt_culm = _altitude(ra, dec, lat, events[..., 1])
+        assert np.allclose(alt_culm, 90 - np.abs(lat - dec))
+        assert np.allclose((events[..., 3] - events[..., 1]) % 360, 180)
+    # En el ecuador todo cuerpo está 6h sobre el horizonte
+    equator = event_lst(ra, dec, [0.0])
+    assert np.allclose((equator[0, :, 2] - equator[0, :, 0]) % 360, 180)
+    print("✓ Horizon crossings and culminations\n")
+
+
+def test_pairs_match_brute_force():
+    """Blocked difference matrix finds exactly the pairs of a full scan."""
+    print("=== Testing Paran Pairs ===")
+
+    rng = np.random.default_rng(5)
+    star_ra, star_dec = rng.uniform(0, 360, 40), rng.uniform(-70, 70, 40)
+    planet_ra, planet_dec = rng.uniform(0, 360, 6), rng.uniform(-25, 25, 6)
+    lats = latitude_bands(-60, 60, 5)
+    pairs = paran_pairs(star_ra, star_dec, planet_ra, planet_dec, lats, tolerance_minutes=6.0)
+    found = set(zip(*(pairs[k].tolist() for k in ["latitude", "star", "star_event", "planet", "planet_event"])))
+    assert len(found) == pairs["latitude"].size > 0
+
+    stars = event_lst(star_ra, star_dec, lats)
+    planets = event_lst(planet_ra, planet_dec, lats)
+    expected = set()
+    for l in range(lats.size):
+        for s in range(40):
+            for se in range(4):
+                for p in range(6):
+                    for pe in range(4):
+                        a, b = stars[l, s, se], planets[l, p, pe]
+                        if not (np.isnan(a) or np.isnan(b)) and abs((a - b + 180) % 360 - 180) * 4 <= 6.0:
+                            expected.add((l, s, se, p, pe))
+    assert found == expected
+    assert np.all(pairs["orb_minutes"] <= 6.0)
+    print(f"✓ {len(found)} parans identical to the full scan\n")
+
+
+def test_find_parans():
+    """Bands over the catalogue with the ephemeris, sorted by orb."""
+    print("=== Testing find_parans ===")
+
+    date = datetime(2025, 3, 20, 12, tzinfo=timezone.utc)
+    lats = latitude_bands(-50, 50, 10)
+    result = find_parans(date, lats, tolerance_minutes=4.0, max_magnitude=1.5, planets=["Sun", "Moon", "Venus"])
+    assert [b["latitude"] for b in result["bands"]] == lats.tolist()
+    total = 0
+    for band in result["bands"]:
+        orbs = [p["orb_minutes"] for p in band["parans"]]
+        assert orbs == sorted(orbs) and all(o <= 4.0 for o in orbs)
+        for p in band["parans"]:
+            assert p["planet"] in ("Sun", "Moon", "Venus")
+            assert p["star_event"] in EVENTS and p["planet_event"] in EVENTS
+            assert p["magnitude"] <= 1.5 and 0 <= p["lst"] < 24
+        total += len(band["parans"])
+    assert total > 0
+
+    # Cerca del equinoccio el Sol (α ≈ 0h) culmina a TSL 0h en todas las latitudes
+    sun_events = event_lst([0.0], [0.0], lats)
+    assert np.allclose(sun_events[:, 0, 1], 0.0)
+    try:
+        find_parans(date, lats, planets=["Chiron"])
+        assert False, "Unknown planet should fail"
+    except ValueError:
+        pass
+    print(f"✓ {total} parans in {len(lats)} bands\n")
+
+
+def test_parans_real_stars():
+    """With the default magnitude limit every paran star is a real catalogue star."""
+    print("=== Testing Paran Stars ===")
+
+    catalog = load_star_catalog()
+    names = catalog["name"].tolist()
+    result = find_parans(datetime(2025, 3, 20, 12, tzinfo=timezone.utc), latitude_bands(-60, 60, 5))
+    stars = {p["star"] for band in result["bands"] for p in band["parans"]}
+    assert stars
+    for star in stars:
+        i = names.index(star)
+        # Estrella con movimiento propio medido, no un punto de referencia con magnitud de relleno
+        assert catalog["pm_ra"][i] != 0 or catalog["pm_dec"][i] != 0, star
+    assert not stars & {"ZerL2000", "Gal.Pole", "Gal.Plane Pole", "Gal.Pole IAU1958", "Sun Pole", "Test"}
+    print(f"✓ {len(stars)} distinct stars\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_event_times_geometry()
+        test_pairs_match_brute_force()
+        test_find_parans()
+        test_parans_real_stars()
+
+        print("=" * 60)
+        print("✓ All paran tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,117 @@
+"""
+Test planetary daily motion and retrograde flags (core.chart, /chart-detailed,
+/transits) and applying/separating detection for every aspect angle.
+"""
+
+import json
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+from core.aspects import is_applying
+from core.chart import chart_json, chart_json_many
+from main import app
+
+client = TestClient(app)
+# Mercurio retrógrado: 2024-04-01 a 2024-04-25
+MERCURY_RX = datetime(2024, 4, 10, tzinfo=timezone.utc)
+LAT, LON = -34.6037, -58.3816
+
+
+def test_speeds_match_finite_difference():
+    """Velocity-based speed agrees with a centered difference of positions."""
+    print("=== Testing Planet Speeds ===")
+
+    chart = chart_json(LAT, LON, MERCURY_RX)
+    before = chart_json(LAT, LON, MERCURY_RX - timedelta(hours=1))
+    after = chart_json(LAT, LON, MERCURY_RX + timedelta(hours=1))
+    for p, b, a in zip(chart.planets, before.planets, after.planets):
+        delta = (a.lon - b.lon + 180) % 360 - 180
+        assert abs(p.speed - delta * 12) < 1e-3, f"{p.name}: {p.speed} vs {delta * 12}"
+        assert p.retrograde == (p.speed < 0)
+
+    by_name = {p.name: p for p in chart.planets}
+    assert by_name["Mercury"].retrograde is True
+    assert by_name["Sun"].retrograde is False and 0.9 < by_name["Sun"].speed < 1.1
+    assert 11 < by_name["Moon"].speed < 16
+    print("✓ Speeds and retrograde flags\n")
+
+
+def test_many_carries_speeds():
+    """chart_json_many returns the same speeds as chart_json."""
+    print("=== Testing Batch Speeds ===")
+
+    dates = [MERCURY_RX + timedelta(days=9 * i) for i in range(6)]
+    for d, batch in zip(dates, chart_json_many(dates, [LAT] * 6, [LON] * 6)):
+        single = chart_json(LAT, LON, d)
+        for p, q in zip(batch.planets, single.planets):
+            assert abs(p.speed - q.speed) < 1e-9 and p.retrograde == q.retrograde
+    print("✓ Batch speeds identical\n")
+
+
+def test_is_applying_all_aspects():
+    """Applying means the orb is shrinking, for any aspect angle."""
+    print("=== Testing Applying Detection ===")
+
+    # Conjunción: tránsito 2° detrás, directo -> aplica; retrógrado -> separa
+    assert is_applying(100, 98, 1.0) is True
+    assert is_applying(100, 98, -1.0) is False
+    # Cuadratura: separación 88° creciendo hacia 90 -> aplica
+    assert is_applying(100, 188, 1.0, 90) is True
+    assert is_applying(100, 192, 1.0, 90) is False
+    assert is_applying(100, 192, -1.0, 90) is True
+    # Cuadratura por el otro lado (tránsito detrás del natal, separación decreciente)
+    assert is_applying(100, 12, 1.0, 90) is False
+    assert is_applying(100, 8, 1.0, 90) is True
+    # Oposición: separación < 180 creciendo -> aplica
+    assert is_applying(10, 188, 1.0, 180) is True
+    assert is_applying(10, 188, -1.0, 180) is False
+    # Sin velocidad: se mantiene el default aplicativo
+    assert is_applying(100, 192, 0, 90) is True
+    print("✓ Applying/separating for all angles\n")
+
+
+def test_endpoints_expose_speeds():
+    """/chart-detailed and /transits carry speed and retrograde."""
+    print("=== Testing Endpoints ===")
+
+    r = client.get("/api/astro/chart-detailed", params={"date": MERCURY_RX.isoformat(), "lat": LAT, "lon": LON})
+    assert r.status_code == 200, r.text
+    planets = {p["name"]: p for p in r.json()["planets"]}
+    assert planets["Mercury"]["retrograde"] is True and planets["Mercury"]["speed"] < 0
+    assert "speed" not in planets["North Node"]
+
+    natal = [{"name": "Sun", "longitude": 15.0}, {"name": "Moon", "longitude": 200.0}]
+    r = client.get("/api/astro/transits", params={
+        "natalPlanets": json.dumps(natal), "date": MERCURY_RX.isoformat(),
+        "lat": LAT, "lon": LON, "includeMajorOnly": False
+    })
+    assert r.status_code == 200, r.text
+    transits = r.json()
+    assert transits and all("transit_speed" in t for t in transits)
+    assert any(t["transit_speed"] != 0 for t in transits)
+    mercury = [t for t in transits if t["transit_planet"] == "Mercury"]
+    assert all(t["transit_retrograde"] is True for t in mercury)
+    print("✓ Endpoints expose speeds\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_speeds_match_finite_difference()
+        test_many_carries_speeds()
+        test_is_applying_all_aspects()
+        test_endpoints_expose_speeds()
+
+        print("=" * 60)
+        print("✓ All planet speed tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,130 @@
+"""
+Test per-request profiling (core/profiling.py).
+Validates spans, Server-Timing header, stage histograms in /metrics and ?profile=1.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+from core.metrics import REGISTRY
+from core.profiling import RequestProfile, span
+from main import app
+
+client = TestClient(app)
+CHART_PARAMS = {"date": "1990-07-05T12:00:00Z", "lat": -34.6, "lon": -58.4}
+
+
+def test_span_outside_request_is_noop():
+    """span() without an active request does not fail or record anything."""
+    print("=== Testing span() Outside Request ===")
+
+    with span("skyfield"):
+        value = 1 + 1
+    assert value == 2
+    print("✓ No-op outside request\n")
+
+
+def test_request_profile_accumulates():
+    """Repeated stages are summed and counted in Server-Timing."""
+    print("=== Testing RequestProfile ===")
+
+    prof = RequestProfile()
+    prof.add("skyfield", 1.5)
+    prof.add("skyfield", 2.5)
+    prof.add("total", 10)
+    assert prof.spans["skyfield"] == [4.0, 2]
+    assert prof.server_timing() == 'skyfield;dur=4.000;desc="x2", total;dur=10.000'
+    print(f"✓ {prof.server_timing()}\n")
+
+
+def test_server_timing_header():
+    """The chart endpoint reports skyfield, handler, serialization and total stages."""
+    print("=== Testing Server-Timing Header ===")
+
+    response = client.get("/api/astro/chart", params=CHART_PARAMS)
+    assert response.status_code == 200
+    header = response.headers["server-timing"]
+    for stage in ("skyfield", "handler", "validate_serialize", "total"):
+        assert f"{stage};dur=" in header, f"Missing {stage} in {header}"
+    print(f"✓ Server-Timing: {header}\n")
+
+
+def test_stage_histograms():
+    """Each request's stages are observed into abu_stage_duration_seconds."""
+    print("=== Testing Stage Histograms ===")
+
+    def count(stage):
+        return REGISTRY.get_sample_value(
+            "abu_stage_duration_seconds_count", {"route": "/api/astro/chart", "stage": stage}
+        ) or 0
+
+    before = {stage: count(stage) for stage in ("total", "skyfield")}
+    client.get("/api/astro/chart", params=CHART_PARAMS)
+    client.get("/api/astro/chart", params=CHART_PARAMS)
+    assert count("total") == before["total"] + 2
+    assert count("skyfield") == before["skyfield"] + 2
+    assert 'stage="validate_serialize"' in client.get("/metrics").text
+    print("✓ Stages observed for /api/astro/chart\n")
+
+
+def test_profile_dump():
+    """?profile=1 returns a cProfile dump of the handler instead of the JSON."""
+    print("=== Testing ?profile=1 ===")
+
+    saved = os.environ.get("ABU_PROFILE_ENABLED")
+    os.environ["ABU_PROFILE_ENABLED"] = "true"
+    try:
+        response = client.get("/api/astro/chart", params={**CHART_PARAMS, "profile": 1})
+    finally:
+        if saved is None:
+            del os.environ["ABU_PROFILE_ENABLED"]
+        else:
+            os.environ["ABU_PROFILE_ENABLED"] = saved
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "chart_json" in response.text
+    assert "server-timing" in response.headers
+    print("✓ Profile dump returned\n")
+
+
+def test_profile_disabled_by_default():
+    """Without ABU_PROFILE_ENABLED=true, ?profile=1 is ignored and the JSON is returned."""
+    print("=== Testing ?profile=1 Disabled ===")
+
+    saved = os.environ.pop("ABU_PROFILE_ENABLED", None)
+    try:
+        response = client.get("/api/astro/chart", params={**CHART_PARAMS, "profile": 1})
+    finally:
+        if saved is not None:
+            os.environ["ABU_PROFILE_ENABLED"] = saved
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/json")
+    assert "planets" in response.json()
+    print("✓ Profile parameter ignored\n")
+
+
+if __name__ == "__main__":
+    print("Starting profiling tests...\n")
+
+    try:
+        test_span_outside_request_is_noop()
+        test_request_profile_accumulates()
+        test_server_timing_header()
+        test_stage_histograms()
+        test_profile_dump()
+        test_profile_disabled_by_default()
+
+        print("=" * 60)
+        print("✓ All profiling tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
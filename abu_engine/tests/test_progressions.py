@@ -0,0 +1,189 @@
+"""
+Test secondary progressions and solar arc directions (core/progressions.py,
+/api/astro/progressions, /api/astro/solar-arc, /api/astro/progressions/timeline).
+"""
+
+import sys
+import time
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+from core.aspects import ASPECTS
+from core.chart import chart_json
+from core.progressions import (
+    YEAR_DAYS,
+    progressed_chart,
+    progressed_datetime,
+    progression_series,
+    solar_arc_directions,
+)
+from main import app
+
+client = TestClient(app)
+BIRTH = datetime(1990, 7, 5, 12, 0, 0, tzinfo=timezone.utc)
+LAT, LON = -34.6037, -58.3816
+
+
+def _dist(a: float, b: float) -> float:
+    return abs((a - b + 180) % 360 - 180)
+
+
+def test_day_for_a_year():
+    """A progressed chart is the natal-location chart one day per year later."""
+    print("=== Testing Secondary Progression ===")
+
+    target = BIRTH + timedelta(days=30 * YEAR_DAYS)
+    assert abs((progressed_datetime(BIRTH, target) - (BIRTH + timedelta(days=30))).total_seconds()) < 1
+
+    prog = progressed_chart(BIRTH, target, LAT, LON)
+    assert abs(prog["age"] - 30) < 1e-3
+    reference = {p.name: p.lon for p in chart_json(LAT, LON, BIRTH + timedelta(days=30)).planets}
+    for p in prog["planets"]:
+        assert _dist(p["lon"], reference[p["name"]]) < 1e-6
+    sun = next(p for p in prog["planets"] if p["name"] == "Sun")
+    assert abs(prog["solar_arc"] - (sun["lon"] - sun["natal_lon"]) % 360) < 1e-3
+    assert 28 < prog["solar_arc"] < 31  # ~0.96°/año en julio
+    assert len(prog["angles"]["cusps"]) == 12
+    assert all(a["orb"] <= 1.0 and a["progressed"] != a["natal"] for a in prog["aspects_to_natal"])
+    print(f"✓ Solar arc {prog['solar_arc']}°, {len(prog['aspects_to_natal'])} aspects\n")
+
+
+def test_solar_arc():
+    """Every directed point moves by the same arc as the progressed Sun."""
+    print("=== Testing Solar Arc ===")
+
+    target = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    sa = solar_arc_directions(BIRTH, target, LAT, LON)
+    prog = progressed_chart(BIRTH, target, LAT, LON)
+    assert sa["solar_arc"] == prog["solar_arc"]
+    for d in sa["directed"]:
+        assert abs(_dist(d["lon"], d["natal_lon"]) - sa["solar_arc"]) < 1e-3
+    # El MC progresado por arco solar coincide con el MC dirigido
+    mc = next(d for d in sa["directed"] if d["name"] == "Midheaven")
+    assert _dist(prog["angles"]["mc"], mc["lon"]) < 1e-6
+    print("✓ Directed points consistent\n")
+
+
+def test_lifetime_series():
+    """Exact hits land on the aspect, and 90 years take one ephemeris batch."""
+    print("=== Testing Lifetime Series ===")
+
+    t0 = time.perf_counter()
+    series = progression_series(BIRTH, LAT, LON, years=90)
+    elapsed = time.perf_counter() - t0
+    assert series["events"] and elapsed < 2.0, f"{elapsed:.2f}s"
+    ages = [e["age"] for e in series["events"]]
+    assert ages == sorted(ages) and 0 < ages[0] and ages[-1] <= 90
+
+    for e in series["events"][::25]:
+        target = BIRTH + timedelta(days=e["age"] * YEAR_DAYS)
+        prog = progressed_chart(BIRTH, target, LAT, LON, orb=5)
+        lons = {p["name"]: p["lon"] for p in prog["planets"]}
+        natal = {p["name"]: p["natal_lon"] for p in prog["planets"]}
+        if e["natal"] in natal:
+            sep = _dist(lons[e["progressed"]], natal[e["natal"]])
+            assert abs(sep - ASPECTS[e["aspect"]]) < 0.05, e
+
+    solar_arc = progression_series(BIRTH, LAT, LON, years=90, method="solar_arc")
+    assert solar_arc["events"] and all(e["progressed"] != e["natal"] for e in solar_arc["events"])
+    print(f"✓ {len(series['events'])} secondary / {len(solar_arc['events'])} solar arc hits in {elapsed:.3f}s\n")
+
+
+def test_moon_to_moon():
+    """Progressed Moon aspects to its own natal place; slow planets never self-aspect."""
+    print("=== Testing Progressed Moon Cycle ===")
+
+    events = progression_series(BIRTH, LAT, LON, years=30)["events"]
+    moon = {(e["aspect"], round(e["age"], 1)) for e in events if e["progressed"] == "Moon" and e["natal"] == "Moon"}
+    print(f"Moon -> Moon: {sorted(moon, key=lambda x: x[1])}")
+    # Cuadratura, oposición y retorno de la Luna progresada (~27.3 años)
+    assert {("square", 7.2), ("opposition", 13.6), ("conjunction", 27.3)} <= moon
+    slow = ("Jupiter", "Saturn", "Uranus", "Neptune", "Pluto")
+    assert not any(e["progressed"] == e["natal"] and e["progressed"] in slow for e in events)
+
+    # Snapshot en el retorno: conjunción Luna-Luna, sin conjunciones permanentes de planetas lentos
+    chart = progressed_chart(BIRTH, BIRTH + timedelta(days=27.31 * YEAR_DAYS), LAT, LON)
+    self_aspects = [(a["progressed"], a["aspect"]) for a in chart["aspects_to_natal"] if a["progressed"] == a["natal"]]
+    assert self_aspects == [("Moon", "conjunction")], self_aspects
+    young = progressed_chart(BIRTH, BIRTH + timedelta(days=2 * YEAR_DAYS), LAT, LON)
+    assert not any(a["progressed"] == a["natal"] for a in young["aspects_to_natal"])
+
+    # Arco solar: todos los puntos avanzan juntos, nunca un punto consigo mismo
+    solar_arc = progression_series(BIRTH, LAT, LON, years=30, method="solar_arc")["events"]
+    assert not any(e["progressed"] == e["natal"] for e in solar_arc)
+    print("✓ Square, opposition and return of the progressed Moon\n")
+
+
+def test_polar_latitude():
+    """Angles are dropped with a note where houses are undefined."""
+    print("=== Testing Polar Latitude ===")
+
+    params = {"birthDate": "1990-07-05T12:00:00Z", "lat": 70.0, "lon": 20.0, "targetDate": "2025-01-01T00:00:00Z"}
+    for path in ("/api/astro/progressions", "/api/astro/solar-arc", "/api/astro/progressions/timeline"):
+        r = client.get(path, params=params)
+        assert r.status_code == 200, (path, r.text)
+        data = r.json()
+        assert "Houses not available" in data["note"]
+        assert "Ascendant" not in str(data)
+    print("✓ Planets-only results at 70°N\n")
+
+
+def test_target_before_birth():
+    """A target date before birth is rejected (no negative progressions)."""
+    print("=== Testing Target Before Birth ===")
+
+    for fn in (progressed_chart, solar_arc_directions):
+        try:
+            fn(BIRTH, BIRTH - timedelta(days=1), LAT, LON)
+            raise AssertionError(f"{fn.__name__}: expected ValueError")
+        except ValueError as e:
+            assert "before birthDate" in str(e)
+    assert progressed_chart(BIRTH, BIRTH, LAT, LON)["age"] == 0
+    print("✓ Rejected\n")
+
+
+def test_endpoints():
+    """Endpoints return data and validate input."""
+    print("=== Testing Endpoints ===")
+
+    params = {"birthDate": "1990-07-05T12:00:00Z", "lat": LAT, "lon": LON, "targetDate": "2025-01-01T00:00:00Z"}
+    r = client.get("/api/astro/progressions", params=params)
+    assert r.status_code == 200, r.text
+    assert r.json()["solar_arc"] > 0
+    r = client.get("/api/astro/solar-arc", params=params)
+    assert r.status_code == 200, r.text
+    r = client.get("/api/astro/progressions/timeline", params={**params, "years": 40, "method": "solar_arc"})
+    assert r.status_code == 200 and r.json()["method"] == "solar_arc"
+
+    assert client.get("/api/astro/progressions/timeline", params={**params, "method": "tertiary"}).status_code == 400
+    assert client.get("/api/astro/progressions/timeline", params={**params, "years": 500}).status_code == 400
+    assert client.get("/api/astro/progressions", params={**params, "birthDate": "nope"}).status_code == 422
+    early = {**params, "targetDate": "1980-01-01T00:00:00Z"}
+    assert client.get("/api/astro/progressions", params=early).status_code == 400
+    assert client.get("/api/astro/solar-arc", params=early).status_code == 400
+    print("✓ Endpoints OK\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_day_for_a_year()
+        test_solar_arc()
+        test_lifetime_series()
+        test_moon_to_moon()
+        test_polar_latitude()
+        test_target_before_birth()
+        test_endpoints()
+
+        print("=" * 60)
+        print("✓ All progression tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -9,9 +9,21 @@ from datetime import datetime, timezone
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import numpy as np
+
+from core.chart import solar_return_chart
 from core.solar_return_ranking import (
+    encode_chart,
+    rank_locations,
     rank_solar_return_locations,
+    score_locations,
     score_solar_return_location,
+    score_dignities,
+    score_angularity,
+    score_solar_conditions,
+    score_aspects_reception,
+    score_sect,
+    _relocated_chart,
     RELOCATION_CITIES
 )
 
@@ -215,6 +227,63 @@ def test_invalid_city_handling():
     print()
 
 
+def test_matrix_scores_match_detailed():
+    """Matrix scoring gives the same totals as the per-city score_* functions."""
+    print("=== Testing Matrix Scoring ===")
+    
+    for birth_date in [
+        datetime(1962, 2, 11, 4, 0, 0, tzinfo=timezone.utc),
+        datetime(1978, 7, 5, 21, 15, 0, tzinfo=timezone.utc),
+        datetime(2001, 10, 30, 13, 45, 0, tzinfo=timezone.utc),
+    ]:
+        full = rank_solar_return_locations(birth_date, year=2025, top_n=3)
+        lite = rank_solar_return_locations(birth_date, year=2025, top_n=3, breakdown_top=2)
+        assert [r["city"] for r in lite["rankings"]] == [r["city"] for r in full["rankings"]]
+        for a, b in zip(lite["rankings"], full["rankings"]):
+            assert a["total_score"] == b["total_score"]
+            assert a["chart_summary"] == b["chart_summary"]
+            for criterion, details in a["breakdown"].items():
+                assert abs(details["total"] - b["breakdown"][criterion]["total"]) < 1e-9, criterion
+        # Sólo los primeros breakdown_top llevan el detalle completo
+        assert "conditions" in lite["rankings"][1]["breakdown"]["solar_conditions"]
+        assert list(lite["rankings"][2]["breakdown"]["solar_conditions"]) == ["total"]
+        
+        # Cada ciudad, recalculada por separado
+        for r in full["rankings"][:4]:
+            city = RELOCATION_CITIES[r["city"]]
+            single = score_solar_return_location(birth_date, r["city"], city["lat"], city["lon"], year=2025)
+            assert single["total_score"] == r["total_score"]
+    
+    print("✓ Matrix totals identical to detailed scoring\n")
+
+
+def test_matrix_no_house_fallback():
+    """Rows without houses use the same fallbacks as the score_* functions."""
+    print("=== Testing No-House Fallback ===")
+    
+    birth_date = datetime(1990, 7, 5, 12, 0, 0, tzinfo=timezone.utc)
+    sr = solar_return_chart(birth_date, 0.0, 0.0, 2025)
+    chart = _relocated_chart(sr, None)
+    scores = score_locations(encode_chart(chart), np.zeros((1, 12)), np.zeros(1), np.zeros(1), np.array([False]))
+    for name, fn in [
+        ("dignities", score_dignities),
+        ("angularity", score_angularity),
+        ("solar_conditions", score_solar_conditions),
+        ("aspects_reception", score_aspects_reception),
+        ("sect", score_sect),
+    ]:
+        assert abs(scores[name][0] - fn(chart)[0]) < 1e-9, name
+    
+    # Muchas ubicaciones arbitrarias: una entrada por ubicación, ordenadas
+    locations = [{"name": f"p{i}", "lat": -50 + i, "lon": -170 + 3.4 * i} for i in range(100)]
+    rankings = rank_locations(birth_date, locations, year=2025, breakdown_top=5)
+    assert len(rankings) == 100
+    totals = [r["total_score"] for r in rankings]
+    assert totals == sorted(totals, reverse=True)
+    
+    print("✓ Fallbacks consistent\n")
+
+
 if __name__ == "__main__":
     print("Starting Solar Return Ranking tests...\n")
     
@@ -225,6 +294,8 @@ if __name__ == "__main__":
         test_score_components()
         test_chart_summary()
         test_invalid_city_handling()
+        test_matrix_scores_match_detailed()
+        test_matrix_no_house_fallback()
         
         print("=" * 60)
         print("✓ All Solar Return Ranking tests passed!")
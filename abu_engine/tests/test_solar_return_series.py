@@ -0,0 +1,110 @@
+"""
+Test the multi-year solar return series (core.chart.find_solar_returns,
+solar_return_series and /api/astro/solar-returns).
+"""
+
+import sys
+import time
+from pathlib import Path
+from datetime import datetime, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+from core.chart import chart_json, find_solar_returns, solar_return_chart, solar_return_series
+from main import app
+
+client = TestClient(app)
+BIRTH = datetime(1990, 7, 5, 12, 0, 0, tzinfo=timezone.utc)
+LAT, LON = 40.7128, -74.0060
+
+
+def _sun(dt: datetime) -> float:
+    return next(p.lon for p in chart_json(LAT, LON, dt).planets if p.name == "Sun")
+
+
+def test_returns_are_exact():
+    """Every instant puts the Sun back on its natal longitude."""
+    print("=== Testing Solar Return Instants ===")
+
+    natal = _sun(BIRTH)
+    years = list(range(1991, 2051, 7))
+    for year, dt in zip(years, find_solar_returns(BIRTH, years)):
+        assert dt.year == year and (dt.month, dt.day) in {(7, 4), (7, 5), (7, 6)}
+        assert abs((_sun(dt) - natal + 180) % 360 - 180) < 1e-4  # < 0.4"
+    # Año de nacimiento: el propio instante natal
+    assert abs((find_solar_returns(BIRTH, [1990])[0] - BIRTH).total_seconds()) < 1
+    print(f"✓ {len(years)} returns exact\n")
+
+
+def test_series_matches_single_year():
+    """A series entry has the same shape as the single-year endpoint and is fast."""
+    print("=== Testing Series ===")
+
+    solar_return_series(BIRTH, LAT, LON, 2000, 2001)  # warm-up
+    t0 = time.perf_counter()
+    series = solar_return_series(BIRTH, LAT, LON, 1990, 2050, include_houses=True)
+    elapsed = time.perf_counter() - t0
+    assert [r["year"] for r in series] == list(range(1990, 2051))
+    assert elapsed < 1.0, f"{elapsed:.2f}s"
+
+    single = solar_return_chart(BIRTH, LAT, LON, 2025)
+    entry = next(r for r in series if r["year"] == 2025)
+    assert set(single) - {"birth_date", "location"} <= set(entry)
+    assert abs((datetime.fromisoformat(entry["solar_return_datetime"])
+                - datetime.fromisoformat(single["solar_return_datetime"])).total_seconds()) < 180
+    assert len(entry["cusps"]) == 12 and all(1 <= p["house"] <= 12 for p in entry["planets"])
+    print(f"✓ {len(series)} years with houses in {elapsed:.3f}s\n")
+
+
+def test_endpoint():
+    """The endpoint defaults to a lifetime range and validates it."""
+    print("=== Testing Endpoint ===")
+
+    params = {"birthDate": "1990-07-05T12:00:00Z", "lat": LAT, "lon": LON}
+    r = client.get("/api/astro/solar-returns", params={**params, "startYear": 2020, "endYear": 2025})
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert [x["year"] for x in data["returns"]] == list(range(2020, 2026))
+    assert "cusps" not in data["returns"][0]
+
+    r = client.get("/api/astro/solar-returns", params={**params, "startYear": 2025, "endYear": 2020})
+    assert r.status_code == 400
+    r = client.get("/api/astro/solar-returns", params={**params, "startYear": 1900, "endYear": 2050})
+    assert r.status_code == 400
+    r = client.get("/api/astro/solar-returns", params={**params, "birthDate": "nope"})
+    assert r.status_code == 422
+    # Fuera de la efeméride: 400 antes de calcular
+    r = client.get("/api/astro/solar-returns", params={**params, "startYear": 2200, "endYear": 2210})
+    assert r.status_code == 400 and "ephemeris" in r.json()["detail"]
+
+    # Latitud polar: los años sin casas quedan marcados, la serie no falla
+    polar = {**params, "lat": 69.5, "lon": 20.0, "startYear": 2020, "endYear": 2025, "includeHouses": True}
+    r = client.get("/api/astro/solar-returns", params=polar)
+    assert r.status_code == 200, r.text
+    for year in r.json()["returns"]:
+        if year["cusps"] is None:
+            assert "Houses not available" in year["note"] and year["asc"] is None
+            assert all(p["house"] is None for p in year["planets"])
+        else:
+            assert len(year["cusps"]) == 12
+    assert any(year["cusps"] is None for year in r.json()["returns"])
+    print("✓ Endpoint OK\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_returns_are_exact()
+        test_series_matches_single_year()
+        test_endpoint()
+
+        print("=" * 60)
+        print("✓ All solar return series tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
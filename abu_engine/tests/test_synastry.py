@@ -0,0 +1,189 @@
+"""
+Test synastry, composite charts and many-to-one ranking (core/synastry.py,
+/api/astro/synastry, /api/astro/composite, /api/astro/synastry:rank).
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from core.aspects import aspect_between
+from core.batch import BatchChartItem
+from core.synastry import (
+    PLANET_NAMES,
+    RankCandidate,
+    circular_midpoint,
+    composite_chart,
+    natal_charts,
+    rank_synastry,
+    score_candidates,
+    synastry,
+)
+from main import app
+
+client = TestClient(app)
+ANA = BatchChartItem(datetime="1990-07-05T12:00:00Z", lat=-34.6037, lon=-58.3816, id="ana")
+LUIS = BatchChartItem(datetime="1988-02-14T08:30:00-03:00", lat=40.4168, lon=-3.7038, id="luis")
+
+
+def test_synastry_pair():
+    """Aspect grid, house overlays and score for one pair."""
+    print("=== Testing Synastry ===")
+
+    result = synastry([ANA, LUIS])
+    assert [c["id"] for c in result["charts"]] == ["ana", "luis"]
+    assert len(result["pairs"]) == 1
+    pair = result["pairs"][0]
+    a, b = result["charts"]
+    for asp in pair["aspects"]:
+        lon_a = a["planets"].get(asp["a"], {"Ascendant": a["asc"], "Midheaven": a["mc"]}.get(asp["a"]))
+        lon_b = b["planets"].get(asp["b"], {"Ascendant": b["asc"], "Midheaven": b["mc"]}.get(asp["b"]))
+        assert aspect_between(lon_a, lon_b)[0] == asp["type"]
+    assert set(pair["overlays"]["a_in_b"]) == set(PLANET_NAMES)
+    assert all(1 <= h <= 12 for h in pair["overlays"]["b_in_a"].values())
+    assert pair["score"] > 0
+
+    # Tres cartas -> tres pares
+    third = BatchChartItem(datetime="2001-11-20T22:00:00Z", lat=19.43, lon=-99.13)
+    assert len(synastry([ANA, LUIS, third], include_houses=False)["pairs"]) == 3
+    print(f"✓ {len(pair['aspects'])} inter-chart aspects, score {pair['score']}\n")
+
+
+def test_score_symmetric():
+    """Swapping the charts gives the same score, pairwise and in the ranking."""
+    print("=== Testing Score Symmetry ===")
+
+    ab = synastry([ANA, LUIS])["pairs"][0]["score"]
+    ba = synastry([LUIS, ANA])["pairs"][0]["score"]
+    assert ab == ba, (ab, ba)
+    a_ranks_b = rank_synastry(ANA, [RankCandidate(**LUIS.dict())])["results"][0]["score"]
+    b_ranks_a = rank_synastry(LUIS, [RankCandidate(**ANA.dict())])["results"][0]["score"]
+    assert abs(a_ranks_b - b_ranks_a) < 1e-3 and abs(a_ranks_b - ab) < 1e-3
+    print(f"✓ score {ab} both ways\n")
+
+
+def test_polar_birth():
+    """A birth where houses are undefined keeps planets and drops asc/mc/cusps."""
+    print("=== Testing Polar Birth ===")
+
+    polar = BatchChartItem(datetime="1990-01-01T00:00:00Z", lat=70.0, lon=20.0, id="polar")
+    result = synastry([ANA, polar])
+    chart = result["charts"][1]
+    assert chart["asc"] is None and chart["mc"] is None and "Houses not available" in chart["note"]
+    pair = result["pairs"][0]
+    assert pair["overlays"]["a_in_b"] is None and set(pair["overlays"]["b_in_a"]) == set(PLANET_NAMES)
+    assert not any(asp["b"] in ("Ascendant", "Midheaven") for asp in pair["aspects"])
+
+    comp = composite_chart([ANA, polar])
+    assert comp["cusps"] is None and comp["asc"] is None and "Houses not available" in comp["note"]
+    assert all(p["house"] is None for p in comp["planets"])
+    for path in ("/api/astro/synastry", "/api/astro/composite"):
+        r = client.post(path, json={"charts": [ANA.dict(), polar.dict()]})
+        assert r.status_code == 200, (path, r.text)
+    print("✓ Houses dropped for the polar chart\n")
+
+
+def test_composite():
+    """Composite points are circular midpoints of the two charts."""
+    print("=== Testing Composite ===")
+
+    assert abs(float(circular_midpoint(np.array([350.0, 20.0]))) - 5.0) < 1e-9
+    assert abs(float(circular_midpoint(np.array([100.0, 200.0]))) - 150.0) < 1e-9
+
+    comp = composite_chart([ANA, LUIS])
+    a, b = natal_charts([ANA, LUIS])
+    for p in comp["planets"]:
+        mid = p["lon"]
+        d_a = abs((a["planets"][p["name"]] - mid + 180) % 360 - 180)
+        d_b = abs((b["planets"][p["name"]] - mid + 180) % 360 - 180)
+        assert abs(d_a - d_b) < 1e-6
+        assert 1 <= p["house"] <= 12
+    assert len(comp["cusps"]) == 12
+    print(f"✓ {len(comp['planets'])} midpoints, {len(comp['aspects'])} aspects\n")
+
+
+def test_rank_matches_pairwise():
+    """The broadcast score equals the pairwise synastry score."""
+    print("=== Testing Rank ===")
+
+    others = [LUIS, BatchChartItem(datetime="2001-11-20T22:00:00Z", lat=19.43, lon=-99.13, id="eva")]
+    ranked = rank_synastry(ANA, [RankCandidate(**o.dict()) for o in others])
+    by_id = {r["id"]: r["score"] for r in ranked["results"]}
+    for other in others:
+        pair = synastry([ANA, other], include_houses=False)["pairs"][0]
+        assert abs(by_id[other.id] - pair["score"]) < 1e-3
+    scores = [r["score"] for r in ranked["results"]]
+    assert scores == sorted(scores, reverse=True)
+
+    # Longitudes precalculadas dan el mismo resultado
+    charts = natal_charts(others, include_houses=False)
+    pre = [RankCandidate(id=c["id"], planets=c["planets"]) for c in charts]
+    assert {r["id"]: r["score"] for r in rank_synastry(ANA, pre)["results"]} == by_id
+    print("✓ Rank consistent with pairwise scores\n")
+
+
+def test_rank_thousands_fast():
+    """Scoring one chart against 10k profiles takes milliseconds."""
+    print("=== Testing Rank Performance ===")
+
+    rng = np.random.default_rng(3)
+    base = rng.uniform(0, 360, len(PLANET_NAMES))
+    cands = rng.uniform(0, 360, (10000, len(PLANET_NAMES)))
+    score_candidates(base, cands[:10])  # warm-up
+    t0 = time.perf_counter()
+    scores = score_candidates(base, cands)
+    elapsed = time.perf_counter() - t0
+    assert scores.shape == (10000,)
+    assert elapsed < 0.5, f"{elapsed:.3f}s"
+    print(f"✓ 10000 candidates in {elapsed * 1000:.1f} ms\n")
+
+
+def test_endpoints():
+    """Endpoints return results and reject bad input with 400."""
+    print("=== Testing Endpoints ===")
+
+    body = {"charts": [ANA.dict(), LUIS.dict()]}
+    r = client.post("/api/astro/synastry", json=body)
+    assert r.status_code == 200, r.text
+    assert r.json()["pairs"][0]["a"] == "ana"
+    r = client.post("/api/astro/composite", json=body)
+    assert r.status_code == 200, r.text
+
+    assert client.post("/api/astro/synastry", json={"charts": [ANA.dict()]}).status_code == 400
+    bad = {"charts": [ANA.dict(), dict(LUIS.dict(), datetime="nope")]}
+    r = client.post("/api/astro/composite", json=bad)
+    assert r.status_code == 400 and "charts[1]" in r.json()["detail"]
+
+    rank = {"chart": ANA.dict(), "candidates": [LUIS.dict(), {"id": "x", "planets": {"Sun": 1.0}}]}
+    r = client.post("/api/astro/synastry:rank", json=rank)
+    assert r.status_code == 400 and "candidates[1]" in r.json()["detail"]
+    rank["candidates"] = [LUIS.dict()]
+    r = client.post("/api/astro/synastry:rank", json=dict(rank, top=1))
+    assert r.status_code == 200 and r.json()["results"][0]["id"] == "luis"
+    print("✓ Endpoints OK\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_synastry_pair()
+        test_score_symmetric()
+        test_polar_birth()
+        test_composite()
+        test_rank_matches_pairwise()
+        test_rank_thousands_fast()
+        test_endpoints()
+
+        print("=" * 60)
+        print("✓ All synastry tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,157 @@
+"""
+Test local birth time -> UTC resolution (core/timezones.py): cached day
+offsets against zoneinfo, DST gaps and overlaps, city zones, and the batch,
+bulk and /api/time/to-utc entry points.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import bulk_charts
+from core.batch import BatchChartItem, parse_item
+from core.cities import get_city_index
+from core.timezones import city_timezone, day_offset, local_to_utc, local_to_utc_many, resolve_local_time
+from main import app
+
+ZONES = ["America/Argentina/Buenos_Aires", "Europe/Madrid", "America/New_York", "America/Sao_Paulo",
+         "Australia/Sydney", "Asia/Kolkata", "America/Santiago", "Europe/London"]
+
+
+def test_matches_zoneinfo():
+    """Cached offsets give the same UTC instant as zoneinfo, including transition days."""
+    print("=== Testing vs zoneinfo ===")
+
+    rng = np.random.default_rng(17)
+    start = datetime(1900, 1, 1)
+    locals_ = [start + timedelta(minutes=int(m)) for m in rng.integers(0, 130 * 365 * 1440, 3000)]
+    zones = [ZONES[i] for i in rng.integers(0, len(ZONES), 3000)]
+    # Horas alrededor de cambios de hora conocidos
+    for day, zone in [((2021, 3, 14), "America/New_York"), ((2021, 11, 7), "America/New_York"),
+                      ((2018, 11, 4), "America/Sao_Paulo"), ((1990, 3, 25), "Europe/Madrid")]:
+        for minutes in range(0, 1440, 15):
+            locals_.append(datetime(*day) + timedelta(minutes=minutes))
+            zones.append(zone)
+    for fold in (0, 1):
+        converted = local_to_utc_many(locals_, zones, fold)
+        for local, zone, utc in zip(locals_, zones, converted):
+            expected = local.replace(tzinfo=ZoneInfo(zone), fold=fold).astimezone(timezone.utc)
+            assert utc == expected and utc.tzinfo == timezone.utc, (local, zone, fold)
+    assert day_offset("America/New_York", datetime(2021, 3, 14).date()) is None
+    assert day_offset("America/New_York", datetime(2021, 3, 15).date()) == timedelta(hours=-4)
+    print(f"✓ {len(locals_)} local times identical to zoneinfo\n")
+
+
+def test_history_and_transitions():
+    """Historical DST, skipped and repeated local times."""
+    print("=== Testing DST History ===")
+
+    # Argentina usó horario de verano en 1989-90 (UTC-2) y no en 2015
+    assert local_to_utc(datetime(1990, 1, 15, 12, 0), "America/Argentina/Buenos_Aires").hour == 14
+    assert local_to_utc(datetime(2015, 1, 15, 12, 0), "America/Argentina/Buenos_Aires").hour == 15
+    # Con offset explícito se respeta
+    aware = datetime(1990, 1, 15, 12, 0, tzinfo=timezone(timedelta(hours=-3)))
+    assert local_to_utc(aware, "Asia/Tokyo") == aware.astimezone(timezone.utc)
+
+    gap = resolve_local_time(datetime(2021, 3, 14, 2, 30), "America/New_York")
+    assert gap["nonexistent"] and not gap["ambiguous"]
+    overlap = resolve_local_time(datetime(2021, 11, 7, 1, 30), "America/New_York")
+    assert overlap["ambiguous"] and not overlap["nonexistent"]
+    assert overlap["utc"] == "2021-11-07T05:30:00+00:00" and overlap["dst"]
+    second = resolve_local_time(datetime(2021, 11, 7, 1, 30), "America/New_York", fold=1)
+    assert second["utc"] == "2021-11-07T06:30:00+00:00" and not second["dst"]
+    normal = resolve_local_time(datetime(1990, 7, 5, 9, 0), "America/Argentina/Buenos_Aires")
+    assert normal["utc"] == "1990-07-05T12:00:00+00:00" and normal["offset_hours"] == -3.0
+    assert not (normal["ambiguous"] or normal["nonexistent"])
+    try:
+        local_to_utc(datetime(2000, 1, 1), "Mars/Olympus_Mons")
+        assert False, "Unknown zone should fail"
+    except ValueError:
+        pass
+    print("✓ History, gaps and overlaps\n")
+
+
+def test_city_zones():
+    """Every city in data/cities.json has a valid IANA zone."""
+    print("=== Testing City Zones ===")
+
+    for city in get_city_index().cities:
+        assert day_offset(city["timezone"], datetime(2020, 6, 1).date()) is not None, city
+    assert city_timezone("cordoba") == "America/Argentina/Cordoba"
+    assert city_timezone("Madrid", "España") == "Europe/Madrid"
+    assert city_timezone("Madrid", "Perú") is None
+    assert city_timezone("Atlantis") is None
+    print("✓ City zones\n")
+
+
+def test_batch_and_bulk_local_times():
+    """Batch items and bulk rows accept local times with an IANA zone."""
+    print("=== Testing Batch/Bulk Local Times ===")
+
+    item = BatchChartItem(datetime="1990-07-05T09:00:00", lat=-34.6, lon=-58.4,
+                          timezone="America/Argentina/Buenos_Aires")
+    assert parse_item(item) == datetime(1990, 7, 5, 12, 0, tzinfo=timezone.utc)
+    assert parse_item(BatchChartItem(datetime="1990-07-05T09:00:00", lat=0, lon=0)).hour == 9
+    try:
+        parse_item(BatchChartItem(datetime="1990-07-05T09:00:00", lat=0, lon=0, timezone="Nowhere/City"))
+        assert False, "Unknown zone should fail"
+    except ValueError:
+        pass
+
+    df = pd.DataFrame({
+        "id": ["local", "aware", "utc", "bad-zone"],
+        "datetime": ["1990-07-05T09:00:00", "1990-07-05T09:00:00-03:00", "1990-07-05T12:00:00", "1990-07-05T09:00:00"],
+        "lat": [-34.6] * 4,
+        "lon": [-58.4] * 4,
+        "timezone": ["America/Argentina/Buenos_Aires", "Asia/Tokyo", None, "Nowhere/City"],
+    })
+    out = bulk_charts.compute_chunk(df, include_houses=False).to_pandas()
+    for i in range(3):
+        assert str(out["datetime"][i]) == "1990-07-05 12:00:00+00:00", out["datetime"][i]
+        assert pd.isna(out["error"][i])
+    assert out["sun_lon"][0] == out["sun_lon"][2]
+    assert "Unknown timezone" in out["error"][3]
+    print("✓ Batch and bulk\n")
+
+
+def test_endpoint():
+    """GET /api/time/to-utc with a zone or a city."""
+    print("=== Testing /api/time/to-utc ===")
+
+    client = TestClient(app)
+    r = client.get("/api/time/to-utc", params={"datetime": "1990-07-05T09:00:00", "city": "Buenos Aires"})
+    assert r.status_code == 200 and r.json()["utc"] == "1990-07-05T12:00:00+00:00"
+    r = client.get("/api/time/to-utc", params={"datetime": "2021-11-07T01:30:00", "timezone": "America/New_York", "fold": 1})
+    assert r.json()["ambiguous"] and r.json()["utc"] == "2021-11-07T06:30:00+00:00"
+    assert client.get("/api/time/to-utc", params={"datetime": "nope", "timezone": "UTC"}).status_code == 422
+    assert client.get("/api/time/to-utc", params={"datetime": "1990-07-05T09:00:00"}).status_code == 400
+    assert client.get("/api/time/to-utc", params={"datetime": "1990-07-05T09:00:00", "timezone": "X/Y"}).status_code == 400
+    assert client.get("/api/time/to-utc", params={"datetime": "1990-07-05T09:00:00", "city": "Atlantis"}).status_code == 400
+    print("✓ Endpoint\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_matches_zoneinfo()
+        test_history_and_transitions()
+        test_city_zones()
+        test_batch_and_bulk_local_times()
+        test_endpoint()
+
+        print("=" * 60)
+        print("✓ All timezone tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
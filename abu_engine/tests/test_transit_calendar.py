@@ -0,0 +1,122 @@
+"""
+Test the transit event calendar (core/transit_calendar.py,
+/api/astro/transit-calendar).
+Validates exact-hit accuracy, orb enter/leave boundaries, retrograde re-hits
+and a full year for all ten planets (its time budget lives in
+benchmarks/bench_core.py).
+"""
+
+import sys
+from pathlib import Path
+from datetime import datetime, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+from core.chart import chart_json
+from core.transit_calendar import OUTER_PLANETS, transit_calendar
+from core.transits import DEFAULT_ORBS
+from main import app
+
+client = TestClient(app)
+BIRTH = datetime(1990, 7, 5, 12, 0, 0, tzinfo=timezone.utc)
+LAT, LON = -34.6037, -58.3816
+NATAL = {p.name: p.lon for p in chart_json(LAT, LON, BIRTH).planets}
+
+
+def _lon_at(planet: str, iso: str) -> float:
+    dt = datetime.fromisoformat(iso)
+    return {p.name: p.lon for p in chart_json(0, 0, dt).planets}[planet]
+
+
+def _dist(a: float, b: float) -> float:
+    return abs((a - b + 180) % 360 - 180)
+
+
+def test_exact_and_orb_boundaries():
+    """Exact hits land on the aspect point; enter/leave land on the orb edge."""
+    print("=== Testing Exact Times ===")
+
+    cal = transit_calendar(NATAL, datetime(2025, 1, 1), datetime(2025, 7, 1),
+                           transit_planets=["Sun", "Mercury", "Mars", "Saturn"])
+    events = cal["events"]
+    assert events
+    for e in events[:60]:
+        for hit in e["exact"]:
+            # 1 minuto de Mercurio < 0.002°
+            assert _dist(_lon_at(e["transit_planet"], hit["time"]), e["target_longitude"]) < 0.002
+        orb = DEFAULT_ORBS[e["aspect"]]
+        for key in ("enter", "leave"):
+            if e[key]:
+                assert abs(_dist(_lon_at(e["transit_planet"], e[key]), e["target_longitude"]) - orb) < 0.002
+        times = [e["enter"]] + [h["time"] for h in e["exact"]] + [e["leave"]]
+        times = [t for t in times if t]
+        assert times == sorted(times)
+    print(f"✓ {len(events)} passes with accurate boundaries\n")
+
+
+def test_retrograde_rehits():
+    """A slow planet stationing near a natal point produces three exact hits."""
+    print("=== Testing Retrograde Re-hits ===")
+
+    cal = transit_calendar(NATAL, datetime(2024, 1, 1), datetime(2025, 6, 1), transit_planets=["Saturn"])
+    triple = [e for e in cal["events"] if len(e["exact"]) == 3]
+    assert triple, "Saturn 2024 should re-hit some natal point three times"
+    for e in triple:
+        assert [h["retrograde"] for h in e["exact"]] == [False, True, False]
+    print(f"✓ {len(triple)} triple passes\n")
+
+
+def test_full_year():
+    """All ten planets over a full year (timed by benchmarks/bench_core.py: transit_calendar_1y)."""
+    print("=== Testing Full Year ===")
+
+    cal = transit_calendar(NATAL, datetime(2025, 1, 1), datetime(2026, 1, 1))
+    assert len(cal["events"]) > 1000  # la Luna sola aporta ~13 pasos por objetivo
+    print(f"✓ {len(cal['events'])} passes\n")
+
+
+def test_endpoint():
+    """The endpoint defaults to outer planets and validates the range."""
+    print("=== Testing Endpoint ===")
+
+    params = {"birthDate": "1990-07-05T12:00:00Z", "lat": LAT, "lon": LON,
+              "start": "2025-01-01T00:00:00Z", "end": "2026-01-01T00:00:00Z"}
+    r = client.get("/api/astro/transit-calendar", params=params)
+    assert r.status_code == 200, r.text
+    events = r.json()["events"]
+    assert events and all(e["transit_planet"] in OUTER_PLANETS for e in events)
+    assert "note" not in r.json()
+
+    # Latitud polar: sin casas, los tránsitos a los ángulos se omiten con una nota
+    r = client.get("/api/astro/transit-calendar", params=dict(params, lat=70.0, lon=20.0))
+    assert r.status_code == 200, r.text
+    assert "Houses not available" in r.json()["note"]
+    assert r.json()["events"] and not any(e["natal_planet"] in ("Ascendant", "Midheaven") for e in r.json()["events"])
+
+    bad = dict(params, end="2024-01-01T00:00:00Z")
+    assert client.get("/api/astro/transit-calendar", params=bad).status_code == 400
+    bad = dict(params, end="2040-01-01T00:00:00Z")
+    assert client.get("/api/astro/transit-calendar", params=bad).status_code == 400
+    bad = dict(params, start="nope")
+    assert client.get("/api/astro/transit-calendar", params=bad).status_code == 422
+    print("✓ Endpoint OK\n")
+
+
+if __name__ == "__main__":
+    try:
+        test_exact_and_orb_boundaries()
+        test_retrograde_rehits()
+        test_full_year()
+        test_endpoint()
+
+        print("=" * 60)
+        print("✓ All transit calendar tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -13,6 +13,8 @@ Default language: Spanish ('es').
 
 Environment variables:
 - OPENAI_API_KEY: OpenAI API key
+- OPENAI_BASE_URL: Optional, OpenAI-compatible endpoint (read by the SDK), e.g.
+  http://127.0.0.1:8089/v1 for the offline stand-in in scripts/fake_openai.py
 - OPENAI_ASSISTANT_ID: Optional, use a pre-created assistant ID
 - LILLY_MODEL: Optional model (default: 'gpt-4o-mini')
 - ABU_URL: Base URL for Abu Engine (default: http://abu_engine:8000; for local dev: http://127.0.0.1:8000)
@@ -28,6 +30,8 @@ from typing import Any, Dict, Optional, List
 import requests
 from openai import OpenAI
 
+from core.metrics import OPENAI_LATENCY, OPENAI_REQUESTS, record_usage
+
 DEFAULT_MODEL = os.getenv("LILLY_MODEL", "gpt-4o-mini")
 ABU_URL = os.getenv("ABU_URL", "http://abu_engine:8000")
 
@@ -231,6 +235,7 @@ def generate_interpretation_assistants(
         ]
     )
 
+    run_started = time.perf_counter()
     run = client.beta.threads.runs.create(
         thread_id=thread.id,
         assistant_id=assistant_id,
@@ -258,6 +263,11 @@ def generate_interpretation_assistants(
         else:
             time.sleep(_DEF_POLL_INTERVAL)
 
+    # Whole run (tool rounds included), as seen by the caller
+    OPENAI_LATENCY.labels("assistants_run", DEFAULT_MODEL).observe(time.perf_counter() - run_started)
+    OPENAI_REQUESTS.labels("assistants_run", DEFAULT_MODEL, "ok" if run.status == "completed" else "error").inc()
+    record_usage("assistants_run", DEFAULT_MODEL, getattr(run, "usage", None))
+
     # Fetch the latest assistant message
     msgs = client.beta.threads.messages.list(thread_id=thread.id, order="desc", limit=1)
     content_text = ""
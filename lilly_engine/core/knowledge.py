@@ -11,6 +11,8 @@ import hashlib
 from pathlib import Path
 from typing import List
 
+from core.metrics import observe_openai, record_usage
+
 EMBEDDINGS_PATH = Path(__file__).parent.parent / "data" / "embeddings.json"
 
 # Load embeddings index
@@ -39,15 +41,18 @@ def embed_mock(text: str, dim: int = 256) -> List[float]:
 
 def embed_openai(text: str, model: str = "text-embedding-3-small") -> List[float]:
     try:
-        import openai
+        from openai import OpenAI
     except Exception as e:
         raise RuntimeError("openai package not installed.") from e
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY not set.")
-    openai.api_key = api_key
-    resp = openai.Embedding.create(model=model, input=[text])
-    return resp["data"][0]["embedding"]
+    # OPENAI_BASE_URL (read by the SDK) may point to scripts/fake_openai.py
+    client = OpenAI(api_key=api_key)
+    with observe_openai("embeddings", model):
+        resp = client.embeddings.create(model=model, input=[text])
+    record_usage("embeddings", model, getattr(resp, "usage", None))
+    return resp.data[0].embedding
 
 # Main search
 
@@ -1,25 +1,17 @@
 import logging
-from core.knowledge import search_embeddings
 # Helper to load axioms from Markdown
 def load_axioms(path=None, limit=8) -> str:
     use_axioms = os.getenv("LILLY_USE_AXIOMS", "true").lower() != "false"
     if not use_axioms:
         return ""
+    if path is None and limit == AXIOMS_LIMIT:
+        # Default file: served from the assembler's mtime-aware cache
+        return _assembler.axioms()
     if path is None:
-        # Use absolute path relative to this file's parent directory
-        path = Path(__file__).parent.parent / "data" / "axioms" / "astrological_axioms.md"
+        path = AXIOMS_PATH
     try:
-        lines = []
-        with open(path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                lines.append(line)
-                if len(lines) >= limit:
-                    break
-        result = "\n".join(lines)
-        print(f"[INFO] Injected {len(lines)} axioms into prompt")
+        result = read_axioms(path, limit)
+        print(f"[INFO] Injected {len(result.splitlines()) if result else 0} axioms into prompt")
         return result
     except Exception as e:
         print(f"[WARN] Could not load axioms: {e}")
@@ -37,13 +29,19 @@ from enum import Enum
 from openai import OpenAI
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
-from pathlib import Path
 
 # Import context manager for semantic memory
 from core.context_manager import (
     get_context,
-    save_context,
-    format_context_for_prompt
+    save_context
+)
+from core.metrics import observe_openai, record_usage
+from core.prompt_assembly import (
+    AXIOMS_LIMIT,
+    AXIOMS_PATH,
+    PromptAssembler,
+    PromptBuild,
+    read_axioms
 )
 
 # Configure OpenAI client with API key from environment
@@ -199,7 +197,17 @@ PROMPT_TEMPLATES = {
     }
 }
 
-def build_prompt(
+SYSTEM_MESSAGES = {
+    "es": "Eres Lilly, una inteligencia astrológica que combina astrología tradicional, psicología y filosofía evolutiva. Respondes siempre en formato JSON válido.",
+    "en": "You are Lilly, an astrological intelligence combining traditional astrology, psychology and evolutionary philosophy. Always respond in valid JSON format.",
+    "pt": "Você é Lilly, uma inteligência astrológica que combina astrologia tradicional, psicologia e filosofia evolutiva. Sempre responda em formato JSON válido.",
+    "fr": "Vous êtes Lilly, une intelligence astrologique qui combine l'astrologie traditionnelle, la psychologie et la philosophie évolutive. Répondez toujours en format JSON valide."
+}
+
+# Static prompt parts (axioms, skeletons, system messages) are pre-rendered once
+_assembler = PromptAssembler(PROMPT_TEMPLATES, SYSTEM_MESSAGES)
+
+def assemble_prompt(
     profile: Union[Profile, Dict[str, Any]],
     chart: Optional[Union[Chart, Dict[str, Any]]] = None,
     transits: Optional[List[Union[Transit, Dict[str, Any]]]] = None,
@@ -207,22 +215,12 @@ def build_prompt(
     question: Optional[str] = None,
     tone: str = "psicológico",
     include_reasoning: bool = True
-) -> tuple[str, str]:
+) -> PromptBuild:
     """
-    Builds a rich multilingual astrological interpretation prompt.
-    Adapts tone based on detected/specified language.
-    
-    Args:
-        profile: User profile with name and optional language preference
-        chart: Optional natal chart data (sun, moon, ascendant)
-        transits: Optional list of current transits
-        events: Optional list of upcoming astrological events
-        question: Optional specific question or focus area
-        tone: Interpretation tone/style (default: psychological)
-    
-    Returns:
-        Tuple of (formatted prompt string, detected language code)
+    Same inputs as `build_prompt`, but returns the full `PromptBuild`
+    (prompt, language, system message and per-stage timings in ms).
     """
+    t0 = time.perf_counter()
     # Convert dict inputs to dataclasses if needed
     if isinstance(profile, dict):
         profile = Profile(**profile)
@@ -245,90 +243,51 @@ def build_prompt(
         lang_code = profile.language if profile.language in PROMPT_TEMPLATES else "es"
     elif question:
         lang_code = detect_language(question, fallback="es")
-    
-    # Get template for detected language
-    template = PROMPT_TEMPLATES.get(lang_code, PROMPT_TEMPLATES["es"])
-
-    # Extract chart placements
-    sun = getattr(chart, "sun", None) if chart else None
-    moon = getattr(chart, "moon", None) if chart else None
-    asc = getattr(chart, "asc", None) if chart else None
-
-    # Format transit and event strings if present
-    transit_text = ', '.join([
-        f"{t.planet} {t.aspect} {t.target}"
-        for t in (transits or [])
-    ]) or template["none"]
-
-    event_text = ', '.join([
-        f"{e.type} de {e.planet} hacia {e.to}"
-        for e in (events or [])
-    ]) or template["none"]
-
-    # Load axioms section
-    axioms_section = load_axioms()
-
-    # Build classical references section using semantic search
-    # Use transit and question context for query
-    query_parts = []
-    if transits:
-        for t in transits:
-            query_parts.append(f"{t.planet} {t.aspect} {t.target}")
-    if question:
-        query_parts.append(str(question))
-    query = " ".join(query_parts).strip() or "astrology"
-    refs = search_embeddings(query, top_k=3)
-    refs_section = "\n".join(refs)
-
-    # Build the complete prompt using template
-    prompt = f"""{template["intro"]}
-
-{template["instruction"].format(name=profile.name)}
-
-{template["format"]}
-
-Reasoning Axioms:
-{axioms_section}
-
-Classical References (William Lilly):
-{refs_section}
-
-{template["data_section"]}
-- {template["sun"]}: {sun or template["none"]}
-- {template["moon"]}: {moon or template["none"]}
-- {template["asc"]}: {asc or template["none"]}
-- {template["transits"]}: {transit_text}
-- {template["events"]}: {event_text}
-
-{template["question"]}: {question or template["general"]}
+    if lang_code not in PROMPT_TEMPLATES:
+        lang_code = "es"
+    language_ms = (time.perf_counter() - t0) * 1000
+
+    build = _assembler.assemble(
+        lang_code,
+        name=profile.name,
+        sun=getattr(chart, "sun", None) if chart else None,
+        moon=getattr(chart, "moon", None) if chart else None,
+        asc=getattr(chart, "asc", None) if chart else None,
+        transits=transits,
+        events=events,
+        question=question,
+        tone=tone,
+        include_reasoning=include_reasoning
+    )
+    build.timings["language"] = round(language_ms, 4)
+    return build
 
-{template["tone"]}: {tone}
-
-{template["context"]}:
-{format_context_for_prompt(profile.name, limit=2)}
-
-Reglas de estilo:
-- Usa lenguaje natural y preciso, sin exageraciones.
-- Evita listas en la narrativa; reserva bullets solo para "actions".
-- Integra el contexto cuando sea pertinente, sin repetirlo.
-"""
-
-    # Add reasoning instruction if enabled
-    if include_reasoning:
-        prompt += """
-Tarea de razonamiento:
-1. Antes de escribir tu interpretación final, razona paso a paso usando los axiomas y referencias proporcionados.
-2. Explica cómo cada principio clave se aplica a la carta y pregunta actual.
-3. Incluye este razonamiento interno como un párrafo breve bajo la clave "reasoning" en la salida JSON.
-4. Luego proporciona "headline", "narrative" y "actions".
-
-Responde con JSON válido que incluya: abu_line, lilly_line, reasoning, headline, narrative, actions. No agregues comentarios fuera del JSON.
-"""
-    else:
-        prompt += """
-Responde solo con JSON válido. No agregues comentarios fuera del JSON.
-"""
-    return prompt, lang_code
+def build_prompt(
+    profile: Union[Profile, Dict[str, Any]],
+    chart: Optional[Union[Chart, Dict[str, Any]]] = None,
+    transits: Optional[List[Union[Transit, Dict[str, Any]]]] = None,
+    events: Optional[List[Union[Event, Dict[str, Any]]]] = None,
+    question: Optional[str] = None,
+    tone: str = "psicológico",
+    include_reasoning: bool = True
+) -> tuple[str, str]:
+    """
+    Builds a rich multilingual astrological interpretation prompt.
+    Adapts tone based on detected/specified language.
+    
+    Args:
+        profile: User profile with name and optional language preference
+        chart: Optional natal chart data (sun, moon, ascendant)
+        transits: Optional list of current transits
+        events: Optional list of upcoming astrological events
+        question: Optional specific question or focus area
+        tone: Interpretation tone/style (default: psychological)
+    
+    Returns:
+        Tuple of (formatted prompt string, detected language code)
+    """
+    build = assemble_prompt(profile, chart, transits, events, question, tone, include_reasoning)
+    return build.prompt, build.language
 
 def generate_interpretation(
     events: List[Dict[str, Any]], 
@@ -377,7 +336,7 @@ def generate_interpretation(
             include_reasoning = os.getenv("LILLY_INCLUDE_REASONING", "true").lower() != "false"
         
         # Build prompt with context and get detected language
-        prompt_text, detected_lang = build_prompt(
+        build = assemble_prompt(
             profile=profile,
             chart=chart,
             events=event_objs,
@@ -385,28 +344,26 @@ def generate_interpretation(
             tone=tone or "psicológico",
             include_reasoning=include_reasoning
         )
+        prompt_text, detected_lang = build.prompt, build.language
+        logging.debug(f"[Lilly] Prompt assembled in {build.timings['total']:.3f} ms: {build.timings}")
         
-        # Build system message based on detected language
-        system_messages = {
-            "es": "Eres Lilly, una inteligencia astrológica que combina astrología tradicional, psicología y filosofía evolutiva. Respondes siempre en formato JSON válido.",
-            "en": "You are Lilly, an astrological intelligence combining traditional astrology, psychology and evolutionary philosophy. Always respond in valid JSON format.",
-            "pt": "Você é Lilly, uma inteligência astrológica que combina astrologia tradicional, psicologia e filosofia evolutiva. Sempre responda em formato JSON válido.",
-            "fr": "Vous êtes Lilly, une intelligence astrologique qui combine l'astrologie traditionnelle, la psychologie et la philosophie évolutive. Répondez toujours en format JSON valide."
-        }
-        system_msg = system_messages.get(detected_lang, system_messages["es"])
+        # System message pre-rendered per detected language
+        system_msg = build.system_message
         
         # Get model from environment or use default
         model_name = os.getenv('LILLY_MODEL', 'gpt-4o-mini')
         
-        response = _client.chat.completions.create(
-            model=model_name,
-            messages=[
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": prompt_text}
-            ],
-            temperature=0.9,
-            max_tokens=900
-        )
+        with observe_openai("chat", model_name):
+            response = _client.chat.completions.create(
+                model=model_name,
+                messages=[
+                    {"role": "system", "content": system_msg},
+                    {"role": "user", "content": prompt_text}
+                ],
+                temperature=0.9,
+                max_tokens=900
+            )
+        record_usage("chat", model_name, getattr(response, "usage", None))
 
         # Extract content
         content = response.choices[0].message.content
@@ -0,0 +1,167 @@
+"""
+Operational metrics for Lilly Engine in Prometheus text format.
+
+Everything lives in a local prometheus_client CollectorRegistry served at
+/metrics; no Pushgateway or other external service is involved.
+
+Exports:
+- lilly_http_requests_total{method,route,status}
+- lilly_http_request_duration_seconds{method,route}
+- lilly_http_requests_in_flight
+- lilly_openai_request_duration_seconds{operation,model}
+- lilly_openai_requests_total{operation,model,outcome}
+- lilly_openai_tokens_total{operation,model,kind}
+- lilly_cache_requests_total{cache,result} and lilly_cache_hit_ratio{cache}
+- process_resident_memory_bytes, process_cpu_seconds_total, ... (ProcessCollector)
+"""
+
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, List, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    ProcessCollector,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+OPENAI_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 60, 120)
+UNMATCHED_ROUTE = "unmatched"
+
+REGISTRY = CollectorRegistry()
+ProcessCollector(registry=REGISTRY)
+
+HTTP_REQUESTS = Counter(
+    "lilly_http_requests_total", "HTTP requests handled",
+    ["method", "route", "status"], registry=REGISTRY
+)
+HTTP_LATENCY = Histogram(
+    "lilly_http_request_duration_seconds", "HTTP request latency",
+    ["method", "route"], buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+HTTP_IN_FLIGHT = Gauge(
+    "lilly_http_requests_in_flight", "HTTP requests currently being handled",
+    registry=REGISTRY
+)
+OPENAI_LATENCY = Histogram(
+    "lilly_openai_request_duration_seconds", "OpenAI call latency (assistants_run: create to terminal status)",
+    ["operation", "model"], buckets=OPENAI_BUCKETS, registry=REGISTRY
+)
+OPENAI_REQUESTS = Counter(
+    "lilly_openai_requests_total", "OpenAI calls by outcome",
+    ["operation", "model", "outcome"], registry=REGISTRY
+)
+OPENAI_TOKENS = Counter(
+    "lilly_openai_tokens_total", "Tokens reported by OpenAI usage",
+    ["operation", "model", "kind"], registry=REGISTRY
+)
+
+
+class CacheStats:
+    """Hit/miss counters per named cache, exported with their hit ratio."""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._counts: Dict[str, List[int]] = {}
+        self._lock = Lock()
+
+    def record(self, cache: str, hit: bool) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(cache, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def hit(self, cache: str) -> None:
+        self.record(cache, True)
+
+    def miss(self, cache: str) -> None:
+        self.record(cache, False)
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        with self._lock:
+            return {name: (c[0], c[1]) for name, c in self._counts.items()}
+
+    def collect(self):
+        requests = CounterMetricFamily(
+            f"{self.prefix}_cache_requests", "Cache lookups by result", labels=["cache", "result"]
+        )
+        ratio = GaugeMetricFamily(
+            f"{self.prefix}_cache_hit_ratio", "Cache hits / lookups since start", labels=["cache"]
+        )
+        for name, (hits, misses) in sorted(self.snapshot().items()):
+            requests.add_metric([name, "hit"], hits)
+            requests.add_metric([name, "miss"], misses)
+            ratio.add_metric([name], hits / (hits + misses) if hits + misses else 0.0)
+        yield requests
+        yield ratio
+
+
+CACHE = CacheStats("lilly")
+REGISTRY.register(CACHE)
+
+
+@contextmanager
+def observe_openai(operation: str, model: str):
+    """Time an OpenAI call and count it as ok/error."""
+    t0 = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        OPENAI_LATENCY.labels(operation, model).observe(time.perf_counter() - t0)
+        OPENAI_REQUESTS.labels(operation, model, outcome).inc()
+
+
+def record_usage(operation: str, model: str, usage: Any) -> None:
+    """Add prompt/completion token counts from an OpenAI `usage` object (if any)."""
+    if usage is None:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        value = getattr(usage, kind, None)
+        if value:
+            OPENAI_TOKENS.labels(operation, model, kind.replace("_tokens", "")).inc(value)
+
+
+def route_label(request) -> str:
+    """Route template (e.g. /api/ai/interpret) to keep label cardinality bounded."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+async def metrics_middleware(request, call_next):
+    """HTTP middleware: request counts, latency and in-flight gauge."""
+    HTTP_IN_FLIGHT.inc()
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - t0
+        HTTP_IN_FLIGHT.dec()
+        route = route_label(request)
+        HTTP_REQUESTS.labels(request.method, route, str(status)).inc()
+        HTTP_LATENCY.labels(request.method, route).observe(elapsed)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """(body, content type) of the registry in Prometheus text format."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+__all__ = [
+    "REGISTRY",
+    "CACHE",
+    "metrics_middleware",
+    "observe_openai",
+    "record_usage",
+    "render_metrics",
+]
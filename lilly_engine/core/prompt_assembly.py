@@ -0,0 +1,309 @@
+"""
+Prompt assembly layer for Lilly Engine.
+
+The static parts of an interpretation prompt (axioms, per-language template
+skeletons and system messages) are loaded and pre-rendered once and only
+refreshed when the underlying file changes on disk (mtime/size). Each request
+then renders just the dynamic sections (name, placements, transits, events,
+classical references and prior context) into a cached skeleton.
+
+Every build reports per-stage timings in milliseconds so slow stages
+(embedding search, memory reload) are visible in logs.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.context_manager import format_context_for_prompt, get_memory_path
+from core.knowledge import search_embeddings
+from core.metrics import CACHE
+
+AXIOMS_PATH = Path(__file__).parent.parent / "data" / "axioms" / "astrological_axioms.md"
+AXIOMS_LIMIT = 8
+
+_STYLE_RULES = """Reglas de estilo:
+- Usa lenguaje natural y preciso, sin exageraciones.
+- Evita listas en la narrativa; reserva bullets solo para "actions".
+- Integra el contexto cuando sea pertinente, sin repetirlo.
+"""
+
+_REASONING_TASK = """
+Tarea de razonamiento:
+1. Antes de escribir tu interpretación final, razona paso a paso usando los axiomas y referencias proporcionados.
+2. Explica cómo cada principio clave se aplica a la carta y pregunta actual.
+3. Incluye este razonamiento interno como un párrafo breve bajo la clave "reasoning" en la salida JSON.
+4. Luego proporciona "headline", "narrative" y "actions".
+
+Responde con JSON válido que incluya: abu_line, lilly_line, reasoning, headline, narrative, actions. No agregues comentarios fuera del JSON.
+"""
+
+_JSON_ONLY = """
+Responde solo con JSON válido. No agregues comentarios fuera del JSON.
+"""
+
+
+def read_axioms(path: Path, limit: int = AXIOMS_LIMIT) -> str:
+    """Read the first `limit` non-heading, non-empty lines of the axioms file."""
+    lines = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            lines.append(line)
+            if len(lines) >= limit:
+                break
+    return "\n".join(lines)
+
+
+def axioms_enabled() -> bool:
+    """Whether axioms should be injected (env `LILLY_USE_AXIOMS`, default true)."""
+    return os.getenv("LILLY_USE_AXIOMS", "true").lower() != "false"
+
+
+class WatchedFile:
+    """Value derived from a file, reloaded only when the file's mtime/size change.
+
+    A missing file is a valid state (stamp None); the loader decides what to
+    return for it. Loader errors are cached as `default` until the file changes.
+    """
+
+    def __init__(self, path: Path, loader: Callable[[Path], Any], default: Any = None):
+        self.path = Path(path)
+        self._loader = loader
+        self._default = default
+        self._lock = Lock()
+        self._loaded = False
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._value: Any = default
+
+    def stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def get(self) -> Tuple[Any, Optional[Tuple[int, int]]]:
+        """Return (value, stamp), reloading first if the file changed."""
+        stamp = self.stamp()
+        if self._loaded and stamp == self._stamp:
+            return self._value, stamp
+        with self._lock:
+            if not self._loaded or stamp != self._stamp:
+                try:
+                    self._value = self._loader(self.path)
+                except Exception as e:
+                    print(f"[WARN] Could not load {self.path.name}: {e}")
+                    self._value = self._default
+                self._stamp = stamp
+                self._loaded = True
+            return self._value, self._stamp
+
+
+def _escape(text: str) -> str:
+    """Escape literal braces so static text survives `str.format`."""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def render_skeleton(template: Dict[str, str], axioms: str, include_reasoning: bool) -> str:
+    """Pre-render every static part of the prompt for one language.
+
+    The result is a `str.format` string whose only placeholders are the
+    dynamic fields: name, refs, sun, moon, asc, transits, events, question,
+    tone and context.
+    """
+    t = {k: _escape(v) for k, v in template.items()}
+    instruction = t["instruction"].replace("{{name}}", "{name}")
+    skeleton = f"""{t["intro"]}
+
+{instruction}
+
+{t["format"]}
+
+Reasoning Axioms:
+{_escape(axioms)}
+
+Classical References (William Lilly):
+{{refs}}
+
+{t["data_section"]}
+- {t["sun"]}: {{sun}}
+- {t["moon"]}: {{moon}}
+- {t["asc"]}: {{asc}}
+- {t["transits"]}: {{transits}}
+- {t["events"]}: {{events}}
+
+{t["question"]}: {{question}}
+
+{t["tone"]}: {{tone}}
+
+{t["context"]}:
+{{context}}
+
+{_escape(_STYLE_RULES)}"""
+    skeleton += _escape(_REASONING_TASK if include_reasoning else _JSON_ONLY)
+    return skeleton
+
+
+@dataclass
+class PromptBuild:
+    """Result of a prompt assembly: the prompt plus per-stage timings (ms)."""
+    prompt: str
+    language: str
+    system_message: str
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class PromptAssembler:
+    """Caches static prompt material and renders only per-request sections.
+
+    Args:
+        templates: Per-language template dicts (see `llm.PROMPT_TEMPLATES`).
+        system_messages: Per-language system messages.
+        default_language: Language used when a code is not in `templates`.
+        axioms_path: Markdown file with reasoning axioms.
+        memory_path: Semantic memory file; formatted context is cached per
+            user until this file changes.
+    """
+
+    def __init__(
+        self,
+        templates: Dict[str, Dict[str, str]],
+        system_messages: Dict[str, str],
+        default_language: str = "es",
+        axioms_path: Path = AXIOMS_PATH,
+        memory_path: Optional[Path] = None,
+    ):
+        self.templates = templates
+        self.system_messages = system_messages
+        self.default_language = default_language
+        self._axioms = WatchedFile(axioms_path, self._load_axioms, default="")
+        # Each memory.json change yields a fresh, empty per-user context cache
+        self._memory = WatchedFile(memory_path or get_memory_path(), lambda _p: {}, default={})
+        self._skeletons: Dict[Tuple[str, bool, bool], str] = {}
+        self._skeletons_stamp = None
+        self._lock = Lock()
+
+    @staticmethod
+    def _load_axioms(path: Path) -> str:
+        text = read_axioms(path)
+        print(f"[INFO] Loaded {len(text.splitlines()) if text else 0} axioms from {path.name}")
+        return text
+
+    def axioms(self) -> str:
+        """Cached axioms text ('' when disabled via LILLY_USE_AXIOMS)."""
+        if not axioms_enabled():
+            return ""
+        return self._axioms.get()[0]
+
+    def system_message(self, language: str) -> str:
+        return self.system_messages.get(language, self.system_messages[self.default_language])
+
+    def skeleton(self, language: str, include_reasoning: bool) -> str:
+        """Return the pre-rendered skeleton, rebuilding all if axioms changed."""
+        use_axioms = axioms_enabled()
+        axioms, stamp = self._axioms.get() if use_axioms else ("", None)
+        key = (language, include_reasoning, use_axioms)
+        with self._lock:
+            if use_axioms and stamp != self._skeletons_stamp:
+                self._skeletons = {k: v for k, v in self._skeletons.items() if not k[2]}
+                self._skeletons_stamp = stamp
+            cached = self._skeletons.get(key)
+            CACHE.record("prompt_skeleton", cached is not None)
+            if cached is None:
+                template = self.templates.get(language, self.templates[self.default_language])
+                cached = render_skeleton(template, axioms, include_reasoning)
+                self._skeletons[key] = cached
+            return cached
+
+    def context(self, user: str, limit: int = 2) -> str:
+        """Formatted prior context for `user`, re-read only after memory changes."""
+        cache, _ = self._memory.get()
+        key = (user, limit)
+        text = cache.get(key)
+        CACHE.record("prompt_context", text is not None)
+        if text is None:
+            text = format_context_for_prompt(user, limit=limit)
+            cache[key] = text
+        return text
+
+    def warm(self) -> None:
+        """Pre-render skeletons for every language and both reasoning modes."""
+        for language in self.templates:
+            for include_reasoning in (True, False):
+                self.skeleton(language, include_reasoning)
+
+    def assemble(
+        self,
+        language: str,
+        name: str,
+        sun: Optional[str] = None,
+        moon: Optional[str] = None,
+        asc: Optional[str] = None,
+        transits: Optional[List[Any]] = None,
+        events: Optional[List[Any]] = None,
+        question: Optional[str] = None,
+        tone: str = "psicológico",
+        include_reasoning: bool = True,
+    ) -> PromptBuild:
+        """Render a full prompt; only the dynamic sections are computed here.
+
+        `transits` items need `planet`, `aspect`, `target` attributes and
+        `events` items need `type`, `planet`, `to` (see `llm.Transit`/`llm.Event`).
+        """
+        timings: Dict[str, float] = {}
+        t0 = time.perf_counter()
+        template = self.templates.get(language, self.templates[self.default_language])
+        skeleton = self.skeleton(language, include_reasoning)
+        t1 = time.perf_counter()
+        timings["static"] = (t1 - t0) * 1000
+
+        none = template["none"]
+        transit_parts = [f"{t.planet} {t.aspect} {t.target}" for t in (transits or [])]
+        transit_text = ", ".join(transit_parts) or none
+        event_text = ", ".join(
+            f"{e.type} de {e.planet} hacia {e.to}" for e in (events or [])
+        ) or none
+        t2 = time.perf_counter()
+        timings["sections"] = (t2 - t1) * 1000
+
+        # Classical references via semantic search over transits + question
+        query_parts = list(transit_parts)
+        if question:
+            query_parts.append(str(question))
+        query = " ".join(query_parts).strip() or "astrology"
+        refs_section = "\n".join(search_embeddings(query, top_k=3))
+        t3 = time.perf_counter()
+        timings["references"] = (t3 - t2) * 1000
+
+        context_section = self.context(name, limit=2)
+        t4 = time.perf_counter()
+        timings["context"] = (t4 - t3) * 1000
+
+        prompt = skeleton.format(
+            name=name,
+            refs=refs_section,
+            sun=sun or none,
+            moon=moon or none,
+            asc=asc or none,
+            transits=transit_text,
+            events=event_text,
+            question=question or template["general"],
+            tone=tone,
+            context=context_section,
+        )
+        t5 = time.perf_counter()
+        timings["render"] = (t5 - t4) * 1000
+        timings["total"] = (t5 - t0) * 1000
+
+        return PromptBuild(
+            prompt=prompt,
+            language=language,
+            system_message=self.system_message(language),
+            timings={k: round(v, 4) for k, v in timings.items()},
+        )
@@ -1,14 +1,15 @@
 # -*- coding: utf-8 -*-
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import json
 import os
 import warnings
-from core.llm import generate_interpretation, Language
+from core.llm import generate_interpretation, Language, _assembler
 from core.assistants import generate_interpretation_assistants
 from core.context_manager import save_context
+from core.metrics import metrics_middleware, render_metrics
 
 class AstroData(BaseModel):
     events: Optional[List[Dict[str, Any]]] = None
@@ -31,6 +32,7 @@ class InterpretResponse(BaseModel):
     astro_metadata: Dict[str, Any]
 
 app = FastAPI(title="Lilly Engine - Interpretación Astrológica")
+app.middleware("http")(metrics_middleware)
 
 # Configure CORS
 app.add_middleware(
@@ -50,6 +52,15 @@ try:
 except Exception:
     archetypes = {}
 
+
+# Pre-render static prompt parts (axioms, skeletons) so the first request skips disk I/O
+@app.on_event("startup")
+async def warm_up():
+    try:
+        _assembler.warm()
+    except Exception as e:
+        warnings.warn(f"Prompt warm-up failed: {e}")
+
 @app.post(
     "/api/ai/interpret",
     response_model=InterpretResponse,
@@ -267,6 +278,17 @@ def root():
     return {"message": "Lilly Engine is running correctly!"}
 
 
+@app.get("/metrics", response_class=Response)
+def get_metrics():
+    """
+    Prometheus text metrics: per-route request counts and latency, in-flight
+    requests, OpenAI call latency and token usage, prompt cache hit ratios
+    and process RSS.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 class SolarReturnData(BaseModel):
     """Solar Return chart data for relocation analysis."""
     natal_chart: Dict[str, Any]
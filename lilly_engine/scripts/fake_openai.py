@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+"""
+Local OpenAI-compatible stand-in server for offline load testing of Lilly.
+
+Implements only the subset of the OpenAI REST API that Lilly calls:
+- POST /v1/chat/completions                       (core.llm)
+- POST /v1/embeddings                             (core.knowledge)
+- POST /v1/assistants                             (core.assistants)
+- POST /v1/threads
+- POST /v1/threads/{thread_id}/runs
+- GET  /v1/threads/{thread_id}/runs/{run_id}
+- POST /v1/threads/{thread_id}/runs/{run_id}/submit_tool_outputs
+- GET  /v1/threads/{thread_id}/messages
+- GET  /_fake/stats                               (request counters, tool outputs)
+
+Usage (PowerShell):
+  python lilly_engine/scripts/fake_openai.py --port 8089 \
+    --config lilly_engine/scripts/fake_openai_config.json
+
+  $env:OPENAI_BASE_URL = "http://127.0.0.1:8089/v1"
+  $env:OPENAI_API_KEY = "sk-fake"
+  uvicorn lilly_engine.main:app --port 8001
+
+The OpenAI SDK reads OPENAI_BASE_URL, so no code change is needed to switch
+between the real API and this server.
+
+Config (JSON, every key optional):
+  {
+    "seed": 42,
+    "latency": {
+      "default":    {"dist": "fixed", "ms": 0},
+      "chat":       {"dist": "lognormal", "median_ms": 900, "sigma": 0.35},
+      "embeddings": {"dist": "uniform", "min_ms": 40, "max_ms": 120},
+      "assistants": {"dist": "fixed", "ms": 30},
+      "run":        {"dist": "exponential", "mean_ms": 600}
+    },
+    "chat_responses": [{...Lilly JSON...}],        # cycled per request
+    "assistant_responses": [{...Lilly JSON...}],   # final run message
+    "assistant_script": [                          # one entry per requires_action round
+      [{"name": "abu_get_chart", "arguments": {"date": "...", "lat": 0, "lon": 0}}]
+    ],
+    "embedding_dim": 256
+  }
+
+Latency distributions: fixed(ms), uniform(min_ms, max_ms), normal(mean_ms,
+std_ms), lognormal(median_ms, sigma), exponential(mean_ms). "chat",
+"embeddings" and "assistants" delay the HTTP response; "run" is the simulated
+processing time before a run leaves "in_progress".
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+
+DEFAULT_LILLY_RESPONSE = {
+    "abu_line": "Saturno cruza un ángulo natal; el cálculo marca un punto de inflexión.",
+    "lilly_line": "Lo que se estructura ahora sostiene lo que vendrá.",
+    "reasoning": "Respuesta simulada por el servidor local de pruebas.",
+    "headline": "Tiempo de estructura",
+    "narrative": "Interpretación simulada para pruebas de carga sin acceso a OpenAI.",
+    "actions": ["Ordenar prioridades", "Revisar compromisos", "Descansar con intención"]
+}
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "seed": 42,
+    "latency": {"default": {"dist": "fixed", "ms": 0}},
+    "chat_responses": [DEFAULT_LILLY_RESPONSE],
+    "assistant_responses": [DEFAULT_LILLY_RESPONSE],
+    "assistant_script": [],
+    "embedding_dim": 256,
+}
+
+
+def load_config(path: Optional[str] = None) -> Dict[str, Any]:
+    """Merge a JSON config file (if any) over DEFAULT_CONFIG."""
+    config = json.loads(json.dumps(DEFAULT_CONFIG))
+    if path:
+        with open(path, encoding="utf-8") as f:
+            user = json.load(f)
+        latency = {**config["latency"], **user.pop("latency", {})}
+        config.update(user)
+        config["latency"] = latency
+    return config
+
+
+class LatencyModel:
+    """Seeded per-endpoint latency sampler (milliseconds)."""
+
+    def __init__(self, spec: Dict[str, Dict[str, Any]], seed: Optional[int] = None):
+        self.spec = spec
+        self._rng = random.Random(seed)
+        self._lock = Lock()
+
+    def sample_ms(self, kind: str) -> float:
+        d = self.spec.get(kind) or self.spec.get("default") or {"dist": "fixed", "ms": 0}
+        dist = d.get("dist", "fixed")
+        with self._lock:
+            if dist == "fixed":
+                value = float(d.get("ms", 0))
+            elif dist == "uniform":
+                value = self._rng.uniform(d.get("min_ms", 0), d.get("max_ms", 0))
+            elif dist == "normal":
+                value = self._rng.gauss(d.get("mean_ms", 0), d.get("std_ms", 0))
+            elif dist == "lognormal":
+                value = self._rng.lognormvariate(math.log(max(d.get("median_ms", 1), 1e-6)), d.get("sigma", 0.5))
+            elif dist == "exponential":
+                mean = d.get("mean_ms", 0)
+                value = self._rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+            else:
+                raise ValueError(f"Unknown latency distribution: {dist}")
+        return max(value, 0.0)
+
+    async def sleep(self, kind: str) -> None:
+        ms = self.sample_ms(kind)
+        if ms > 0:
+            await asyncio.sleep(ms / 1000.0)
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:24]}"
+
+
+def _count_tokens(text: str) -> int:
+    """Rough token estimate (~4 chars/token), enough for usage accounting."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def fake_embedding(text: str, dim: int) -> List[float]:
+    """Deterministic hash-based vector (same scheme as knowledge.embed_mock)."""
+    h = hashlib.sha256(text.encode("utf-8")).digest()
+    raw = (h * ((dim // len(h)) + 1))[:dim]
+    return [b / 255.0 for b in raw]
+
+
+def create_app(config: Optional[Dict[str, Any]] = None) -> FastAPI:
+    """Build the fake OpenAI FastAPI app from a (merged) config dict."""
+    config = config or load_config()
+    latency = LatencyModel(config.get("latency", {}), config.get("seed"))
+    chat_cycle = itertools.cycle(config.get("chat_responses") or [DEFAULT_LILLY_RESPONSE])
+    answer_cycle = itertools.cycle(config.get("assistant_responses") or [DEFAULT_LILLY_RESPONSE])
+    script: List[List[Dict[str, Any]]] = config.get("assistant_script") or []
+    embedding_dim = int(config.get("embedding_dim", 256))
+
+    state_lock = Lock()
+    stats: Counter = Counter()
+    tool_outputs_log: List[Dict[str, Any]] = []
+    threads: Dict[str, Dict[str, Any]] = {}
+    runs: Dict[str, Dict[str, Any]] = {}
+
+    app = FastAPI(title="Fake OpenAI (Lilly load testing)")
+
+    def _content(item: Any) -> str:
+        return item if isinstance(item, str) else json.dumps(item, ensure_ascii=False)
+
+    def _message(thread_id: str, role: str, text: str, run_id: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "id": _new_id("msg"),
+            "object": "thread.message",
+            "created_at": int(time.time()),
+            "thread_id": thread_id,
+            "role": role,
+            "content": [{"type": "text", "text": {"value": text, "annotations": []}}],
+            "assistant_id": None,
+            "run_id": run_id,
+            "attachments": [],
+            "metadata": {},
+            "status": "completed",
+        }
+
+    def _run_view(run: Dict[str, Any]) -> Dict[str, Any]:
+        """Advance the run state machine and return its public representation."""
+        now = time.monotonic()
+        if run["status"] in ("queued", "in_progress"):
+            if now < run["ready_at"]:
+                run["status"] = "in_progress"
+            elif run["step"] < len(script):
+                run["status"] = "requires_action"
+                run["pending"] = [
+                    {
+                        "id": _new_id("call"),
+                        "type": "function",
+                        "function": {
+                            "name": call["name"],
+                            "arguments": _content(call.get("arguments", {})),
+                        },
+                    }
+                    for call in script[run["step"]]
+                ]
+            else:
+                run["status"] = "completed"
+                run["completed_at"] = int(time.time())
+                text = _content(next(answer_cycle))
+                threads[run["thread_id"]]["messages"].append(
+                    _message(run["thread_id"], "assistant", text, run["id"])
+                )
+                prompt_tokens = sum(
+                    _count_tokens(m["content"][0]["text"]["value"])
+                    for m in threads[run["thread_id"]]["messages"]
+                )
+                run["usage"] = {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": _count_tokens(text),
+                    "total_tokens": prompt_tokens + _count_tokens(text),
+                }
+        view = {k: v for k, v in run.items() if k not in ("ready_at", "step", "pending")}
+        view["required_action"] = None
+        if run["status"] == "requires_action":
+            view["required_action"] = {
+                "type": "submit_tool_outputs",
+                "submit_tool_outputs": {"tool_calls": run["pending"]},
+            }
+        return view
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["chat.completions"] += 1
+        await latency.sleep("chat")
+        text = _content(next(chat_cycle))
+        prompt_text = " ".join(str(m.get("content", "")) for m in body.get("messages", []))
+        prompt_tokens, completion_tokens = _count_tokens(prompt_text), _count_tokens(text)
+        return {
+            "id": _new_id("chatcmpl"),
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake-model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        stats["embeddings"] += 1
+        await latency.sleep("embeddings")
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        tokens = sum(_count_tokens(str(t)) for t in inputs)
+        return {
+            "object": "list",
+            "model": body.get("model", "fake-embedding"),
+            "data": [
+                {"object": "embedding", "index": i, "embedding": fake_embedding(str(t), embedding_dim)}
+                for i, t in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    @app.post("/v1/assistants")
+    async def create_assistant(request: Request):
+        body = await request.json()
+        stats["assistants.create"] += 1
+        await latency.sleep("assistants")
+        return {
+            "id": _new_id("asst"),
+            "object": "assistant",
+            "created_at": int(time.time()),
+            "name": body.get("name"),
+            "description": None,
+            "model": body.get("model", "fake-model"),
+            "instructions": body.get("instructions"),
+            "tools": body.get("tools", []),
+            "metadata": {},
+        }
+
+    @app.post("/v1/threads")
+    async def create_thread(request: Request):
+        body = await request.json()
+        stats["threads.create"] += 1
+        await latency.sleep("assistants")
+        thread_id = _new_id("thread")
+        with state_lock:
+            threads[thread_id] = {"messages": [
+                _message(thread_id, m.get("role", "user"), _content(m.get("content", "")))
+                for m in body.get("messages", [])
+            ]}
+        return {"id": thread_id, "object": "thread", "created_at": int(time.time()), "metadata": {}}
+
+    @app.post("/v1/threads/{thread_id}/runs")
+    async def create_run(thread_id: str, request: Request):
+        body = await request.json()
+        stats["runs.create"] += 1
+        await latency.sleep("assistants")
+        with state_lock:
+            if thread_id not in threads:
+                raise HTTPException(status_code=404, detail="thread not found")
+            run_id = _new_id("run")
+            runs[run_id] = {
+                "id": run_id,
+                "object": "thread.run",
+                "created_at": int(time.time()),
+                "thread_id": thread_id,
+                "assistant_id": body.get("assistant_id"),
+                "model": body.get("model", "fake-model"),
+                "instructions": "",
+                "tools": [],
+                "status": "queued",
+                "completed_at": None,
+                "usage": None,
+                "ready_at": time.monotonic() + latency.sample_ms("run") / 1000.0,
+                "step": 0,
+                "pending": [],
+            }
+            return _run_view(runs[run_id])
+
+    @app.get("/v1/threads/{thread_id}/runs/{run_id}")
+    async def retrieve_run(thread_id: str, run_id: str):
+        stats["runs.retrieve"] += 1
+        await latency.sleep("assistants")
+        with state_lock:
+            run = runs.get(run_id)
+            if not run or run["thread_id"] != thread_id:
+                raise HTTPException(status_code=404, detail="run not found")
+            return _run_view(run)
+
+    @app.post("/v1/threads/{thread_id}/runs/{run_id}/submit_tool_outputs")
+    async def submit_tool_outputs(thread_id: str, run_id: str, request: Request):
+        body = await request.json()
+        stats["runs.submit_tool_outputs"] += 1
+        await latency.sleep("assistants")
+        with state_lock:
+            run = runs.get(run_id)
+            if not run or run["thread_id"] != thread_id:
+                raise HTTPException(status_code=404, detail="run not found")
+            if run["status"] != "requires_action":
+                raise HTTPException(status_code=400, detail=f"run is {run['status']}, not requires_action")
+            expected = {tc["id"] for tc in run["pending"]}
+            received = {o.get("tool_call_id") for o in body.get("tool_outputs", [])}
+            if expected != received:
+                raise HTTPException(status_code=400, detail="tool_call_id mismatch")
+            names = {tc["id"]: tc["function"]["name"] for tc in run["pending"]}
+            for o in body.get("tool_outputs", []):
+                tool_outputs_log.append({"run_id": run_id, "name": names[o["tool_call_id"]], "output": o.get("output")})
+            run["step"] += 1
+            run["pending"] = []
+            run["status"] = "queued"
+            run["ready_at"] = time.monotonic() + latency.sample_ms("run") / 1000.0
+            return _run_view(run)
+
+    @app.get("/v1/threads/{thread_id}/messages")
+    async def list_messages(thread_id: str, order: str = "desc", limit: int = 20):
+        stats["messages.list"] += 1
+        await latency.sleep("assistants")
+        with state_lock:
+            if thread_id not in threads:
+                raise HTTPException(status_code=404, detail="thread not found")
+            messages = list(threads[thread_id]["messages"])
+        if order == "desc":
+            messages.reverse()
+        messages = messages[:limit]
+        return {
+            "object": "list",
+            "data": messages,
+            "first_id": messages[0]["id"] if messages else None,
+            "last_id": messages[-1]["id"] if messages else None,
+            "has_more": False,
+        }
+
+    @app.get("/_fake/stats")
+    def fake_stats():
+        return {"requests": dict(stats), "tool_outputs": list(tool_outputs_log)}
+
+    return app
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Fake OpenAI-compatible server for Lilly load tests")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--config", default=None, help="JSON config (latency, canned responses, tool script)")
+    args = ap.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(load_config(args.config)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Test the local OpenAI stand-in server (scripts/fake_openai.py).
+Drives the real OpenAI SDK against it: chat, embeddings and the Assistants
+tool-call cycle used by core.llm, core.knowledge and core.assistants.
+"""
+
+import sys
+from pathlib import Path
+
+# Add lilly_engine and its scripts to path
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from fastapi.testclient import TestClient
+from openai import OpenAI
+
+from fake_openai import LatencyModel, create_app, load_config
+
+
+def _sdk(config_overrides=None):
+    config = load_config()
+    config.update(config_overrides or {})
+    http = TestClient(create_app(config))
+    client = OpenAI(api_key="sk-fake", base_url="http://testserver/v1", http_client=http)
+    return client, http
+
+
+def test_latency_distributions():
+    """Every supported distribution yields non-negative, seeded samples."""
+    print("=== Testing Latency Distributions ===")
+
+    spec = {
+        "fixed": {"dist": "fixed", "ms": 7},
+        "uniform": {"dist": "uniform", "min_ms": 10, "max_ms": 20},
+        "normal": {"dist": "normal", "mean_ms": 5, "std_ms": 50},
+        "lognormal": {"dist": "lognormal", "median_ms": 100, "sigma": 0.3},
+        "exponential": {"dist": "exponential", "mean_ms": 30},
+    }
+    a, b = LatencyModel(spec, seed=1), LatencyModel(spec, seed=1)
+    for kind in spec:
+        samples = [a.sample_ms(kind) for _ in range(200)]
+        assert samples == [b.sample_ms(kind) for _ in range(200)], "Seeded samples must repeat"
+        assert min(samples) >= 0
+    assert a.sample_ms("fixed") == 7
+    assert all(10 <= a.sample_ms("uniform") <= 20 for _ in range(50))
+    print("✓ Distributions sampled\n")
+
+
+def test_chat_and_embeddings():
+    """Chat returns the canned Lilly JSON with usage; embeddings are deterministic."""
+    print("=== Testing Chat + Embeddings ===")
+
+    client, _ = _sdk({"chat_responses": [{"headline": "A"}, {"headline": "B"}], "embedding_dim": 8})
+    r1 = client.chat.completions.create(model="m", messages=[{"role": "user", "content": "hola"}])
+    r2 = client.chat.completions.create(model="m", messages=[{"role": "user", "content": "hola"}])
+    assert '"A"' in r1.choices[0].message.content and '"B"' in r2.choices[0].message.content
+    assert r1.usage.total_tokens > 0
+
+    e = client.embeddings.create(model="e", input=["Saturn square Sun", "Saturn square Sun"])
+    assert len(e.data) == 2 and len(e.data[0].embedding) == 8
+    assert e.data[0].embedding == e.data[1].embedding
+    print("✓ Chat and embeddings respond\n")
+
+
+def test_generate_interpretation_offline():
+    """core.llm.generate_interpretation runs end-to-end against the fake server."""
+    print("=== Testing generate_interpretation Offline ===")
+
+    import core.llm as llm
+
+    client, _ = _sdk()
+    original = llm._client
+    llm._client = client
+    try:
+        result = llm.generate_interpretation(
+            [{"type": "return", "planet": "Saturn", "to": "Saturn"}],
+            user_name="fake_openai_test",
+            include_reasoning=False
+        )
+    finally:
+        llm._client = original
+    assert result["headline"] == "Tiempo de estructura"
+    assert len(result["actions"]) == 3
+    print(f"✓ Interpretation: {result['headline']}\n")
+
+
+def test_assistants_tool_call_cycle():
+    """Scripted tool-call rounds are surfaced as requires_action, then complete."""
+    print("=== Testing Assistants Tool-Call Cycle ===")
+
+    import core.assistants as assistants
+
+    script = [
+        [{"name": "abu_get_chart", "arguments": {"date": "1990-01-01T12:00:00Z", "lat": 0, "lon": 0}}],
+        [{"name": "abu_get_life_cycles", "arguments": {"birthDate": "1990-01-01T12:00:00Z"}},
+         {"name": "abu_get_forecast", "arguments": {"birthDate": "1990-01-01T12:00:00Z"}}],
+    ]
+    client, http = _sdk({"assistant_script": script})
+    called = []
+
+    originals = (assistants._client, assistants.run_tool_call, assistants._DEF_POLL_INTERVAL)
+    assistants._client = lambda: client
+    assistants.run_tool_call = lambda name, args: called.append(name) or '{"ok": true}'
+    assistants._DEF_POLL_INTERVAL = 0
+    try:
+        result = assistants.generate_interpretation_assistants(events=[{"type": "return"}])
+    finally:
+        assistants._client, assistants.run_tool_call, assistants._DEF_POLL_INTERVAL = originals
+
+    assert called == ["abu_get_chart", "abu_get_life_cycles", "abu_get_forecast"]
+    assert result["headline"] == "Tiempo de estructura"
+    stats = http.get("/_fake/stats").json()
+    assert stats["requests"]["runs.submit_tool_outputs"] == 2
+    assert len(stats["tool_outputs"]) == 3
+    print(f"✓ Tool calls executed: {called}\n")
+
+
+if __name__ == "__main__":
+    print("Starting fake OpenAI server tests...\n")
+
+    try:
+        test_latency_distributions()
+        test_chat_and_embeddings()
+        test_generate_interpretation_offline()
+        test_assistants_tool_call_cycle()
+
+        print("=" * 60)
+        print("✓ All fake OpenAI tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
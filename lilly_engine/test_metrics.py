@@ -0,0 +1,107 @@
+"""
+Test Lilly's Prometheus /metrics endpoint (core/metrics.py).
+Drives a chat call through the fake OpenAI server and checks latency/token
+metrics, HTTP route counters and prompt cache ratios.
+"""
+
+import sys
+from pathlib import Path
+
+# Add lilly_engine and its scripts to path
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from fastapi.testclient import TestClient
+from openai import OpenAI
+
+from core.metrics import REGISTRY
+from fake_openai import create_app, load_config
+from main import app
+
+client = TestClient(app)
+
+
+def _sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_metrics_format():
+    """/metrics serves Prometheus text including process RSS and HTTP families."""
+    print("=== Testing /metrics Format ===")
+
+    client.get("/")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for family in (
+        "# TYPE lilly_http_requests_total counter",
+        "# TYPE lilly_http_request_duration_seconds histogram",
+        "# TYPE lilly_http_requests_in_flight gauge",
+        "process_resident_memory_bytes",
+    ):
+        assert family in response.text, f"Missing {family}"
+    assert _sample("lilly_http_requests_total", {"method": "GET", "route": "/", "status": "200"}) >= 1
+    print("✓ Prometheus families present\n")
+
+
+def test_openai_latency_and_tokens():
+    """A chat interpretation records OpenAI latency, outcome and token usage."""
+    print("=== Testing OpenAI Metrics ===")
+
+    import core.llm as llm
+
+    fake = OpenAI(api_key="sk-fake", base_url="http://testserver/v1",
+                  http_client=TestClient(create_app(load_config())))
+    model = llm.os.getenv("LILLY_MODEL", "gpt-4o-mini")
+    labels = {"operation": "chat", "model": model}
+    before_calls = _sample("lilly_openai_request_duration_seconds_count", labels)
+    before_tokens = _sample("lilly_openai_tokens_total", {**labels, "kind": "prompt"})
+
+    original = llm._client
+    llm._client = fake
+    try:
+        llm.generate_interpretation(
+            [{"type": "return", "planet": "Saturn", "to": "Saturn"}],
+            user_name="metrics_test",
+            include_reasoning=False
+        )
+    finally:
+        llm._client = original
+
+    assert _sample("lilly_openai_request_duration_seconds_count", labels) == before_calls + 1
+    assert _sample("lilly_openai_requests_total", {**labels, "outcome": "ok"}) >= 1
+    assert _sample("lilly_openai_tokens_total", {**labels, "kind": "prompt"}) > before_tokens
+    print("✓ Chat latency and tokens recorded\n")
+
+
+def test_prompt_cache_ratio():
+    """Prompt skeleton lookups feed the cache hit ratio."""
+    print("=== Testing Prompt Cache Ratio ===")
+
+    from core.llm import _assembler
+
+    _assembler.skeleton("es", True)
+    _assembler.skeleton("es", True)
+    hits = _sample("lilly_cache_requests_total", {"cache": "prompt_skeleton", "result": "hit"})
+    ratio = _sample("lilly_cache_hit_ratio", {"cache": "prompt_skeleton"})
+    assert hits >= 1 and 0 < ratio <= 1
+    print(f"✓ prompt_skeleton hit ratio {ratio:.2f}\n")
+
+
+if __name__ == "__main__":
+    print("Starting Lilly metrics tests...\n")
+
+    try:
+        test_metrics_format()
+        test_openai_latency_and_tokens()
+        test_prompt_cache_ratio()
+
+        print("=" * 60)
+        print("✓ All Lilly metrics tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
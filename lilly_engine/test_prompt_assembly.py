@@ -0,0 +1,114 @@
+"""
+Test the prompt assembly cache in Lilly Engine.
+Verifies skeleton rendering, mtime-based axiom reload and per-stage timings.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add lilly_engine to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lilly_engine.core.llm import (
+    PROMPT_TEMPLATES,
+    SYSTEM_MESSAGES,
+    Event,
+    Profile,
+    assemble_prompt,
+    build_prompt
+)
+from lilly_engine.core.prompt_assembly import PromptAssembler, WatchedFile
+
+
+def test_build_prompt_contract():
+    """build_prompt keeps returning (prompt, language) with dynamic fields filled."""
+    print("=== Testing build_prompt Contract ===")
+
+    prompt, lang = build_prompt(
+        profile=Profile(name="Ana {curly}", language="en"),
+        events=[Event(type="return", planet="Saturn", to="Saturn")],
+        question="What now?"
+    )
+    assert lang == "en"
+    assert "Generate a personalized interpretation for Ana {curly}." in prompt
+    assert "- Events: return de Saturn hacia Saturn" in prompt
+    assert "- Sun: none" in prompt
+    assert "User's question or focus: What now?" in prompt
+    assert prompt.rstrip().endswith("No agregues comentarios fuera del JSON.")
+    print("✓ Prompt contract preserved\n")
+
+
+def test_timings_and_system_message():
+    """assemble_prompt reports per-stage timings and the language system message."""
+    print("=== Testing Timings ===")
+
+    build = assemble_prompt(profile={"name": "Bob", "language": "pt"})
+    for stage in ("language", "static", "sections", "references", "context", "render", "total"):
+        assert stage in build.timings, f"Missing stage {stage}"
+    assert build.system_message == SYSTEM_MESSAGES["pt"]
+    print(f"✓ Timings: {build.timings}\n")
+
+
+def test_axioms_reload_on_mtime_change():
+    """Editing the axioms file re-renders the skeletons; otherwise they are reused."""
+    print("=== Testing Axioms Reload ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        axioms = Path(tmp) / "axioms.md"
+        memory = Path(tmp) / "memory.json"
+        axioms.write_text("# Title\n- AX-1 first\n", encoding="utf-8")
+        assembler = PromptAssembler(PROMPT_TEMPLATES, SYSTEM_MESSAGES, axioms_path=axioms, memory_path=memory)
+
+        first = assembler.skeleton("es", True)
+        assert "- AX-1 first" in first
+        assert assembler.skeleton("es", True) is first, "Skeleton should be cached"
+
+        axioms.write_text("# Title\n- AX-2 second {x}\n", encoding="utf-8")
+        stat = axioms.stat()
+        os.utime(axioms, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        second = assembler.skeleton("es", True)
+        assert "- AX-2 second {{x}}" in second
+        assert "- AX-2 second {x}" in second.format(
+            name="n", refs="", sun="", moon="", asc="", transits="",
+            events="", question="", tone="", context=""
+        )
+    print("✓ Axioms reloaded after mtime change\n")
+
+
+def test_watched_file_missing():
+    """A missing file yields the loader's value and reloads once it appears."""
+    print("=== Testing WatchedFile ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "data.txt"
+        watched = WatchedFile(path, lambda p: p.read_text() if p.exists() else "missing")
+        assert watched.get() == ("missing", None)
+        path.write_text("hello")
+        time.sleep(0.01)
+        value, stamp = watched.get()
+        assert value == "hello" and stamp is not None
+    print("✓ WatchedFile tracks file creation\n")
+
+
+if __name__ == "__main__":
+    print("Starting prompt assembly tests...\n")
+
+    try:
+        test_build_prompt_contract()
+        test_timings_and_system_message()
+        test_axioms_reload_on_mtime_change()
+        test_watched_file_missing()
+
+        print("=" * 60)
+        print("✓ All prompt assembly tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,411 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end load generator for Abu + Lilly.
+
+Drives the services with an open-loop arrival process (constant or Poisson)
+at a target RPS, following a scenario file that mirrors the frontend's real
+request mix, and writes HDR-style latency histograms and error rates as JSON.
+
+Usage (PowerShell):
+  python loadtest/loadgen.py loadtest/scenarios/interpret_page.json `
+    --rps 5 --duration 60 --concurrency 64 --out loadtest_results.json `
+    --max-p95-ms 2000 --max-error-rate 0.01
+
+Offline Lilly: run lilly_engine/scripts/fake_openai.py and start Lilly with
+OPENAI_BASE_URL pointing at it (see .env.example).
+
+Latency is measured from each request's *intended* start time, so queueing
+behind a saturated service is counted (no coordinated omission). The pure
+send→response time is reported separately as `service_time`.
+
+Scenario format (JSON):
+  {
+    "name": "interpret_page",
+    "services": {"abu": "http://localhost:8000", "lilly": "http://localhost:8001"},
+    "profiles": [{"birthDate": "1990-01-01T12:00:00Z", "lat": -34.6, "lon": -58.4, ...}],
+    "tasks": [
+      {"name": "chart", "weight": 15, "steps": [
+        {"service": "abu", "method": "GET", "path": "/api/astro/chart",
+         "params": {"date": "{birthDate}", "lat": "{lat}", "lon": "{lon}"}}
+      ]},
+      {"name": "interpret", "weight": 30, "steps": [
+        {"name": "life-cycles", "service": "abu", "path": "/api/astro/life-cycles",
+         "params": {"birthDate": "{birthDate}"}, "save": {"events": "astro_data.events"}},
+        {"name": "interpret", "service": "lilly", "method": "POST", "path": "/api/ai/interpret",
+         "json": {"events": "$events", "language": "es"}}
+      ]}
+    ]
+  }
+
+Each task picks a random profile; "{var}" is formatted from the profile and
+saved values, a string that is exactly "$var" is replaced by the saved value
+itself (any JSON type). Steps of a task run in order and stop at the first
+failure (remaining steps are counted as skipped).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+PERCENTILES = (50, 75, 90, 95, 99, 99.9)
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in the spirit of HdrHistogram.
+
+    Values are recorded in integer microseconds. Each power-of-two range is
+    split into 2**(sub_bucket_bits - 1) linear sub-buckets, so any recorded
+    value is reproduced within 1 / 2**(sub_bucket_bits - 1) relative error
+    (< 0.8% with the default 8 bits, i.e. two significant digits).
+    """
+
+    def __init__(self, sub_bucket_bits: int = 8):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts: Counter = Counter()
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def _key(self, value_us: int):
+        shift = max(0, value_us.bit_length() - self.sub_bucket_bits)
+        return shift, value_us >> shift
+
+    def record(self, seconds: float) -> None:
+        value_us = max(0, int(round(seconds * 1e6)))
+        self.counts[self._key(value_us)] += 1
+        self.count += 1
+        self.total_us += value_us
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts.update(other.counts)
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def _buckets(self):
+        """(upper bound µs, count) in ascending value order."""
+        for shift, sub in sorted(self.counts, key=lambda k: k[1] << k[0]):
+            yield ((sub + 1) << shift) - 1, self.counts[(shift, sub)]
+
+    def percentile_us(self, p: float) -> int:
+        if not self.count:
+            return 0
+        rank = max(1, int(round(p / 100.0 * self.count + 0.4999999)))
+        seen = 0
+        for upper, n in self._buckets():
+            seen += n
+            if seen >= rank:
+                return min(upper, self.max_us)
+        return self.max_us
+
+    def to_dict(self) -> Dict[str, Any]:
+        ms = lambda us: round(us / 1000.0, 3)
+        return {
+            "count": self.count,
+            "min_ms": ms(self.min_us or 0),
+            "mean_ms": ms(self.total_us / self.count) if self.count else 0.0,
+            "max_ms": ms(self.max_us),
+            "percentiles_ms": {f"p{p:g}": ms(self.percentile_us(p)) for p in PERCENTILES},
+            "buckets": [[ms(upper), n] for upper, n in self._buckets()],
+        }
+
+
+class EndpointStats:
+    """Latency histograms and outcome counters for one named step."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.status_codes: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.skipped = 0
+
+    @property
+    def requests(self) -> int:
+        return self.latency.count
+
+    def to_dict(self) -> Dict[str, Any]:
+        failed = sum(self.errors.values())
+        return {
+            "requests": self.requests,
+            "errors": failed,
+            "error_rate": round(failed / self.requests, 6) if self.requests else 0.0,
+            "error_kinds": dict(self.errors),
+            "status_codes": {str(k): v for k, v in sorted(self.status_codes.items())},
+            "skipped": self.skipped,
+            "latency": self.latency.to_dict(),
+            "service_time": self.service_time.to_dict(),
+        }
+
+
+def _lookup(data: Any, dotted: str) -> Any:
+    for part in dotted.split("."):
+        if isinstance(data, list):
+            data = data[int(part)]
+        elif isinstance(data, dict):
+            data = data.get(part)
+        else:
+            return None
+    return data
+
+
+def render(value: Any, variables: Dict[str, Any]) -> Any:
+    """Substitute "$var" (whole value) and "{var}" (string formatting) recursively."""
+    if isinstance(value, str):
+        if value.startswith("$") and value[1:] in variables:
+            return variables[value[1:]]
+        return value.format_map(variables) if "{" in value else value
+    if isinstance(value, dict):
+        return {k: render(v, variables) for k, v in value.items()}
+    if isinstance(value, list):
+        return [render(v, variables) for v in value]
+    return value
+
+
+class LoadGenerator:
+    """Open-loop scenario runner.
+
+    Args:
+        scenario: Parsed scenario dict (see module docstring).
+        rps: Target arrival rate of tasks per second.
+        duration: Seconds of arrivals to generate (after warm-up).
+        concurrency: Max in-flight tasks; extra arrivals queue (and that
+            queueing time counts toward latency).
+        arrival: "constant" or "poisson" inter-arrival times.
+        warmup: Seconds of arrivals at the start whose results are discarded.
+        timeout: Per-request timeout in seconds.
+        services: Base URL overrides per service name.
+        seed: RNG seed for task/profile choice and Poisson arrivals.
+        transport: Optional httpx transport (e.g. ASGITransport for tests).
+    """
+
+    def __init__(
+        self,
+        scenario: Dict[str, Any],
+        rps: float,
+        duration: float,
+        concurrency: int = 64,
+        arrival: str = "poisson",
+        warmup: float = 0.0,
+        timeout: float = 30.0,
+        services: Optional[Dict[str, str]] = None,
+        seed: int = 42,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if rps <= 0:
+            raise ValueError("rps must be > 0")
+        self.scenario = scenario
+        self.rps = rps
+        self.duration = duration
+        self.concurrency = concurrency
+        self.arrival = arrival
+        self.warmup = warmup
+        self.timeout = timeout
+        self.services = {**scenario.get("services", {}), **(services or {})}
+        self.seed = seed
+        self.transport = transport
+        self._rng = random.Random(seed)
+        self.tasks = scenario["tasks"]
+        self.weights = [t.get("weight", 1) for t in self.tasks]
+        self.profiles = scenario.get("profiles") or [{}]
+        self.stats: Dict[str, EndpointStats] = {}
+        self.task_latency: Dict[str, LatencyHistogram] = {}
+        self.sent = 0
+        self.completed = 0
+
+    def _schedule(self) -> List[float]:
+        """Intended start offsets (s) for every arrival, warm-up included."""
+        offsets, t, horizon = [], 0.0, self.warmup + self.duration
+        while True:
+            t += self._rng.expovariate(self.rps) if self.arrival == "poisson" else 1.0 / self.rps
+            if t > horizon:
+                return offsets
+            offsets.append(t)
+
+    async def _step(self, client: httpx.AsyncClient, step: Dict[str, Any], variables: Dict[str, Any],
+                    intended: float, record: bool) -> Optional[Any]:
+        name = step.get("name") or step["path"]
+        stats = self.stats.setdefault(name, EndpointStats())
+        base = self.services.get(step.get("service", "abu"), "").rstrip("/")
+        sent_at = time.perf_counter()
+        status, error, body = None, None, None
+        try:
+            resp = await client.request(
+                step.get("method", "GET").upper(),
+                base + render(step["path"], variables),
+                params=render(step.get("params"), variables),
+                json=render(step.get("json"), variables),
+            )
+            status = resp.status_code
+            if status >= 500:
+                error = "http_5xx"
+            elif status >= 400:
+                error = "http_4xx"
+            elif step.get("save"):
+                body = resp.json()
+        except httpx.TimeoutException:
+            error = "timeout"
+        except httpx.TransportError:
+            error = "connection"
+        except Exception:
+            error = "exception"
+        done = time.perf_counter()
+        if record:
+            stats.latency.record(done - intended)
+            stats.service_time.record(done - sent_at)
+            if status is not None:
+                stats.status_codes[status] += 1
+            if error:
+                stats.errors[error] += 1
+        if error:
+            return None
+        for var, path in (step.get("save") or {}).items():
+            variables[var] = _lookup(body, path)
+        return True
+
+    async def _task(self, client: httpx.AsyncClient, sem: asyncio.Semaphore, task: Dict[str, Any],
+                    profile: Dict[str, Any], intended: float, record: bool) -> None:
+        async with sem:
+            variables = dict(profile)
+            steps = task["steps"]
+            for i, step in enumerate(steps):
+                step_intended = intended if i == 0 else time.perf_counter()
+                if await self._step(client, step, variables, step_intended, record) is None:
+                    if record:
+                        for rest in steps[i + 1:]:
+                            self.stats.setdefault(rest.get("name") or rest["path"], EndpointStats()).skipped += 1
+                    break
+            if record:
+                self.task_latency.setdefault(task["name"], LatencyHistogram()).record(time.perf_counter() - intended)
+                self.completed += 1
+
+    async def run(self) -> Dict[str, Any]:
+        offsets = self._schedule()
+        sem = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        started_at = datetime.now(timezone.utc).isoformat()
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits, transport=self.transport) as client:
+            t0 = time.perf_counter()
+            pending = []
+            for offset in offsets:
+                delay = t0 + offset - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                task = self._rng.choices(self.tasks, weights=self.weights)[0]
+                profile = self._rng.choice(self.profiles)
+                record = offset > self.warmup
+                self.sent += int(record)
+                pending.append(asyncio.create_task(
+                    self._task(client, sem, task, profile, t0 + offset, record)
+                ))
+            await asyncio.gather(*pending)
+            elapsed = time.perf_counter() - t0
+        return self.report(started_at, elapsed)
+
+    def report(self, started_at: str, elapsed: float) -> Dict[str, Any]:
+        overall = LatencyHistogram()
+        requests = errors = 0
+        for s in self.stats.values():
+            overall.merge(s.latency)
+            requests += s.requests
+            errors += sum(s.errors.values())
+        measured = max(elapsed - self.warmup, 1e-9)
+        return {
+            "scenario": self.scenario.get("name", "unnamed"),
+            "started_at": started_at,
+            "config": {
+                "rps": self.rps, "duration_s": self.duration, "warmup_s": self.warmup,
+                "concurrency": self.concurrency, "arrival": self.arrival,
+                "timeout_s": self.timeout, "seed": self.seed, "services": self.services,
+            },
+            "elapsed_s": round(elapsed, 3),
+            "tasks_sent": self.sent,
+            "tasks_completed": self.completed,
+            "requests": requests,
+            "throughput_rps": round(requests / measured, 3),
+            "errors": errors,
+            "error_rate": round(errors / requests, 6) if requests else 0.0,
+            "latency": overall.to_dict(),
+            "endpoints": {name: s.to_dict() for name, s in sorted(self.stats.items())},
+            "tasks": {name: h.to_dict() for name, h in sorted(self.task_latency.items())},
+        }
+
+
+def check_slo(report: Dict[str, Any], max_p95_ms: Optional[float] = None,
+              max_p99_ms: Optional[float] = None, max_error_rate: Optional[float] = None) -> List[str]:
+    """Return human-readable SLO violations for the overall latency/error rate."""
+    violations = []
+    pct = report["latency"]["percentiles_ms"]
+    if max_p95_ms is not None and pct["p95"] > max_p95_ms:
+        violations.append(f"p95 {pct['p95']} ms > {max_p95_ms} ms")
+    if max_p99_ms is not None and pct["p99"] > max_p99_ms:
+        violations.append(f"p99 {pct['p99']} ms > {max_p99_ms} ms")
+    if max_error_rate is not None and report["error_rate"] > max_error_rate:
+        violations.append(f"error rate {report['error_rate']} > {max_error_rate}")
+    return violations
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Abu + Lilly load generator")
+    ap.add_argument("scenario", help="Scenario JSON file")
+    ap.add_argument("--rps", type=float, default=5.0, help="Target task arrivals per second")
+    ap.add_argument("--duration", type=float, default=30.0, help="Measured seconds of load")
+    ap.add_argument("--warmup", type=float, default=0.0, help="Seconds of load discarded first")
+    ap.add_argument("--concurrency", type=int, default=64, help="Max in-flight tasks")
+    ap.add_argument("--arrival", choices=["constant", "poisson"], default="poisson")
+    ap.add_argument("--timeout", type=float, default=30.0)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--abu-url", default=os.getenv("ABU_URL"))
+    ap.add_argument("--lilly-url", default=os.getenv("LILLY_URL"))
+    ap.add_argument("--out", default=None, help="Write JSON report here (default: stdout)")
+    ap.add_argument("--max-p95-ms", type=float, default=None)
+    ap.add_argument("--max-p99-ms", type=float, default=None)
+    ap.add_argument("--max-error-rate", type=float, default=None)
+    args = ap.parse_args(argv)
+
+    with open(args.scenario, encoding="utf-8") as f:
+        scenario = json.load(f)
+    services = {k: v for k, v in (("abu", args.abu_url), ("lilly", args.lilly_url)) if v}
+
+    gen = LoadGenerator(
+        scenario, rps=args.rps, duration=args.duration, concurrency=args.concurrency,
+        arrival=args.arrival, warmup=args.warmup, timeout=args.timeout,
+        services=services, seed=args.seed,
+    )
+    report = asyncio.run(gen.run())
+    violations = check_slo(report, args.max_p95_ms, args.max_p99_ms, args.max_error_rate)
+    report["slo_violations"] = violations
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+        pct = report["latency"]["percentiles_ms"]
+        print(f"[loadgen] {report['requests']} requests, {report['throughput_rps']} rps, "
+              f"p50 {pct['p50']} ms, p95 {pct['p95']} ms, p99 {pct['p99']} ms, "
+              f"errors {report['error_rate']:.2%} -> {args.out}")
+    else:
+        print(text)
+    for v in violations:
+        print(f"[loadgen] SLO violation: {v}", file=sys.stderr)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
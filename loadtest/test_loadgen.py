@@ -0,0 +1,125 @@
+"""
+Test the load generator (loadgen.py).
+Checks histogram accuracy, scenario substitution and a short in-process run
+against a tiny ASGI app (no network needed).
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add loadtest to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from loadgen import LatencyHistogram, LoadGenerator, check_slo, render
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/api/astro/life-cycles")
+    def life_cycles(birthDate: str):
+        return {"astro_data": {"events": [{"type": "return", "planet": "Saturn", "to": birthDate}]}}
+
+    @app.post("/api/ai/interpret")
+    def interpret(body: dict):
+        if not body.get("events"):
+            raise HTTPException(status_code=400, detail="no events")
+        return {"headline": "ok"}
+
+    @app.get("/boom")
+    def boom():
+        raise HTTPException(status_code=503, detail="down")
+
+    return app
+
+
+def test_histogram_percentiles():
+    """Percentiles stay within the histogram's relative error."""
+    print("=== Testing LatencyHistogram ===")
+
+    h = LatencyHistogram()
+    for ms in range(1, 1001):
+        h.record(ms / 1000.0)
+    d = h.to_dict()
+    assert d["count"] == 1000
+    for p, expected in (("p50", 500), ("p90", 900), ("p99", 990)):
+        assert abs(d["percentiles_ms"][p] - expected) / expected < 0.01, (p, d["percentiles_ms"][p])
+    assert d["max_ms"] == 1000.0 and d["min_ms"] == 1.0
+    assert sum(n for _, n in d["buckets"]) == 1000
+
+    other = LatencyHistogram()
+    other.record(5.0)
+    h.merge(other)
+    assert h.count == 1001 and h.percentile_us(100) == 5_000_000
+    print(f"✓ Percentiles: {d['percentiles_ms']}\n")
+
+
+def test_render():
+    """Whole-value $var keeps the saved type; {var} formats strings."""
+    print("=== Testing Substitution ===")
+
+    v = {"events": [{"a": 1}], "lat": -34.6}
+    assert render({"events": "$events", "q": "lat={lat}", "n": 5}, v) == {
+        "events": [{"a": 1}], "q": "lat=-34.6", "n": 5
+    }
+    print("✓ Substitution works\n")
+
+
+def test_run_in_process():
+    """A sequence passes saved values along; failures are counted and skip later steps."""
+    print("=== Testing In-Process Run ===")
+
+    scenario = {
+        "name": "unit",
+        "services": {"abu": "http://abu", "lilly": "http://lilly"},
+        "profiles": [{"birthDate": "1990-01-01T12:00:00Z"}],
+        "tasks": [
+            {"name": "interpret", "weight": 3, "steps": [
+                {"name": "life-cycles", "service": "abu", "path": "/api/astro/life-cycles",
+                 "params": {"birthDate": "{birthDate}"}, "save": {"events": "astro_data.events"}},
+                {"name": "interpret", "service": "lilly", "method": "POST", "path": "/api/ai/interpret",
+                 "json": {"events": "$events"}},
+            ]},
+            {"name": "boom", "weight": 1, "steps": [
+                {"name": "boom", "service": "abu", "path": "/boom"},
+                {"name": "after-boom", "service": "abu", "path": "/never"},
+            ]},
+        ],
+    }
+    gen = LoadGenerator(scenario, rps=200, duration=0.5, arrival="constant", seed=7,
+                        transport=httpx.ASGITransport(app=_app()))
+    report = asyncio.run(gen.run())
+
+    eps = report["endpoints"]
+    assert report["tasks_sent"] == report["tasks_completed"] > 50
+    assert eps["interpret"]["errors"] == 0
+    assert eps["interpret"]["requests"] == eps["life-cycles"]["requests"]
+    assert eps["boom"]["error_kinds"] == {"http_5xx": eps["boom"]["requests"]}
+    assert eps["after-boom"]["skipped"] == eps["boom"]["requests"]
+    assert 0 < report["error_rate"] < 1
+    assert check_slo(report, max_error_rate=0.0)
+    assert not check_slo(report, max_error_rate=1.0, max_p99_ms=60_000)
+    print(f"✓ {report['requests']} requests, error rate {report['error_rate']}\n")
+
+
+if __name__ == "__main__":
+    print("Starting load generator tests...\n")
+
+    try:
+        test_histogram_percentiles()
+        test_render()
+        test_run_in_process()
+
+        print("=" * 60)
+        print("✓ All load generator tests completed!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -7,6 +7,7 @@ export type CityData = {
   country: string
   lat: number
   lon: number
+  timezone?: string
 }
 
 type CitySelectorProps = {